@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Batch CV Analysis - IISER StatusCode 02
+Analyzes a whole cohort of CVs in one run. Text is extracted in a process
+pool, skill extraction runs through a bounded pool of concurrent LLM calls
+(several CVs packed into each call, see --bulk), and every file gets one
+NDJSON line with its status as soon as it finishes, so an interrupted run
+resumes where it stopped.
+
+Input is a directory of CVs (.pdf/.txt/.md, searched recursively) or a
+manifest:
+    .txt   one CV path per line
+    .csv   a "path" column plus optional github_username, github_user_id,
+           user_id, email and target_job columns
+    .json  a list of paths or of objects with the same keys
+Relative manifest paths are resolved against the manifest's directory.
+
+Usage:
+    python batch_analyze.py cohort/ --out cohort.ndjson
+    python batch_analyze.py cohort.csv --workers 8 --llm-concurrency 6 --store-db
+    python batch_analyze.py cohort.csv --out cohort.ndjson --no-resume --bulk 1
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CV_SUFFIXES = (".pdf", ".txt", ".md")
+TARGET_JOBS = ("software_engineer", "data_scientist", "product_manager")
+DEFAULT_LLM_CONCURRENCY = 4
+
+
+@dataclass
+class CVJob:
+    """One CV to analyze, with the optional identity columns from a manifest"""
+    path: str
+    github_username: Optional[str] = None
+    github_user_id: Optional[int] = None
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+    target_job: Optional[str] = None
+
+
+def _job_from_entry(entry: Any, base: Path) -> Optional[CVJob]:
+    if isinstance(entry, str):
+        entry = {"path": entry}
+    if not isinstance(entry, dict) or not str(entry.get("path") or "").strip():
+        return None
+    path = Path(str(entry["path"]).strip()).expanduser()
+    if not path.is_absolute():
+        path = base / path
+
+    def _int(key: str) -> Optional[int]:
+        value = str(entry.get(key) or "").strip()
+        return int(value) if value.isdigit() else None
+
+    return CVJob(
+        path=str(path.resolve()),
+        github_username=str(entry.get("github_username") or "").strip() or None,
+        github_user_id=_int("github_user_id"),
+        user_id=_int("user_id"),
+        email=str(entry.get("email") or "").strip() or None,
+        target_job=str(entry.get("target_job") or "").strip() or None
+    )
+
+
+def discover_jobs(source: str) -> List[CVJob]:
+    """CV jobs from a directory or a .txt/.csv/.json manifest, de-duplicated by path"""
+    source_path = Path(source).expanduser()
+    if source_path.is_dir():
+        entries = [str(path) for path in sorted(source_path.rglob("*")) if path.suffix.lower() in CV_SUFFIXES]
+        base = source_path
+    else:
+        suffix = source_path.suffix.lower()
+        with open(source_path, "r", encoding="utf-8") as f:
+            if suffix == ".csv":
+                entries = list(csv.DictReader(f))
+            elif suffix == ".json":
+                entries = json.load(f)
+            else:
+                entries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        base = source_path.parent
+
+    jobs, seen = [], set()
+    for entry in entries:
+        job = _job_from_entry(entry, base)
+        if job and job.path not in seen:
+            seen.add(job.path)
+            jobs.append(job)
+    return jobs
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_cv_text(path: str) -> Tuple[str, str]:
+    """(text, method) for one CV; runs in a pool worker, so it only uses local parsers.
+
+    PDFs without a text layer come back empty and are sent to Gemini Vision
+    by the parent process.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in (".txt", ".md"):
+        return Path(path).read_text(encoding="utf-8", errors="replace"), "text"
+    if suffix != ".pdf":
+        raise ValueError(f"Unsupported file format: {suffix}. Supported: {', '.join(CV_SUFFIXES)}")
+    for module in ("pypdf", "PyPDF2"):
+        try:
+            reader = importlib.import_module(module).PdfReader(path)
+        except ImportError:
+            continue
+        return "\n".join(page.extract_text() or "" for page in reader.pages).strip(), module
+    return "", "none"
+
+
+def load_results(out_path: str) -> Dict[str, Dict[str, Any]]:
+    """Latest record per CV path from an NDJSON results file (a torn last line is ignored)"""
+    records = {}
+    if not os.path.exists(out_path):
+        return records
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            path = record.get("path")
+            if not path:
+                continue
+            if record.get("status") == "stored":
+                if path in records and records[path].get("sha256") == record.get("sha256"):
+                    records[path]["stored"] = True
+                    records[path]["user_id"] = record.get("user_id")
+            else:
+                records[path] = record
+    return records
+
+
+def pending_jobs(jobs: List[CVJob], previous: Dict[str, Dict[str, Any]], digests: Dict[str, str]) -> List[CVJob]:
+    """Jobs without an ok result for the file's current content"""
+    return [job for job in jobs if not (
+        previous.get(job.path, {}).get("status") == "ok" and previous[job.path].get("sha256") == digests[job.path]
+    )]
+
+
+class ResultWriter:
+    """Appends one JSON line per record and flushes it, so finished work survives a crash"""
+
+    def __init__(self, out_path: str):
+        self._file = open(out_path, "a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+async def analyze_all(agent, jobs: List[CVJob], digests: Dict[str, str], args, writer: ResultWriter) -> Dict[str, int]:
+    """Extract text in a process pool and analyze with at most ``llm_concurrency`` model calls in flight.
+
+    With ``bulk`` > 1, CVs are analyzed in packs of that size, one model call per pack.
+    """
+    loop = asyncio.get_running_loop()
+    llm_slots = asyncio.Semaphore(args.llm_concurrency)
+    counts = {"ok": 0, "error": 0}
+    finished = 0
+
+    def finish(record: Dict[str, Any], started: float):
+        nonlocal finished
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+        record["finished_at"] = datetime.now().isoformat()
+        writer.write(record)
+        counts[record["status"]] += 1
+        finished += 1
+        name = Path(record["path"]).name
+        if record["status"] == "ok":
+            print(f"✅ [{finished}/{len(jobs)}] {name}: {len(record['skills'])} skills, "
+                  f"{record['skill_analysis'].get('match_percentage', 0):.0f}% match ({record['elapsed_ms']}ms)")
+        else:
+            print(f"❌ [{finished}/{len(jobs)}] {name}: {record['stage']} failed - {record['error']}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as text_pool, \
+            ThreadPoolExecutor(max_workers=args.llm_concurrency, thread_name_prefix="cv-llm") as llm_pool:
+
+        async def extract(job: CVJob) -> Optional[Tuple[Dict[str, Any], str, float]]:
+            started = time.perf_counter()
+            target_job = job.target_job if job.target_job in TARGET_JOBS else args.target_job
+            record = {**asdict(job), "sha256": digests[job.path], "target_job": target_job, "stored": False}
+            try:
+                cv_text, method = await loop.run_in_executor(text_pool, extract_cv_text, job.path)
+                if not cv_text.strip() and job.path.lower().endswith(".pdf") and agent.model is not None:
+                    async with llm_slots:
+                        cv_text = await loop.run_in_executor(llm_pool, agent._parse_pdf_with_gemini, job.path)
+                    method = "gemini_vision"
+                if not cv_text.strip():
+                    raise ValueError("No text extracted from CV file")
+            except Exception as e:
+                record.update({"status": "error", "stage": "parse", "error": str(e)})
+                finish(record, started)
+                return None
+            record.update({"text_method": method, "chars": len(cv_text), "cv_text": cv_text})
+            return record, cv_text, started
+
+        async def analyze(pack: List[Tuple[Dict[str, Any], str, float]]):
+            texts = [cv_text for _, cv_text, _ in pack]
+            try:
+                async with llm_slots:
+                    if len(pack) == 1:
+                        results = [await loop.run_in_executor(llm_pool, agent.analyze_cv_text, texts[0], True)]
+                    else:
+                        results = await loop.run_in_executor(llm_pool, agent.extract_skills_bulk, texts, True)
+            except Exception as e:
+                results = [e] * len(pack)
+            for (record, _, started), result in zip(pack, results):
+                if isinstance(result, Exception):
+                    record.update({"status": "error", "stage": "analysis", "error": str(result)})
+                else:
+                    skills = result.get("skills", [])
+                    record.update({
+                        "status": "ok",
+                        "bulk_size": len(pack),
+                        "skills": skills,
+                        "career_goals": result.get("career_goals", {}),
+                        "current_profile": result.get("current_profile", {}),
+                        "skill_gaps_identified": result.get("skill_gaps_identified", []),
+                        "skill_analysis": agent.skill_gap_report(skills, record["target_job"])
+                    })
+                finish(record, started)
+
+        # Start a model call as soon as a full pack of CVs has its text
+        analyses, pack = [], []
+        for extracted in asyncio.as_completed([extract(job) for job in jobs]):
+            item = await extracted
+            if item:
+                pack.append(item)
+            if len(pack) >= args.bulk:
+                analyses.append(asyncio.create_task(analyze(pack)))
+                pack = []
+        if pack:
+            analyses.append(asyncio.create_task(analyze(pack)))
+        await asyncio.gather(*analyses)
+    return counts
+
+
+def store_results(db, records: List[Dict[str, Any]], chunk_size: int) -> Dict[str, int]:
+    """Bulk-insert analyzed CVs into Supabase; returns {path: user_id} for the stored ones"""
+    from main import skill_profile
+
+    user_ids = db.find_user_ids([r["github_username"] for r in records if not r.get("user_id") and r.get("github_username")])
+    new_users = {r["github_username"]: r for r in records
+                 if not r.get("user_id") and r.get("github_username")
+                 and r["github_username"] not in user_ids and r.get("github_user_id")}
+    created = db.bulk_insert("users", [{
+        "github_username": username,
+        "github_user_id": record["github_user_id"],
+        "email": record.get("email"),
+        "avatar_url": f"https://github.com/{username}.png"
+    } for username, record in new_users.items()], chunk_size)
+    user_ids.update({row["github_username"]: row["id"] for row in created})
+
+    resolved = []
+    for record in records:
+        user_id = record.get("user_id") or user_ids.get(record.get("github_username"))
+        if user_id:
+            resolved.append((user_id, record))
+        else:
+            print(f"⚠️ {Path(record['path']).name}: no user_id, known github_username or github_user_id; not stored")
+    if not resolved:
+        return {}
+
+    timestamp = datetime.now().isoformat()
+    has_resume = db.users_with_resume([user_id for user_id, _ in resolved])
+    resume_rows, skills_rows, onboarding_rows, operation_rows = [], [], [], []
+    for user_id, record in resolved:
+        resume_data = {
+            "cv_text": record["cv_text"],
+            "extracted_skills": record["skills"],
+            "career_goals": record["career_goals"],
+            "analysis_timestamp": record.get("finished_at", timestamp)
+        }
+        if user_id in has_resume:
+            db.store_resume_data(user_id, resume_data)
+        else:
+            resume_rows.append({"user_id": user_id, "resume_data": resume_data})
+
+        skill_level, strengths, growth_areas = skill_profile(record["skills"])
+        skills_rows.append({
+            "user_id": user_id,
+            "analysis_data": {
+                "skills_summary": record["skills"],
+                "career_goals": record["career_goals"],
+                "skill_analysis": record["skill_analysis"],
+                "analysis_type": "batch_cv_analysis"
+            },
+            "skill_level": skill_level,
+            "strengths": strengths,
+            "growth_areas": growth_areas,
+            "recommended_learning_path": {"target_job": record["target_job"], "roadmap_items": [], "priority_skills": []}
+        })
+        onboarding_rows.append({
+            "user_id": user_id,
+            "target_role": record["target_job"],
+            "chosen_path": skill_level,
+            "onboarding_complete": True
+        })
+        operation_rows.append({
+            "user_id": user_id,
+            "operation_type": "cv_batch_analysis",
+            "target_repository": "local_cv_analysis",
+            "input_data": {"target_job": record["target_job"], "cv_file_type": Path(record["path"]).suffix.lstrip(".")},
+            "output_data": {
+                "skills_count": len(record["skills"]),
+                "match_percentage": record["skill_analysis"].get("match_percentage", 0)
+            },
+            "success": True,
+            "execution_time_ms": record.get("elapsed_ms")
+        })
+
+    db.bulk_insert("user_resume", resume_rows, chunk_size)
+    stored_ids = {row["user_id"] for row in db.bulk_insert("user_skills_analysis", skills_rows, chunk_size)}
+    db.bulk_insert("user_onboarding", [row for row in onboarding_rows if row["user_id"] in stored_ids], chunk_size)
+    db.bulk_insert("agent_operations", [row for row in operation_rows if row["user_id"] in stored_ids], chunk_size)
+    return {record["path"]: user_id for user_id, record in resolved if user_id in stored_ids}
+
+
+def main():
+    """Batch CLI: analyze a cohort of CVs into NDJSON, optionally storing them in Supabase"""
+    parser = argparse.ArgumentParser(
+        description="Batch CV Analysis - IISER StatusCode 02",
+        epilog="""
+Examples:
+  python batch_analyze.py cohort/ --out cohort.ndjson
+  python batch_analyze.py cohort.csv --llm-concurrency 6 --store-db
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("source", help="Directory of CVs, or a .txt/.csv/.json manifest")
+    parser.add_argument("--out", default="cv_batch_results.ndjson",
+                        help="NDJSON results file, appended to (default: cv_batch_results.ndjson)")
+    parser.add_argument("--target-job", default="software_engineer", choices=TARGET_JOBS,
+                        help="Target job for CVs whose manifest row has none (default: software_engineer)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Processes for text extraction (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help=f"LLM calls in flight at once (default: {DEFAULT_LLM_CONCURRENCY})")
+    parser.add_argument("--bulk", type=int, default=None,
+                        help="CVs packed into one LLM call; 1 = one call per CV (default: CV_BULK_SIZE or 5)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Re-analyze CVs that already have an ok result in --out")
+    parser.add_argument("--store-db", action="store_true",
+                        help="Bulk-insert ok results not yet stored into Supabase")
+    parser.add_argument("--db-batch-size", type=int, default=100, help="Rows per Supabase insert (default: 100)")
+    parser.add_argument("--api-key", help="Gemini API key (if not using default)")
+    parser.add_argument("--supabase-url", help="Supabase URL (if not using environment variable)")
+    parser.add_argument("--supabase-key", help="Supabase anon key (if not using environment variable)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"❌ CV source not found: {args.source}")
+        return 1
+    args.workers = max(1, args.workers)
+    args.llm_concurrency = max(1, args.llm_concurrency)
+
+    # Imported here, not at module level, so text-extraction workers skip the SDK checks
+    from main import CV_BULK_SIZE, CVAnalysisAgent
+    args.bulk = max(1, args.bulk if args.bulk is not None else CV_BULK_SIZE)
+
+    jobs = [job for job in discover_jobs(args.source) if os.path.exists(job.path)]
+    previous = {} if args.no_resume else load_results(args.out)
+    digests = {job.path: file_digest(job.path) for job in jobs}
+    pending = pending_jobs(jobs, previous, digests)
+
+    print("🤖 Batch CV Analysis - IISER StatusCode 02")
+    print("=" * 60)
+    print(f"📂 Source: {args.source} ({len(jobs)} CVs, {len(jobs) - len(pending)} already done)")
+    print(f"⚙️  {args.workers} extraction workers, {args.llm_concurrency} concurrent LLM calls, "
+          f"{args.bulk} CV{'s' if args.bulk > 1 else ''} per call")
+    print(f"📝 Results: {args.out}")
+    print("=" * 60)
+
+    agent = CVAnalysisAgent(args.api_key or os.getenv("GEMINI_API_KEY"), args.supabase_url, args.supabase_key)
+    counts = {"ok": 0, "error": 0}
+    if pending:
+        if not agent.router.available:
+            print("❌ No LLM provider available; set GEMINI_API_KEY, GROQ_API_KEY or LLM_STUB_URLS")
+            return 1
+        started = time.perf_counter()
+        writer = ResultWriter(args.out)
+        try:
+            counts = asyncio.run(analyze_all(agent, pending, digests, args, writer))
+        finally:
+            writer.close()
+        elapsed = time.perf_counter() - started
+        print(f"\n📊 {counts['ok']} ok, {counts['error']} failed in {elapsed:.1f}s "
+              f"({len(pending) / elapsed * 60:.0f} CVs/min)")
+
+    if args.store_db:
+        if not agent.db.client:
+            print("❌ Database not available")
+            return 1
+        results = load_results(args.out)
+        unstored = [record for record in results.values() if record.get("status") == "ok" and not record.get("stored")]
+        print(f"\n🗄️  Storing {len(unstored)} analyses in Supabase...")
+        stored = store_results(agent.db, unstored, args.db_batch_size)
+        writer = ResultWriter(args.out)
+        try:
+            for path, user_id in stored.items():
+                writer.write({"path": path, "sha256": results[path]["sha256"], "status": "stored", "user_id": user_id})
+        finally:
+            writer.close()
+        print(f"✅ Stored {len(stored)}/{len(unstored)} analyses")
+
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -55,6 +55,7 @@ CREATE TABLE ai_issues (
     complexity VARCHAR(20), -- 'simple', 'medium', 'complex'
     estimated_hours INTEGER,
     status VARCHAR(20) DEFAULT 'suggested', -- 'suggested', 'created', 'failed'
+    idempotency_key CHAR(64) UNIQUE, -- SHA-256 of owner/repo + normalized title; set by the issue publisher
     created_at TIMESTAMP DEFAULT NOW()
 );
 
@@ -126,6 +127,27 @@ CREATE TABLE agent_metrics (
     UNIQUE(date, operation_type)
 );
 
+-- Adds a batch of operations to the daily metrics atomically (operation_logger roll-up).
+-- increments: [{"date": "2026-10-19", "operation_type": "code_analysis", "total": 3,
+-- "success": 2, "time_ms": 5400}, ...], at most one entry per (date, operation_type)
+CREATE OR REPLACE FUNCTION agent_metrics_add(increments JSONB)
+RETURNS VOID LANGUAGE sql AS $$
+    INSERT INTO agent_metrics (date, operation_type, total_operations, successful_operations,
+                               average_execution_time_ms)
+    SELECT (item->>'date')::DATE, item->>'operation_type', (item->>'total')::INTEGER,
+           (item->>'success')::INTEGER, (item->>'time_ms')::BIGINT / GREATEST((item->>'total')::INTEGER, 1)
+    FROM jsonb_array_elements(increments) AS item
+    ON CONFLICT (date, operation_type)
+    DO UPDATE SET
+        -- Every right-hand side reads the old row, so the average uses the old total
+        average_execution_time_ms = (
+            COALESCE(agent_metrics.average_execution_time_ms, 0)::BIGINT * COALESCE(agent_metrics.total_operations, 0)
+            + EXCLUDED.average_execution_time_ms::BIGINT * EXCLUDED.total_operations
+        ) / GREATEST(COALESCE(agent_metrics.total_operations, 0) + EXCLUDED.total_operations, 1),
+        total_operations = COALESCE(agent_metrics.total_operations, 0) + EXCLUDED.total_operations,
+        successful_operations = COALESCE(agent_metrics.successful_operations, 0) + EXCLUDED.successful_operations;
+$$;
+
 -- Indexes for performance
 CREATE INDEX idx_repository_analyses_repo ON repository_analyses(owner, repo_name);
 CREATE INDEX idx_repository_analyses_user ON repository_analyses(user_id);
@@ -243,7 +265,38 @@ CREATE TABLE leaderboard (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id),
     total_points INTEGER DEFAULT 0,
-    current_rank INTEGER,
+    current_rank INTEGER, -- not maintained (NULL); the backend serves ranks from memory
     last_updated TIMESTAMP DEFAULT NOW(),
     UNIQUE(user_id)
-);
\ No newline at end of file
+);
+
+-- Content-addressed storage for large JSON payloads (CV text, full analyses).
+-- Hot tables store {"$blob": <hash>, "size_bytes": <n>} instead of the payload.
+CREATE TABLE payload_blobs (
+    hash CHAR(64) PRIMARY KEY, -- SHA-256 of the canonical JSON
+    payload JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Time-windowed leaderboard points (period_key like 'weekly:2026-W42' or 'monthly:2026-10')
+CREATE TABLE leaderboard_periods (
+    id SERIAL PRIMARY KEY,
+    period_key VARCHAR(32) NOT NULL,
+    user_id INTEGER REFERENCES users(id),
+    points INTEGER DEFAULT 0,
+    last_updated TIMESTAMP DEFAULT NOW(),
+    UNIQUE(period_key, user_id)
+);
+
+-- Adds window points atomically so concurrent workers never overwrite each other.
+-- increments: [{"period_key": "weekly:2026-W42", "user_id": 1, "points": 50}, ...],
+-- at most one entry per (period_key, user_id)
+CREATE OR REPLACE FUNCTION leaderboard_add_period_points(increments JSONB)
+RETURNS VOID LANGUAGE sql AS $$
+    INSERT INTO leaderboard_periods (period_key, user_id, points, last_updated)
+    SELECT item->>'period_key', (item->>'user_id')::INTEGER, (item->>'points')::INTEGER, NOW()
+    FROM jsonb_array_elements(increments) AS item
+    ON CONFLICT (period_key, user_id)
+    DO UPDATE SET points = leaderboard_periods.points + EXCLUDED.points, last_updated = NOW();
+$$;
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Any
 import argparse
 from dataclasses import dataclass
 from datetime import datetime
+from importlib.util import find_spec
 
 # Import required libraries
 try:
@@ -22,44 +23,165 @@ except ImportError:
     DOTENV_AVAILABLE = False
     print("Warning: python-dotenv not available. Please install with: pip install python-dotenv")
 
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-    print("Warning: google-generativeai not available. Using mock responses.")
 
-try:
-    from langchain_community.document_loaders import PyPDFLoader, TextLoader
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
+def _installed(module: str) -> bool:
+    """True if ``module`` can be imported, without importing it"""
     try:
-        # Fallback to older import path
-        from langchain.document_loaders import PyPDFLoader, TextLoader
-        from langchain.text_splitter import RecursiveCharacterTextSplitter
-        LANGCHAIN_AVAILABLE = True
-    except ImportError:
-        LANGCHAIN_AVAILABLE = False
-        print("Warning: langchain not available. Using basic text processing.")
+        return find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    WEB_AVAILABLE = True
-except ImportError:
-    WEB_AVAILABLE = False
+
+# Gemini, LangChain and Supabase SDKs are slow to import; check they are
+# installed here and import them where they are first used
+GENAI_AVAILABLE = _installed("google.generativeai")
+if not GENAI_AVAILABLE:
+    print("Warning: google-generativeai not available. Using mock responses.")
+
+LANGCHAIN_AVAILABLE = _installed("langchain_community") or _installed("langchain")
+if not LANGCHAIN_AVAILABLE:
+    print("Warning: langchain not available. Using basic text processing.")
+
+WEB_AVAILABLE = _installed("requests") and _installed("bs4")
+if not WEB_AVAILABLE:
     print("Warning: requests/beautifulsoup4 not available. Web features disabled.")
 
-try:
-    from supabase import create_client, Client
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+SUPABASE_AVAILABLE = _installed("supabase")
+if not SUPABASE_AVAILABLE:
     print("Warning: supabase-py not available. Please install with: pip install supabase psycopg2-binary")
 
+# agents/ holds the shared package used by both agents
+_AGENTS_DIR = str(Path(__file__).resolve().parent.parent)
+if _AGENTS_DIR not in sys.path:
+    sys.path.append(_AGENTS_DIR)
+from shared.prompt_compaction import compact_cv, compact_json, context_budget, estimate_tokens
+from shared.llm_router import GEMINI_MODEL, GeminiProvider, get_router
+from shared.resource_catalog import resource_catalog
+from shared.skill_normalizer import skill_normalizer
+# Upper bound on CV tokens sent for extraction; Gemini's window is far larger, but input tokens are billed
+CV_PROMPT_MAX_TOKENS = int(os.getenv("CV_PROMPT_MAX_TOKENS", "4000"))
+# Bulk extraction packs up to CV_BULK_SIZE CVs, and at most CV_BULK_MAX_TOKENS of CV text, per request;
+# packs are also kept inside the largest configured model's context window
+CV_BULK_SIZE = int(os.getenv("CV_BULK_SIZE", "5"))
+CV_BULK_MAX_TOKENS = int(os.getenv("CV_BULK_MAX_TOKENS", "20000"))
+# Reply tokens reserved per CV in a pack (the JSON analysis of one CV)
+CV_BULK_REPLY_TOKENS = 1024
+
+# What to extract and the JSON shape; shared by single-CV and bulk prompts
+CV_ANALYSIS_INSTRUCTIONS = """
+Please analyze and extract the following information with high accuracy:
+
+1. **Technical Skills**: Identify all technical skills mentioned, including:
+   - Programming languages
+   - Frameworks and libraries
+   - Databases and data technologies
+   - Cloud platforms and DevOps tools
+   - Development tools and methodologies
+
+2. **Skill Proficiency Assessment**: For each skill, determine the proficiency level (1-5) based on:
+   - Years of experience mentioned
+   - Project complexity
+   - Professional vs academic experience
+   - Self-described proficiency levels (beginner, intermediate, advanced)
+   - Depth of implementation described
+
+3. **Career Goals Analysis**: Extract career aspirations including:
+   - Target job titles or roles
+   - Industry preferences
+   - Short-term and long-term objectives
+   - Specific technologies or domains of interest
+
+4. **Experience Level Assessment**: Determine overall experience level based on:
+   - Total years of professional experience
+   - Complexity of projects handled
+   - Leadership or mentoring experience
+   - Educational background
+
+Please provide the response in the following detailed JSON format:
+{
+    "skills": [
+        {
+            "name": "skill_name",
+            "level": 1-5,
+            "category": "programming/database/frontend/backend/devops/cloud/ai_ml/data_analysis/soft_skills/tools/other",
+            "evidence": "specific evidence from CV showing this skill level",
+            "years_experience": "estimated years of experience",
+            "context": "professional/academic/personal projects"
+        }
+    ],
+    "career_goals": {
+        "primary_target": "main desired job title",
+        "secondary_targets": ["alternative job titles"],
+        "industry": "preferred industry/domain",
+        "experience_level": "entry/junior/mid/senior",
+        "timeline": "short_term/medium_term/long_term",
+        "specific_interests": ["specific areas of interest"],
+        "motivation": "reason for career direction"
+    },
+    "current_profile": {
+        "total_experience_years": "number",
+        "seniority_level": "entry/junior/mid/senior",
+        "primary_domains": ["main areas of expertise"],
+        "education_level": "degree level and field",
+        "strongest_skills": ["top 5 skills"],
+        "career_progression": "trajectory analysis"
+    },
+    "skill_gaps_identified": [
+        {
+            "target_role": "role name",
+            "missing_skills": ["skills needed"],
+            "weak_areas": ["skills to improve"]
+        }
+    ]
+}
+
+Be thorough and evidence-based in your analysis. Consider context clues like project descriptions, responsibilities, and achievements to accurately assess skill levels.
+"""
+
+def validate_extraction(result: Any) -> Dict:
+    """Check one CV analysis has the expected shape; skill levels become ints in 1-5
+    and skill names canonical, with duplicate spellings merged at the highest level.
+    Each skill keeps the names the CV actually used in ``original_names``.
+
+    Raises ValueError for a reply that cannot be used.
+    """
+    if not isinstance(result, dict):
+        raise ValueError("analysis is not a JSON object")
+    skills = result.get("skills")
+    if not isinstance(skills, list):
+        raise ValueError("analysis has no skills list")
+    if not isinstance(result.get("career_goals", {}), dict):
+        raise ValueError("career_goals is not an object")
+    
+    valid_skills: Dict[str, Dict] = {}
+    for skill in skills:
+        if not isinstance(skill, dict) or not str(skill.get("name") or "").strip():
+            continue
+        try:
+            level = int(float(skill.get("level", 1)))
+        except (TypeError, ValueError):
+            raise ValueError(f"skill '{skill['name']}' has no numeric level")
+        original = " ".join(str(skill["name"]).split())
+        name = skill_normalizer.canonical(original)
+        key = skill_normalizer.key(name)
+        seen = valid_skills[key]["original_names"] if key in valid_skills else []
+        if original not in seen:
+            seen = seen + [original]
+        if key not in valid_skills or level > valid_skills[key]["level"]:
+            valid_skills[key] = {**skill, "name": name, "level": max(1, min(5, level))}
+        valid_skills[key]["original_names"] = seen
+    result["skills"] = list(valid_skills.values())
+    return result
+
+def parse_json_reply(text: str) -> Any:
+    """JSON from a model reply, with any markdown code fence removed"""
+    text = text.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0]
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0]
+    return json.loads(text)
+
 @dataclass
 class SkillLevel:
     """Represents a skill with its proficiency level"""
@@ -86,6 +208,24 @@ class RoadmapItem:
     resources: List[str]
     estimated_time: str
 
+def skill_profile(skills: List[Dict]) -> tuple:
+    """(overall skill level, strengths, growth areas) from extracted skills"""
+    skill_levels = [skill.get("level", 0) for skill in skills]
+    avg_skill_level = sum(skill_levels) / len(skill_levels) if skill_levels else 0
+    
+    if avg_skill_level >= 4:
+        skill_level = "advanced"
+    elif avg_skill_level >= 3:
+        skill_level = "intermediate"
+    elif avg_skill_level >= 2:
+        skill_level = "beginner"
+    else:
+        skill_level = "entry"
+    
+    strengths = [skill["name"] for skill in skills if skill.get("level", 0) >= 4]
+    growth_areas = [skill["name"] for skill in skills if skill.get("level", 0) < 3]
+    return skill_level, strengths, growth_areas
+
 class SupabaseManager:
     """Manages Supabase database operations"""
     
@@ -106,7 +246,8 @@ class SupabaseManager:
             return
             
         try:
-            self.client: Client = create_client(self.url, self.key)
+            from supabase import create_client
+            self.client = create_client(self.url, self.key)
             print("✅ Supabase client initialized successfully")
         except Exception as e:
             print(f"❌ Failed to initialize Supabase client: {e}")
@@ -224,6 +365,46 @@ class SupabaseManager:
             print(f"❌ Error logging operation: {e}")
             return False
     
+    def find_user_ids(self, github_usernames: List[str]) -> Dict[str, int]:
+        """Map existing users' GitHub usernames to ids with one query"""
+        if not self.client or not github_usernames:
+            return {}
+            
+        try:
+            result = self.client.table('users').select('id, github_username').in_(
+                'github_username', list(github_usernames)).execute()
+            return {row['github_username']: row['id'] for row in result.data}
+        except Exception as e:
+            print(f"❌ Error looking up users: {e}")
+            return {}
+    
+    def users_with_resume(self, user_ids: List[int]) -> set:
+        """Ids among ``user_ids`` that already have a user_resume row"""
+        if not self.client or not user_ids:
+            return set()
+            
+        try:
+            result = self.client.table('user_resume').select('user_id').in_('user_id', list(user_ids)).execute()
+            return {row['user_id'] for row in result.data}
+        except Exception as e:
+            print(f"❌ Error looking up resumes: {e}")
+            return set()
+    
+    def bulk_insert(self, table: str, rows: List[Dict], chunk_size: int = 100) -> List[Dict]:
+        """Insert ``rows`` into ``table`` in chunks of ``chunk_size``; returns the inserted rows"""
+        if not self.client or not rows:
+            return []
+            
+        inserted = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                result = self.client.table(table).insert(chunk).execute()
+                inserted.extend(result.data or [])
+            except Exception as e:
+                print(f"❌ Error inserting {len(chunk)} rows into {table}: {e}")
+        return inserted
+    
     def create_onboarding_record(self, user_id: int, uploaded_cv_url: str = None, 
                                target_role: str = None, chosen_path: str = None) -> bool:
         """Create user onboarding record"""
@@ -264,8 +445,9 @@ class CVAnalysisAgent:
             self.model = None
         elif GENAI_AVAILABLE:
             try:
+                import google.generativeai as genai
                 genai.configure(api_key=self.gemini_api_key)
-                self.model = genai.GenerativeModel('gemini-2.5-flash')
+                self.model = genai.GenerativeModel(GEMINI_MODEL)
                 print("✅ Gemini API configured successfully")
             except Exception as e:
                 print(f"❌ Failed to configure Gemini API: {e}")
@@ -274,6 +456,11 @@ class CVAnalysisAgent:
             self.model = None
             print("Running in mock mode - Gemini API not available")
         
+        # Text completions go through the shared router: Gemini first, failing over to Groq
+        self.router = get_router(("gemini", "groq"))
+        if self.model is not None:
+            self.router.add_provider(GeminiProvider(self.gemini_api_key))
+        
         # Initialize Supabase manager
         self.db = SupabaseManager(supabase_url, supabase_key)
         
@@ -426,6 +613,10 @@ class CVAnalysisAgent:
             if LANGCHAIN_AVAILABLE:
                 try:
                     print("🔄 Falling back to LangChain PDF parsing...")
+                    try:
+                        from langchain_community.document_loaders import PyPDFLoader
+                    except ImportError:
+                        from langchain.document_loaders import PyPDFLoader
                     loader = PyPDFLoader(pdf_path)
                     documents = loader.load()
                     return "\n".join([doc.page_content for doc in documents])
@@ -436,102 +627,12 @@ class CVAnalysisAgent:
     
     def extract_skills_and_goals(self, cv_text: str) -> tuple:
         """Extract skills and career goals from CV using Gemini with enhanced prompting"""
-        
-        enhanced_prompt = f"""
-        You are an expert HR analyst and career counselor. Analyze the following CV/Resume text comprehensively and extract detailed information.
-
-        CV Content:
-        {cv_text}
-
-        Please analyze and extract the following information with high accuracy:
-
-        1. **Technical Skills**: Identify all technical skills mentioned, including:
-           - Programming languages
-           - Frameworks and libraries
-           - Databases and data technologies
-           - Cloud platforms and DevOps tools
-           - Development tools and methodologies
-
-        2. **Skill Proficiency Assessment**: For each skill, determine the proficiency level (1-5) based on:
-           - Years of experience mentioned
-           - Project complexity
-           - Professional vs academic experience
-           - Self-described proficiency levels (beginner, intermediate, advanced)
-           - Depth of implementation described
-
-        3. **Career Goals Analysis**: Extract career aspirations including:
-           - Target job titles or roles
-           - Industry preferences
-           - Short-term and long-term objectives
-           - Specific technologies or domains of interest
-
-        4. **Experience Level Assessment**: Determine overall experience level based on:
-           - Total years of professional experience
-           - Complexity of projects handled
-           - Leadership or mentoring experience
-           - Educational background
-
-        Please provide the response in the following detailed JSON format:
-        {{
-            "skills": [
-                {{
-                    "name": "skill_name",
-                    "level": 1-5,
-                    "category": "programming/database/frontend/backend/devops/cloud/ai_ml/data_analysis/soft_skills/tools/other",
-                    "evidence": "specific evidence from CV showing this skill level",
-                    "years_experience": "estimated years of experience",
-                    "context": "professional/academic/personal projects"
-                }}
-            ],
-            "career_goals": {{
-                "primary_target": "main desired job title",
-                "secondary_targets": ["alternative job titles"],
-                "industry": "preferred industry/domain",
-                "experience_level": "entry/junior/mid/senior",
-                "timeline": "short_term/medium_term/long_term",
-                "specific_interests": ["specific areas of interest"],
-                "motivation": "reason for career direction"
-            }},
-            "current_profile": {{
-                "total_experience_years": "number",
-                "seniority_level": "entry/junior/mid/senior",
-                "primary_domains": ["main areas of expertise"],
-                "education_level": "degree level and field",
-                "strongest_skills": ["top 5 skills"],
-                "career_progression": "trajectory analysis"
-            }},
-            "skill_gaps_identified": [
-                {{
-                    "target_role": "role name",
-                    "missing_skills": ["skills needed"],
-                    "weak_areas": ["skills to improve"]
-                }}
-            ]
-        }}
-
-        Be thorough and evidence-based in your analysis. Consider context clues like project descriptions, responsibilities, and achievements to accurately assess skill levels.
-        """
-        
         try:
-            if GENAI_AVAILABLE and self.model:
-                print("🧠 Performing deep CV analysis with Gemini...")
-                response = self.model.generate_content(enhanced_prompt)
-                
-                # Clean and parse JSON response
-                response_text = response.text.strip()
-                # Remove markdown code blocks if present
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0]
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0]
-                
-                result = json.loads(response_text)
-                print("✅ Detailed analysis completed")
-                
+            if self.router.available:
+                print("🧠 Performing deep CV analysis...")
             else:
-                # Enhanced mock analysis
                 print("⚠️  Using enhanced mock analysis (Gemini not available)")
-                result = self._enhanced_mock_analysis(cv_text)
+            result = self.analyze_cv_text(cv_text)
             
             # Store in cache with enhanced structure
             self.cache["extracted_skills"] = result.get("skills", [])
@@ -556,6 +657,124 @@ class CVAnalysisAgent:
             print("Falling back to basic extraction...")
             return self._basic_skill_extraction(cv_text)
     
+    def analyze_cv_text(self, cv_text: str, quiet: bool = False) -> Dict:
+        """Skills, career goals and profile for one CV, without touching the cache.
+
+        Safe to call from several threads at once (batch mode); raises if the
+        model call or its JSON fails.
+        """
+        compacted_cv = compact_cv(cv_text, min(CV_PROMPT_MAX_TOKENS, context_budget(GEMINI_MODEL)))
+        original_tokens, compacted_tokens = estimate_tokens(cv_text), estimate_tokens(compacted_cv)
+        if compacted_tokens < original_tokens and not quiet:
+            print(f"✂️ CV compacted: ~{original_tokens:,} -> ~{compacted_tokens:,} tokens")
+
+        enhanced_prompt = f"""
+        You are an expert HR analyst and career counselor. Analyze the following CV/Resume text comprehensively and extract detailed information.
+
+        CV Content:
+        {compacted_cv}
+
+        {CV_ANALYSIS_INSTRUCTIONS}
+        """
+        
+        if not self.router.available:
+            return self._enhanced_mock_analysis(cv_text)
+        
+        response = self.router.complete(enhanced_prompt, json_mode=True)
+        if not quiet:
+            print(f"   via {response.provider} in {response.latency_ms:.0f}ms")
+        
+        result = validate_extraction(parse_json_reply(response.text))
+        if not quiet:
+            print("✅ Detailed analysis completed")
+        return result
+    
+    def extract_skills_bulk(self, cv_texts: List[str], quiet: bool = False) -> List[Any]:
+        """Analyze many CVs with one model call per pack of up to CV_BULK_SIZE.
+
+        The packed prompt carries the analysis instructions once, each CV between
+        its own delimiters, and asks for a JSON object keyed by document id.
+        Entries that are missing or fail validation are retried one CV at a time.
+        Returns one result per input, in order; a CV that fails even alone gets
+        its exception in place of a result.
+        """
+        if not self.router.available:
+            return [self._enhanced_mock_analysis(cv_text) for cv_text in cv_texts]
+        
+        compacted = [compact_cv(cv_text, min(CV_PROMPT_MAX_TOKENS, CV_BULK_MAX_TOKENS)) for cv_text in cv_texts]
+        results: List[Any] = [None] * len(cv_texts)
+        retry = []
+        for pack in self._bulk_packs(compacted, self.router.max_context_window):
+            if len(pack) == 1:
+                retry.extend(pack)
+                continue
+            try:
+                response = self.router.complete(self._bulk_prompt([compacted[i] for i in pack]), json_mode=True)
+                reply = parse_json_reply(response.text)
+                if not quiet:
+                    print(f"   {len(pack)} CVs via {response.provider} in {response.latency_ms:.0f}ms")
+            except Exception as e:
+                print(f"⚠️ Bulk extraction of {len(pack)} CVs failed: {e}")
+                reply = {}
+            for position, index in enumerate(pack, 1):
+                try:
+                    results[index] = validate_extraction(reply.get(f"cv_{position}") if isinstance(reply, dict) else None)
+                except ValueError:
+                    retry.append(index)
+        
+        if len(retry) < len(cv_texts) and retry:
+            print(f"🔁 Retrying {len(retry)} of {len(cv_texts)} CVs one at a time")
+        for index in retry:
+            try:
+                results[index] = self.analyze_cv_text(cv_texts[index], quiet=True)
+            except Exception as e:
+                results[index] = e
+        return results
+    
+    @classmethod
+    def _bulk_packs(cls, compacted: List[str], context_window: int) -> List[List[int]]:
+        """Indices of consecutive CVs grouped within CV_BULK_SIZE and CV_BULK_MAX_TOKENS.
+
+        A pack's whole prompt plus CV_BULK_REPLY_TOKENS per CV must also fit in
+        ``context_window``, so with only small-window models (e.g. Groq's 8k)
+        packs shrink to single CVs instead of overflowing after failover.
+        """
+        fixed = estimate_tokens(cls._bulk_prompt([]))
+        packs, pack, pack_tokens, prompt_tokens = [], [], 0, fixed
+        for index, cv_text in enumerate(compacted):
+            tokens = estimate_tokens(cv_text)
+            document = estimate_tokens(cls._bulk_prompt([cv_text])) - fixed + CV_BULK_REPLY_TOKENS
+            if pack and (len(pack) >= CV_BULK_SIZE or pack_tokens + tokens > CV_BULK_MAX_TOKENS
+                         or prompt_tokens + document > context_window):
+                packs.append(pack)
+                pack, pack_tokens, prompt_tokens = [], 0, fixed
+            pack.append(index)
+            pack_tokens += tokens
+            prompt_tokens += document
+        if pack:
+            packs.append(pack)
+        return packs
+    
+    @staticmethod
+    def _bulk_prompt(cv_texts: List[str]) -> str:
+        documents = "\n\n".join(
+            f"=== BEGIN cv_{position} ===\n{cv_text}\n=== END cv_{position} ==="
+            for position, cv_text in enumerate(cv_texts, 1)
+        )
+        keys = ", ".join(f'"cv_{position}": {{...}}' for position in range(1, len(cv_texts) + 1))
+        return f"""
+        You are an expert HR analyst and career counselor. Below are {len(cv_texts)} separate CVs/Resumes, each between
+        "=== BEGIN cv_N ===" and "=== END cv_N ===" markers. Analyze each one independently and comprehensively;
+        never mix information between CVs.
+
+        {documents}
+
+        {CV_ANALYSIS_INSTRUCTIONS}
+
+        Apply the format above to every CV and return ONE JSON object keyed by document id, with every id exactly once:
+        {{{keys}}}
+        """
+    
     def _enhanced_mock_analysis(self, cv_text: str) -> Dict:
         """Enhanced mock analysis with better pattern recognition"""
         cv_lower = cv_text.lower()
@@ -759,18 +978,32 @@ class CVAnalysisAgent:
             print(f"Job '{target_job}' not found in database")
             return {}
         
+        analysis = self.skill_gap_report(self.cache["extracted_skills"], target_job)
+        self.cache["skill_analysis"] = analysis
+        return analysis
+    
+    def skill_gap_report(self, extracted_skills: List[Dict], target_job: str) -> Dict[str, Any]:
+        """Compare ``extracted_skills`` with the target job's requirements ({} for an unknown job)"""
+        if target_job not in self.job_skill_db:
+            return {}
+        
         required_skills = self.job_skill_db[target_job]["required_skills"]
-        user_skills = {skill["name"].lower(): skill for skill in self.cache["extracted_skills"]}
+        # Keyed by canonical skill, so "Nodejs" on a CV meets a "Node.js" requirement
+        user_skills = {}
+        for skill in extracted_skills:
+            key = skill_normalizer.key(skill["name"])
+            if key not in user_skills or skill.get("level", 0) > user_skills[key].get("level", 0):
+                user_skills[key] = skill
         
         skill_gaps = []
         strengths = []
         
         for req_skill in required_skills:
-            skill_name = req_skill["name"].lower()
+            skill_name = skill_normalizer.key(req_skill["name"])
             required_level = req_skill["level"]
             
             if skill_name in user_skills:
-                user_level = user_skills[skill_name]["level"]
+                user_level = user_skills[skill_name].get("level", 0)
                 if user_level >= required_level:
                     strengths.append({
                         "skill": req_skill["name"],
@@ -801,8 +1034,6 @@ class CVAnalysisAgent:
             "strengths": strengths,
             "match_percentage": len(strengths) / len(required_skills) * 100 if required_skills else 0
         }
-        
-        self.cache["skill_analysis"] = analysis
         return analysis
     
     def generate_roadmap(self) -> List[RoadmapItem]:
@@ -817,7 +1048,7 @@ class CVAnalysisAgent:
         roadmap_prompt = f"""
         Based on the following skill gap analysis and career goals, create a personalized learning roadmap:
         
-        Skill Gaps: {json.dumps(skill_analysis.get('skill_gaps', []))}
+        Skill Gaps: {compact_json(skill_analysis.get('skill_gaps', []))}
         Career Goal: {career_goals.title} in {career_goals.industry}
         Timeline: {career_goals.timeline}
         
@@ -830,7 +1061,6 @@ class CVAnalysisAgent:
                     "target_level": 0-5,
                     "priority": "high/medium/low",
                     "estimated_time": "time estimate",
-                    "resources": ["resource1", "resource2", "resource3"],
                     "milestones": ["milestone1", "milestone2"]
                 }}
             ]
@@ -844,13 +1074,13 @@ class CVAnalysisAgent:
         """
         
         try:
-            if GENAI_AVAILABLE and self.model:
-                response = self.model.generate_content(roadmap_prompt)
+            if self.router.available:
+                response = self.router.complete(roadmap_prompt, json_mode=True)
                 response_text = response.text.strip().replace('```json', '').replace('```', '')
                 if response_text:
                     result = json.loads(response_text)
                 else:
-                    print("Warning: Empty response from Gemini, using mock roadmap")
+                    print(f"Warning: Empty response from {response.provider}, using mock roadmap")
                     result = self._mock_roadmap_generation(skill_analysis, career_goals)
             else:
                 # Mock roadmap generation
@@ -858,12 +1088,15 @@ class CVAnalysisAgent:
             
             roadmap_items = []
             for item in result.get("roadmap", []):
+                # Resources come from the local catalog (for the next level), not the model
+                current_level = item.get("current_level", 0)
+                next_level = current_level + 1 if isinstance(current_level, int) else None
                 roadmap_item = RoadmapItem(
                     skill=item.get("skill", ""),
                     current_level=item.get("current_level", 0),
                     target_level=item.get("target_level", 0),
                     priority=item.get("priority", "medium"),
-                    resources=item.get("resources", []),
+                    resources=resource_catalog.labels(item.get("skill", ""), next_level),
                     estimated_time=item.get("estimated_time", "")
                 )
                 roadmap_items.append(roadmap_item)
@@ -906,8 +1139,8 @@ class CVAnalysisAgent:
             time_mapping = {1: "2-4 weeks", 2: "1-2 months", 3: "2-3 months", 4: "3-4 months", 5: "4-6 months"}
             estimated_time = time_mapping.get(gap["gap"], "1-2 months")
             
-            # Generate resources based on skill category
-            resources = self._get_mock_resources(gap["skill"], gap["category"])
+            # Top catalogued resources for the learner's next level
+            resources = resource_catalog.labels(gap["skill"], min(gap["required_level"], gap["user_level"] + 1))
             
             roadmap.append({
                 "skill": gap["skill"],
@@ -921,23 +1154,6 @@ class CVAnalysisAgent:
         
         return {"roadmap": roadmap}
     
-    def _get_mock_resources(self, skill: str, category: str) -> List[str]:
-        """Get mock learning resources for a skill"""
-        resource_map = {
-            "Python": ["Python.org Tutorial", "Automate the Boring Stuff", "Python for Data Science Handbook"],
-            "Machine Learning": ["Coursera ML Course", "Hands-On Machine Learning", "Kaggle Learn"],
-            "Statistics": ["Khan Academy Statistics", "Think Stats", "Statistics for Data Science"],
-            "SQL": ["SQLBolt", "W3Schools SQL", "SQL Zoo"],
-            "TensorFlow": ["TensorFlow.org Tutorials", "Deep Learning with Python", "TensorFlow Developer Certificate"],
-            "Pandas": ["Pandas Documentation", "Python for Data Analysis", "Kaggle Pandas Course"],
-            "Tableau": ["Tableau Public Training", "Tableau Desktop Specialist", "DataCamp Tableau"],
-            "R": ["R for Data Science", "Swirl R Programming", "Coursera R Programming"],
-            "Docker": ["Docker Official Tutorial", "Docker for Beginners", "Docker Mastery Course"],
-            "AWS": ["AWS Free Tier", "AWS Cloud Practitioner", "A Cloud Guru AWS Courses"]
-        }
-        
-        return resource_map.get(skill, [f"{skill} Official Documentation", f"{skill} Tutorial", f"{skill} Best Practices"])
-    
     def display_results(self):
         """Display analysis results in CLI format"""
         print("\n" + "="*80)
@@ -1050,22 +1266,8 @@ class CVAnalysisAgent:
             if not success:
                 return False
             
-            # Determine skill level and prepare data for skills analysis
-            skill_levels = [skill.get("level", 0) for skill in self.cache["extracted_skills"]]
-            avg_skill_level = sum(skill_levels) / len(skill_levels) if skill_levels else 0
-            
-            if avg_skill_level >= 4:
-                skill_level = "advanced"
-            elif avg_skill_level >= 3:
-                skill_level = "intermediate"
-            elif avg_skill_level >= 2:
-                skill_level = "beginner"
-            else:
-                skill_level = "entry"
-            
-            # Extract strengths and growth areas
-            strengths = [skill["name"] for skill in self.cache["extracted_skills"] if skill.get("level", 0) >= 4]
-            growth_areas = [skill["name"] for skill in self.cache["extracted_skills"] if skill.get("level", 0) < 3]
+            # Determine skill level, strengths and growth areas for skills analysis
+            skill_level, strengths, growth_areas = skill_profile(self.cache["extracted_skills"])
             
             # Prepare learning path from roadmap
             learning_path = {
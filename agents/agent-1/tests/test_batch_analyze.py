@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for batch CV analysis resume
+Checks which CVs a rerun skips, given the NDJSON results of an earlier run
+"""
+
+import os
+import sys
+
+# Add the agent-1 directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_analyze import CVJob, ResultWriter, file_digest, load_results, pending_jobs
+
+
+def _cohort(tmp_path, *names):
+    jobs = []
+    for name in names:
+        path = tmp_path / name
+        path.write_text(f"CV of {name}", encoding="utf-8")
+        jobs.append(CVJob(path=str(path)))
+    return jobs
+
+
+def _write(out_path, *records):
+    writer = ResultWriter(str(out_path))
+    try:
+        for record in records:
+            writer.write(record)
+    finally:
+        writer.close()
+
+
+def test_resume_skips_only_unchanged_ok_results(tmp_path):
+    """Ok results for unchanged files are skipped; errors, edits and new files run again"""
+    done, failed, edited, new = _cohort(tmp_path, "done.txt", "failed.txt", "edited.txt", "new.txt")
+    out = tmp_path / "results.ndjson"
+    _write(out,
+           {"path": done.path, "sha256": file_digest(done.path), "status": "ok"},
+           {"path": failed.path, "sha256": file_digest(failed.path), "status": "error", "error": "timeout"},
+           {"path": edited.path, "sha256": file_digest(edited.path), "status": "ok"})
+    (tmp_path / "edited.txt").write_text("CV of edited.txt, with a new job", encoding="utf-8")
+
+    jobs = [done, failed, edited, new]
+    digests = {job.path: file_digest(job.path) for job in jobs}
+    pending = pending_jobs(jobs, load_results(str(out)), digests)
+    assert [job.path for job in pending] == [failed.path, edited.path, new.path]
+    print("✅ Resume skips only unchanged ok results")
+
+
+def test_latest_record_wins(tmp_path):
+    """A retried file's later ok line replaces its earlier error"""
+    job, = _cohort(tmp_path, "retried.txt")
+    out = tmp_path / "results.ndjson"
+    digest = file_digest(job.path)
+    _write(out,
+           {"path": job.path, "sha256": digest, "status": "error", "error": "timeout"},
+           {"path": job.path, "sha256": digest, "status": "ok"})
+    assert load_results(str(out))[job.path]["status"] == "ok"
+    assert pending_jobs([job], load_results(str(out)), {job.path: digest}) == []
+    print("✅ Latest record wins")
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    """A line cut off by a crash is skipped and its CV runs again"""
+    first, torn = _cohort(tmp_path, "first.txt", "torn.txt")
+    out = tmp_path / "results.ndjson"
+    _write(out, {"path": first.path, "sha256": file_digest(first.path), "status": "ok"})
+    with open(out, "a", encoding="utf-8") as f:
+        f.write('{"path": "%s", "sha256": "%s", "sta' % (torn.path, file_digest(torn.path)))
+
+    results = load_results(str(out))
+    assert list(results) == [first.path]
+    digests = {job.path: file_digest(job.path) for job in (first, torn)}
+    assert pending_jobs([first, torn], results, digests) == [torn]
+    print("✅ Torn last line is ignored")
+
+
+def test_stored_lines_apply_to_matching_content(tmp_path):
+    """A stored marker counts only for the analysis of the same file content"""
+    kept, replaced = _cohort(tmp_path, "kept.txt", "replaced.txt")
+    out = tmp_path / "results.ndjson"
+    _write(out,
+           {"path": kept.path, "sha256": "aaa", "status": "ok", "stored": False},
+           {"path": replaced.path, "sha256": "old", "status": "ok", "stored": False},
+           {"path": replaced.path, "sha256": "new", "status": "ok", "stored": False},
+           {"path": kept.path, "sha256": "aaa", "status": "stored", "user_id": 7},
+           {"path": replaced.path, "sha256": "old", "status": "stored", "user_id": 8},
+           {"path": "/missing.txt", "sha256": "zzz", "status": "stored", "user_id": 9})
+
+    results = load_results(str(out))
+    assert results[kept.path]["stored"] is True and results[kept.path]["user_id"] == 7
+    assert results[replaced.path]["stored"] is False  # the stored analysis was of the old content
+    assert results[replaced.path]["sha256"] == "new"
+    assert "/missing.txt" not in results
+    print("✅ Stored lines apply to matching content")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for CV analysis validation
+Checks that skill names are canonicalised without losing the CV's own names
+"""
+
+import os
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+
+# Load agent-1's main.py by path; agent2 also has a top-level "main" module
+_spec = spec_from_file_location(
+    "cv_analysis_main", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+)
+_main = module_from_spec(_spec)
+_spec.loader.exec_module(_main)
+validate_extraction = _main.validate_extraction
+
+
+def test_duplicate_spellings_merge_at_highest_level():
+    """Spellings of one skill merge, keep the highest level and record every original name"""
+    result = validate_extraction({"skills": [
+        {"name": "Nodejs", "level": 2, "category": "backend"},
+        {"name": "node.js", "level": "4"},
+        {"name": " Nodejs ", "level": 1},
+    ]})
+    assert result["skills"] == [{"name": "Node.js", "level": 4, "original_names": ["Nodejs", "node.js"]}]
+    print("✅ Duplicate spellings merge at highest level")
+
+
+def test_distinct_skills_stay_separate():
+    """Related but different skills are not merged and keep their names"""
+    result = validate_extraction({"skills": [
+        {"name": "TensorFlow", "level": 3},
+        {"name": "TensorFlow.js", "level": 2},
+        {"name": "Spring", "level": 2},
+        {"name": "Spring Boot", "level": 4},
+    ]})
+    names = [skill["name"] for skill in result["skills"]]
+    assert names == ["TensorFlow", "TensorFlow.js", "Spring", "Spring Boot"]
+    assert result["skills"][1]["original_names"] == ["TensorFlow.js"]
+    print("✅ Distinct skills stay separate")
+
+
+def test_levels_are_clamped_and_bad_replies_rejected():
+    """Levels become ints in 1-5; unusable replies raise ValueError"""
+    result = validate_extraction({"skills": [{"name": "Python", "level": 9.5}, {"name": "Go", "level": 0}, {"level": 3}]})
+    assert [skill["level"] for skill in result["skills"]] == [5, 1]
+    for reply in ([], {"skills": "Python"}, {"skills": [{"name": "Python", "level": "expert"}]},
+                  {"skills": [], "career_goals": []}):
+        try:
+            validate_extraction(reply)
+        except ValueError:
+            continue
+        raise AssertionError(f"reply {reply!r} was accepted")
+    print("✅ Levels clamped and bad replies rejected")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Execution Mode Benchmark - Agent2
+Runs each top-level operation N times under every execution mode and prints
+latency p50/p95, mean LLM calls and tokens per call, and how often hybrid
+escalated to the agent loop.
+
+Usage:
+    python benchmark_execution.py                       # real Groq calls (needs GROQ_API_KEY)
+    python benchmark_execution.py --runs 20 --modes direct hybrid
+    python benchmark_execution.py --simulate            # no key: stub model with fixed latency
+    python benchmark_execution.py --simulate --invalid-rate 0.2 --json
+
+--simulate replaces the model and agent loop with stubs that sleep
+--latency-ms per round trip and return canned JSON, so it measures the
+round-trip structure of each mode, not real model quality.
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import sys
+sys.path.append(str(Path(__file__).parent))
+
+from dotenv import load_dotenv
+
+from execution_policy import MODES, ExecutionPolicy, usage_ledger
+from roadmap_agent import RoadmapGenerationAgent
+from repository_agent import RepositoryCreationAgent
+
+load_dotenv()
+
+SAMPLE_SKILLS = [
+    {"name": "Python", "level": 2, "category": "programming"},
+    {"name": "JavaScript", "level": 1, "category": "programming"},
+    {"name": "Git", "level": 2, "category": "tools"}
+]
+
+OPERATIONS = {
+    "create_learning_roadmap": lambda roadmap, repo: roadmap.create_learning_roadmap(2, "software_engineer", SAMPLE_SKILLS),
+    "create_project_repository": lambda roadmap, repo: repo.create_project_repository(2, ["Python", "Flask"]),
+    "generate_coding_issues": lambda roadmap, repo: repo.generate_coding_issues("intermediate", ["Python", "Flask"]),
+    "validate_project_requirements": lambda roadmap, repo: repo.validate_project_requirements(SAMPLE_SKILLS, "Web Application"),
+}
+
+# Canned replies for --simulate, keyed by a phrase from each operation's prompt
+CANNED = {
+    "learning roadmap": {"milestones": [{"title": "Foundations", "description": "Core Python and Git",
+                                         "skills_covered": ["Python", "Git"]}],
+                         "total_duration": "8 weeks", "difficulty_curve": "gradual"},
+    "project repository": {"name": "task-tracker", "description": "A Flask task tracker",
+                           "tech_stack": ["Python", "Flask"], "difficulty_level": "intermediate"},
+    "coding issues": {"issues": [{"title": "Add task model", "description": "Create the Task model",
+                                  "acceptance_criteria": ["Tasks persist"]}]},
+    "compatibility": {"compatibility": "Good", "skill_gaps": [], "recommendations": ["Start with the API"]},
+}
+
+
+class StubChatModel:
+    """Stands in for ChatGroq: sleeps one round trip and answers with canned JSON"""
+
+    def __init__(self, latency_ms: float, invalid_rate: float):
+        self.latency_ms = latency_ms
+        self.invalid_rate = invalid_rate
+
+    def bind(self, **kwargs):
+        return self
+
+    def invoke(self, prompt: str):
+        time.sleep(self.latency_ms * random.uniform(0.8, 1.3) / 1000)
+        reply = next((data for phrase, data in CANNED.items() if phrase in prompt), {})
+        content = "{}" if random.random() < self.invalid_rate else json.dumps(reply)
+        usage = {"input_tokens": len(prompt) // 4, "output_tokens": len(content) // 4}
+        return SimpleNamespace(content=content, usage_metadata=usage)
+
+
+class StubAgentExecutor:
+    """Stands in for AgentExecutor: 2-5 model round trips (tool calls), then a final answer"""
+
+    def __init__(self, model: StubChatModel):
+        self.model = model
+
+    def invoke(self, inputs: Dict[str, Any], config: Dict[str, Any] = None) -> Dict[str, Any]:
+        callbacks = (config or {}).get("callbacks", [])
+        prompt = inputs["input"]
+        reply = None
+        for _ in range(random.randint(2, 5)):
+            reply = self.model.invoke(prompt)
+            usage = {"prompt_tokens": reply.usage_metadata["input_tokens"],
+                     "completion_tokens": reply.usage_metadata["output_tokens"]}
+            for callback in callbacks:
+                callback.on_llm_end(SimpleNamespace(llm_output={"token_usage": usage}))
+            prompt += "\nObservation: " + reply.content  # the scratchpad grows every step
+        canned = next((data for phrase, data in CANNED.items() if phrase in inputs["input"]), {})
+        return {"output": f"```json\n{json.dumps(canned)}\n```"}
+
+
+def build_agents(mode: str, args) -> tuple:
+    policy = ExecutionPolicy(mode)
+    roadmap, repo = RoadmapGenerationAgent(policy=policy), RepositoryCreationAgent(policy=policy)
+    repo.challenge_bank = None  # measure generation, not bank hits
+    if args.simulate:
+        model = StubChatModel(args.latency_ms, args.invalid_rate)
+        for agent in (roadmap, repo):
+            agent.executor.router = None  # keep direct calls on the stub model
+            agent.executor.llm = model
+            agent.executor.agent_executor = StubAgentExecutor(model)
+    elif not roadmap.executor.available:
+        raise SystemExit("❌ No GROQ_API_KEY / LangChain setup; rerun with --simulate")
+    return roadmap, repo
+
+
+def run_benchmark(args) -> List[Dict[str, Any]]:
+    usage_ledger.clear()
+    for mode in args.modes:
+        roadmap, repo = build_agents(mode, args)
+        for operation in args.operations:
+            for _ in range(args.runs):
+                OPERATIONS[operation](roadmap, repo)
+    return usage_ledger.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Agent2 execution modes")
+    parser.add_argument("--runs", type=int, default=5, help="calls per operation and mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--operations", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument("--simulate", action="store_true", help="use a stub model instead of Groq")
+    parser.add_argument("--latency-ms", type=float, default=400, help="stub round-trip latency (--simulate)")
+    parser.add_argument("--invalid-rate", type=float, default=0.1,
+                        help="share of stub replies that fail validation (--simulate)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'operation':<30} {'mode':<7} {'p50':>8} {'p95':>8} {'llm':>5} {'tokens':>7} {'esc':>4} {'mock':>5}")
+    for row in rows:
+        tokens = row["prompt_tokens"] + row["completion_tokens"]
+        print(f"{row['operation']:<30} {row['mode']:<7} {row['p50_ms']:>6.0f}ms {row['p95_ms']:>6.0f}ms "
+              f"{row['llm_calls']:>5} {tokens:>7} {row['escalations']:>4} {row['fallbacks']:>5}")
+
+
+if __name__ == "__main__":
+    main()
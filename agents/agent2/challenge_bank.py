@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Challenge Bank - IISER StatusCode 02
+Persistent bank of generated coding issues, so a new project draws vetted
+challenges that fit its tech stack and difficulty before asking the LLM for
+more.
+
+- issues are indexed by difficulty and by the normalized keys of their
+  required skills and of the tech stack they were generated for
+- each issue's text gets a MinHash signature, bucketed with LSH, so near
+  duplicates are found without comparing against the whole bank: they are
+  merged on insert and never handed to the same project twice
+- only issues that pass ``vet`` (a real description, acceptance criteria,
+  required skills) are stored; mock issues never are
+
+An issue fits a project when its difficulty matches, every technology it
+requires (languages, frameworks, databases, platforms) is in the project's
+stack, and the stack it was generated for overlaps the project's by at least
+MIN_STACK_SIMILARITY (Jaccard). Portable skills such as Git or Testing do not
+need to be in the stack.
+
+Every process (e.g. each web worker) holds its own copy of the bank and
+appends to the same JSONL file. Appends take a shared lock and compaction an
+exclusive one on a ``.lock`` file next to it, and compaction rewrites what is
+in the file (every process's lines), not this process's copy. Without fcntl
+(Windows) the file is only appended to, never compacted.
+
+Configuration (environment):
+    AGENT2_CHALLENGE_BANK   JSONL file backing the bank (default challenge_bank.jsonl
+                            next to this module; "off" keeps the bank in memory)
+"""
+
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so the file is never compacted
+    fcntl = None
+
+import shared_path  # noqa: F401
+from shared.resource_catalog import level_name
+from shared.skill_normalizer import skill_normalizer
+
+DEFAULT_BANK_PATH = Path(__file__).resolve().parent / "challenge_bank.jsonl"
+# MinHash signature length, split into LSH_BANDS bands of NUM_PERM / LSH_BANDS rows;
+# 16 bands of 4 rows make pairs above ~0.5 Jaccard likely to share a bucket
+NUM_PERM = 64
+LSH_BANDS = 16
+# Estimated text Jaccard above which two issues with overlapping skills are the same challenge
+DUPLICATE_SIMILARITY = 0.7
+# Minimum Jaccard between the project's stack and the stack an issue was generated for
+MIN_STACK_SIMILARITY = 0.5
+MIN_DESCRIPTION_CHARS = 40
+# Skill categories that name a technology a project must actually use
+STACK_CATEGORIES = {"programming", "frontend", "backend", "database", "devops", "cloud", "ai_ml",
+                    "data_analysis", "visualization"}
+# Technologies that are concepts rather than a stack choice
+PORTABLE_SKILLS = {"REST APIs"}
+
+_ROWS = NUM_PERM // LSH_BANDS
+_PRIME = (1 << 61) - 1
+_seeds = random.Random(20240917)
+_PERMUTATIONS = [(_seeds.randrange(1, _PRIME), _seeds.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {"a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "be",
+              "it", "that", "this", "as", "by", "from", "should", "must", "can", "all", "each"}
+
+
+def shingles(text: str) -> Set[str]:
+    """Word bigrams of ``text`` without stopwords (single words for one-word texts)"""
+    words = [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+    if len(words) < 2:
+        return set(words)
+    return {f"{words[i]} {words[i + 1]}" for i in range(len(words) - 1)}
+
+
+def minhash(features: Iterable[str]) -> Tuple[int, ...]:
+    """NUM_PERM-value MinHash signature; empty for no features"""
+    hashes = [int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+              for feature in features]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def signature_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the feature sets behind two signatures"""
+    if not left or not right:
+        return 0.0
+    return sum(a == b for a, b in zip(left, right)) / NUM_PERM
+
+
+def _jaccard(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    union = left | right
+    return len(left & right) / len(union) if union else 0.0
+
+
+def _issue_dict(issue: Any) -> Dict[str, Any]:
+    return asdict(issue) if is_dataclass(issue) else dict(issue)
+
+
+def _issue_text(issue: Dict[str, Any]) -> str:
+    return " ".join([str(issue.get("title") or ""), str(issue.get("description") or "")]
+                    + [str(item) for item in issue.get("acceptance_criteria") or []])
+
+
+def _keys(skills: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(key for key in (skill_normalizer.key(skill) for skill in skills or []) if key)
+
+
+def _stack_keys(skills: Iterable[str]) -> FrozenSet[str]:
+    """Keys of the skills that are a technology choice (see STACK_CATEGORIES)"""
+    return frozenset(
+        skill_normalizer.key(skill) for skill in skills or []
+        if skill_normalizer.category(skill) in STACK_CATEGORIES and skill_normalizer.canonical(skill) not in PORTABLE_SKILLS
+    )
+
+
+def vet(issue: Any) -> Optional[str]:
+    """Why ``issue`` is not fit for the bank, or None if it is"""
+    issue = _issue_dict(issue)
+    if not str(issue.get("title") or "").strip():
+        return "no title"
+    if len(str(issue.get("description") or "").strip()) < MIN_DESCRIPTION_CHARS:
+        return "description too short"
+    if not issue.get("acceptance_criteria"):
+        return "no acceptance criteria"
+    if not issue.get("skills_required"):
+        return "no required skills"
+    return None
+
+
+@dataclass
+class Challenge:
+    """One banked issue with its index keys and MinHash signature"""
+    id: str
+    issue: Dict[str, Any]
+    difficulty: str
+    tech_stack: List[str]
+    seen: int = 1
+    added_at: str = ""
+
+    def __post_init__(self):
+        self.skill_keys = _keys(self.issue.get("skills_required"))
+        self.required_stack = _stack_keys(self.issue.get("skills_required"))
+        self.stack_keys = _keys(self.tech_stack) or self.skill_keys
+        self.signature = minhash(shingles(_issue_text(self.issue)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "issue": self.issue, "difficulty": self.difficulty,
+                "tech_stack": self.tech_stack, "seen": self.seen, "added_at": self.added_at}
+
+
+class ChallengeBank:
+    """Vetted coding issues indexed by (difficulty, skill key), with an LSH index for near duplicates"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._challenges: Dict[str, Challenge] = {}
+        self._index: Dict[Tuple[str, str], Set[str]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ChallengeBank":
+        """Bank backed by ``path`` (default AGENT2_CHALLENGE_BANK); the latest line per id wins"""
+        if path is None:
+            setting = os.getenv("AGENT2_CHALLENGE_BANK", "").strip()
+            if setting.lower() in ("off", "none", "false", "0"):
+                return cls()
+            path = Path(setting) if setting else DEFAULT_BANK_PATH
+        bank = cls(path)
+        lines = bank._read()
+        if lines > 2 * len(bank._challenges) + 100:
+            bank.compact()
+        return bank
+
+    def _read(self) -> int:
+        """Index every line of the backing file (the latest line per id wins); returns the line count"""
+        lines = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        self._put(Challenge(**record))
+                    except (ValueError, TypeError, AttributeError):
+                        continue  # torn or hand-edited line
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not load challenge bank {self.path}: {e}")
+        return lines
+
+    def __len__(self) -> int:
+        return len(self._challenges)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _put(self, challenge: Challenge):
+        previous = self._challenges.get(challenge.id)
+        if previous:
+            self._unindex(previous)
+        self._challenges[challenge.id] = challenge
+        for key in challenge.skill_keys | challenge.stack_keys:
+            self._index.setdefault((challenge.difficulty, key), set()).add(challenge.id)
+        for bucket in self._bands(challenge.signature):
+            self._buckets.setdefault(bucket, set()).add(challenge.id)
+
+    def _unindex(self, challenge: Challenge):
+        for key in challenge.skill_keys | challenge.stack_keys:
+            self._index.get((challenge.difficulty, key), set()).discard(challenge.id)
+        for bucket in self._bands(challenge.signature):
+            self._buckets.get(bucket, set()).discard(challenge.id)
+
+    @staticmethod
+    def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        if not signature:
+            return []
+        return [(band, signature[band * _ROWS:(band + 1) * _ROWS]) for band in range(LSH_BANDS)]
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Advisory lock shared by every process using the backing file; yields False if unavailable"""
+        if fcntl is None:
+            yield False
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(self.path.suffix + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append(self, challenges: List[Challenge]):
+        if not self.path or not challenges:
+            return
+        # One write per batch, opened under the lock so it never lands in a file being replaced
+        lines = "".join(json.dumps(challenge.to_dict()) + "\n" for challenge in challenges)
+        try:
+            with self._file_lock(exclusive=False):
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError as e:
+            print(f"⚠️ Could not write challenge bank {self.path}: {e}")
+
+    def compact(self):
+        """Rewrite the backing file with one line per challenge.
+
+        Runs under the exclusive file lock and rewrites what is in the file, so
+        lines other processes appended are kept (and picked up here too).
+        """
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                with self._file_lock(exclusive=True) as locked:
+                    if not locked:
+                        return
+                    self._read()
+                    temp = self.path.with_suffix(self.path.suffix + ".tmp")
+                    with open(temp, "w", encoding="utf-8") as f:
+                        for challenge in self._challenges.values():
+                            f.write(json.dumps(challenge.to_dict()) + "\n")
+                    os.replace(temp, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not compact challenge bank {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Similarity
+    # ------------------------------------------------------------------
+
+    def _candidates(self, signature: Tuple[int, ...]) -> Set[str]:
+        return {challenge_id for bucket in self._bands(signature) for challenge_id in self._buckets.get(bucket, ())}
+
+    def _duplicate_of(self, challenge: Challenge) -> Optional[Challenge]:
+        """A banked challenge at the same difficulty with near-identical text and overlapping skills"""
+        best, best_score = None, DUPLICATE_SIMILARITY
+        for challenge_id in self._candidates(challenge.signature):
+            other = self._challenges[challenge_id]
+            if other.difficulty != challenge.difficulty or _jaccard(other.skill_keys, challenge.skill_keys) < 0.5:
+                continue
+            score = signature_similarity(other.signature, challenge.signature)
+            if score >= best_score:
+                best, best_score = other, score
+        return best
+
+    def similar(self, issue: Any, limit: int = 5, threshold: float = 0.3) -> List[Tuple[Dict[str, Any], float]]:
+        """Banked issues whose text resembles ``issue`` (an issue or plain text), most similar first"""
+        text = issue if isinstance(issue, str) else _issue_text(_issue_dict(issue))
+        signature = minhash(shingles(text))
+        with self._lock:
+            scored = [(self._challenges[challenge_id], signature_similarity(signature, self._challenges[challenge_id].signature))
+                      for challenge_id in self._candidates(signature)]
+        scored = sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+        return [(dict(challenge.issue), round(score, 3)) for challenge, score in scored[:limit]]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, issues: Iterable[Any], tech_stack: Iterable[str], difficulty: Optional[str] = None) -> int:
+        """Bank generated ``issues`` for a project on ``tech_stack``; returns how many were new.
+
+        Issues that fail ``vet`` are skipped; a near duplicate of a banked
+        issue bumps that issue's ``seen`` count instead of being stored.
+        """
+        stack = [skill_normalizer.canonical(skill) for skill in tech_stack or []]
+        added, changed = 0, []
+        with self._lock:
+            for issue in issues:
+                issue = _issue_dict(issue)
+                if vet(issue):
+                    continue
+                level = level_name(issue.get("difficulty")) or level_name(difficulty) or "intermediate"
+                issue["difficulty"] = level
+                key = "\n".join([level, " ".join(str(issue["title"]).split()).lower(),
+                                 ",".join(sorted(_keys(issue["skills_required"])))])
+                challenge = Challenge(
+                    id=hashlib.sha256(key.encode("utf-8")).hexdigest()[:16],
+                    issue=issue,
+                    difficulty=level,
+                    tech_stack=stack,
+                    added_at=datetime.now().isoformat(timespec="seconds")
+                )
+                existing = self._challenges.get(challenge.id) or self._duplicate_of(challenge)
+                if existing:
+                    existing.seen += 1
+                    changed.append(existing)
+                    continue
+                self._put(challenge)
+                changed.append(challenge)
+                added += 1
+            self._append(changed)
+        return added
+
+    def find(self, tech_stack: Iterable[str], difficulty: str, limit: int = 5,
+             exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Up to ``limit`` banked issues that fit a ``difficulty`` project on ``tech_stack``.
+
+        Best stack match first (ties: seen more often, then banked earlier),
+        skipping near duplicates of issues already picked and titles in ``exclude``.
+        """
+        level = level_name(difficulty) or str(difficulty or "").strip().lower()
+        wanted = _keys(tech_stack)
+        excluded = {" ".join(str(title).split()).lower() for title in exclude}
+        with self._lock:
+            candidate_ids = set()
+            for key in wanted:
+                candidate_ids |= self._index.get((level, key), set())
+            ranked = []
+            for challenge_id in candidate_ids:
+                challenge = self._challenges[challenge_id]
+                stack_match = _jaccard(challenge.stack_keys, wanted)
+                if challenge.required_stack <= wanted and stack_match >= MIN_STACK_SIMILARITY:
+                    ranked.append((stack_match, challenge))
+            ranked.sort(key=lambda item: (-item[0], -item[1].seen, item[1].added_at))
+
+            picked: List[Challenge] = []
+            for _, challenge in ranked:
+                if len(picked) >= limit:
+                    break
+                if " ".join(str(challenge.issue.get("title")).split()).lower() in excluded:
+                    continue
+                if any(signature_similarity(challenge.signature, other.signature) >= DUPLICATE_SIMILARITY for other in picked):
+                    continue
+                picked.append(challenge)
+            return [copy.deepcopy(challenge.issue) for challenge in picked]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_difficulty: Dict[str, int] = {}
+            for challenge in self._challenges.values():
+                by_difficulty[challenge.difficulty] = by_difficulty.get(challenge.difficulty, 0) + 1
+            return {"challenges": len(self._challenges), "by_difficulty": by_difficulty,
+                    "path": str(self.path) if self.path else None}
+
+
+challenge_bank = ChallengeBank.load()
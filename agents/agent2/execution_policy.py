@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Execution Policy - IISER StatusCode 02
+Chooses how each top-level Agent2 operation talks to the LLM:
+
+- direct: one schema-constrained JSON call (Groq JSON mode), validated locally
+- agent:  the LangChain AgentExecutor tool-calling loop (up to 5 round trips)
+- hybrid: direct first, escalating to the agent loop only if validation fails
+
+Every call is recorded (mode, path taken, LLM calls, tokens, latency) in
+``usage_ledger`` so modes can be compared; see benchmark_execution.py.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import shared_path  # noqa: F401
+from shared.llm_router import GroqProvider, LLMRouter, get_router
+
+MODES = ("direct", "agent", "hybrid")
+DEFAULT_MODE = "hybrid"
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    """Expected JSON shape of one operation's response"""
+    shape: str                               # example shown to the model
+    required: Tuple[str, ...]                # required top-level keys
+    list_key: Optional[str] = None           # key holding the list of items
+    item_required: Tuple[str, ...] = ()      # required keys on each item
+
+    def validate(self, data: Any) -> List[str]:
+        """Problems with ``data``; empty when it matches"""
+        if not isinstance(data, dict):
+            return ["response is not a JSON object"]
+        problems = [f"missing '{key}'" for key in self.required if key not in data]
+        if self.list_key:
+            items = data.get(self.list_key)
+            if not isinstance(items, list) or not items:
+                problems.append(f"'{self.list_key}' must be a non-empty list")
+            else:
+                for index, item in enumerate(items):
+                    if not isinstance(item, dict):
+                        problems.append(f"{self.list_key}[{index}] is not an object")
+                        continue
+                    problems.extend(f"{self.list_key}[{index}] missing '{key}'"
+                                    for key in self.item_required if not item.get(key))
+        return problems
+
+
+SCHEMAS: Dict[str, OutputSchema] = {
+    "create_learning_roadmap": OutputSchema(
+        shape='{"milestones": [{"title": str, "description": str, "skills_covered": [str], '
+              '"difficulty": "beginner|intermediate|advanced", "estimated_time": str, '
+              '"prerequisites": [str], "completion_criteria": [str]}], "total_duration": str, '
+              '"difficulty_curve": str, "success_metrics": [str]}',
+        required=("milestones",),
+        list_key="milestones",
+        item_required=("title", "description", "skills_covered")
+    ),
+    "create_project_repository": OutputSchema(
+        shape='{"name": "kebab-case-repo-name", "description": str, "tech_stack": [str], '
+              '"difficulty_level": "beginner|intermediate|advanced", "estimated_time": str, '
+              '"learning_objectives": [str], "target_audience": str, "setup_instructions": str}',
+        required=("name", "description", "tech_stack")
+    ),
+    "generate_coding_issues": OutputSchema(
+        shape='{"issues": [{"title": str, "description": str, "difficulty": "beginner|intermediate|advanced", '
+              '"estimated_time": str, "skills_required": [str], "acceptance_criteria": [str], '
+              '"hints": [str], "resources": [str]}]}',
+        required=("issues",),
+        list_key="issues",
+        item_required=("title", "description", "acceptance_criteria")
+    ),
+    "validate_project_requirements": OutputSchema(
+        shape='{"compatibility": "Good|Fair|Poor", "skill_gaps": [str], "recommendations": [str], '
+              '"estimated_difficulty": "Easy|Medium|Hard", "success_probability": "High|Medium|Low"}',
+        required=("compatibility", "skill_gaps", "recommendations")
+    ),
+    "narrate_progress": OutputSchema(
+        shape='{"summary": str, "suggestions": [str]}',
+        required=("summary", "suggestions")
+    ),
+}
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """Parse a JSON object from a model reply (bare, fenced, or wrapped in prose)"""
+    if not text:
+        return None
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0]
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0]
+    try:
+        return json.loads(text)
+    except ValueError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            return json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+
+
+# ----------------------------------------------------------------------
+# Usage accounting
+# ----------------------------------------------------------------------
+
+@dataclass
+class CallRecord:
+    """One top-level operation: which path ran and what it cost"""
+    operation: str
+    mode: str
+    path: str = ""                  # direct, agent or fallback
+    provider: str = ""              # router provider that answered the direct call
+    escalated: bool = False
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def add_usage(self, prompt_tokens: int, completion_tokens: int):
+        self.llm_calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+
+class UsageLedger:
+    """Thread-safe, bounded list of recent CallRecords"""
+
+    def __init__(self, max_records: int = 1000):
+        self.max_records = max_records
+        self._records: List[CallRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: CallRecord):
+        with self._lock:
+            self._records.append(record)
+            del self._records[:-self.max_records]
+
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (operation, mode): call count, latency percentiles, mean LLM calls/tokens, escalations"""
+        groups: Dict[Tuple[str, str], List[CallRecord]] = {}
+        for record in self.records():
+            groups.setdefault((record.operation, record.mode), []).append(record)
+
+        rows = []
+        for (operation, mode), records in sorted(groups.items()):
+            latencies = sorted(record.latency_ms for record in records)
+            count = len(records)
+            rows.append({
+                "operation": operation,
+                "mode": mode,
+                "calls": count,
+                "p50_ms": round(latencies[count // 2], 1),
+                "p95_ms": round(latencies[min(count - 1, int(count * 0.95))], 1),
+                "llm_calls": round(sum(r.llm_calls for r in records) / count, 2),
+                "prompt_tokens": round(sum(r.prompt_tokens for r in records) / count),
+                "completion_tokens": round(sum(r.completion_tokens for r in records) / count),
+                "escalations": sum(1 for r in records if r.escalated),
+                "fallbacks": sum(1 for r in records if r.path == "fallback")
+            })
+        return rows
+
+
+usage_ledger = UsageLedger()
+
+
+def token_usage(response: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens from a LangChain message"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    metadata = getattr(response, "response_metadata", None) or {}
+    if metadata.get("token_usage"):
+        usage = metadata["token_usage"]
+        return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+    return 0, 0
+
+
+# ----------------------------------------------------------------------
+# Policy
+# ----------------------------------------------------------------------
+
+class ExecutionPolicy:
+    """Execution mode per operation.
+
+    The default comes from AGENT2_EXECUTION_MODE and per-operation overrides
+    from AGENT2_EXECUTION_MODES, e.g.
+    ``create_learning_roadmap=agent,generate_coding_issues=direct``.
+    """
+
+    def __init__(self, default: str = DEFAULT_MODE, overrides: Optional[Dict[str, str]] = None):
+        if default not in MODES:
+            raise ValueError(f"Unknown execution mode '{default}' (expected one of {', '.join(MODES)})")
+        self.default = default
+        self.overrides: Dict[str, str] = {}
+        for operation, mode in (overrides or {}).items():
+            self.set_mode(operation, mode)
+
+    @classmethod
+    def from_env(cls) -> "ExecutionPolicy":
+        default = os.getenv("AGENT2_EXECUTION_MODE", DEFAULT_MODE).strip().lower()
+        if default not in MODES:
+            print(f"⚠️ Unknown AGENT2_EXECUTION_MODE '{default}', using '{DEFAULT_MODE}'")
+            default = DEFAULT_MODE
+        overrides = {}
+        for item in os.getenv("AGENT2_EXECUTION_MODES", "").split(","):
+            operation, _, mode = item.partition("=")
+            if operation.strip() and mode.strip().lower() in MODES:
+                overrides[operation.strip()] = mode.strip().lower()
+        return cls(default, overrides)
+
+    def set_mode(self, operation: str, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown execution mode '{mode}' for {operation}")
+        self.overrides[operation] = mode
+
+    def mode_for(self, operation: str) -> str:
+        return self.overrides.get(operation, self.default)
+
+
+class LLMExecutor:
+    """Runs operations for one agent under an ExecutionPolicy.
+
+    Direct calls go through the shared LLM router (Groq preferred, failing
+    over to Gemini); ``llm`` (the agent's ChatGroq model) is only used for
+    them when no router provider is configured. ``agent_executor`` is the
+    agent's LangChain AgentExecutor (or None).
+    """
+
+    def __init__(self, policy: ExecutionPolicy, groq_api_key: Optional[str] = None,
+                 ledger: UsageLedger = usage_ledger, router: Optional[LLMRouter] = None):
+        self.policy = policy
+        self.ledger = ledger
+        self.router = router or get_router(("groq", "gemini"))
+        if groq_api_key:
+            self.router.add_provider(GroqProvider(groq_api_key))
+        self.llm = None
+        self.agent_executor = None
+
+    @property
+    def available(self) -> bool:
+        return bool(self.llm or self.agent_executor or (self.router and self.router.available))
+
+    def run(self, operation: str, prompt: str, parse_agent_output: Callable[[str], Any],
+            build: Callable[[Dict[str, Any]], Any], fallback: Callable[[], Any],
+            temperature: float = 0.7) -> Any:
+        """Run ``operation`` under its mode.
+
+        ``build`` turns validated direct-mode JSON into the operation's return
+        value; ``parse_agent_output`` does the same for agent-loop text;
+        ``fallback`` (the mock) is used when no path produced a result.
+        """
+        mode = self.policy.mode_for(operation)
+        record = CallRecord(operation=operation, mode=mode)
+        started = time.perf_counter()
+        result = None
+        try:
+            if mode in ("direct", "hybrid") or not self.agent_executor:
+                data = self._direct(operation, prompt, temperature, record)
+                if data is not None:
+                    result, record.path = build(data), "direct"
+            if result is None and self.agent_executor and (mode == "agent" or mode == "hybrid"):
+                record.escalated = mode == "hybrid"
+                output = self._agent(prompt, record)
+                if output is not None:
+                    result, record.path = parse_agent_output(output), "agent"
+        finally:
+            if result is None:
+                result, record.path = fallback(), "fallback"
+            record.latency_ms = (time.perf_counter() - started) * 1000
+            self.ledger.add(record)
+        return result
+
+    def _direct(self, operation: str, prompt: str, temperature: float, record: CallRecord) -> Optional[Dict[str, Any]]:
+        """One JSON-mode completion; None if the call failed or the output is off-schema"""
+        if not (self.llm or (self.router and self.router.available)):
+            return None
+        schema = SCHEMAS[operation]
+        constrained = (f"{prompt.strip()}\n\nRespond with one JSON object only, no prose, "
+                       f"matching this shape:\n{schema.shape}")
+        try:
+            text = self._complete_json(constrained, temperature, record)
+        except Exception as e:
+            record.errors.append(f"direct call failed: {e}")
+            return None
+        data = extract_json(text)
+        problems = schema.validate(data)
+        if problems:
+            record.errors.append("direct output invalid: " + "; ".join(problems[:5]))
+            return None
+        return data
+
+    def _complete_json(self, prompt: str, temperature: float, record: CallRecord) -> str:
+        if self.router and self.router.available:
+            response = self.router.complete(prompt, temperature=temperature, json_mode=True)
+            record.add_usage(response.prompt_tokens, response.completion_tokens)
+            record.provider = response.provider
+            return response.text
+
+        # ChatGroq carries the agent's own temperature
+        response = self.llm.bind(response_format={"type": "json_object"}).invoke(prompt)
+        record.add_usage(*token_usage(response))
+        return response.content
+
+    def _agent(self, prompt: str, record: CallRecord) -> Optional[str]:
+        """The LangChain tool-calling loop, counting every LLM round trip it makes"""
+        try:
+            result = self.agent_executor.invoke({"input": prompt}, config={"callbacks": [_usage_callback(record)]})
+            return result["output"]
+        except Exception as e:
+            record.errors.append(f"agent loop failed: {e}")
+            return None
+
+
+def _usage_callback(record: CallRecord):
+    """LangChain callback adding each LLM round trip's token usage to ``record``"""
+    try:
+        from langchain_core.callbacks import BaseCallbackHandler
+    except ImportError:  # executors that are not LangChain only need the method
+        BaseCallbackHandler = object
+
+    class UsageCounter(BaseCallbackHandler):
+        def on_llm_end(self, response, **kwargs):
+            usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+            record.add_usage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+    return UsageCounter()
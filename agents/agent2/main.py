@@ -13,6 +13,7 @@ from pathlib import Path
 # Import our agents
 from roadmap_agent import RoadmapGenerationAgent, LearningRoadmap, Milestone
 from repository_agent import RepositoryCreationAgent, ProjectRepository, CodingIssue
+from progress_engine import progress_engine
 
 class Agent2Integration:
     """Main integration class for Agent2 functionality"""
@@ -87,32 +88,30 @@ class Agent2Integration:
         try:
             print(f"📈 Updating learning progress for user {user_id}")
             
-            # Update roadmap progress
-            updated_roadmap = self.roadmap_agent.update_roadmap_progress(completed_projects, current_roadmap)
+            # Update roadmap progress locally; the LLM is only used at milestone boundaries
+            progress = self.roadmap_agent.track_progress(completed_projects, current_roadmap)
+            next_skills = progress_engine.next_skills(progress)
             
-            # Suggest next skills
-            next_skills = self.roadmap_agent.suggest_next_skills({
-                "completed_projects": len(completed_projects),
-                "current_roadmap": current_roadmap
-            })
-            
-            # Create next project if needed
+            # Create the next project when a milestone was just completed
             next_project = None
-            if len(completed_projects) >= 2:  # Create new project after 2 completions
+            if progress.at_milestone_boundary and len(completed_projects) >= 2:
                 user_level = current_roadmap.get("current_level", 1) + 1
-                skill_focus = ["Advanced Programming", "System Design"]
+                skill_focus = [skill["skill"] for skill in next_skills[:3]] or ["Advanced Programming", "System Design"]
                 next_project = self.repository_agent.create_project_repository(user_level, skill_focus)
             
             return {
                 "user_id": user_id,
                 "updated_at": datetime.now().isoformat(),
-                "updated_roadmap": updated_roadmap,
+                "updated_roadmap": progress.roadmap,
+                "roadmap_diff": progress.diff,
                 "next_skills": next_skills,
                 "next_project": next_project,
                 "progress_summary": {
                     "completed_projects": len(completed_projects),
-                    "roadmap_completion": self._calculate_completion_percentage(current_roadmap, completed_projects),
-                    "ready_for_next_level": len(completed_projects) >= 3
+                    "roadmap_completion": progress.completion_percentage,
+                    "newly_completed_milestones": progress.newly_completed,
+                    "remaining_time": progress.remaining_time,
+                    "ready_for_next_level": progress.completion_percentage >= 100 or len(completed_projects) >= 3
                 }
             }
             
@@ -209,20 +208,6 @@ class Agent2Integration:
             "resources": issue.resources
         }
     
-    def _calculate_completion_percentage(self, roadmap: Dict, completed_projects: List[Dict]) -> float:
-        """Calculate roadmap completion percentage"""
-        try:
-            total_milestones = len(roadmap.get("milestones", []))
-            if total_milestones == 0:
-                return 0.0
-            
-            # Simple calculation based on completed projects
-            completion_ratio = min(len(completed_projects) / 3, 1.0)  # Assume 3 projects = 100%
-            return round(completion_ratio * 100, 1)
-            
-        except Exception:
-            return 0.0
-    
     def _create_fallback_path(self, user_id: str, current_level: int, target_role: str, user_skills: List[Dict]) -> Dict:
         """Create a fallback learning path when AI fails"""
         return {
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Progress Engine - IISER StatusCode 02
+Updates a learning roadmap from completed projects without calling an LLM:
+milestones are marked complete by matching practised skills and completion
+criteria, remaining time is recomputed from the milestones' estimates, and
+every change is reported as a diff.
+"""
+
+import copy
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import shared_path  # noqa: F401
+from shared.skill_normalizer import skill_normalizer
+
+# A milestone is complete once this share of its skills has been practised
+SKILL_COVERAGE_TO_COMPLETE = 2 / 3
+# Projects scored below this (0-100) do not count as practice
+PASSING_SCORE = 60
+# Fields the diff reports on each milestone
+TRACKED_FIELDS = ("completed", "progress", "remaining_time", "completed_at")
+
+_WEEKS_PER_UNIT = {"hour": 1 / 40, "day": 1 / 5, "week": 1.0, "month": 4.0}
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-|to)?\s*(\d+(?:\.\d+)?)?\s*(hour|day|week|month)", re.I)
+_STOPWORDS = {"a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at", "least",
+              "complete", "completed", "build", "create", "make", "finish", "using", "your", "one", "all"}
+
+
+def parse_duration(text: str) -> Optional[Tuple[float, float]]:
+    """``"4-6 weeks"`` -> (4.0, 6.0) in weeks; None if no duration is found"""
+    match = _DURATION.search(text or "")
+    if not match:
+        return None
+    low, high, unit = match.groups()
+    scale = _WEEKS_PER_UNIT[unit.lower()]
+    return float(low) * scale, float(high or low) * scale
+
+
+def format_weeks(low: float, high: float) -> str:
+    if high <= 0:
+        return "0 weeks"
+    if high < 1:
+        return f"{max(1, round(low * 5))}-{max(1, round(high * 5))} days"
+    low, high = max(1, round(low)), max(1, round(high))
+    return f"{low} week{'s' if high > 1 else ''}" if low == high else f"{low}-{high} weeks"
+
+
+def _words(text: str) -> set:
+    words = (word.strip(".") for word in re.findall(r"[a-z0-9+#.]+", text.lower()))
+    return {word for word in words if word and word not in _STOPWORDS}
+
+
+@dataclass
+class ProgressUpdate:
+    """Result of applying completed projects to a roadmap"""
+    roadmap: Dict[str, Any]
+    diff: List[Dict[str, Any]]
+    newly_completed: List[str]
+    completion_percentage: float
+    remaining_time: str
+    practised_skills: List[str] = field(default_factory=list)
+
+    @property
+    def at_milestone_boundary(self) -> bool:
+        """True when this update completed at least one milestone"""
+        return bool(self.newly_completed)
+
+
+class ProgressEngine:
+    """Deterministic roadmap progress; ``normalize`` maps skill names to comparable keys
+    (by default the shared skill normalizer, so "Nodejs" practises "Node.js")"""
+
+    def __init__(self, normalize: Callable[[str], str] = skill_normalizer.key):
+        self.normalize = normalize
+
+    def practised_skills(self, completed_projects: List[Dict[str, Any]]) -> List[str]:
+        """Skills from passing projects (skills_used, skills, tech_stack or skills_practiced)"""
+        skills, seen = [], set()
+        for project in completed_projects or []:
+            if not isinstance(project, dict):
+                continue
+            score = project.get("score")
+            if isinstance(score, (int, float)) and score < PASSING_SCORE:
+                continue
+            for key in ("skills_used", "skills", "tech_stack", "skills_practiced"):
+                for skill in project.get(key) or []:
+                    normalized = self.normalize(skill)
+                    if normalized and normalized not in seen:
+                        seen.add(normalized)
+                        skills.append(skill)
+        return skills
+
+    def apply(self, completed_projects: List[Dict[str, Any]], current_roadmap: Dict[str, Any],
+              now: Optional[datetime] = None) -> ProgressUpdate:
+        now = now or datetime.now()
+        roadmap = copy.deepcopy(current_roadmap or {})
+        practised = self.practised_skills(completed_projects)
+        practised_keys = {self.normalize(skill) for skill in practised}
+        project_words = set()
+        for project in completed_projects or []:
+            if isinstance(project, dict):
+                project_words |= _words(" ".join(str(project.get(key, "")) for key in ("name", "title", "description")))
+        project_words |= {word for skill in practised for word in _words(str(skill))}
+
+        newly_completed, progress_values = [], []
+        remaining_low = remaining_high = 0.0
+        for milestone in roadmap.get("milestones", []):
+            if not isinstance(milestone, dict):
+                continue
+            progress = self._milestone_progress(milestone, practised_keys, project_words)
+            if progress is None:  # nothing to match on; trust the stored flag
+                progress = 1.0 if milestone.get("completed") else 0.0
+            elif milestone.get("completed"):
+                progress = 1.0
+            elif progress >= 1.0:
+                milestone["completed"] = True
+                milestone["completed_at"] = now.isoformat()
+                newly_completed.append(milestone.get("title", "Untitled"))
+            milestone["progress"] = round(progress * 100)
+            progress_values.append(progress)
+
+            estimate = parse_duration(milestone.get("estimated_time", ""))
+            if estimate and progress < 1.0:
+                low, high = estimate[0] * (1 - progress), estimate[1] * (1 - progress)
+                remaining_low, remaining_high = remaining_low + low, remaining_high + high
+                milestone["remaining_time"] = format_weeks(low, high)
+            else:
+                milestone.pop("remaining_time", None)
+
+        completion = round(100 * sum(progress_values) / len(progress_values), 1) if progress_values else 0.0
+        remaining_time = format_weeks(remaining_low, remaining_high)
+        roadmap.update({
+            "completed_projects": len(completed_projects or []),
+            "completion_percentage": completion,
+            "remaining_duration": remaining_time,
+            "last_updated": now.isoformat()
+        })
+        return ProgressUpdate(
+            roadmap=roadmap,
+            diff=diff_roadmaps(current_roadmap or {}, roadmap),
+            newly_completed=newly_completed,
+            completion_percentage=completion,
+            remaining_time=remaining_time,
+            practised_skills=practised
+        )
+
+    def next_skills(self, update: ProgressUpdate, limit: int = 5) -> List[Dict[str, str]]:
+        """Unpractised skills from the earliest incomplete milestones"""
+        practised = {self.normalize(skill) for skill in update.practised_skills}
+        suggestions, seen = [], set()
+        for milestone in update.roadmap.get("milestones", []):
+            if not isinstance(milestone, dict) or milestone.get("completed"):
+                continue
+            for skill in milestone.get("skills_covered") or []:
+                key = self.normalize(skill)
+                if key in practised or key in seen:
+                    continue
+                seen.add(key)
+                suggestions.append({
+                    "skill": skill,
+                    "priority": "high" if not suggestions else "medium",
+                    "reasoning": f"Next step in milestone '{milestone.get('title', 'Untitled')}'"
+                })
+                if len(suggestions) >= limit:
+                    return suggestions
+        return suggestions
+
+    def _milestone_progress(self, milestone: Dict[str, Any], practised_keys: set, project_words: set) -> Optional[float]:
+        """Share of the milestone done (1.0 = complete), or None if it has no skills or criteria"""
+        skills = [self.normalize(skill) for skill in milestone.get("skills_covered") or []]
+        criteria = [_words(str(criterion)) for criterion in milestone.get("completion_criteria") or []]
+        criteria = [words for words in criteria if words]
+        if not skills and not criteria:
+            return None
+
+        coverage = sum(1 for skill in skills if skill in practised_keys) / len(skills) if skills else 0.0
+        # A criterion is met when most of its content words appear in a completed project
+        met = sum(1 for words in criteria if len(words & project_words) * 2 >= len(words))
+        criteria_share = met / len(criteria) if criteria else 0.0
+        if (skills and coverage >= SKILL_COVERAGE_TO_COMPLETE) or (criteria and met == len(criteria)):
+            return 1.0
+        return max(coverage, criteria_share)
+
+
+def diff_roadmaps(before: Dict[str, Any], after: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Changed milestone fields and top-level progress fields, as path/from/to entries"""
+    changes = []
+    for key in ("completed_projects", "completion_percentage", "remaining_duration"):
+        if before.get(key) != after.get(key):
+            changes.append({"path": key, "from": before.get(key), "to": after.get(key)})
+    old_milestones = before.get("milestones", [])
+    for index, milestone in enumerate(after.get("milestones", [])):
+        if not isinstance(milestone, dict):
+            continue
+        old = old_milestones[index] if index < len(old_milestones) and isinstance(old_milestones[index], dict) else {}
+        for key in TRACKED_FIELDS:
+            if old.get(key) != milestone.get(key):
+                changes.append({
+                    "path": f"milestones[{index}].{key}",
+                    "milestone": milestone.get("title", "Untitled"),
+                    "from": old.get(key),
+                    "to": milestone.get(key)
+                })
+    return changes
+
+
+progress_engine = ProgressEngine()
@@ -7,35 +7,83 @@ Creates AI-powered GitHub repositories and issues using LangChain and agentic AI
 import os
 import json
 import random
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import re
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Any
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from importlib.util import find_spec
 from pathlib import Path
+from string import Template
 
+from challenge_bank import challenge_bank
+from execution_policy import ExecutionPolicy, LLMExecutor
 
-# LangChain imports
-try:
-    from langchain.agents import Tool, AgentExecutor, create_openai_functions_agent
-    from langchain_groq import ChatGroq
-    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-    from langchain.schema import HumanMessage, AIMessage
-    from langchain.tools import tool
-    from langchain.memory import ConversationBufferMemory
-    from langchain.chains import LLMChain
-    from langchain.prompts import PromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
+from shared.prompt_compaction import compact_skills
+
+
+# LangChain, Groq and PyGithub take seconds to import; only check they are
+# installed here and import them when an agent is actually set up
+LANGCHAIN_AVAILABLE = find_spec("langchain") is not None and find_spec("langchain_groq") is not None
+if not LANGCHAIN_AVAILABLE:
     print("Warning: LangChain not available. Install with: pip install langchain langchain-groq")
 
-# GitHub API imports
-try:
-    from github import Github
-    GITHUB_AVAILABLE = True
-except ImportError:
-    GITHUB_AVAILABLE = False
+GROQ_AVAILABLE = find_spec("groq") is not None
+
+GITHUB_AVAILABLE = find_spec("github") is not None
+if not GITHUB_AVAILABLE:
     print("Warning: PyGithub not available. Install with: pip install PyGithub")
 
+# Issues per generated project; banked challenges fill these before the LLM is asked
+ISSUES_PER_PROJECT = int(os.getenv("AGENT2_ISSUES_PER_PROJECT", "5"))
+
+# Compiled once; mirrors the backend's markdown template registry
+ISSUE_BODY_TEMPLATE = Template("""## Description
+$description
+
+## Skills Required
+$skills_required
+
+## Acceptance Criteria
+$acceptance_criteria
+
+## Estimated Time
+$estimated_time
+
+## Hints
+$hints
+
+## Resources
+$resources
+""")
+
+def _bullets(items: List[Any]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+# Must stay in sync with idempotency_key() in backend/app/services/issue_publisher.py,
+# which computes the key the backend stores in ai_issues.idempotency_key
+def _issue_idempotency_key(repo_full_name: str, title: str) -> str:
+    """Same key the backend stores in ai_issues.idempotency_key"""
+    normalized = f"{repo_full_name}\n{' '.join(title.split()).lower()}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def _is_github_rate_limit(error: Any) -> bool:
+    """429, or a 403 that is GitHub's primary or secondary rate limit (not a permission error).
+
+    Same test as is_rate_limited() in backend/app/services/issue_publisher.py.
+    """
+    if error.status == 429:
+        return True
+    if error.status != 403:
+        return False
+    headers = {key.lower(): value for key, value in (getattr(error, "headers", None) or {}).items()}
+    if headers.get("x-ratelimit-remaining") == "0":
+        return True
+    return "rate limit" in str(error.data or "").lower()
+
 @dataclass
 class ProjectRepository:
     """Represents a project repository"""
@@ -63,26 +111,42 @@ class CodingIssue:
 class RepositoryCreationAgent:
     """Agent for creating AI-powered GitHub repositories and issues"""
     
-    def __init__(self, groq_api_key: str = None, github_token: str = None):
-        """Initialize the agent"""
+    def __init__(self, groq_api_key: str = None, github_token: str = None, policy: ExecutionPolicy = None):
+        """Initialize the agent; ``policy`` picks direct/agent/hybrid per operation"""
         self.groq_api_key = groq_api_key or os.getenv('GROQ_API_KEY')
         self.github_token = github_token or os.getenv('GITHUB_TOKEN')
         self.llm = None
         self.agent = None
+        self.agent_executor = None
         self.github_client = None
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        self._github_pace_lock = threading.Lock()
+        self._github_next_slot = 0.0
+        self.memory = None
+        # Shared bank of vetted issues; None generates every issue afresh
+        self.challenge_bank = challenge_bank
         
         if self.groq_api_key and LANGCHAIN_AVAILABLE:
             self._setup_langchain_agent()
         elif self.groq_api_key:
             self._setup_groq_fallback()
         
+        self.executor = LLMExecutor(policy or ExecutionPolicy.from_env(),
+                                    self.groq_api_key if GROQ_AVAILABLE else None)
+        self.executor.llm = self.llm
+        self.executor.agent_executor = self.agent_executor
+        
         if self.github_token and GITHUB_AVAILABLE:
             self._setup_github_client()
     
     def _setup_langchain_agent(self):
         """Setup LangChain agent with tools"""
         try:
+            from langchain.agents import Tool, AgentExecutor, create_openai_functions_agent
+            from langchain_groq import ChatGroq
+            from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+            from langchain.memory import ConversationBufferMemory
+            self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+            
             # Initialize LLM
             self.llm = ChatGroq(
                 model="llama3-8b-8192",  # Groq's free model
@@ -139,7 +203,7 @@ class RepositoryCreationAgent:
                 agent=self.agent,
                 tools=tools,
                 memory=self.memory,
-                verbose=True,
+                verbose=os.getenv("AGENT2_VERBOSE", "false").lower() == "true",
                 max_iterations=5
             )
             
@@ -161,12 +225,12 @@ class RepositoryCreationAgent:
     def _setup_github_client(self):
         """Setup GitHub client"""
         try:
+            from github import Github
             self.github_client = Github(self.github_token)
             print("✅ GitHub client initialized")
         except Exception as e:
             print(f"❌ Failed to setup GitHub client: {e}")
     
-    @tool
     def _analyze_user_skills_tool(self, user_skills: str, target_role: str) -> str:
         """Analyze user skills to determine appropriate project complexity"""
         try:
@@ -196,7 +260,6 @@ class RepositoryCreationAgent:
         except Exception as e:
             return f"Error analyzing skills: {str(e)}"
     
-    @tool
     def _design_project_structure_tool(self, project_type: str, tech_stack: str, complexity: str) -> str:
         """Design project structure and architecture"""
         try:
@@ -226,14 +289,16 @@ class RepositoryCreationAgent:
         except Exception as e:
             return f"Error designing project structure: {str(e)}"
     
-    @tool
     def _generate_coding_challenges_tool(self, skill_focus: str, difficulty: str, project_scope: str) -> str:
-        """Generate coding challenges and issues"""
+        """Generate coding challenges and issues, starting from banked ones that fit"""
         try:
+            banked = self._banked_issues(difficulty, [skill for skill in re.split(r"[,;]", skill_focus) if skill.strip()])
+            if len(banked) >= ISSUES_PER_PROJECT:
+                return json.dumps({"issues": banked})
             if self.llm:
                 prompt = f"""
-                Generate coding challenges for {skill_focus} at {difficulty} level within {project_scope}.
-                
+                Generate {ISSUES_PER_PROJECT - len(banked)} coding challenges for {skill_focus} at {difficulty} level within {project_scope}.
+                {self._existing_issues_note(banked)}
                 Provide a JSON response with:
                 {{
                     "issues": [
@@ -252,14 +317,20 @@ class RepositoryCreationAgent:
                 """
                 
                 response = self.llm.invoke(prompt)
-                return response.content
+                content = response.content
             else:
-                return self._mock_coding_challenges(skill_focus, difficulty, project_scope)
+                content = self._mock_coding_challenges(skill_focus, difficulty, project_scope)
+            
+            if not banked:
+                return content
+            generated = self._parse_issues_response(content, strict=True)
+            if generated is None:
+                return content
+            return json.dumps({"issues": banked + [asdict(issue) for issue in generated]})
                 
         except Exception as e:
             return f"Error generating challenges: {str(e)}"
     
-    @tool
     def _validate_project_requirements_tool(self, project_plan: str, user_skills: str) -> str:
         """Validate project requirements against user skills"""
         try:
@@ -290,88 +361,160 @@ class RepositoryCreationAgent:
     
     def create_project_repository(self, user_level: int, skill_focus: List[str]) -> Dict:
         """Create a project repository based on user level and skills"""
+        prompt = f"""
+        Create a project repository for a user at level {user_level} 
+        focusing on these skills: {", ".join(skill_focus)}
+        
+        Design:
+        1. Project concept and purpose
+        2. Technology stack
+        3. Project structure
+        4. Learning objectives
+        5. Difficulty level
+        
+        Return the project design in a structured JSON format.
+        """
         try:
-            if self.agent_executor:
-                # Use LangChain agent
-                skill_focus_text = ", ".join(skill_focus)
-                
-                prompt = f"""
-                Create a project repository for a user at level {user_level} 
-                focusing on these skills: {skill_focus_text}
-                
-                Design:
-                1. Project concept and purpose
-                2. Technology stack
-                3. Project structure
-                4. Learning objectives
-                5. Difficulty level
-                
-                Return the project design in a structured JSON format.
-                """
-                
-                result = self.agent_executor.invoke({"input": prompt})
-                return self._parse_project_response(result["output"], user_level, skill_focus)
-                
-            elif self.llm:
-                # Use Groq directly
-                return self._create_project_with_groq(user_level, skill_focus)
-            else:
-                # Use mock implementation
-                return self._create_mock_project(user_level, skill_focus)
-                
+            return self.executor.run(
+                "create_project_repository",
+                prompt,
+                parse_agent_output=lambda output: self._parse_project_response(output, user_level, skill_focus),
+                build=lambda data: self._finalize_project(data, user_level),
+                fallback=lambda: self._create_mock_project(user_level, skill_focus),
+                temperature=0.8
+            )
         except Exception as e:
             print(f"Error creating project: {e}")
             return self._create_mock_project(user_level, skill_focus)
     
-    def generate_coding_issues(self, difficulty_level: str, tech_stack: List[str]) -> List[CodingIssue]:
-        """Generate coding issues for the project"""
+    def generate_coding_issues(self, difficulty_level: str, tech_stack: List[str],
+                               count: int = ISSUES_PER_PROJECT) -> List[CodingIssue]:
+        """Generate coding issues for the project.
+
+        Banked challenges that fit the stack and difficulty come first; only
+        the remaining ``count`` are generated, and generated issues go into
+        the bank. Mock issues used when generation fails are never banked.
+        Returns at most ``count`` issues.
+        """
+        banked = self._issues_from_data({"issues": self._banked_issues(difficulty_level, tech_stack, count)})
+        if banked:
+            print(f"♻️ Reusing {len(banked)} banked challenges")
+        if len(banked) >= count:
+            return banked
+        
+        prompt = f"""
+        Generate {count - len(banked)} coding issues for a {difficulty_level} project using {", ".join(tech_stack)}.
+        {self._existing_issues_note(banked)}
+        Create issues that:
+        1. Build skills progressively
+        2. Are challenging but achievable
+        3. Have clear acceptance criteria
+        4. Include helpful hints and resources
+        5. Cover different aspects of the tech stack
+        
+        Return the issues in a structured JSON format.
+        """
         try:
-            if self.agent_executor:
-                tech_stack_text = ", ".join(tech_stack)
-                
-                prompt = f"""
-                Generate coding issues for a {difficulty_level} project using {tech_stack_text}.
-                
-                Create issues that:
-                1. Build skills progressively
-                2. Are challenging but achievable
-                3. Have clear acceptance criteria
-                4. Include helpful hints and resources
-                5. Cover different aspects of the tech stack
-                
-                Return the issues in a structured JSON format.
-                """
-                
-                result = self.agent_executor.invoke({"input": prompt})
-                return self._parse_issues_response(result["output"])
-                
-            elif self.llm:
-                return self._generate_issues_with_groq(difficulty_level, tech_stack)
-            else:
-                return self._generate_mock_issues(difficulty_level, tech_stack)
-                
+            generated = self.executor.run(
+                "generate_coding_issues",
+                prompt,
+                parse_agent_output=lambda output: self._parse_issues_response(output, strict=True),
+                build=self._issues_from_data,
+                fallback=lambda: None,
+                temperature=0.8
+            )
         except Exception as e:
             print(f"Error generating issues: {e}")
-            return self._generate_mock_issues(difficulty_level, tech_stack)
+            generated = None
+        
+        if not generated:
+            return (banked + self._generate_mock_issues(difficulty_level, tech_stack))[:count]
+        # Extra issues the model returned are still banked for later projects
+        if self.challenge_bank is not None:
+            self.challenge_bank.add(generated, tech_stack, difficulty_level)
+        return banked + generated[:count - len(banked)]
+    
+    def _banked_issues(self, difficulty_level: str, tech_stack: List[str],
+                       limit: int = ISSUES_PER_PROJECT) -> List[Dict]:
+        """Banked issue dicts that fit the stack and difficulty (none without a bank)"""
+        if self.challenge_bank is None:
+            return []
+        return self.challenge_bank.find(tech_stack, difficulty_level, limit=limit)
+    
+    def _existing_issues_note(self, issues: List[Any]) -> str:
+        """Prompt line listing issues the project already has, so the LLM does not repeat them"""
+        if not issues:
+            return ""
+        titles = [issue.title if isinstance(issue, CodingIssue) else issue.get("title") for issue in issues]
+        return "The project already has these issues; do not repeat them:\n" + _bullets(titles)
     
-    def create_github_issues(self, repo_name: str, issues: List[CodingIssue]) -> List[Dict]:
-        """Create GitHub issues in the repository"""
+    def create_github_issues(self, repo_name: str, issues: List[CodingIssue],
+                             progress: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+        """Create GitHub issues in the repository.
+
+        Issues are created concurrently (paced to stay clear of GitHub's
+        secondary rate limits) with retry and backoff. Titles that already
+        exist in the repository are skipped, so re-running after a partial
+        failure completes the set without duplicates.
+        """
         try:
             if not self.github_client:
                 print("⚠️ GitHub client not available, returning mock issues")
                 return self._mock_github_issues(repo_name, issues)
             
-            # This would create actual GitHub issues
-            # For now, return mock data
-            created_issues = []
-            for issue in issues:
-                created_issues.append({
+            repo = (self.github_client.get_repo(repo_name) if "/" in repo_name
+                    else self.github_client.get_user().get_repo(repo_name))
+            keys = [_issue_idempotency_key(repo.full_name, issue.title) for issue in issues]
+            existing = {
+                _issue_idempotency_key(repo.full_name, gh_issue.title): gh_issue
+                for gh_issue in repo.get_issues(state="all") if gh_issue.pull_request is None
+            }
+            
+            # Create all labels up front rather than racing on issue creation
+            present = {label.name.lower() for label in repo.get_labels()}
+            wanted = {label for issue in issues for label in (issue.difficulty, "hackathon-project")}
+            for label in sorted(label for label in wanted if label.lower() not in present):
+                self._with_github_retry(lambda: repo.create_label(label, "1d76db"))
+            
+            created_issues: List[Optional[Dict]] = [None] * len(issues)
+            done = 0
+            
+            def publish(index: int) -> Dict:
+                issue = issues[index]
+                labels = [issue.difficulty, "hackathon-project"]
+                body = self._format_issue_body(issue)
+                try:
+                    if keys[index] in existing:
+                        gh_issue, status = existing[keys[index]], "existing"
+                    else:
+                        self._pace_github()
+                        gh_issue = self._with_github_retry(
+                            lambda: repo.create_issue(title=issue.title, body=body, labels=labels),
+                            recheck=lambda: self._find_github_issue(repo, keys[index])
+                        )
+                        status = "created" if gh_issue else "failed"
+                except Exception as e:  # one failed issue must not turn the whole batch into mocks
+                    print(f"❌ Could not create issue '{issue.title}': {e}")
+                    gh_issue, status = None, "failed"
+                return {
                     "title": issue.title,
-                    "body": self._format_issue_body(issue),
-                    "labels": [issue.difficulty, "hackathon-project"],
+                    "body": body,
+                    "labels": labels,
                     "assignees": [],
-                    "milestone": None
-                })
+                    "milestone": None,
+                    "number": gh_issue.number if gh_issue else None,
+                    "url": gh_issue.html_url if gh_issue else None,
+                    "status": status,
+                    "idempotency_key": keys[index]
+                }
+            
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = {pool.submit(publish, i): i for i in range(len(issues))}
+                for future in as_completed(futures):
+                    created_issues[futures[future]] = future.result()
+                    done += 1
+                    if progress:
+                        progress(done, len(issues), created_issues[futures[future]])
             
             return created_issues
             
@@ -379,55 +522,96 @@ class RepositoryCreationAgent:
             print(f"Error creating GitHub issues: {e}")
             return self._mock_github_issues(repo_name, issues)
     
+    def _pace_github(self, min_interval: float = 1.0):
+        """Space content-creating GitHub requests at least min_interval apart"""
+        with self._github_pace_lock:
+            now = time.monotonic()
+            wait = self._github_next_slot - now
+            self._github_next_slot = max(now, self._github_next_slot) + min_interval
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _with_github_retry(self, call, max_retries: int = 4, backoff: float = 2.0,
+                           recheck: Optional[Callable[[], Any]] = None):
+        """Run a content-creating PyGithub call, retrying rate-limit and server errors with backoff.
+
+        A timeout, connection error or 5xx may come after GitHub already
+        created the resource, so ``recheck()`` looks it up before each retry
+        and its result is returned instead of calling again. Permission and
+        bad-token 403s are not retried.
+        """
+        import requests
+        from github import GithubException
+        ambiguous = False
+        for attempt in range(max_retries + 1):
+            if ambiguous and recheck:
+                try:
+                    found = recheck()
+                except (GithubException, requests.RequestException):
+                    found = None
+                if found:
+                    return found
+            try:
+                return call()
+            except requests.RequestException as e:
+                ambiguous = True
+                delay = backoff ** attempt
+                print(f"⚠️ GitHub request failed ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+            except GithubException as e:
+                if e.status == 422:  # already exists / validation; not retryable
+                    return None
+                if _is_github_rate_limit(e) or e.status >= 500:
+                    ambiguous = ambiguous or e.status >= 500
+                    delay = backoff ** (attempt + 1)
+                    print(f"⚠️ GitHub returned {e.status}, retrying in {delay:.0f}s")
+                    time.sleep(delay)
+                    continue
+                print(f"❌ GitHub request failed: {e.status} {e.data}")
+                return None
+        return None
+    
+    @staticmethod
+    def _find_github_issue(repo, key: str):
+        """The most recently created issue in ``repo`` with idempotency ``key``, if any"""
+        for gh_issue in repo.get_issues(state="all", sort="created", direction="desc")[:100]:
+            if gh_issue.pull_request is None and _issue_idempotency_key(repo.full_name, gh_issue.title) == key:
+                return gh_issue
+        return None
+    
     def validate_project_requirements(self, user_skills: List[Dict], project_type: str) -> Dict:
         """Validate project requirements against user skills"""
+        prompt = f"""
+        Validate this {project_type} project against user skills:
+        
+        User Skills (level 1-5): {compact_skills(user_skills)}
+        Project Type: {project_type}
+        
+        Check compatibility and provide recommendations.
+        """
         try:
-            if self.agent_executor:
-                user_skills_text = json.dumps(user_skills, indent=2)
-                
-                prompt = f"""
-                Validate this {project_type} project against user skills:
-                
-                User Skills: {user_skills_text}
-                Project Type: {project_type}
-                
-                Check compatibility and provide recommendations.
-                """
-                
-                result = self.agent_executor.invoke({"input": prompt})
-                return self._parse_validation_response(result["output"])
-                
-            elif self.llm:
-                return self._validate_with_openai(user_skills, project_type)
-            else:
-                return self._mock_validation(user_skills, project_type)
-                
+            return self.executor.run(
+                "validate_project_requirements",
+                prompt,
+                parse_agent_output=self._parse_validation_response,
+                build=lambda data: data,
+                fallback=lambda: json.loads(self._mock_validation("", "")),
+                temperature=0.7
+            )
         except Exception as e:
             print(f"Error validating requirements: {e}")
-            return self._mock_validation(user_skills, project_type)
+            return json.loads(self._mock_validation("", ""))
     
     def _format_issue_body(self, issue: CodingIssue) -> str:
         """Format issue for GitHub"""
-        body = f"""
-## Description
-{issue.description}
-
-## Skills Required
-{', '.join(issue.skills_required)}
-
-## Acceptance Criteria
-{chr(10).join([f'- {criterion}' for criterion in issue.acceptance_criteria])}
-
-## Estimated Time
-{issue.estimated_time}
-
-## Hints
-{chr(10).join([f'- {hint}' for criterion in issue.hints])}
-
-## Resources
-{chr(10).join([f'- {resource}' for resource in issue.resources])}
-        """
-        return body.strip()
+        return ISSUE_BODY_TEMPLATE.substitute(
+            description=issue.description,
+            skills_required=', '.join(issue.skills_required),
+            acceptance_criteria=_bullets(issue.acceptance_criteria),
+            estimated_time=issue.estimated_time,
+            hints=_bullets(issue.hints),
+            resources=_bullets(issue.resources)
+        ).strip()
     
     # Mock implementations for when AI is not available
     def _create_mock_project(self, user_level: int, skill_focus: List[str]) -> Dict:
@@ -513,22 +697,22 @@ class RepositoryCreationAgent:
             else:
                 json_str = response
             
-            project_data = json.loads(json_str)
-            
-            # Ensure required fields
-            if "name" not in project_data:
-                project_data["name"] = f"ai-project-{user_level}"
-            if "description" not in project_data:
-                project_data["description"] = f"AI-generated project for level {user_level}"
-            
-            return project_data
+            return self._finalize_project(json.loads(json_str), user_level)
             
         except Exception as e:
             print(f"Error parsing project response: {e}")
             return self._create_mock_project(user_level, skill_focus)
     
-    def _parse_issues_response(self, response: str) -> List[CodingIssue]:
-        """Parse AI response into structured issues"""
+    def _finalize_project(self, project_data: Dict, user_level: int) -> Dict:
+        """Ensure required fields on a generated project"""
+        if "name" not in project_data:
+            project_data["name"] = f"ai-project-{user_level}"
+        if "description" not in project_data:
+            project_data["description"] = f"AI-generated project for level {user_level}"
+        return project_data
+    
+    def _parse_issues_response(self, response: str, strict: bool = False) -> Optional[List[CodingIssue]]:
+        """Parse AI response into structured issues; on failure the mock issues, or None if ``strict``"""
         try:
             # Try to extract JSON from response
             if "```json" in response:
@@ -538,88 +722,27 @@ class RepositoryCreationAgent:
             else:
                 json_str = response
             
-            issues_data = json.loads(json_str)
-            issues = []
-            
-            for issue_data in issues_data.get("issues", []):
-                issue = CodingIssue(
-                    title=issue_data.get("title", "Untitled Issue"),
-                    description=issue_data.get("description", ""),
-                    difficulty=issue_data.get("difficulty", "intermediate"),
-                    estimated_time=issue_data.get("estimated_time", "2-4 hours"),
-                    skills_required=issue_data.get("skills_required", []),
-                    acceptance_criteria=issue_data.get("acceptance_criteria", []),
-                    hints=issue_data.get("hints", []),
-                    resources=issue_data.get("resources", [])
-                )
-                issues.append(issue)
-            
-            return issues
+            return self._issues_from_data(json.loads(json_str))
             
         except Exception as e:
             print(f"Error parsing issues response: {e}")
-            return self._generate_mock_issues("intermediate", ["JavaScript"])
-    
-    def _create_project_with_groq(self, user_level: int, skill_focus: List[str]) -> Dict:
-        """Create project using Groq directly"""
-        try:
-            import groq
-            
-            prompt = f"""
-            Create a project repository for a user at level {user_level} 
-            focusing on these skills: {', '.join(skill_focus)}
-            
-            Design:
-            1. Project concept and purpose
-            2. Technology stack
-            3. Project structure
-            4. Learning objectives
-            5. Difficulty level
-            
-            Return the project design in a structured JSON format.
-            """
-            
-            response = groq.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8
-            )
-            
-            return self._parse_project_response(response.choices[0].message.content, user_level, skill_focus)
-            
-        except Exception as e:
-            print(f"Error with Groq: {e}")
-            return self._create_mock_project(user_level, skill_focus)
+            return None if strict else self._generate_mock_issues("intermediate", ["JavaScript"])
     
-    def _generate_issues_with_groq(self, difficulty_level: str, tech_stack: List[str]) -> List[CodingIssue]:
-        """Generate issues using Groq directly"""
-        try:
-            import groq
-            
-            prompt = f"""
-            Generate coding issues for a {difficulty_level} project using {', '.join(tech_stack)}.
-            
-            Create issues that:
-            1. Build skills progressively
-            2. Are challenging but achievable
-            3. Have clear acceptance criteria
-            4. Include helpful hints and resources
-            5. Cover different aspects of the tech stack
-            
-            Return the issues in a structured JSON format.
-            """
-            
-            response = groq.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8
+    def _issues_from_data(self, issues_data: Dict) -> List[CodingIssue]:
+        """CodingIssues from a parsed {"issues": [...]} response"""
+        return [
+            CodingIssue(
+                title=issue_data.get("title", "Untitled Issue"),
+                description=issue_data.get("description", ""),
+                difficulty=issue_data.get("difficulty", "intermediate"),
+                estimated_time=issue_data.get("estimated_time", "2-4 hours"),
+                skills_required=issue_data.get("skills_required", []),
+                acceptance_criteria=issue_data.get("acceptance_criteria", []),
+                hints=issue_data.get("hints", []),
+                resources=issue_data.get("resources", [])
             )
-            
-            return self._parse_issues_response(response.choices[0].message.content)
-            
-        except Exception as e:
-            print(f"Error with Groq: {e}")
-            return self._generate_mock_issues(difficulty_level, tech_stack)
+            for issue_data in issues_data.get("issues", [])
+        ]
     
     def _mock_skill_analysis(self, user_skills: str, target_role: str) -> str:
         """Mock skill analysis"""
@@ -673,8 +796,8 @@ class RepositoryCreationAgent:
             "success_probability": "High"
         })
     
-    def _parse_validation_response(self, response: str) -> Dict:
-        """Parse validation response"""
+    def _parse_validation_response(self, response: str) -> Optional[Dict]:
+        """Parse validation response; None if unparseable, so the executor uses its fallback"""
         try:
             if "```json" in response:
                 json_str = response.split("```json")[1].split("```")[0]
@@ -687,35 +810,7 @@ class RepositoryCreationAgent:
             
         except Exception as e:
             print(f"Error parsing validation response: {e}")
-            return self._mock_validation("", "")
-    
-    def _validate_with_openai(self, user_skills: List[Dict], project_type: str) -> Dict:
-        """Validate using OpenAI directly"""
-        try:
-            import openai
-            
-            user_skills_text = json.dumps(user_skills, indent=2)
-            
-            prompt = f"""
-            Validate this {project_type} project against user skills:
-            
-            User Skills: {user_skills_text}
-            Project Type: {project_type}
-            
-            Check compatibility and provide recommendations.
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7
-            )
-            
-            return self._parse_validation_response(response.choices[0].message.content)
-            
-        except Exception as e:
-            print(f"Error with OpenAI: {e}")
-            return self._mock_validation(user_skills, project_type)
+            return None
 
 # Example usage
 if __name__ == "__main__":
@@ -9,30 +9,25 @@ import json
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from execution_policy import ExecutionPolicy, LLMExecutor, extract_json
+from progress_engine import ProgressUpdate, progress_engine
 
-# LangChain imports
-try:
-    from langchain.agents import Tool, AgentExecutor, create_openai_functions_agent
-    from langchain_groq import ChatGroq
-    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-    from langchain.schema import HumanMessage, AIMessage
-    from langchain.tools import tool
-    from langchain.memory import ConversationBufferMemory
-    from langchain.chains import LLMChain
-    from langchain.prompts import PromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
+from shared.llm_router import GROQ_MODEL
+from shared.prompt_compaction import compact_json, compact_roadmap, compact_skills, context_budget, fit_to_budget
+from shared.resource_catalog import resource_catalog
+
+
+# LangChain, Groq and PyGithub take seconds to import; only check they are
+# installed here and import them when an agent is actually set up
+LANGCHAIN_AVAILABLE = find_spec("langchain") is not None and find_spec("langchain_groq") is not None
+if not LANGCHAIN_AVAILABLE:
     print("Warning: LangChain not available. Install with: pip install langchain langchain-groq")
 
-# Fallback Groq imports
-try:
-    import groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
+GROQ_AVAILABLE = find_spec("groq") is not None
+if not GROQ_AVAILABLE:
     print("Warning: Groq not available. Install with: pip install groq")
 
 @dataclass
@@ -64,12 +59,13 @@ class LearningRoadmap:
 class RoadmapGenerationAgent:
     """Agent for generating personalized learning roadmaps"""
     
-    def __init__(self, groq_api_key: str = None):
-        """Initialize the agent"""
+    def __init__(self, groq_api_key: str = None, policy: ExecutionPolicy = None):
+        """Initialize the agent; ``policy`` picks direct/agent/hybrid per operation"""
         self.groq_api_key = groq_api_key or os.getenv('GROQ_API_KEY')
         self.llm = None
         self.agent = None
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+        self.agent_executor = None
+        self.memory = None
         
         if self.groq_api_key and LANGCHAIN_AVAILABLE:
             self._setup_langchain_agent()
@@ -77,10 +73,21 @@ class RoadmapGenerationAgent:
             self._setup_groq_fallback()
         else:
             print("⚠️ No Groq API key or LangChain available. Using mock responses.")
+        
+        self.executor = LLMExecutor(policy or ExecutionPolicy.from_env(),
+                                    self.groq_api_key if GROQ_AVAILABLE else None)
+        self.executor.llm = self.llm
+        self.executor.agent_executor = self.agent_executor
     
     def _setup_langchain_agent(self):
         """Setup LangChain agent with tools"""
         try:
+            from langchain.agents import Tool, AgentExecutor, create_openai_functions_agent
+            from langchain_groq import ChatGroq
+            from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+            from langchain.memory import ConversationBufferMemory
+            self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+            
             # Initialize LLM
             self.llm = ChatGroq(
                 model="llama3-8b-8192",  # Groq's free model
@@ -137,7 +144,7 @@ class RoadmapGenerationAgent:
                 agent=self.agent,
                 tools=tools,
                 memory=self.memory,
-                verbose=True,
+                verbose=os.getenv("AGENT2_VERBOSE", "false").lower() == "true",
                 max_iterations=5
             )
             
@@ -150,12 +157,12 @@ class RoadmapGenerationAgent:
     def _setup_groq_fallback(self):
         """Setup Groq fallback without LangChain"""
         try:
+            import groq
             groq.api_key = self.groq_api_key
             print("✅ Groq fallback initialized")
         except Exception as e:
             print(f"❌ Failed to setup Groq fallback: {e}")
     
-    @tool
     def _analyze_skill_gaps_tool(self, current_skills: str, target_role: str) -> str:
         """Analyze skill gaps between current skills and target role"""
         try:
@@ -184,7 +191,6 @@ class RoadmapGenerationAgent:
         except Exception as e:
             return f"Error analyzing skill gaps: {str(e)}"
     
-    @tool
     def _generate_milestones_tool(self, skill_area: str, difficulty: str, time_frame: str) -> str:
         """Generate learning milestones for a specific skill area"""
         try:
@@ -201,7 +207,6 @@ class RoadmapGenerationAgent:
                             "skills_covered": ["specific skills"],
                             "difficulty": "{difficulty}",
                             "estimated_time": "time estimate",
-                            "resources": ["learning resources"],
                             "prerequisites": ["required skills"],
                             "completion_criteria": ["how to know it's done"]
                         }}
@@ -217,7 +222,6 @@ class RoadmapGenerationAgent:
         except Exception as e:
             return f"Error generating milestones: {str(e)}"
     
-    @tool
     def _validate_roadmap_tool(self, roadmap_json: str) -> str:
         """Validate and optimize learning roadmap"""
         try:
@@ -244,65 +248,40 @@ class RoadmapGenerationAgent:
         except Exception as e:
             return f"Error validating roadmap: {str(e)}"
     
-    @tool
     def _suggest_resources_tool(self, skill: str, level: str) -> str:
-        """Suggest learning resources for specific skills"""
-        try:
-            if self.llm:
-                prompt = f"""
-                Suggest learning resources for {skill} at {level} level.
-                
-                Include:
-                - Online courses
-                - Documentation
-                - Practice projects
-                - Books
-                - Communities
-                
-                Return as JSON with categories and specific recommendations.
-                """
-                
-                response = self.llm.invoke(prompt)
-                return response.content
-            else:
-                return self._mock_resource_suggestions(skill, level)
-                
-        except Exception as e:
-            return f"Error suggesting resources: {str(e)}"
+        """Suggest learning resources for specific skills (from the local catalog, no LLM call)"""
+        resources = resource_catalog.top(skill, level, limit=5)
+        return json.dumps({
+            "skill": skill,
+            "level": level,
+            "resources": [resource.to_dict() for resource in resources]
+        })
     
     def create_learning_roadmap(self, current_level: int, target_role: str, user_skills: List[Dict]) -> Dict:
         """Create a comprehensive learning roadmap"""
+        prompt = f"""
+        Create a comprehensive learning roadmap for a user at level {current_level} 
+        targeting the role of {target_role}.
+        
+        Current Skills (level 1-5): {compact_skills(user_skills)}
+        
+        Generate a complete roadmap with:
+        1. Skill gap analysis
+        2. Learning milestones
+        3. Time estimates
+        4. Success metrics
+        
+        Return the roadmap in a structured JSON format.
+        """
         try:
-            if self.agent_executor:
-                # Use LangChain agent
-                current_skills_text = json.dumps(user_skills, indent=2)
-                
-                prompt = f"""
-                Create a comprehensive learning roadmap for a user at level {current_level} 
-                targeting the role of {target_role}.
-                
-                Current Skills: {current_skills_text}
-                
-                Generate a complete roadmap with:
-                1. Skill gap analysis
-                2. Learning milestones
-                3. Time estimates
-                4. Resource recommendations
-                5. Success metrics
-                
-                Return the roadmap in a structured JSON format.
-                """
-                
-                result = self.agent_executor.invoke({"input": prompt})
-                return self._parse_roadmap_response(result["output"], current_level, target_role)
-                
-            elif self.llm:
-                # Use Groq directly
-                return self._create_roadmap_with_groq(current_level, target_role, user_skills)
-            else:
-                # Use mock implementation
-                return self._create_mock_roadmap(current_level, target_role, user_skills)
-                
+            return self.executor.run(
+                "create_learning_roadmap",
+                prompt,
+                parse_agent_output=lambda output: self._parse_roadmap_response(output, current_level, target_role),
+                build=lambda data: self._finalize_roadmap(data, current_level, target_role),
+                fallback=lambda: self._create_mock_roadmap(current_level, target_role, user_skills),
+                temperature=0.7
+            )
         except Exception as e:
             print(f"Error creating roadmap: {e}")
             return self._create_mock_roadmap(current_level, target_role, user_skills)
@@ -337,7 +316,7 @@ class RoadmapGenerationAgent:
             if self.llm:
                 prompt = f"""
                 Based on this learning progress, suggest the next 3-5 skills to focus on:
-                {json.dumps(current_progress, indent=2)}
+                {fit_to_budget(compact_json(current_progress), context_budget(GROQ_MODEL, reserve_output=1024))}
                 
                 Consider:
                 - What's most logical to learn next
@@ -358,37 +337,52 @@ class RoadmapGenerationAgent:
             return self._mock_skill_suggestions(current_progress)
     
     def update_roadmap_progress(self, completed_projects: List[Dict], current_roadmap: Dict) -> Dict:
-        """Update roadmap based on completed projects"""
+        """Update roadmap based on completed projects (computed locally, see track_progress)"""
+        return self.track_progress(completed_projects, current_roadmap).roadmap
+
+    def track_progress(self, completed_projects: List[Dict], current_roadmap: Dict) -> ProgressUpdate:
+        """Apply completed projects with the local progress engine.
+
+        The LLM is only asked for a short narrative when a milestone was just
+        completed (and AGENT2_PROGRESS_NARRATIVE is on); every other update
+        costs no tokens.
+        """
+        update = progress_engine.apply(completed_projects, current_roadmap)
+        if update.at_milestone_boundary and os.getenv("AGENT2_PROGRESS_NARRATIVE", "true").lower() == "true":
+            narrative = self.narrate_progress(update)
+            if narrative:
+                update.roadmap["narrative"] = narrative
+        return update
+
+    def narrate_progress(self, update: ProgressUpdate) -> Optional[Dict]:
+        """Short encouragement and next-step suggestions after a milestone; None without an LLM"""
+        if not self.executor.available:
+            return None
+        prompt = f"""
+        A learner just completed these roadmap milestones: {", ".join(update.newly_completed)}.
+        Roadmap: {compact_roadmap(update.roadmap)}
+        Practised skills: {", ".join(update.practised_skills)}
+
+        Write a two-sentence encouraging summary of their progress and 2-3 concrete
+        suggestions for the next milestone.
+        """
         try:
-            if self.llm:
-                prompt = f"""
-                Update this learning roadmap based on completed projects:
-                
-                Completed Projects: {json.dumps(completed_projects, indent=2)}
-                Current Roadmap: {json.dumps(current_roadmap, indent=2)}
-                
-                Update:
-                - Mark completed milestones
-                - Adjust remaining time estimates
-                - Suggest new milestones if needed
-                - Update skill progress
-                
-                Return updated roadmap in JSON format.
-                """
-                
-                response = self.llm.invoke(prompt)
-                return json.loads(response.content)
-            else:
-                return self._mock_roadmap_update(completed_projects, current_roadmap)
-                
+            return self.executor.run(
+                "narrate_progress",
+                prompt,
+                parse_agent_output=extract_json,
+                build=lambda data: data,
+                fallback=lambda: None,
+                temperature=0.7
+            )
         except Exception as e:
-            print(f"Error updating roadmap: {e}")
-            return self._mock_roadmap_update(completed_projects, current_roadmap)
+            print(f"Error narrating progress: {e}")
+            return None
     
     # Mock implementations for when AI is not available
     def _create_mock_roadmap(self, current_level: int, target_role: str, user_skills: List[Dict]) -> Dict:
         """Create a mock roadmap when AI is not available"""
-        return {
+        return self._attach_resources({
             "user_id": "mock_user",
             "current_level": current_level,
             "target_role": target_role,
@@ -399,7 +393,6 @@ class RoadmapGenerationAgent:
                     "skills_covered": ["Python", "Git", "Basic Algorithms"],
                     "difficulty": "beginner",
                     "estimated_time": "4-6 weeks",
-                    "resources": ["Python.org", "GitHub Learning Lab", "LeetCode"],
                     "prerequisites": [],
                     "completion_criteria": ["Complete 10 coding challenges", "Build a simple project"]
                 },
@@ -409,7 +402,6 @@ class RoadmapGenerationAgent:
                     "skills_covered": ["HTML", "CSS", "JavaScript"],
                     "difficulty": "beginner",
                     "estimated_time": "6-8 weeks",
-                    "resources": ["MDN Web Docs", "freeCodeCamp", "Codecademy"],
                     "prerequisites": ["Basic Programming"],
                     "completion_criteria": ["Build a responsive website", "Complete a JavaScript project"]
                 }
@@ -417,7 +409,7 @@ class RoadmapGenerationAgent:
             "total_duration": "10-14 weeks",
             "difficulty_curve": "gradual",
             "success_metrics": ["Complete all milestones", "Build portfolio projects", "Pass skill assessments"]
-        }
+        })
     
     def _generate_mock_milestones(self) -> List[Milestone]:
         """Generate mock milestones"""
@@ -442,13 +434,6 @@ class RoadmapGenerationAgent:
             {"skill": "Advanced Skill", "priority": "medium", "reasoning": "Career advancement"}
         ]
     
-    def _mock_roadmap_update(self, completed_projects: List[Dict], current_roadmap: Dict) -> Dict:
-        """Mock roadmap update"""
-        updated_roadmap = current_roadmap.copy()
-        updated_roadmap["completed_projects"] = len(completed_projects)
-        updated_roadmap["last_updated"] = datetime.now().isoformat()
-        return updated_roadmap
-    
     def _parse_roadmap_response(self, response: str, current_level: int, target_role: str) -> Dict:
         """Parse AI response into structured roadmap"""
         try:
@@ -460,51 +445,31 @@ class RoadmapGenerationAgent:
             else:
                 json_str = response
             
-            roadmap_data = json.loads(json_str)
-            
-            # Ensure required fields
-            roadmap_data["user_id"] = "ai_generated"
-            roadmap_data["current_level"] = current_level
-            roadmap_data["target_role"] = target_role
-            roadmap_data["created_at"] = datetime.now().isoformat()
-            roadmap_data["updated_at"] = datetime.now().isoformat()
-            
-            return roadmap_data
+            return self._finalize_roadmap(json.loads(json_str), current_level, target_role)
             
         except Exception as e:
             print(f"Error parsing roadmap response: {e}")
             return self._create_mock_roadmap(current_level, target_role, [])
     
-    def _create_roadmap_with_groq(self, current_level: int, target_role: str, user_skills: List[Dict]) -> Dict:
-        """Create roadmap using Groq directly"""
-        try:
-            prompt = f"""
-            Create a comprehensive learning roadmap for a user at level {current_level} 
-            targeting the role of {target_role}.
-            
-            Current Skills: {json.dumps(user_skills, indent=2)}
-            
-            Generate a complete roadmap with:
-            1. Skill gap analysis
-            2. Learning milestones
-            3. Time estimates
-            4. Resource recommendations
-            5. Success metrics
-            
-            Return the roadmap in a structured JSON format.
-            """
-            
-            response = groq.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7
-            )
-            
-            return self._parse_roadmap_response(response.choices[0].message.content, current_level, target_role)
-            
-        except Exception as e:
-            print(f"Error with Groq: {e}")
-            return self._create_mock_roadmap(current_level, target_role, user_skills)
+    def _finalize_roadmap(self, roadmap_data: Dict, current_level: int, target_role: str) -> Dict:
+        """Ensure required fields on a generated roadmap"""
+        roadmap_data["user_id"] = "ai_generated"
+        roadmap_data["current_level"] = current_level
+        roadmap_data["target_role"] = target_role
+        roadmap_data["created_at"] = datetime.now().isoformat()
+        roadmap_data["updated_at"] = datetime.now().isoformat()
+        return self._attach_resources(roadmap_data)
+
+    @staticmethod
+    def _attach_resources(roadmap_data: Dict) -> Dict:
+        """Fill each milestone's resources from the local catalog by its skills and difficulty"""
+        for milestone in roadmap_data.get("milestones", []):
+            if not isinstance(milestone, dict):
+                continue
+            resources = resource_catalog.for_skills(milestone.get("skills_covered") or [], milestone.get("difficulty"))
+            if resources or not milestone.get("resources"):
+                milestone["resources"] = resources
+        return roadmap_data
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Shared Path - IISER StatusCode 02
+Puts the agents/ directory on sys.path so Agent2 modules can import the
+``shared`` package used by both agents. Import it before any ``shared.*``
+import; modules that import another Agent2 module first get it for free.
+"""
+
+import sys
+from pathlib import Path
+
+AGENTS_DIR = str(Path(__file__).resolve().parent.parent)
+if AGENTS_DIR not in sys.path:
+    sys.path.append(AGENTS_DIR)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the Challenge Bank
+Checks vetting, near-duplicate merging, stack-aware lookup and that the
+backing file survives several processes appending and compacting
+"""
+
+import json
+import os
+import sys
+
+# Add the agent2 directory to path; keep the module-level bank off the real file
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AGENT2_CHALLENGE_BANK", "off")
+
+from challenge_bank import ChallengeBank, vet
+
+CRITERIA = ["Endpoint returns 200 with a JSON body", "Invalid input returns 400", "Tests cover both cases"]
+
+
+def _issue(title, skills, description=None, difficulty="intermediate"):
+    return {
+        "title": title,
+        "description": description or f"Implement {title.lower()} for the service, with input validation and tests.",
+        "acceptance_criteria": CRITERIA,
+        "skills_required": skills,
+        "difficulty": difficulty
+    }
+
+
+def test_vet_rejects_thin_issues():
+    """Only complete issues are fit for the bank"""
+    assert vet(_issue("Add login endpoint", ["Python"])) is None
+    assert vet({**_issue("Add login endpoint", ["Python"]), "description": "Add login"}) == "description too short"
+    assert vet({**_issue("Add login endpoint", ["Python"]), "acceptance_criteria": []}) == "no acceptance criteria"
+    assert vet({**_issue("Add login endpoint", ["Python"]), "skills_required": []}) == "no required skills"
+    assert ChallengeBank().add([{"title": "Mock issue"}], ["Python"]) == 0
+    print("✅ Vet rejects thin issues")
+
+
+def test_near_duplicates_are_merged():
+    """A reworded copy of a banked issue bumps its seen count instead of being stored"""
+    bank = ChallengeBank()
+    original = _issue("Add pagination to the users endpoint", ["Python", "Flask"],
+                      "Add cursor pagination to the users list endpoint so large result sets load in pages.")
+    reworded = {**original, "title": "Add pagination to users endpoint"}
+    assert bank.add([original], ["Python", "Flask"]) == 1
+    assert bank.add([reworded], ["Python", "Flask"]) == 0
+    assert bank.add([original], ["python", "flask"]) == 0
+    assert len(bank) == 1
+    assert bank._challenges[next(iter(bank._challenges))].seen == 3
+    assert bank.similar(reworded)[0][1] >= 0.7
+    print("✅ Near duplicates are merged")
+
+
+def test_find_matches_stack_and_difficulty():
+    """Issues come back only for a matching difficulty and a stack that has every required technology"""
+    bank = ChallengeBank()
+    bank.add([
+        _issue("Add login endpoint", ["Python", "Flask", "Git"]),
+        _issue("Cache profile lookups", ["Python", "Flask", "Redis"]),
+        _issue("Build the signup form", ["React", "JavaScript"]),
+    ], ["Python", "Flask"])
+
+    titles = [issue["title"] for issue in bank.find(["python", "Flask"], "intermediate")]
+    assert titles == ["Add login endpoint"]  # Redis is not in the stack; Git is portable
+    assert bank.find(["Python", "Flask", "Redis"], "intermediate", limit=5)
+    assert bank.find(["Python", "Flask"], "beginner") == []
+    assert bank.find(["Python", "Flask"], "intermediate", exclude=["add  LOGIN endpoint"]) == []
+
+    found = bank.find(["Python", "Flask"], "intermediate")
+    found[0]["title"] = "changed"
+    assert bank.find(["Python", "Flask"], "intermediate")[0]["title"] == "Add login endpoint"
+    print("✅ Find matches stack and difficulty")
+
+
+def test_bank_reloads_from_file(tmp_path):
+    """A new bank on the same file sees every banked issue"""
+    path = tmp_path / "bank.jsonl"
+    ChallengeBank(path).add([_issue("Add login endpoint", ["Python", "Flask"])], ["Python", "Flask"])
+    reloaded = ChallengeBank.load(path)
+    assert len(reloaded) == 1
+    assert reloaded.find(["Python", "Flask"], "intermediate")[0]["title"] == "Add login endpoint"
+    print("✅ Bank reloads from file")
+
+
+def test_compaction_keeps_other_processes_lines(tmp_path):
+    """Compacting rewrites the file's contents, not just this instance's copy"""
+    path = tmp_path / "bank.jsonl"
+    first, second = ChallengeBank(path), ChallengeBank(path)
+    first.add([_issue("Add login endpoint", ["Python", "Flask"])], ["Python", "Flask"])
+    second.add([_issue("Cache profile lookups", ["Python", "Redis"])], ["Python", "Redis"])
+    first.add([_issue("Add login endpoint", ["Python", "Flask"])], ["Python", "Flask"])  # seen bump: a second line
+    assert len(path.read_text().splitlines()) == 3
+
+    first.compact()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(line["issue"]["title"] for line in lines) == ["Add login endpoint", "Cache profile lookups"]
+    assert {line["issue"]["title"]: line["seen"] for line in lines}["Add login endpoint"] == 2
+    assert len(first) == 2
+    print("✅ Compaction keeps other processes' lines")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
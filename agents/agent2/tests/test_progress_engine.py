@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the Progress Engine
+Checks milestone completion, remaining time and the roadmap diff
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add the agent2 directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_engine import ProgressEngine, diff_roadmaps, format_weeks, parse_duration
+
+NOW = datetime(2026, 10, 19, 9, 30)
+
+ROADMAP = {
+    "target_role": "Backend Developer",
+    "milestones": [
+        {"title": "APIs", "skills_covered": ["Python", "Flask", "REST APIs"], "estimated_time": "4 weeks"},
+        {"title": "Databases", "skills_covered": ["PostgreSQL", "Redis", "SQL"], "estimated_time": "2-4 weeks"},
+        {"title": "Deploy", "completion_criteria": ["Deploy a service with Docker"], "estimated_time": "1 week"},
+    ]
+}
+
+
+def test_parse_and_format_durations():
+    """Estimates are read in weeks and written back in the largest sensible unit"""
+    assert parse_duration("4-6 weeks") == (4.0, 6.0)
+    assert parse_duration("2 to 3 months") == (8.0, 12.0)
+    assert parse_duration("10 days") == (2.0, 2.0)
+    assert parse_duration("soon") is None
+    assert format_weeks(0, 0) == "0 weeks"
+    assert format_weeks(0.4, 0.6) == "2-3 days"
+    assert format_weeks(1, 1) == "1 week"
+    assert format_weeks(2.2, 3.8) == "2-4 weeks"
+    print("✅ Durations parsed and formatted")
+
+
+def test_skill_coverage_completes_milestone():
+    """Two of three skills practised (under any alias) completes a milestone"""
+    engine = ProgressEngine()
+    projects = [{"name": "Todo API", "skills_used": ["python", "flask"], "score": 85}]
+    update = engine.apply(projects, ROADMAP, now=NOW)
+
+    apis, databases, deploy = update.roadmap["milestones"]
+    assert update.newly_completed == ["APIs"]
+    assert update.at_milestone_boundary
+    assert apis["completed"] is True and apis["completed_at"] == NOW.isoformat()
+    assert "remaining_time" not in apis
+    assert databases["progress"] == 0 and deploy["progress"] == 0
+    assert update.completion_percentage == round(100 / 3, 1)
+    assert update.remaining_time == "3-5 weeks"
+    # The input roadmap is not modified
+    assert "completed" not in ROADMAP["milestones"][0]
+    print("✅ Skill coverage completes milestone")
+
+
+def test_partial_progress_scales_remaining_time():
+    """One of three skills leaves two thirds of the estimate"""
+    update = ProgressEngine().apply([{"skills": ["PostgreSQL"]}], ROADMAP, now=NOW)
+    databases = update.roadmap["milestones"][1]
+    assert databases["progress"] == 33
+    assert not databases.get("completed")
+    assert databases["remaining_time"] == "1-3 weeks"
+    assert update.newly_completed == []
+    print("✅ Partial progress scales remaining time")
+
+
+def test_completion_criteria_and_failed_projects():
+    """Criteria are matched on project words; projects below the passing score do not count"""
+    engine = ProgressEngine()
+    deployed = {"title": "Deploy service", "description": "Dockerized deployment", "skills": ["Docker"]}
+    update = engine.apply([deployed], ROADMAP, now=NOW)
+    assert update.newly_completed == ["Deploy"]
+
+    failed = {"skills_used": ["Python", "Flask", "REST APIs"], "score": 40}
+    update = engine.apply([failed], ROADMAP, now=NOW)
+    assert update.newly_completed == []
+    assert update.practised_skills == []
+    print("✅ Completion criteria and failed projects")
+
+
+def test_diff_and_next_skills():
+    """The diff lists what changed and next_skills skips what was practised"""
+    engine = ProgressEngine()
+    update = engine.apply([{"skills_used": ["Python", "Flask"]}], ROADMAP, now=NOW)
+    paths = {change["path"] for change in update.diff}
+    assert {"completed_projects", "completion_percentage", "remaining_duration",
+            "milestones[0].completed", "milestones[0].progress"} <= paths
+    assert diff_roadmaps(update.roadmap, update.roadmap) == []
+
+    suggestions = engine.next_skills(update, limit=2)
+    assert [s["skill"] for s in suggestions] == ["PostgreSQL", "Redis"]
+    assert suggestions[0]["priority"] == "high" and suggestions[1]["priority"] == "medium"
+    print("✅ Diff and next skills")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the Repository Agent
+Checks which GitHub errors are retried, that an ambiguous failure never creates
+an issue twice, and that unusable LLM output falls back to the mock
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the agent2 directory to path; keep the challenge bank off the real file
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AGENT2_CHALLENGE_BANK", "off")
+
+github = pytest.importorskip("github")
+requests = pytest.importorskip("requests")
+
+import repository_agent
+from execution_policy import ExecutionPolicy
+from repository_agent import CodingIssue, RepositoryCreationAgent, _is_github_rate_limit
+
+
+class FakeRepo:
+    """PyGithub Repository stand-in; ``failures`` are raised by create_issue in order,
+    after the issue was created when ``created_anyway`` is set"""
+
+    full_name = "octo/demo"
+
+    def __init__(self, failures=(), created_anyway=False):
+        self.issues = []
+        self.failures = list(failures)
+        self.created_anyway = created_anyway
+        self.create_calls = 0
+
+    def get_issues(self, state="open", sort=None, direction=None):
+        return list(reversed(self.issues))
+
+    def get_labels(self):
+        return [SimpleNamespace(name="beginner"), SimpleNamespace(name="hackathon-project")]
+
+    def create_label(self, name, color):
+        return SimpleNamespace(name=name)
+
+    def create_issue(self, title, body, labels):
+        self.create_calls += 1
+        if self.failures:
+            error = self.failures.pop(0)
+            if self.created_anyway:
+                self._add(title)
+            raise error
+        return self._add(title)
+
+    def _add(self, title):
+        number = len(self.issues) + 1
+        issue = SimpleNamespace(title=title, number=number, pull_request=None,
+                                html_url=f"https://github.com/octo/demo/issues/{number}")
+        self.issues.append(issue)
+        return issue
+
+
+def _agent(repo, monkeypatch):
+    monkeypatch.setattr(repository_agent.time, "sleep", lambda seconds: None)
+    agent = RepositoryCreationAgent(groq_api_key="", github_token="")
+    agent.github_client = SimpleNamespace(get_repo=lambda name: repo)
+    return agent
+
+
+def _issue(title):
+    return CodingIssue(title, "Implement it", "beginner", "2 hours", ["Python"], ["Works"], [], [])
+
+
+def test_rate_limit_detection():
+    """Only 429s and rate-limit 403s count as rate limits"""
+    assert _is_github_rate_limit(github.GithubException(429, "slow down", None))
+    assert _is_github_rate_limit(github.GithubException(403, {"message": "API rate limit exceeded"}, None))
+    assert _is_github_rate_limit(github.GithubException(403, {}, {"X-RateLimit-Remaining": "0"}))
+    assert not _is_github_rate_limit(github.GithubException(403, {"message": "Bad credentials"}, None))
+    assert not _is_github_rate_limit(github.GithubException(500, "boom", None))
+    print("✅ Rate limit detection")
+
+
+def test_permission_denied_is_not_retried(monkeypatch):
+    """A permission 403 fails the issue at once"""
+    repo = FakeRepo(failures=[github.GithubException(403, {"message": "Resource not accessible"}, None)])
+    results = _agent(repo, monkeypatch).create_github_issues("octo/demo", [_issue("Add login")])
+    assert results[0]["status"] == "failed"
+    assert repo.create_calls == 1
+    print("✅ Permission denied is not retried")
+
+
+def test_ambiguous_failure_does_not_duplicate(monkeypatch):
+    """A 502 or timeout after GitHub created the issue returns that issue instead of creating another"""
+    for error in (github.GithubException(502, "bad gateway", None), requests.Timeout("read timed out")):
+        repo = FakeRepo(failures=[error], created_anyway=True)
+        results = _agent(repo, monkeypatch).create_github_issues("octo/demo", [_issue("Add login")])
+        assert results[0]["status"] == "created" and results[0]["number"] == 1
+        assert repo.create_calls == 1 and len(repo.issues) == 1
+    print("✅ Ambiguous failure does not duplicate")
+
+
+def test_rate_limit_is_retried(monkeypatch):
+    """A rate-limited create is sent again"""
+    repo = FakeRepo(failures=[github.GithubException(403, {"message": "secondary rate limit"}, None)])
+    results = _agent(repo, monkeypatch).create_github_issues("octo/demo", [_issue("Add login")])
+    assert results[0]["status"] == "created"
+    assert repo.create_calls == 2
+    print("✅ Rate limit is retried")
+
+
+def test_one_failing_issue_keeps_the_batch_real(monkeypatch):
+    """An unexpected error fails only its issue; the others are still reported as created"""
+    repo = FakeRepo()
+    agent = _agent(repo, monkeypatch)
+    create = repo.create_issue
+
+    def flaky(title, body, labels):
+        if title == "Broken":
+            raise ValueError("unexpected")
+        return create(title, body, labels)
+
+    repo.create_issue = flaky
+    results = agent.create_github_issues("octo/demo", [_issue("Add login"), _issue("Broken")])
+    assert [result["status"] for result in results] == ["created", "failed"]
+    assert results[0]["url"] == "https://github.com/octo/demo/issues/1"
+    print("✅ One failing issue keeps the batch real")
+
+
+def test_unparseable_validation_uses_fallback():
+    """Agent-loop output that is not JSON yields the mock dict, recorded as the fallback path"""
+    agent = RepositoryCreationAgent(groq_api_key="", github_token="",
+                                    policy=ExecutionPolicy("agent"))
+    agent.executor.agent_executor = SimpleNamespace(invoke=lambda inputs, config=None: {"output": "Looks fine!"})
+    result = agent.validate_project_requirements([{"name": "Python", "level": 3}], "web_app")
+    assert isinstance(result, dict) and "compatibility" in result
+    assert agent.executor.ledger.records()[-1].path == "fallback"
+    print("✅ Unparseable validation uses fallback")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,5 @@
+"""
+Shared helpers for agent-1 and agent2 - IISER StatusCode 02
+Both agents put the agents/ directory on sys.path (agent-1 in main.py,
+agent2 in shared_path.py) and import from here.
+"""
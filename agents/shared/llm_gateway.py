@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+LLM Gateway - IISER StatusCode 02
+Admission control in front of every provider call made by the LLM router:
+
+- a concurrency limit and tokens-per-minute / requests-per-minute buckets per
+  provider, so traffic spikes queue instead of triggering 429 storms
+- single-flight coalescing, so identical prompts already in flight share one
+  upstream call
+- deadlines: a queued call waits until its deadline, then gives up with
+  GatewayTimeout (the router then tries the next provider)
+
+Configuration (environment):
+    LLM_LIMITS          per provider "name=concurrency:tokens_per_minute[:requests_per_minute]",
+                        comma-separated, e.g. "groq=4:30000:30,gemini=8:1000000"
+    LLM_QUEUE_TIMEOUT   seconds a call may wait for admission (default 30)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Limits used when LLM_LIMITS does not mention a provider
+DEFAULT_LIMITS = {
+    "groq": "4:30000:30",
+    "gemini": "8:1000000:1000",
+}
+DEFAULT_CONCURRENCY = 8
+DEFAULT_QUEUE_TIMEOUT = 30.0
+# How long a provider is paused after it answers with a rate-limit error
+RATE_LIMIT_BACKOFF_SECONDS = 10.0
+
+_RATE_LIMITED = re.compile(r"\b429\b|rate.?limit|quota|resource.?exhausted|too many requests", re.I)
+
+
+class GatewayTimeout(Exception):
+    """A call could not be admitted before its deadline"""
+
+
+class TokenBucket:
+    """Refills continuously at ``per_minute``/60 units per second, up to ``per_minute``"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float, deadline: float) -> bool:
+        """Take ``amount`` units (at most ``capacity``), waiting until ``deadline`` (monotonic).
+
+        False if the bucket cannot refill in time.
+        """
+        amount = min(amount, self.capacity)
+        with self._condition:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return True
+                wait = (amount - self._level) / self.rate
+                remaining = deadline - time.monotonic()
+                if wait > remaining:  # cannot refill in time; fail now rather than at the deadline
+                    return False
+                self._condition.wait(wait)
+
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) units once the real usage is known"""
+        with self._condition:
+            self._refill()
+            self._level = min(self.capacity, self._level - delta)
+            if delta < 0:
+                self._condition.notify_all()
+
+    @property
+    def level(self) -> float:
+        with self._condition:
+            self._refill()
+            return self._level
+
+
+@dataclass
+class ProviderLimits:
+    concurrency: int = DEFAULT_CONCURRENCY
+    tokens_per_minute: Optional[float] = None
+    requests_per_minute: Optional[float] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "ProviderLimits":
+        """``"4:30000:30"`` -> concurrency 4, 30k tokens/min, 30 requests/min (empty parts = unlimited)"""
+        parts = [part.strip() for part in spec.split(":")] + ["", ""]
+        return cls(
+            concurrency=int(parts[0]) if parts[0] else DEFAULT_CONCURRENCY,
+            tokens_per_minute=float(parts[1]) if parts[1] else None,
+            requests_per_minute=float(parts[2]) if parts[2] else None
+        )
+
+
+class _ProviderGate:
+    """Runtime state for one provider's limits"""
+
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.slots = threading.BoundedSemaphore(limits.concurrency)
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.paused_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+
+
+class LLMGateway:
+    """Per-provider admission control plus single-flight coalescing"""
+
+    def __init__(self, limits: Optional[Dict[str, ProviderLimits]] = None,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        self.limits = dict(limits or {})
+        self.queue_timeout = queue_timeout
+        self._gates: Dict[str, _ProviderGate] = {}
+        self._flights: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        specs = dict(DEFAULT_LIMITS)
+        for item in os.getenv("LLM_LIMITS", "").split(","):
+            name, _, spec = item.partition("=")
+            if name.strip() and spec.strip():
+                specs[name.strip()] = spec.strip()
+        limits = {}
+        for name, spec in specs.items():
+            try:
+                limits[name] = ProviderLimits.parse(spec)
+            except ValueError:
+                print(f"⚠️ Invalid LLM_LIMITS entry '{name}={spec}', using defaults")
+        return cls(limits, float(os.getenv("LLM_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)))
+
+    def deadline(self, timeout: Optional[float] = None) -> float:
+        """Monotonic deadline ``timeout`` (default LLM_QUEUE_TIMEOUT) seconds from now"""
+        return time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+
+    def _gate(self, provider: str) -> _ProviderGate:
+        with self._lock:
+            if provider not in self._gates:
+                self._gates[provider] = _ProviderGate(self.limits.get(provider, ProviderLimits()))
+            return self._gates[provider]
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def admit(self, provider: str, estimated_tokens: int, deadline: float) -> Iterator[Callable[[int], None]]:
+        """Hold a slot and reserve tokens for one call to ``provider``.
+
+        Yields ``settle(actual_tokens)`` to correct the token reservation once
+        usage is known. Raises GatewayTimeout if admission misses ``deadline``.
+        """
+        gate = self._gate(provider)
+        if gate.tokens:  # an oversized call still runs once the bucket is full
+            estimated_tokens = min(estimated_tokens, gate.tokens.capacity)
+        with self._lock:
+            gate.waiting += 1
+        try:
+            pause = gate.paused_until - time.monotonic()
+            if pause > 0:
+                if time.monotonic() + pause > deadline:
+                    raise GatewayTimeout(f"{provider} is backing off after a rate limit")
+                time.sleep(pause)
+            if gate.requests and not gate.requests.acquire(1, deadline):
+                raise GatewayTimeout(f"{provider} request rate limit")
+            if gate.tokens and not gate.tokens.acquire(estimated_tokens, deadline):
+                if gate.requests:
+                    gate.requests.adjust(-1)
+                raise GatewayTimeout(f"{provider} token rate limit")
+            if not gate.slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                if gate.requests:
+                    gate.requests.adjust(-1)
+                if gate.tokens:
+                    gate.tokens.adjust(-estimated_tokens)
+                raise GatewayTimeout(f"{provider} concurrency limit")
+        except GatewayTimeout:
+            with self._lock:
+                gate.waiting -= 1
+                gate.timeouts += 1
+            raise
+
+        with self._lock:
+            gate.waiting -= 1
+            gate.in_flight += 1
+
+        def settle(actual_tokens: int):
+            if gate.tokens and actual_tokens:
+                gate.tokens.adjust(actual_tokens - estimated_tokens)
+
+        try:
+            yield settle
+        except Exception as e:
+            if _RATE_LIMITED.search(str(e)):
+                gate.paused_until = time.monotonic() + RATE_LIMIT_BACKOFF_SECONDS
+                with self._lock:
+                    gate.rate_limited += 1
+            raise
+        finally:
+            gate.slots.release()
+            with self._lock:
+                gate.in_flight -= 1
+
+    # ------------------------------------------------------------------
+    # Single flight
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def flight_key(*parts: Any) -> str:
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+    def single_flight(self, key: str, call: Callable[[], Any]) -> Any:
+        """Run ``call`` once per ``key`` at a time; concurrent callers with the same key get its result"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            result = call()
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            gates = dict(self._gates)
+            status = {"coalesced": self.coalesced, "in_flight_prompts": len(self._flights), "providers": {}}
+        for name, gate in gates.items():
+            status["providers"][name] = {
+                "concurrency": gate.limits.concurrency,
+                "in_flight": gate.in_flight,
+                "waiting": gate.waiting,
+                "tokens_available": round(gate.tokens.level) if gate.tokens else None,
+                "timeouts": gate.timeouts,
+                "rate_limited": gate.rate_limited,
+                "paused": gate.paused_until > time.monotonic()
+            }
+        return status
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide gateway shared by every router, so limits hold across both agents"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway.from_env()
+        return _gateway
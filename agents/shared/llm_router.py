@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+LLM Router - IISER StatusCode 02
+One completion interface over several LLM providers (Gemini, Groq and a local
+stub server for tests). The router keeps rolling latency percentiles and
+error rates per provider, sends each call to the fastest healthy provider,
+fails over to the next one on errors, and can hedge a slow call by firing the
+same prompt at a second provider after a latency threshold.
+
+Configuration (environment):
+    LLM_PROVIDERS       preferred order, e.g. "groq,gemini" (default: all configured)
+    LLM_HEDGE_AFTER_MS  hedge threshold in ms, "auto" (primary's p95) or 0/unset for off
+    LLM_STUB_URLS       comma-separated stub server URLs (see stub_llm_server.py)
+    GROQ_API_KEY, GEMINI_API_KEY
+Rate limits and queueing are configured on the gateway (llm_gateway.py).
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .llm_gateway import GatewayTimeout, LLMGateway, get_gateway
+from .prompt_compaction import DEFAULT_CONTEXT, DEFAULT_OUTPUT_RESERVE, MODEL_CONTEXT, estimate_tokens
+
+GROQ_MODEL = "llama3-8b-8192"
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# Rolling window of calls kept per provider
+STATS_WINDOW = 50
+# Providers above this error rate (over the window) are skipped unless nothing else is left
+MAX_ERROR_RATE = 0.5
+# Consecutive failures that take a provider out of rotation, and for how long
+FAILURES_TO_TRIP = 3
+COOLDOWN_SECONDS = 30.0
+# Samples needed before a provider is ranked by its latency (until then it is probed first)
+MIN_SAMPLES = 5
+# Every Nth call goes to the provider that has gone longest without one, so a
+# provider ranked down after a few slow outliers gets re-measured
+PROBE_EVERY = 20
+# Samples needed before "auto" hedging trusts a provider's p95
+MIN_SAMPLES_FOR_AUTO_HEDGE = 10
+# Completion tokens reserved per call before the real usage is known
+EXPECTED_OUTPUT_TOKENS = 512
+
+
+class LLMRouterError(Exception):
+    """No provider produced a completion"""
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    provider: str
+    model: str
+    latency_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    hedged: bool = False
+
+
+# ----------------------------------------------------------------------
+# Providers
+# ----------------------------------------------------------------------
+
+class Provider:
+    """A single LLM backend; subclasses implement ``_complete``"""
+
+    name = "provider"
+
+    def __init__(self, model: str):
+        self.model = model
+        self.context_window = MODEL_CONTEXT.get(model, DEFAULT_CONTEXT)
+
+    def fits(self, prompt_tokens: int, reserve_output: int = DEFAULT_OUTPUT_RESERVE) -> bool:
+        """Whether a prompt of ``prompt_tokens`` leaves room for the reply in this model's window"""
+        return prompt_tokens + reserve_output <= self.context_window
+
+    def complete(self, prompt: str, temperature: float = 0.7, json_mode: bool = False) -> Tuple[str, int, int]:
+        """(text, prompt_tokens, completion_tokens)"""
+        return self._complete(prompt, temperature, json_mode)
+
+    def _complete(self, prompt: str, temperature: float, json_mode: bool) -> Tuple[str, int, int]:
+        raise NotImplementedError
+
+
+class GroqProvider(Provider):
+    name = "groq"
+
+    def __init__(self, api_key: str, model: str = GROQ_MODEL):
+        super().__init__(model)
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from groq import Groq
+                self._client = Groq(api_key=self.api_key)
+            return self._client
+
+    def _complete(self, prompt, temperature, json_mode):
+        kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            **kwargs
+        )
+        usage = response.usage
+        return (response.choices[0].message.content,
+                getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
+
+
+class GeminiProvider(Provider):
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = GEMINI_MODEL):
+        super().__init__(model)
+        self.api_key = api_key
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                self._model = genai.GenerativeModel(self.model)
+            return self._model
+
+    def _complete(self, prompt, temperature, json_mode):
+        config = {"temperature": temperature}
+        if json_mode:
+            config["response_mime_type"] = "application/json"
+        response = self._get_model().generate_content(prompt, generation_config=config)
+        usage = getattr(response, "usage_metadata", None)
+        return (response.text,
+                getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0)
+
+
+class StubProvider(Provider):
+    """Talks to stub_llm_server.py over HTTP; used for tests and failover drills"""
+
+    def __init__(self, url: str, name: str = "stub", timeout: float = 30.0):
+        super().__init__("stub")
+        self.context_window = MODEL_CONTEXT[GEMINI_MODEL]  # the stub accepts any prompt size
+        self.url = url.rstrip("/")
+        self.name = name
+        self.timeout = timeout
+
+    def _complete(self, prompt, temperature, json_mode):
+        body = json.dumps({"prompt": prompt, "temperature": temperature, "json_mode": json_mode}).encode()
+        request = urllib.request.Request(f"{self.url}/v1/complete", data=body,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = json.loads(response.read())
+        return data["text"], data.get("prompt_tokens", 0), data.get("completion_tokens", 0)
+
+
+# ----------------------------------------------------------------------
+# Health tracking
+# ----------------------------------------------------------------------
+
+class ProviderStats:
+    """Rolling latency and error rate for one provider, plus a simple circuit breaker"""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self._calls: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._cooldown_until = 0.0
+        self.last_used = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, ok: bool):
+        with self._lock:
+            self._calls.append((latency_ms, ok))
+            self.last_used = time.monotonic()
+            if ok:
+                self._consecutive_failures = 0
+            else:
+                self._consecutive_failures += 1
+                if self._consecutive_failures >= FAILURES_TO_TRIP:
+                    # Out of rotation for a while, then measured afresh
+                    self._cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+                    self._consecutive_failures = 0
+                    self._calls.clear()
+
+    def _latencies(self) -> List[float]:
+        return sorted(latency for latency, ok in self._calls if ok)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            latencies = self._latencies()
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    @property
+    def samples(self) -> int:
+        return len(self._calls)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(1 for _, ok in self._calls if not ok) / len(self._calls) if self._calls else 0.0
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self._cooldown_until
+
+    @property
+    def healthy(self) -> bool:
+        return not self.cooling_down and (self.samples < MIN_SAMPLES or self.error_rate <= MAX_ERROR_RATE)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "samples": self.samples,
+            "p50_ms": round(p50, 1) if p50 is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "healthy": self.healthy
+        }
+
+
+# ----------------------------------------------------------------------
+# Router
+# ----------------------------------------------------------------------
+
+class LLMRouter:
+    """Routes completions to the fastest healthy provider.
+
+    Providers with fewer than MIN_SAMPLES calls rank first so they get
+    measured, and every PROBE_EVERY-th call re-measures the provider that has
+    gone longest without traffic. With
+    ``hedge_after_ms`` set (a number, or "auto" for the primary's p95), a
+    call still running after the threshold is duplicated to the next
+    provider and whichever answers first wins; the slower result still
+    counts towards its provider's statistics.
+
+    Every provider call passes through ``gateway`` (rate limits, queueing
+    with a deadline), and identical concurrent prompts share one call.
+    """
+
+    def __init__(self, providers: List[Provider], hedge_after_ms: Any = None, max_workers: int = 8,
+                 gateway: Optional[LLMGateway] = None):
+        self.providers = list(providers)
+        self.hedge_after_ms = hedge_after_ms
+        self.gateway = gateway or get_gateway()
+        self.stats: Dict[str, ProviderStats] = {provider.name: ProviderStats() for provider in self.providers}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-router")
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, preferred: Optional[List[str]] = None) -> "LLMRouter":
+        """Router over every provider with credentials, in LLM_PROVIDERS (or ``preferred``) order"""
+        available: Dict[str, Provider] = {}
+        if os.getenv("GROQ_API_KEY") and find_spec("groq") is not None:
+            available["groq"] = GroqProvider(os.getenv("GROQ_API_KEY"))
+        gemini_key = os.getenv("GEMINI_API_KEY")
+        if gemini_key and find_spec("google.generativeai") is not None:
+            available["gemini"] = GeminiProvider(gemini_key)
+        for index, url in enumerate(url for url in os.getenv("LLM_STUB_URLS", "").split(",") if url.strip()):
+            name = f"stub-{index + 1}"
+            available[name] = StubProvider(url.strip(), name=name)
+
+        order = [name.strip() for name in os.getenv("LLM_PROVIDERS", "").split(",") if name.strip()] or preferred or []
+        providers = [available.pop(name) for name in order if name in available] + list(available.values())
+
+        hedge = os.getenv("LLM_HEDGE_AFTER_MS", "").strip().lower()
+        if hedge not in ("", "auto"):
+            try:
+                hedge = float(hedge) or None
+            except ValueError:
+                print(f"⚠️ Invalid LLM_HEDGE_AFTER_MS '{hedge}', hedging disabled")
+                hedge = None
+        return cls(providers, hedge_after_ms=hedge or None)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.providers)
+
+    @property
+    def max_context_window(self) -> int:
+        """Largest context window among the providers; bigger prompts cannot be routed anywhere"""
+        return max((provider.context_window for provider in self.providers), default=DEFAULT_CONTEXT)
+
+    def add_provider(self, provider: Provider):
+        """Register ``provider`` unless one with the same name exists (e.g. a key passed in code)"""
+        if provider.name not in self.stats:
+            self.stats[provider.name] = ProviderStats()
+            self.providers.append(provider)
+
+    def ranked(self) -> List[Provider]:
+        """Healthy providers fastest first (by p50), then unhealthy ones as a last resort"""
+        def speed(provider: Provider) -> float:
+            stats = self.stats[provider.name]
+            p50 = stats.percentile(0.5)
+            return -1.0 if p50 is None or stats.samples < MIN_SAMPLES else p50
+
+        healthy = sorted((provider for provider in self.providers if self.stats[provider.name].healthy), key=speed)
+        unhealthy = [provider for provider in self.providers if not self.stats[provider.name].healthy]
+        with self._calls_lock:
+            self._calls += 1
+            probe = self._calls % PROBE_EVERY == 0
+        probeable = [provider for provider in self.providers if not self.stats[provider.name].cooling_down]
+        if probe and len(probeable) > 1:
+            stalest = min(probeable, key=lambda provider: self.stats[provider.name].last_used)
+            return [stalest] + [provider for provider in healthy + unhealthy if provider is not stalest]
+        return healthy + unhealthy
+
+    def complete(self, prompt: str, temperature: float = 0.7, json_mode: bool = False,
+                 timeout: Optional[float] = None) -> LLMResponse:
+        """Completion from the best provider, failing over down the ranking.
+
+        ``timeout`` bounds how long the call may queue for admission (default
+        LLM_QUEUE_TIMEOUT); an identical prompt already in flight is joined
+        instead of sent again.
+        """
+        deadline = self.gateway.deadline(timeout)
+        key = LLMGateway.flight_key(temperature, json_mode, prompt)
+        return self.gateway.single_flight(key, lambda: self._route(prompt, temperature, json_mode, deadline))
+
+    def _route(self, prompt: str, temperature: float, json_mode: bool, deadline: float) -> LLMResponse:
+        candidates = self.ranked()
+        if not candidates:
+            raise LLMRouterError("No LLM provider configured")
+        # Never fail over to a model whose context window the prompt would overflow
+        prompt_tokens = estimate_tokens(prompt)
+        candidates = [provider for provider in candidates if provider.fits(prompt_tokens)]
+        if not candidates:
+            raise LLMRouterError(f"Prompt of ~{prompt_tokens:,} tokens exceeds every provider's context window")
+
+        errors = []
+        while candidates:
+            primary = candidates.pop(0)
+            hedge_delay = self._hedge_delay(primary)
+            if hedge_delay is None or not candidates:
+                try:
+                    return self._call(primary, prompt, temperature, json_mode, deadline)
+                except LLMRouterError as e:
+                    errors.append(str(e))
+                    continue
+
+            backup = candidates.pop(0)
+            try:
+                return self._hedged(primary, backup, hedge_delay, prompt, temperature, json_mode, deadline)
+            except LLMRouterError as e:
+                errors.append(str(e))
+        raise LLMRouterError("All LLM providers failed: " + "; ".join(errors))
+
+    def _hedge_delay(self, provider: Provider) -> Optional[float]:
+        if self.hedge_after_ms == "auto":
+            stats = self.stats[provider.name]
+            if stats.samples < MIN_SAMPLES_FOR_AUTO_HEDGE:
+                return None
+            return stats.percentile(0.95) / 1000
+        return self.hedge_after_ms / 1000 if self.hedge_after_ms else None
+
+    def _hedged(self, primary: Provider, backup: Provider, delay: float,
+                prompt: str, temperature: float, json_mode: bool, deadline: float) -> LLMResponse:
+        """Start ``primary``; if it has not answered after ``delay`` seconds, race ``backup`` against it"""
+        pending = {self._pool.submit(self._call, primary, prompt, temperature, json_mode, deadline)}
+        done, pending = wait(pending, timeout=delay)
+        hedged = False
+        if not done:
+            hedged = True
+            pending.add(self._pool.submit(self._call, backup, prompt, temperature, json_mode, deadline))
+
+        errors = []
+        while done or pending:
+            for future in done:
+                try:
+                    response = future.result()
+                    response.hedged = hedged
+                    return response
+                except Exception as e:
+                    errors.append(str(e))
+            if not hedged:  # primary failed fast: fall over to the backup
+                hedged = True
+                pending.add(self._pool.submit(self._call, backup, prompt, temperature, json_mode, deadline))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED) if pending else (set(), set())
+        raise LLMRouterError(f"{primary.name} and {backup.name} failed: " + "; ".join(errors))
+
+    def _call(self, provider: Provider, prompt: str, temperature: float, json_mode: bool,
+              deadline: float) -> LLMResponse:
+        try:
+            with self.gateway.admit(provider.name, estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS,
+                                    deadline) as settle:
+                # Latency is measured from admission, so queueing does not count against the provider
+                started = time.perf_counter()
+                try:
+                    text, prompt_tokens, completion_tokens = provider.complete(prompt, temperature, json_mode)
+                except Exception as e:
+                    self.stats[provider.name].record((time.perf_counter() - started) * 1000, ok=False)
+                    raise LLMRouterError(f"{provider.name}: {e}") from e
+                latency_ms = (time.perf_counter() - started) * 1000
+                self.stats[provider.name].record(latency_ms, ok=True)
+                settle(prompt_tokens + completion_tokens)
+        except GatewayTimeout as e:
+            raise LLMRouterError(f"{provider.name}: not admitted before deadline ({e})") from e
+        return LLMResponse(text=text, provider=provider.name, model=provider.model, latency_ms=latency_ms,
+                           prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "providers": {provider.name: dict(self.stats[provider.name].snapshot(), model=provider.model)
+                          for provider in self.providers},
+            "gateway": self.gateway.status()
+        }
+
+
+_routers: Dict[Tuple[str, ...], LLMRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(preferred: Tuple[str, ...] = ()) -> LLMRouter:
+    """Process-wide router built from the environment on first use.
+
+    ``preferred`` orders providers that have no latency samples yet (agent-1
+    prefers Gemini, agent2 Groq); LLM_PROVIDERS overrides it.
+    """
+    key = tuple(preferred)
+    with _routers_lock:
+        if key not in _routers:
+            _routers[key] = LLMRouter.from_env(list(preferred))
+        return _routers[key]
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Prompt Compaction - IISER StatusCode 02
+Serializes skill lists, roadmaps and CVs into short, token-efficient forms
+before they are embedded in LLM prompts, and keeps each prompt inside the
+target model's context budget using a fast local token estimate.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .skill_normalizer import fold, skill_normalizer
+
+# Context window per model, in tokens
+MODEL_CONTEXT = {
+    "llama3-8b-8192": 8192,
+    "llama3-70b-8192": 8192,
+    "gemini-2.5-flash": 1_048_576,
+}
+DEFAULT_CONTEXT = 8192
+# Tokens kept free for the model's reply
+DEFAULT_OUTPUT_RESERVE = 2048
+
+TRUNCATION_MARKER = "[...truncated]"
+
+# Words, digit runs and single punctuation marks, roughly how BPE vocabularies split text
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count without loading a tokenizer.
+
+    Short words are one token, long words are split every ~7 letters,
+    numbers every 3 digits and each punctuation mark is its own token.
+    Tends to overestimate slightly, which is the safe side for budgets.
+    """
+    if not text:
+        return 0
+    total = 0
+    for piece in _PIECES.findall(text):
+        if piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // 7
+        elif piece[0].isdigit():
+            total += (len(piece) + 2) // 3
+        else:
+            total += 1
+    return total
+
+
+def context_budget(model: str, instructions: str = "", reserve_output: int = DEFAULT_OUTPUT_RESERVE) -> int:
+    """Tokens left for data in a prompt to ``model`` after the instructions and the reply"""
+    return max(0, MODEL_CONTEXT.get(model, DEFAULT_CONTEXT) - reserve_output - estimate_tokens(instructions))
+
+
+def _cut_words(line: str, max_tokens: int) -> str:
+    """Longest prefix of ``line``, in whole words, that fits in ``max_tokens``"""
+    kept, used = [], 0
+    for word in line.split():
+        cost = estimate_tokens(word)
+        if used + cost > max_tokens:
+            break
+        kept.append(word)
+        used += cost
+    return " ".join(kept)
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """Cut ``text`` so it fits in ``max_tokens``.
+
+    Whole lines are kept while they fit; the line that crosses the budget is
+    cut at a word boundary, so one long line (e.g. a CV extracted from a PDF
+    without line breaks) still keeps its beginning.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept, used = [], estimate_tokens(TRUNCATION_MARKER)
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            partial = _cut_words(line, max_tokens - used - 1)
+            if partial:
+                kept.append(partial)
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + [TRUNCATION_MARKER])
+
+
+# ----------------------------------------------------------------------
+# Structured payloads
+# ----------------------------------------------------------------------
+
+def _prune(value: Any) -> Any:
+    """Drop None, empty strings and empty containers, recursively"""
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        pruned = [_prune(item) for item in value]
+        return [item for item in pruned if item not in (None, "", [], {})]
+    return value
+
+
+def compact_json(data: Any) -> str:
+    """Minified JSON without empty fields (``indent=2`` roughly doubles the token count)"""
+    return json.dumps(_prune(data), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def compact_skills(skills: Iterable[Any], limit: Optional[int] = None) -> str:
+    """``programming: Python 3, Go 1; tools: Git 2`` from skill dicts or names.
+
+    Names are canonicalised with the skill normalizer, so "Nodejs" and "Node.js"
+    become one entry (keeping the highest level), and sorted strongest first
+    within each category; ``limit`` keeps the top N.
+    """
+    best: Dict[str, Tuple[str, int, str]] = {}
+    for skill in skills or []:
+        if isinstance(skill, dict):
+            name = str(skill.get("name") or skill.get("skill") or "").strip()
+            level = skill.get("level") or skill.get("current_level") or 0
+            category = str(skill.get("category") or skill_normalizer.category(name)).strip()
+        else:
+            name, level = str(skill).strip(), 0
+            category = skill_normalizer.category(name)
+        if not name:
+            continue
+        try:
+            level = int(level)
+        except (TypeError, ValueError):
+            level = 0
+        name = skill_normalizer.canonical(name)
+        key = fold(name)
+        if key not in best:
+            best[key] = (name, level, category)
+        elif level > best[key][1]:
+            best[key] = (best[key][0], level, best[key][2])
+
+    ranked = sorted(best.values(), key=lambda entry: -entry[1])[:limit]
+    groups: Dict[str, List[str]] = {}
+    for name, level, category in ranked:
+        groups.setdefault(category, []).append(f"{name} {level}" if level else name)
+    return "; ".join(f"{category}: {', '.join(names)}" for category, names in groups.items())
+
+
+def compact_roadmap(roadmap: Dict[str, Any]) -> str:
+    """The parts of a roadmap an LLM needs to reason about progress, minified"""
+    milestones = [{
+        "title": milestone.get("title"),
+        "skills": milestone.get("skills_covered"),
+        "difficulty": milestone.get("difficulty"),
+        "time": milestone.get("estimated_time"),
+        "done": milestone.get("completed") or None
+    } for milestone in roadmap.get("milestones", []) if isinstance(milestone, dict)]
+    return compact_json({
+        "role": roadmap.get("target_role"),
+        "level": roadmap.get("current_level"),
+        "duration": roadmap.get("total_duration"),
+        "milestones": milestones
+    })
+
+
+def compact_projects(projects: Iterable[Dict[str, Any]]) -> str:
+    """Completed projects reduced to name, skills and completion date, minified"""
+    return compact_json([{
+        "name": project.get("name") or project.get("title"),
+        "skills": project.get("skills") or project.get("tech_stack") or project.get("skills_practiced"),
+        "completed": project.get("completed_at") or project.get("completion_date")
+    } for project in projects or [] if isinstance(project, dict)])
+
+
+# ----------------------------------------------------------------------
+# CV text
+# ----------------------------------------------------------------------
+
+# Relevance of each CV section to skill and career-goal extraction
+SECTION_WEIGHTS = {
+    "skills": 1.0,
+    "experience": 0.9,
+    "projects": 0.9,
+    "summary": 0.8,
+    "certifications": 0.6,
+    "education": 0.5,
+    "achievements": 0.4,
+    "publications": 0.3,
+    "languages": 0.3,
+    "other": 0.5,
+    "interests": 0.1,
+    "references": 0.0,
+}
+
+SECTION_HEADINGS = {
+    "skills": ("skills", "technical skills", "core competencies", "technologies", "tech stack", "tools"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "internships",
+                   "work history"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "summary": ("summary", "profile", "objective", "career objective", "about me", "professional summary"),
+    "certifications": ("certifications", "certificates", "courses", "training"),
+    "education": ("education", "academic background", "qualifications"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments", "extracurricular"),
+    "publications": ("publications", "research"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies"),
+    "references": ("references", "referees", "declaration"),
+}
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+
+def _heading(line: str) -> Optional[str]:
+    """Section name if ``line`` is a CV heading such as "WORK EXPERIENCE" or "Skills:" """
+    text = re.sub(r"[^a-z ]", "", line.lower()).strip()
+    if len(text) > 30:
+        return None
+    return _HEADING_LOOKUP.get(text)
+
+
+def split_cv_sections(cv_text: str) -> List[Tuple[str, List[str]]]:
+    """(section, lines) in document order, with blank, page-number and repeated lines removed"""
+    sections: List[Tuple[str, List[str]]] = [("summary", [])]
+    seen = set()
+    for raw in cv_text.splitlines():
+        line = " ".join(raw.split())
+        if not line or re.fullmatch(r"(page\s*)?\d+(\s*(of|/)\s*\d+)?", line.lower()):
+            continue
+        section = _heading(line)
+        if section:
+            sections.append((section, [line]))
+            continue
+        key = line.lower()
+        if key in seen:  # headers/footers repeated on every page, duplicated bullet points
+            continue
+        seen.add(key)
+        sections[-1][1].append(line)
+    return [(name, lines) for name, lines in sections if lines]
+
+
+def compact_cv(cv_text: str, max_tokens: int) -> str:
+    """CV text cleaned and, if needed, cut to ``max_tokens`` by section relevance.
+
+    Whole sections are kept in order of SECTION_WEIGHTS until the budget runs
+    out; the section that crosses it is truncated line by line, and its last
+    line word by word. The output keeps the document's original section order.
+    """
+    sections = split_cv_sections(cv_text)
+    costs = [sum(estimate_tokens(line) + 1 for line in lines) for _, lines in sections]
+    if sum(costs) <= max_tokens:
+        return "\n".join(line for _, lines in sections for line in lines)
+
+    kept: Dict[int, List[str]] = {}
+    remaining = max_tokens
+    by_relevance = sorted(range(len(sections)), key=lambda i: -SECTION_WEIGHTS.get(sections[i][0], 0.5))
+    for index in by_relevance:
+        name, lines = sections[index]
+        if remaining <= 0 or SECTION_WEIGHTS.get(name, 0.5) <= 0:
+            break
+        if costs[index] <= remaining:
+            kept[index] = lines
+            remaining -= costs[index]
+            continue
+        partial = fit_to_budget("\n".join(lines), remaining).splitlines()
+        heading = 1 if _heading(lines[0]) else 0
+        if len(partial) > heading + 1:  # more than the heading and the marker
+            kept[index] = partial
+        remaining = 0
+    return "\n".join(line for index in sorted(kept) for line in kept[index])
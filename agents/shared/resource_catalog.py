@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Resource Catalog - IISER StatusCode 02
+Local catalog of learning resources (data/learning_resources.json) behind an
+inverted index by skill, level and format, so roadmaps get resources from a
+dict lookup instead of an LLM call.
+
+Each posting list is ranked once at load time by quality (0-5 rating) and
+popularity (approximate learners, log-scaled); a query is a dict lookup and
+a short scan. Skill names go through the shared skill normalizer, so "ReactJS",
+"react" and "React" hit the same list.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .skill_normalizer import skill_normalizer
+
+CATALOG_PATH = Path(__file__).resolve().parent / "data" / "learning_resources.json"
+LEVELS = ("beginner", "intermediate", "advanced")
+FORMATS = ("course", "docs", "book", "tutorial", "practice", "video")
+# Share of the ranking score from quality; the rest comes from popularity
+QUALITY_WEIGHT = 0.7
+_ANY = "*"
+
+
+@dataclass(frozen=True)
+class LearningResource:
+    title: str
+    url: str
+    skills: Tuple[str, ...]
+    levels: Tuple[str, ...]
+    format: str
+    free: bool = True
+    quality: float = 0.0
+    popularity: int = 0
+    score: float = 0.0
+
+    def label(self) -> str:
+        """``"Title (url)"`` as stored in roadmap ``resources`` lists"""
+        return f"{self.title} ({self.url})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"title": self.title, "url": self.url, "format": self.format, "free": self.free,
+                "levels": list(self.levels), "quality": self.quality}
+
+
+def level_name(level: Union[int, str, None]) -> Optional[str]:
+    """Map a 1-5 skill level or a level/difficulty word to beginner/intermediate/advanced"""
+    if level is None or level == "":
+        return None
+    if isinstance(level, (int, float)):
+        return "beginner" if level <= 2 else "intermediate" if level <= 3 else "advanced"
+    text = str(level).strip().lower()
+    if text.isdigit():
+        return level_name(int(text))
+    if text in ("entry", "basic", "novice", "junior", "foundation", "foundations"):
+        return "beginner"
+    if text in ("mid", "medium"):
+        return "intermediate"
+    if text in ("expert", "senior"):
+        return "advanced"
+    return text if text in LEVELS else None
+
+
+class ResourceCatalog:
+    """Inverted index (skill key, level, format) -> resources ranked best first"""
+
+    def __init__(self, resources: Iterable[Dict[str, Any]]):
+        entries = [entry for entry in resources if entry.get("title") and entry.get("url")]
+        max_popularity = max((int(entry.get("popularity") or 0) for entry in entries), default=0)
+
+        self.resources: List[LearningResource] = []
+        for entry in entries:
+            quality = float(entry.get("quality") or 0)
+            popularity = int(entry.get("popularity") or 0)
+            popularity_share = math.log1p(popularity) / math.log1p(max_popularity) if max_popularity else 0.0
+            self.resources.append(LearningResource(
+                title=entry["title"],
+                url=entry["url"],
+                skills=tuple(skill_normalizer.canonical(skill) for skill in entry.get("skills") or []),
+                levels=tuple(level for level in entry.get("levels") or LEVELS if level in LEVELS),
+                format=str(entry.get("format") or "docs"),
+                free=bool(entry.get("free", True)),
+                quality=quality,
+                popularity=popularity,
+                score=round(QUALITY_WEIGHT * quality / 5 + (1 - QUALITY_WEIGHT) * popularity_share, 4)
+            ))
+
+        index: Dict[Tuple[str, str, str], List[LearningResource]] = {}
+        for resource in self.resources:
+            for skill in resource.skills:
+                key = skill_normalizer.key(skill)
+                for level in resource.levels + (_ANY,):
+                    for fmt in (resource.format, _ANY):
+                        index.setdefault((key, level, fmt), []).append(resource)
+        for postings in index.values():
+            postings.sort(key=lambda resource: -resource.score)
+        self._index = index
+
+    @classmethod
+    def load(cls, path: Path = CATALOG_PATH) -> "ResourceCatalog":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                resources = json.load(f).get("resources", [])
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load resource catalog {path}: {e}")
+            resources = []
+        return cls(resources)
+
+    def top(self, skill: str, level: Union[int, str, None] = None, formats: Optional[Iterable[str]] = None,
+            limit: int = 3, free_only: bool = False) -> List[LearningResource]:
+        """Best resources for ``skill`` at ``level`` (1-5 or a level word), optionally in given formats.
+
+        Resources tagged with the requested level come first; the rest of
+        ``limit`` is filled from other levels.
+        """
+        key = skill_normalizer.key(skill)
+        level = level_name(level) or _ANY
+        wanted = list(formats) if formats else [_ANY]
+        found: List[LearningResource] = []
+        for lookup_level in ((level, _ANY) if level != _ANY else (_ANY,)):
+            if len(wanted) == 1:
+                postings = self._index.get((key, lookup_level, wanted[0]), [])
+            else:
+                postings = sorted({resource for fmt in wanted for resource in self._index.get((key, lookup_level, fmt), [])},
+                                  key=lambda resource: -resource.score)
+            for resource in postings:
+                if len(found) >= limit:
+                    return found
+                if (resource.free or not free_only) and resource not in found:
+                    found.append(resource)
+        return found
+
+    def labels(self, skill: str, level: Union[int, str, None] = None, limit: int = 3) -> List[str]:
+        """Top resources as ``"Title (url)"`` strings; generic pointers for an uncatalogued skill"""
+        found = self.top(skill, level, limit=limit)
+        if found:
+            return [resource.label() for resource in found]
+        return [f"{skill} Official Documentation", f"{skill} Tutorial", f"{skill} Best Practices"][:limit]
+
+    def for_skills(self, skills: Iterable[str], level: Union[int, str, None] = None, limit: int = 4) -> List[str]:
+        """Labels for a group of skills (e.g. a milestone): each skill's best resource first, then
+        its runners-up, so one well-covered skill does not crowd out the others"""
+        ranked = [self.top(skill, level, limit=limit) for skill in skills or []]
+        picked: List[LearningResource] = []
+        for rank in range(limit):
+            for resources in ranked:
+                if rank < len(resources) and resources[rank] not in picked:
+                    picked.append(resources[rank])
+                if len(picked) >= limit:
+                    return [resource.label() for resource in picked]
+        return [resource.label() for resource in picked]
+
+    def skills(self) -> List[str]:
+        return sorted({skill for resource in self.resources for skill in resource.skills})
+
+
+resource_catalog = ResourceCatalog.load()
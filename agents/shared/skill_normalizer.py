@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Skill Normalizer - IISER StatusCode 02
+Maps the many spellings of a skill ("Nodejs", "node.js", "Postgres", "ML")
+to one canonical name from a small ontology (data/skill_ontology.json).
+
+Lookup order for a name:
+1. exact or alias hash lookup on a folded key (case, spaces, dots, dashes
+   and slashes ignored, "&" read as "and")
+2. the same with a trailing version number removed ("Python 3.11")
+3. nearest neighbour over character-trigram vectors of every name and alias,
+   accepted above FUZZY_MATCH_THRESHOLD cosine similarity ("Javascipt").
+   Only spelling slips are corrected: a name that contains a known skill plus
+   more ("TensorFlow.js", "JavaScript Testing") is a different skill and is
+   left as written.
+
+Results are memoized, so repeated names cost one dict lookup.
+"""
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ONTOLOGY_PATH = Path(__file__).resolve().parent / "data" / "skill_ontology.json"
+# Minimum trigram cosine similarity for a fuzzy match
+FUZZY_MATCH_THRESHOLD = 0.6
+# Shorter folded names are too ambiguous to match fuzzily ("go", "ui", "r")
+FUZZY_MIN_LENGTH = 4
+# A fuzzy candidate's key may differ in length from the query's by at most this many
+# characters, so "Reactive Programming" does not land on "R programming"
+FUZZY_MAX_LENGTH_DIFFERENCE = 2
+CACHE_SIZE = 8192
+
+_SEPARATORS = re.compile(r"[\s._\-/]+")
+_VERSION = re.compile(r"\s*v?\d+(?:\.\d+)*\s*$", re.I)
+
+
+def fold(name: str) -> str:
+    """Lookup key: lower case, "&" as "and", spaces and . _ - / removed (``"Node.js"`` -> ``"nodejs"``)"""
+    return _SEPARATORS.sub("", str(name).lower().replace("&", " and "))
+
+
+def _trigrams(key: str) -> Counter:
+    padded = f"^{key}$"
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class SkillMatch:
+    """Canonical skill for a name, and how it was found (exact, alias, version or fuzzy)"""
+    name: str
+    category: str
+    method: str
+    score: float = 1.0
+
+
+class SkillNormalizer:
+    """Canonical skill names from an ontology of ``{"name", "category", "aliases"}`` entries"""
+
+    def __init__(self, skills: List[Dict[str, Any]], threshold: float = FUZZY_MATCH_THRESHOLD,
+                 cache_size: int = CACHE_SIZE):
+        self.threshold = threshold
+        self._canonical: Dict[str, SkillMatch] = {}
+        self._aliases: Dict[str, SkillMatch] = {}
+        for skill in skills:
+            name = str(skill["name"])
+            category = str(skill.get("category") or "other")
+            self._canonical[fold(name)] = SkillMatch(name, category, "exact")
+            for alias in skill.get("aliases") or []:
+                self._aliases.setdefault(fold(alias), SkillMatch(name, category, "alias"))
+
+        # Trigram vectors for every known key, with an inverted index for candidate lookup
+        self._keys = list({**self._aliases, **self._canonical})
+        self._vectors = [_trigrams(key) for key in self._keys]
+        self._norms = [math.sqrt(sum(count * count for count in vector.values())) for vector in self._vectors]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for index, vector in enumerate(self._vectors):
+            for gram in vector:
+                self._postings[gram].append(index)
+
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    @classmethod
+    def load(cls, path: Path = ONTOLOGY_PATH) -> "SkillNormalizer":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                skills = json.load(f).get("skills", [])
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load skill ontology {path}: {e}")
+            skills = []
+        return cls(skills)
+
+    def _lookup(self, key: str) -> Optional[SkillMatch]:
+        return self._canonical.get(key) or self._aliases.get(key)
+
+    def _extends_known(self, name: str) -> bool:
+        """Whether some of the name's words, but not all, already name a skill ("TensorFlow.js")"""
+        words = [word for word in _SEPARATORS.split(str(name).lower().replace("&", " and ")) if word]
+        return any(self._lookup("".join(words[start:end]))
+                   for start in range(len(words)) for end in range(start + 1, len(words) + 1)
+                   if end - start < len(words))
+
+    def _match(self, name: str) -> Optional[SkillMatch]:
+        """Canonical skill for ``name``, or None if nothing is close enough"""
+        key = fold(name)
+        if not key:
+            return None
+        found = self._lookup(key)
+        if found:
+            return found
+
+        unversioned = fold(_VERSION.sub("", str(name)))
+        if unversioned and unversioned != key:
+            found = self._lookup(unversioned)
+            if found:
+                return SkillMatch(found.name, found.category, "version")
+
+        if len(key) < FUZZY_MIN_LENGTH or not self._keys or self._extends_known(name):
+            return None
+        query = _trigrams(key)
+        dots: Dict[int, int] = defaultdict(int)
+        for gram, count in query.items():
+            for index in self._postings.get(gram, ()):
+                dots[index] += count * self._vectors[index][gram]
+        query_norm = math.sqrt(sum(count * count for count in query.values()))
+        candidates = [(i, dot / (query_norm * self._norms[i])) for i, dot in dots.items()
+                      if abs(len(key) - len(self._keys[i])) <= FUZZY_MAX_LENGTH_DIFFERENCE]
+        if not candidates:
+            return None
+        index, score = max(candidates, key=lambda item: item[1])
+        if score < self.threshold:
+            return None
+        found = self._lookup(self._keys[index])
+        return SkillMatch(found.name, found.category, "fuzzy", round(score, 3))
+
+    def canonical(self, name: str) -> str:
+        """Canonical name, or ``name`` with its whitespace tidied when it is unknown"""
+        found = self.match(str(name))
+        return found.name if found else " ".join(str(name).split())
+
+    def key(self, name: str) -> str:
+        """Comparable key: equal for every spelling of the same skill"""
+        return fold(self.canonical(name))
+
+    def category(self, name: str, default: str = "other") -> str:
+        found = self.match(str(name))
+        return found.category if found else default
+
+    def cache_info(self):
+        return self.match.cache_info()
+
+
+skill_normalizer = SkillNormalizer.load()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Stub LLM Server - IISER StatusCode 02
+A local HTTP stand-in for an LLM provider, for exercising the router's
+failover and hedging without API keys. It answers POST /v1/complete with
+{"text", "prompt_tokens", "completion_tokens"} after a configurable delay,
+and can inject errors and slow outliers.
+
+Usage:
+    python stub_llm_server.py --port 8765 --latency-ms 200 --slow-rate 0.05 --slow-ms 3000
+    python stub_llm_server.py --port 8766 --error-rate 0.2 --reply '{"summary": "ok", "suggestions": []}'
+
+Point the agents at it with LLM_STUB_URLS=http://127.0.0.1:8765,http://127.0.0.1:8766
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+@dataclass
+class StubBehaviour:
+    latency_ms: float = 200
+    jitter_ms: float = 50
+    error_rate: float = 0.0
+    slow_rate: float = 0.0
+    slow_ms: float = 3000
+    reply: str = '{"stub": true}'
+
+
+def _handler(behaviour: StubBehaviour):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._send(200, {"status": "ok"})
+
+        def do_POST(self):
+            if self.path != "/v1/complete":
+                self._send(404, {"error": "not found"})
+                return
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            delay = behaviour.slow_ms if random.random() < behaviour.slow_rate else behaviour.latency_ms
+            time.sleep(max(0.0, delay + random.uniform(-behaviour.jitter_ms, behaviour.jitter_ms)) / 1000)
+            if random.random() < behaviour.error_rate:
+                self._send(503, {"error": "injected failure"})
+                return
+            prompt = payload.get("prompt", "")
+            self._send(200, {
+                "text": behaviour.reply,
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(behaviour.reply) // 4
+            })
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def serve_in_thread(behaviour: StubBehaviour = None, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a stub server on a daemon thread; returns (server, base URL). Port 0 picks a free one."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(behaviour or StubBehaviour()))
+    threading.Thread(target=server.serve_forever, name="stub-llm", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub LLM provider")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with HTTP 503")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="share of calls delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    parser.add_argument("--reply", default='{"stub": true}', help="text returned for every completion")
+    args = parser.parse_args()
+
+    behaviour = StubBehaviour(args.latency_ms, args.jitter_ms, args.error_rate, args.slow_rate, args.slow_ms, args.reply)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), _handler(behaviour))
+    print(f"🧪 Stub LLM listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM gateway
+Checks the token buckets, admission limits and single-flight coalescing
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the agents directory to path so the shared package imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.llm_gateway import GatewayTimeout, LLMGateway, ProviderLimits, TokenBucket
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for followers"
+        time.sleep(0.01)
+
+
+def test_token_bucket_takes_and_refunds():
+    """A full bucket serves its capacity at once; refunds make units available again"""
+    bucket = TokenBucket(600)  # 10 units per second
+    deadline = time.monotonic()
+    assert bucket.acquire(500, deadline)
+    assert bucket.acquire(100, deadline)
+    assert bucket.level < 1
+    bucket.adjust(-200)
+    assert 199 < bucket.level <= 201
+    bucket.adjust(1000)
+    assert bucket.level < 0
+    print("✅ Token bucket takes and refunds")
+
+
+def test_token_bucket_fails_fast():
+    """An amount that cannot refill before the deadline fails immediately"""
+    bucket = TokenBucket(60)  # 1 unit per second
+    assert bucket.acquire(60, time.monotonic())
+    started = time.monotonic()
+    assert not bucket.acquire(30, started + 5)
+    assert time.monotonic() - started < 0.5
+    print("✅ Token bucket fails fast")
+
+
+def test_token_bucket_waits_for_refill():
+    """A small shortfall is waited out"""
+    bucket = TokenBucket(6000)  # 100 units per second
+    assert bucket.acquire(6000, time.monotonic())
+    started = time.monotonic()
+    assert bucket.acquire(5, started + 2)
+    assert time.monotonic() - started >= 0.03
+    print("✅ Token bucket waits for refill")
+
+
+def test_oversized_request_is_capped():
+    """A request larger than the bucket takes the full bucket instead of never running"""
+    bucket = TokenBucket(100)
+    assert bucket.acquire(10_000, time.monotonic())
+    assert bucket.level < 1
+    print("✅ Oversized request is capped")
+
+
+def test_provider_limits_parse():
+    """Limit specs allow empty parts for unlimited"""
+    limits = ProviderLimits.parse("4:30000:30")
+    assert (limits.concurrency, limits.tokens_per_minute, limits.requests_per_minute) == (4, 30000.0, 30.0)
+    limits = ProviderLimits.parse("2")
+    assert limits.tokens_per_minute is None and limits.requests_per_minute is None
+    print("✅ Provider limits parse")
+
+
+def test_admit_enforces_concurrency_and_settles():
+    """A second call past the concurrency limit times out; settle refunds unused tokens"""
+    gateway = LLMGateway({"groq": ProviderLimits(concurrency=1, tokens_per_minute=6000)})
+    with gateway.admit("groq", 1000, gateway.deadline(1)) as settle:
+        try:
+            with gateway.admit("groq", 10, gateway.deadline(0.05)):
+                raise AssertionError("second call was admitted")
+        except GatewayTimeout:
+            pass
+        settle(200)
+    status = gateway.status()["providers"]["groq"]
+    assert status["in_flight"] == 0 and status["timeouts"] == 1
+    assert status["tokens_available"] >= 5800
+    print("✅ Admission enforces concurrency and settles tokens")
+
+
+def test_rate_limit_error_pauses_provider():
+    """A 429 from the provider pauses it so queued calls back off"""
+    gateway = LLMGateway({"groq": ProviderLimits(concurrency=2)})
+    try:
+        with gateway.admit("groq", 10, gateway.deadline(1)):
+            raise RuntimeError("429 Too Many Requests")
+    except RuntimeError:
+        pass
+    assert gateway.status()["providers"]["groq"]["paused"]
+    try:
+        with gateway.admit("groq", 10, gateway.deadline(0.1)):
+            raise AssertionError("paused provider admitted a call")
+    except GatewayTimeout:
+        pass
+    print("✅ Rate limit error pauses provider")
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent callers with the same key share one upstream call"""
+    gateway = LLMGateway()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(2)
+        return "answer"
+
+    key = LLMGateway.flight_key("groq", "prompt")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gateway.single_flight(key, call))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: gateway.coalesced == 4)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+    assert gateway.status()["in_flight_prompts"] == 0
+    # A finished flight is not cached: the next call runs again
+    assert gateway.single_flight(key, lambda: "fresh") == "fresh"
+    print("✅ Single flight coalesces concurrent calls")
+
+
+def test_single_flight_shares_errors():
+    """Followers see the leader's exception and the key is freed"""
+    gateway = LLMGateway()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(2)
+        raise ValueError("upstream failed")
+
+    def run():
+        try:
+            gateway.single_flight("key", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: gateway.coalesced == 2)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert errors == ["upstream failed"] * 3
+    assert gateway.single_flight("key", lambda: "ok") == "ok"
+    print("✅ Single flight shares errors")
+
+
+def test_flight_key_separates_prompts():
+    """Keys differ by provider and cannot collide by shifting text between parts"""
+    assert LLMGateway.flight_key("groq", "a") == LLMGateway.flight_key("groq", "a")
+    assert LLMGateway.flight_key("groq", "a") != LLMGateway.flight_key("gemini", "a")
+    assert LLMGateway.flight_key("a", "bc") != LLMGateway.flight_key("ab", "c")
+    print("✅ Flight key separates prompts")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
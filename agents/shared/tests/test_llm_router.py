@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM router
+Checks failover, the circuit breaker, hedging and context-window filtering
+with in-process fake providers (and one round trip through the stub server)
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add the agents directory to path so the shared package imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.llm_gateway import LLMGateway
+from shared.llm_router import (
+    FAILURES_TO_TRIP, GEMINI_MODEL, GROQ_MODEL, LLMRouter, LLMRouterError, Provider, StubProvider
+)
+from shared.stub_llm_server import StubBehaviour, serve_in_thread
+
+
+class FakeProvider(Provider):
+    """Answers with its own name after ``delay`` seconds, or raises while ``failing``"""
+
+    def __init__(self, name: str, model: str = GEMINI_MODEL, delay: float = 0.0, failing: bool = False):
+        super().__init__(model)
+        self.name = name
+        self.delay = delay
+        self.failing = failing
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _complete(self, prompt, temperature, json_mode):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError(f"{self.name} is down")
+        return f"reply from {self.name}", 10, 5
+
+
+def _router(*providers, hedge_after_ms=None):
+    return LLMRouter(list(providers), hedge_after_ms=hedge_after_ms, gateway=LLMGateway())
+
+
+def test_failing_primary_falls_over_to_backup():
+    """An error on the first provider is answered by the next one"""
+    primary, backup = FakeProvider("primary", failing=True), FakeProvider("backup")
+    router = _router(primary, backup)
+    response = router.complete("hello")
+    assert (response.provider, response.text) == ("backup", "reply from backup")
+    assert not response.hedged
+    assert primary.calls == 1
+    assert router.stats["primary"].error_rate == 1.0
+    print("✅ Failing primary falls over to backup")
+
+
+def test_all_providers_failing_raises():
+    """When every provider fails, the error names each failure"""
+    router = _router(FakeProvider("a", failing=True), FakeProvider("b", failing=True))
+    try:
+        router.complete("hello")
+    except LLMRouterError as e:
+        assert "a is down" in str(e) and "b is down" in str(e)
+    else:
+        raise AssertionError("no error raised")
+    print("✅ All providers failing raises")
+
+
+def test_breaker_trips_after_consecutive_failures():
+    """FAILURES_TO_TRIP failures take a provider out of rotation for the cooldown"""
+    primary, backup = FakeProvider("primary", failing=True), FakeProvider("backup")
+    router = _router(primary, backup)
+    for i in range(FAILURES_TO_TRIP):
+        router.complete(f"prompt {i}")
+    assert primary.calls == FAILURES_TO_TRIP
+    assert router.stats["primary"].cooling_down
+    assert not router.status()["providers"]["primary"]["healthy"]
+
+    primary.failing = False
+    assert router.complete("after trip").provider == "backup"
+    assert primary.calls == FAILURES_TO_TRIP
+    assert [provider.name for provider in router.ranked()][-1] == "primary"
+    print("✅ Breaker trips after consecutive failures")
+
+
+def test_slow_primary_is_hedged():
+    """After the hedge threshold the backup races the primary and the faster reply wins"""
+    primary, backup = FakeProvider("primary", delay=0.5), FakeProvider("backup", delay=0.01)
+    router = _router(primary, backup, hedge_after_ms=50)
+    started = time.perf_counter()
+    response = router.complete("hedge me")
+    assert response.provider == "backup" and response.hedged
+    assert time.perf_counter() - started < 0.4
+    assert backup.calls == 1
+    print("✅ Slow primary is hedged")
+
+
+def test_fast_primary_is_not_hedged():
+    """A reply before the threshold never starts the backup"""
+    primary, backup = FakeProvider("primary", delay=0.0), FakeProvider("backup")
+    response = _router(primary, backup, hedge_after_ms=200).complete("quick")
+    assert response.provider == "primary" and not response.hedged
+    assert backup.calls == 0
+    print("✅ Fast primary is not hedged")
+
+
+def test_prompt_too_large_for_every_window_raises():
+    """A prompt no provider can hold fails before any call; a larger window takes it"""
+    small = FakeProvider("groq", model=GROQ_MODEL)
+    oversized = "word " * 9000
+    try:
+        _router(small).complete(oversized)
+    except LLMRouterError as e:
+        assert "context window" in str(e)
+    else:
+        raise AssertionError("oversized prompt was routed")
+    assert small.calls == 0
+
+    large = FakeProvider("gemini", model=GEMINI_MODEL)
+    assert _router(small, large).complete(oversized).provider == "gemini"
+    assert small.calls == 0
+    print("✅ Oversized prompt is filtered by context window")
+
+
+def test_stub_server_round_trip():
+    """The stub server answers through StubProvider like a real backend"""
+    server, url = serve_in_thread(StubBehaviour(latency_ms=1, jitter_ms=0, reply='{"ok": true}'))
+    try:
+        response = _router(StubProvider(url)).complete("ping", json_mode=True)
+        assert response.text == '{"ok": true}' and response.provider == "stub"
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Stub server round trip")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for prompt compaction
+Checks that compact_cv stays inside its token budget and keeps the most
+relevant CV sections
+"""
+
+import os
+import sys
+
+# Add the agents directory to path so the shared package imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.prompt_compaction import (
+    TRUNCATION_MARKER, compact_cv, compact_skills, estimate_tokens, fit_to_budget, split_cv_sections
+)
+
+SAMPLE_CV = """Jane Doe
+jane@example.com
+SUMMARY
+Backend engineer who likes distributed systems.
+EXPERIENCE
+Built payment APIs in Go and Python at Acme.
+Led the migration of batch jobs to Kubernetes.
+SKILLS
+Python, Go, PostgreSQL, Docker, Kubernetes
+INTERESTS
+Chess, hiking, baking bread and long walks along the river.
+Page 1 of 2
+Jane Doe
+REFERENCES
+Available on request.
+"""
+
+
+def test_cv_under_budget_is_only_cleaned():
+    """A CV that fits keeps every section but loses page numbers and repeated lines"""
+    compacted = compact_cv(SAMPLE_CV, 10_000)
+    assert "Page 1 of 2" not in compacted
+    assert compacted.count("Jane Doe") == 1
+    assert "Available on request." in compacted
+    print("✅ CV under budget is only cleaned")
+
+
+def test_cv_respects_budget():
+    """A compacted CV never exceeds its budget"""
+    for budget in (15, 25, 40, 60):
+        compacted = compact_cv(SAMPLE_CV, budget)
+        assert estimate_tokens(compacted) <= budget, (budget, compacted)
+    print("✅ CV respects budget")
+
+
+def test_cv_keeps_relevant_sections():
+    """Skills and experience survive before interests and references"""
+    sections = dict(split_cv_sections(SAMPLE_CV))
+    budget = sum(estimate_tokens(line) + 1 for name in ("skills", "experience") for line in sections[name])
+    compacted = compact_cv(SAMPLE_CV, budget)
+    assert "Python, Go, PostgreSQL, Docker, Kubernetes" in compacted
+    assert "Led the migration of batch jobs to Kubernetes." in compacted
+    assert "Chess" not in compacted
+    assert "Available on request." not in compacted
+    # Kept sections stay in document order
+    assert compacted.index("EXPERIENCE") < compacted.index("SKILLS")
+    print("✅ CV keeps relevant sections")
+
+
+def test_single_line_cv_is_not_emptied():
+    """A CV extracted without line breaks keeps its beginning instead of vanishing"""
+    cv_text = " ".join(["Python developer with Django and Flask experience"] * 200)
+    compacted = compact_cv(cv_text, 100)
+    assert compacted.startswith("Python developer with Django")
+    assert compacted.endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(compacted) <= 100
+    print("✅ Single-line CV is not emptied")
+
+
+def test_fit_to_budget_cuts_at_word_boundary():
+    """fit_to_budget keeps whole lines, then whole words of the line that crosses the budget"""
+    text = "first line\n" + " ".join(["alpha", "beta", "gamma", "delta"] * 5)
+    fitted = fit_to_budget(text, 15)
+    assert fitted.splitlines() == ["first line", "alpha beta gamma delta", TRUNCATION_MARKER]
+    assert estimate_tokens(fitted) <= 15
+    assert fit_to_budget("short", 10) == "short"
+    print("✅ fit_to_budget cuts at word boundary")
+
+
+def test_compact_skills_merges_aliases():
+    """Aliases collapse into one entry with the highest level"""
+    compacted = compact_skills([
+        {"name": "Nodejs", "level": 2, "category": "backend"},
+        {"name": "Node.js", "level": 4, "category": "backend"},
+        {"name": "Python", "level": 3, "category": "programming"},
+    ])
+    assert compacted == "backend: Node.js 4; programming: Python 3"
+    print("✅ compact_skills merges aliases")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the Skill Normalizer
+Checks alias, version and fuzzy matching, and that distinct skills are never
+folded together
+"""
+
+import os
+import sys
+
+# Add the agents directory to path so the shared package imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.skill_normalizer import SkillNormalizer, fold, skill_normalizer
+
+ONTOLOGY = [
+    {"name": "JavaScript", "category": "programming", "aliases": ["JS", "ECMAScript"]},
+    {"name": "TensorFlow", "category": "ai_ml", "aliases": ["tf", "tensorflow2"]},
+    {"name": "R Programming", "category": "programming", "aliases": ["R"]},
+    {"name": "Spring", "category": "backend"},
+    {"name": "Spring Boot", "category": "backend", "aliases": ["springboot"]},
+]
+
+
+def test_fold():
+    """Case, separators and "&" do not change the key"""
+    assert fold("Node.js") == fold("node js") == fold("NODE-JS") == "nodejs"
+    assert fold("CI/CD") == "cicd"
+    assert fold("R&D") == fold("r and d")
+    print("✅ Fold")
+
+
+def test_exact_alias_and_version():
+    """Aliases and trailing version numbers resolve to the canonical name"""
+    normalizer = SkillNormalizer(ONTOLOGY)
+    assert normalizer.match("javascript").method == "exact"
+    assert normalizer.canonical("ECMAScript") == "JavaScript"
+    match = normalizer.match("TensorFlow 2.15")
+    assert (match.name, match.method) == ("TensorFlow", "version")
+    assert normalizer.category("JS") == "programming"
+    assert normalizer.key("js") == normalizer.key("JavaScript")
+    print("✅ Exact, alias and version matches")
+
+
+def test_fuzzy_corrects_typos():
+    """Spelling slips are corrected"""
+    normalizer = SkillNormalizer(ONTOLOGY)
+    match = normalizer.match("Javascipt")
+    assert (match.name, match.method) == ("JavaScript", "fuzzy")
+    assert normalizer.threshold <= match.score < 1
+    assert normalizer.canonical("Tensorflwo") == "TensorFlow"
+    print("✅ Fuzzy match corrects typos")
+
+
+def test_distinct_skills_are_not_folded():
+    """A known skill plus more words is a different skill and stays as written"""
+    normalizer = SkillNormalizer(ONTOLOGY)
+    for name in ("TensorFlow.js", "JavaScript Testing", "Reactive Programming", "Go"):
+        assert normalizer.match(name) is None, name
+    assert normalizer.canonical("  TensorFlow.js ") == "TensorFlow.js"
+    assert normalizer.canonical("Spring Boot") == "Spring Boot"
+    assert normalizer.key("Spring") != normalizer.key("Spring Boot")
+    assert normalizer.category("Reactive Programming") == "other"
+    print("✅ Distinct skills are not folded")
+
+
+def test_shipped_ontology_keeps_related_skills_apart():
+    """Related tools in the bundled ontology keep their own names"""
+    for name in ("Spring", "GitHub Actions", "Docker Compose", "OpenCV", "Scrum", "Kanban", "Unix"):
+        assert skill_normalizer.canonical(name) == name
+    assert skill_normalizer.canonical("Nodejs") == "Node.js"
+    assert skill_normalizer.canonical("Postgres") == "PostgreSQL"
+    assert skill_normalizer.canonical("Python 3.11") == "Python"
+    print("✅ Shipped ontology keeps related skills apart")
+
+
+def test_results_are_cached():
+    """Repeated names are served from the memo"""
+    normalizer = SkillNormalizer(ONTOLOGY)
+    normalizer.canonical("Javascipt")
+    normalizer.canonical("Javascipt")
+    assert normalizer.cache_info().hits >= 1
+    print("✅ Results are cached")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -2,13 +2,13 @@ from flask import Flask
 from flask_cors import CORS
 from .config import Config
 from .services.supabase_client import supabase
+from .services.lifecycle import lifecycle
 import os
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
-
-
+    lifecycle.init_app(app)
 
     # Get frontend URL from environment or use default
     frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -30,4 +30,13 @@ def create_app():
     def home():
         return {"status": "ok", "message": "Flask backend running"}
 
+    @app.route("/healthz")
+    def healthz():
+        # 503 while draining so load balancers stop sending new requests
+        return lifecycle.status(), 503 if lifecycle.draining else 200
+
+    @app.route("/healthz/warmup")
+    def warmup_status():
+        return lifecycle.warmup_status()
+
     return app
@@ -10,3 +10,48 @@ class Config:
     GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
     GITHUB_REDIRECT_URI = "http://localhost:3000/auth/github/callback"
     JWT_SECRET = os.getenv("JWT_SECRET", "supersecret")
+
+    # Agent operation telemetry (see services/operation_logger.py)
+    OPERATION_LOG_BATCH_SIZE = int(os.getenv("OPERATION_LOG_BATCH_SIZE", "50"))
+    OPERATION_LOG_FLUSH_INTERVAL = float(os.getenv("OPERATION_LOG_FLUSH_INTERVAL", "2.0"))
+    OPERATION_LOG_SPILL_PATH = os.getenv("OPERATION_LOG_SPILL_PATH", "logs/agent_operations_spill.ndjson")
+
+    # Payloads larger than this (bytes of JSON) are stored in payload_blobs
+    BLOB_INLINE_THRESHOLD = int(os.getenv("BLOB_INLINE_THRESHOLD", "2048"))
+
+    # Leaderboard ranking engine
+    LEADERBOARD_PERSIST_INTERVAL = float(os.getenv("LEADERBOARD_PERSIST_INTERVAL", "10"))
+    LEADERBOARD_RELOAD_INTERVAL = float(os.getenv("LEADERBOARD_RELOAD_INTERVAL", "30"))
+
+    # Seconds a fetched contribution calendar is reused across period views
+    CONTRIBUTION_CACHE_TTL = float(os.getenv("CONTRIBUTION_CACHE_TTL", "600"))
+
+    # Multi-year contribution history files and how often they are topped up
+    CONTRIBUTION_HISTORY_DIR = os.getenv("CONTRIBUTION_HISTORY_DIR", "data/contributions")
+    CONTRIBUTION_HISTORY_REFRESH = float(os.getenv("CONTRIBUTION_HISTORY_REFRESH", "86400"))
+
+    # Minimum seconds between GitHub event polls per user (GitHub may ask for more)
+    ACTIVITY_POLL_INTERVAL = float(os.getenv("ACTIVITY_POLL_INTERVAL", "60"))
+
+    # Seconds computed repository statistics are reused per user
+    REPO_STATS_CACHE_TTL = float(os.getenv("REPO_STATS_CACHE_TTL", "300"))
+
+    # Precomputed role x level repository blueprints (regenerate with build_blueprints.py)
+    BLUEPRINT_DIR = os.getenv(
+        "BLUEPRINT_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blueprints")
+    )
+
+    # Production serving (gunicorn.conf.py / asgi.py). Caches, leaderboard boards,
+    # rate-limit buckets and the challenge bank are per process, so each extra
+    # worker multiplies their memory and upstream API usage; scale threads first.
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+    WEB_WORKER_CLASS = os.getenv("WEB_WORKER_CLASS", "gthread")
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "16"))
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "120"))
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+    # Seconds a worker keeps serving after SIGTERM with /healthz at 503, so load balancers notice
+    WEB_DRAIN_DELAY = float(os.getenv("WEB_DRAIN_DELAY", "5"))
+    # Build lazy services in the background once a worker is serving health checks
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+    # Threads async views use to run blocking Supabase/GitHub/LLM calls concurrently
+    ASYNC_IO_WORKERS = int(os.getenv("ASYNC_IO_WORKERS", "32"))
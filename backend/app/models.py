@@ -61,6 +61,7 @@ class AIIssue:
     estimated_hours: Optional[int]
     status: str
     created_at: datetime
+    idempotency_key: Optional[str] = None
 
 @dataclass
 class AIRepository:
@@ -80,7 +81,7 @@ class Leaderboard:
     id: Optional[int]
     user_id: int
     total_points: int
-    current_rank: Optional[int]
+    current_rank: Optional[int]  # not maintained; LeaderboardService serves ranks from memory
     last_updated: datetime
 
 @dataclass
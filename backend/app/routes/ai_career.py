@@ -3,19 +3,36 @@ from werkzeug.utils import secure_filename
 import os
 from ..utils.decorators import token_required, auth_required
 from ..services.supabase_client import supabase
-from ..services.ai_agent_service import AIAgentService
+from ..services.ai_agent_service import ai_agent_service
+from ..services.operation_logger import operation_logger
+from ..services.blob_store import blob_store
+from ..services import data_repository as repo
+from ..services.leaderboard_service import leaderboard_service
 from ..services.github_skill_analyzer import GitHubSkillAnalyzer
+from ..services.git_tree_writer import git_tree_writer
+from ..services.issue_publisher import issue_publisher, IssueSpec
+from ..services.blueprint_library import (
+    blueprint_library, agent2_delta_generator, agent2_portfolio_issues, render_level_issues
+)
+from ..utils.markdown_templates import render, render_roadmap_tree
+from ..utils.async_io import gather_blocking
+from ..utils.lazy import LazyProxy
 from datetime import datetime, timezone, timedelta
 import json
 from pathlib import Path
 
 bp = Blueprint("ai_career", __name__)
 
-# Initialize AI Agent Service
-ai_service = AIAgentService()
+# Built on first use so importing the routes stays cheap (see utils/lazy.py)
+ai_service = ai_agent_service
+github_analyzer = LazyProxy(GitHubSkillAnalyzer, name="github_analyzer")
 
-# Initialize GitHub Skill Analyzer
-github_analyzer = GitHubSkillAnalyzer()
+# Column sets for dashboard/progress previews
+ISSUE_SUMMARY_COLUMNS = (
+    "id", "owner", "repo_name", "github_issue_id", "issue_title", "labels",
+    "priority", "complexity", "estimated_hours", "status", "created_at"
+)
+SUBMISSION_SUMMARY_COLUMNS = ("id", "issue_id", "github_pr_url", "ai_score", "status", "submitted_at")
 
 # File upload configuration
 UPLOAD_FOLDER = 'uploads/cv'
@@ -235,6 +252,7 @@ def _fallback_generate_roadmap(target_role):
 @auth_required
 def cv_analysis_onboarding(current_user_id):
     """Complete CV analysis and onboarding flow"""
+    timer = operation_logger.timer()
     try:
         # Get form data
         target_role = request.form.get('target_role', 'software_engineer')
@@ -264,6 +282,10 @@ def cv_analysis_onboarding(current_user_id):
         if not analysis_result["success"]:
             return jsonify({"error": "CV analysis failed", "details": analysis_result.get("error")}), 500
         
+        # Store the CV text and full analysis once; tables below keep references
+        cv_text_ref = blob_store.put(analysis_result["cv_text"])
+        analysis_ref = blob_store.put({**analysis_result, "cv_text": cv_text_ref})
+        
         # Store onboarding data
         onboarding_data = {
             "user_id": current_user_id,
@@ -281,7 +303,7 @@ def cv_analysis_onboarding(current_user_id):
         # Store skills analysis
         skills_data = {
             "user_id": current_user_id,
-            "analysis_data": analysis_result,
+            "analysis_data": analysis_ref,
             "skill_level": analysis_result["analysis"]["current_level"],
             "strengths": [skill["name"] for skill in analysis_result["skills"] if skill["level"] >= 3],
             "growth_areas": analysis_result["analysis"]["skill_gaps"],
@@ -298,7 +320,7 @@ def cv_analysis_onboarding(current_user_id):
         resume_data = {
             "user_id": current_user_id,
             "resume_data": {
-                "cv_text": analysis_result["cv_text"],
+                "cv_text": cv_text_ref,
                 "extracted_skills": analysis_result["skills"],
                 "career_goals": analysis_result["goals"],
                 "analysis_summary": analysis_result["analysis"]
@@ -321,7 +343,9 @@ def cv_analysis_onboarding(current_user_id):
         }
         
         try:
+            previous_xp = leaderboard_service.stored_xp(current_user_id)
             supabase.table("user_progress").upsert(progress_data).execute()
+            leaderboard_service.update_points(current_user_id, progress_data["xp_points"], previous_xp)
         except Exception as e:
             print(f"Progress storage error: {e}")
         
@@ -331,16 +355,13 @@ def cv_analysis_onboarding(current_user_id):
             "operation_type": "cv_analysis_onboarding",
             "target_repository": None,
             "input_data": {"target_role": target_role, "chosen_path": "auto_generated"},
-            "output_data": analysis_result,
+            "output_data": analysis_ref,
             "success": True,
             "ai_model_used": "Gemini AI Agent",
-            "execution_time_ms": 5000  # Mock time
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -356,11 +377,14 @@ def cv_analysis_onboarding(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("cv_analysis_onboarding", current_user_id, e, timer, ai_model_used="Gemini AI Agent")
         return jsonify({"error": f"Onboarding failed: {str(e)}"}), 500
 
 @bp.route("/api/onboarding/github-analysis", methods=["POST"])
 def github_skill_analysis():
     """Analyze user skills based on GitHub profile when CV is not provided"""
+    timer = operation_logger.timer()
+    current_user_id = None
     try:
         # Get current user ID from either JWT or cookie auth
         current_user_id = get_user_id_from_request()
@@ -417,10 +441,13 @@ def github_skill_analysis():
         except Exception as e:
             print(f"Onboarding storage error: {e}")
         
+        # Store the full analysis once; tables below keep a reference to it
+        analysis_ref = blob_store.put(analysis_result)
+        
         # Store skills analysis
         skills_analysis_data = {
             "user_id": current_user_id,
-            "analysis_data": analysis_result,
+            "analysis_data": analysis_ref,
             "skill_level": overall_assessment["current_level"],
             "strengths": [skill["name"] for skill in all_skills if skill.get("level", 0) >= 4],
             "growth_areas": [area["name"] for area in overall_assessment.get("improvement_areas", [])],
@@ -461,7 +488,9 @@ def github_skill_analysis():
         }
         
         try:
+            previous_xp = leaderboard_service.stored_xp(current_user_id)
             supabase.table("user_progress").upsert(progress_data).execute()
+            leaderboard_service.update_points(current_user_id, progress_data["xp_points"], previous_xp)
         except Exception as e:
             print(f"Progress storage error: {e}")
         
@@ -471,16 +500,13 @@ def github_skill_analysis():
             "operation_type": "github_skill_analysis",
             "target_repository": None,
             "input_data": {"target_role": target_role, "github_username": github_username},
-            "output_data": analysis_result,
+            "output_data": analysis_ref,
             "success": True,
             "ai_model_used": "GitHub API Analysis",
-            "execution_time_ms": 3000
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -496,6 +522,7 @@ def github_skill_analysis():
         })
         
     except Exception as e:
+        operation_logger.log_failure("github_skill_analysis", current_user_id, e, timer, ai_model_used="GitHub API Analysis")
         return jsonify({"error": f"GitHub analysis failed: {str(e)}"}), 500
 
 def _convert_level_to_number(self, level: str) -> int:
@@ -516,14 +543,15 @@ def _convert_level_to_number(self, level: str) -> int:
 @token_required
 def generate_ai_project(current_user_id):
     """Generate AI-powered GitHub repository with issues"""
+    timer = operation_logger.timer()
     try:
         data = request.get_json()
         skill_focus = data.get('skill_focus', 'python')
         project_type = data.get('project_type', 'web_application')
         
         # Get user's current level and skills
-        user_progress = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-        current_level = user_progress.data[0]["current_level"] if user_progress.data else 1
+        user_progress = repo.user_progress.first(("current_level",), user_id=current_user_id)
+        current_level = user_progress.current_level if user_progress else 1
         
         # Generate repository using AI agent
         repo_result = ai_service.create_github_repository(current_level, skill_focus, current_user_id)
@@ -580,13 +608,10 @@ def generate_ai_project(current_user_id):
             "output_data": {"repository": repo_result["repository"], "issues": created_issues},
             "success": True,
             "ai_model_used": "AI Agent",
-            "execution_time_ms": 3000  # Mock time
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -602,12 +627,14 @@ def generate_ai_project(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("ai_project_generation", current_user_id, e, timer, ai_model_used="AI Agent")
         return jsonify({"error": f"Project generation failed: {str(e)}"}), 500
 
 @bp.route("/api/submissions/analyze", methods=["POST"])
 @token_required
 def analyze_code_submission(current_user_id):
     """Analyze code submission and generate score"""
+    timer = operation_logger.timer()
     try:
         data = request.get_json()
         github_pr_url = data.get('github_pr_url')
@@ -642,10 +669,10 @@ def analyze_code_submission(current_user_id):
         
         # Update user progress with XP points and enhanced leveling logic
         try:
-            current_progress = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-            if current_progress.data:
-                current_xp = current_progress.data[0]["xp_points"]
-                current_level = current_progress.data[0]["current_level"]
+            current_progress = repo.user_progress.first(("current_level", "xp_points", "badges"), user_id=current_user_id)
+            if current_progress:
+                current_xp = current_progress.xp_points
+                current_level = current_progress.current_level
                 new_xp = current_xp + analysis_result["xp_points"]
                 
                 # Enhanced leveling logic: Level up only with 75%+ score
@@ -664,7 +691,7 @@ def analyze_code_submission(current_user_id):
                         level_up_message = f"🎉 Congratulations! You've reached Level {new_level}!"
                         
                         # Add level up badge
-                        current_badges = current_progress.data[0].get("badges", [])
+                        current_badges = list(current_progress.get("badges", []))
                         new_badge = f"Level {new_level} Achiever"
                         if new_badge not in current_badges:
                             current_badges.append(new_badge)
@@ -689,6 +716,7 @@ def analyze_code_submission(current_user_id):
                     update_data["next_goal"] = next_goal
                 
                 supabase.table("user_progress").update(update_data).eq("user_id", current_user_id).execute()
+                leaderboard_service.update_points(current_user_id, new_xp, current_xp)
                 
                 # Log level progression
                 if new_level > current_level:
@@ -703,16 +731,13 @@ def analyze_code_submission(current_user_id):
             "operation_type": "code_analysis",
             "target_repository": github_pr_url,
             "input_data": {"github_pr_url": github_pr_url, "issue_id": issue_id},
-            "output_data": analysis_result,
+            "output_data": blob_store.put(analysis_result),
             "success": True,
             "ai_model_used": "AI Agent",
-            "execution_time_ms": 4000  # Mock time
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -736,32 +761,38 @@ def analyze_code_submission(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("code_analysis", current_user_id, e, timer, ai_model_used="AI Agent")
         return jsonify({"error": f"Code analysis failed: {str(e)}"}), 500
 
 @bp.route("/api/dashboard/summary", methods=["GET"])
 @auth_required
-def get_dashboard_summary(current_user_id):
+async def get_dashboard_summary(current_user_id):
     """Get comprehensive dashboard data"""
     try:
-        # Get user progress
-        progress_result = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-        progress = progress_result.data[0] if progress_result.data else {}
-        
-        # Get recent AI issues
-        issues_result = supabase.table("ai_issues").select("*").eq("user_id", current_user_id).order("created_at", desc=True).limit(5).execute()
-        recent_issues = issues_result.data if issues_result.data else []
-        
-        # Get recent submissions
-        submissions_result = supabase.table("user_submissions").select("*").eq("user_id", current_user_id).order("submitted_at", desc=True).limit(5).execute()
-        recent_submissions = submissions_result.data if submissions_result.data else []
-        
-        # Get skills analysis
-        skills_result = supabase.table("user_skills_analysis").select("*").eq("user_id", current_user_id).order("created_at", desc=True).limit(1).execute()
-        skills_analysis = skills_result.data[0] if skills_result.data else {}
-        
-        # Get leaderboard position
-        leaderboard_result = supabase.table("leaderboard").select("*").eq("user_id", current_user_id).execute()
-        leaderboard_position = leaderboard_result.data[0] if leaderboard_result.data else {}
+        def skills_analysis_row():
+            result = supabase.table("user_skills_analysis").select(
+                "id, analysis_data, skill_level, strengths, growth_areas, recommended_learning_path, created_at, expires_at"
+            ).eq("user_id", current_user_id).order("created_at", desc=True).limit(1).execute()
+            return blob_store.resolve(result.data[0]) if result.data else {}
+        
+        def leaderboard_ranks():
+            position = leaderboard_service.position(current_user_id)
+            position["weekly_rank"] = leaderboard_service.position(current_user_id, period="weekly")["current_rank"]
+            position["monthly_rank"] = leaderboard_service.position(current_user_id, period="monthly")["current_rank"]
+            return position
+        
+        # Progress, recent issues/submissions, skills analysis and leaderboard are independent reads
+        progress, recent_issues, recent_submissions, skills_analysis, leaderboard_position = await gather_blocking(
+            lambda: repo.user_progress.first(repo.PROGRESS_COLUMNS, user_id=current_user_id) or {},
+            lambda: repo.to_dicts(repo.ai_issues.find(
+                ISSUE_SUMMARY_COLUMNS, order_by="created_at", limit=5, user_id=current_user_id
+            )),
+            lambda: repo.to_dicts(repo.user_submissions.find(
+                SUBMISSION_SUMMARY_COLUMNS, order_by="submitted_at", limit=5, user_id=current_user_id
+            )),
+            skills_analysis_row,
+            leaderboard_ranks
+        )
         
         # Calculate next level progress
         current_level = progress.get("current_level", 1)
@@ -802,10 +833,11 @@ def generate_user_resume(current_user_id):
     """Generate AI-powered resume from user data"""
     try:
         # Get user projects and skills
-        projects_result = supabase.table("user_submissions").select("*").eq("user_id", current_user_id).execute()
-        user_projects = projects_result.data if projects_result.data else []
+        user_projects = repo.to_dicts(repo.user_submissions.all(
+            repo.user_submissions.columns, order_by="submitted_at", user_id=current_user_id
+        ))
         
-        skills_result = supabase.table("user_skills_analysis").select("*").eq("user_id", current_user_id).order("created_at", desc=True).limit(1).execute()
+        skills_result = supabase.table("user_skills_analysis").select("strengths").eq("user_id", current_user_id).order("created_at", desc=True).limit(1).execute()
         user_skills = skills_result.data[0] if skills_result.data else {}
         
         # Generate resume using AI agent
@@ -841,21 +873,23 @@ def get_level_requirements(current_user_id):
     """Get detailed level progression requirements and current status"""
     try:
         # Get current user progress
-        progress_result = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-        if not progress_result.data:
+        current_progress = repo.user_progress.first(repo.PROGRESS_COLUMNS, user_id=current_user_id)
+        if not current_progress:
             return jsonify({"error": "User progress not found"}), 404
         
-        current_progress = progress_result.data[0]
-        current_level = current_progress["current_level"]
-        current_xp = current_progress["xp_points"]
+        current_level = current_progress.current_level
+        current_xp = current_progress.xp_points
         
         # Get user's recent submissions to check completion status
-        submissions_result = supabase.table("user_submissions").select("*").eq("user_id", current_user_id).order("submitted_at", desc=True).limit(10).execute()
-        recent_submissions = submissions_result.data if submissions_result.data else []
+        recent_submissions = repo.to_dicts(repo.user_submissions.find(
+            SUBMISSION_SUMMARY_COLUMNS, order_by="submitted_at", limit=10, user_id=current_user_id
+        ))
         
-        # Get AI issues assigned to user
-        issues_result = supabase.table("ai_issues").select("*").eq("user_id", current_user_id).execute()
-        assigned_issues = issues_result.data if issues_result.data else []
+        # Get AI issues assigned to user (count only, plus a short preview)
+        total_issues_assigned = repo.ai_issues.count(user_id=current_user_id)
+        assigned_issues = repo.to_dicts(repo.ai_issues.find(
+            ISSUE_SUMMARY_COLUMNS, order_by="created_at", limit=5, user_id=current_user_id
+        ))
         
         # Calculate level requirements
         xp_required_for_current_level = (current_level - 1) * 1500
@@ -891,7 +925,7 @@ def get_level_requirements(current_user_id):
                 "xp_requirement_met": current_xp >= xp_required_for_next_level
             },
             "progress_summary": {
-                "total_issues_assigned": len(assigned_issues),
+                "total_issues_assigned": total_issues_assigned,
                 "completed_submissions": len(recent_submissions),
                 "current_badges": current_progress.get("badges", []),
                 "next_goal": current_progress.get("next_goal", "Complete your first project")
@@ -940,6 +974,8 @@ def get_user_id_from_request():
 @bp.route("/api/cv/analyze", methods=["POST"])
 def comprehensive_cv_analysis():
     """Comprehensive CV analysis using CVAnalysisAgent from main.py"""
+    timer = operation_logger.timer()
+    current_user_id = None
     try:
         # Get current user ID from either JWT or cookie auth
         current_user_id = get_user_id_from_request()
@@ -1260,7 +1296,7 @@ def comprehensive_cv_analysis():
         resume_data = {
             "user_id": current_user_id,
             "resume_data": {
-                "cv_text": cv_text,
+                "cv_text": blob_store.put(cv_text),
                 "extracted_skills": skills,
                 "career_goals": goals.__dict__ if goals and hasattr(goals, '__dict__') else {},
                 "analysis_summary": {
@@ -1291,13 +1327,10 @@ def comprehensive_cv_analysis():
             },
             "success": True,
             "ai_model_used": "CVAnalysisAgent + Gemini LLM",
-            "execution_time_ms": 5000
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         # Prepare comprehensive response
         response = {
@@ -1368,6 +1401,7 @@ def comprehensive_cv_analysis():
         return jsonify(response)
         
     except Exception as e:
+        operation_logger.log_failure("comprehensive_cv_analysis", current_user_id, e, timer, ai_model_used="CVAnalysisAgent + Gemini LLM")
         print(f"❌ CV analysis failed: {str(e)}")
         return jsonify({
             "success": False,
@@ -1379,6 +1413,7 @@ def comprehensive_cv_analysis():
 @token_required
 def generate_learning_roadmap(current_user_id):
     """Generate personalized learning roadmap using Agent2"""
+    timer = operation_logger.timer()
     try:
         # Get request data
         data = request.get_json()
@@ -1494,13 +1529,10 @@ def generate_learning_roadmap(current_user_id):
             },
             "success": True,
             "ai_model_used": "Agent2 + OpenAI GPT-4o-mini",
-            "execution_time_ms": 8000
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"⚠️ Failed to log operation: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -1515,6 +1547,7 @@ def generate_learning_roadmap(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("learning_roadmap_generation", current_user_id, e, timer, ai_model_used="Agent2 + OpenAI GPT-4o-mini")
         print(f"❌ Roadmap generation failed: {str(e)}")
         return jsonify({
             "success": False,
@@ -1541,26 +1574,35 @@ def generate_portfolio_project(current_user_id):
         except Exception:
             skill_level = 1
         
-        # Import and initialize Agent2
-        try:
-            import sys
-            agent_path = Path(__file__).parent.parent.parent / "agents" / "agent2"
-            sys.path.append(str(agent_path))
-            
-            from main import Agent2Integration
-            
-            agent = Agent2Integration()
-            print(f"✅ Agent2 initialized for portfolio project")
+        # Precomputed portfolio one level up; the LLM only covers focus areas it lacks
+        target_role = data.get('target_role', 'software_engineer')
+        blueprint = blueprint_library.get(target_role, skill_level + 1)
+        if blueprint and blueprint.portfolio.get("project"):
+            print(f"📚 Using blueprint portfolio {target_role}/{blueprint.bucket} v{blueprint.version}")
+            portfolio = blueprint.personalize_portfolio(
+                str(current_user_id), skill_level, focus_areas, agent2_portfolio_issues
+            )
+        else:
+            # Import and initialize Agent2
+            try:
+                import sys
+                agent_path = Path(__file__).parent.parent.parent / "agents" / "agent2"
+                sys.path.append(str(agent_path))
+                
+                from main import Agent2Integration
+                
+                agent = Agent2Integration()
+                print(f"✅ Agent2 initialized for portfolio project")
+                
+            except ImportError as e:
+                print(f"⚠️ Failed to import Agent2: {str(e)}")
+                return jsonify({"error": "Agent2 not available", "details": str(e)}), 500
             
-        except ImportError as e:
-            print(f"⚠️ Failed to import Agent2: {str(e)}")
-            return jsonify({"error": "Agent2 not available", "details": str(e)}), 500
-        
-        # Generate portfolio project
-        print(f"🎨 Generating portfolio project for level {skill_level}")
-        portfolio = agent.generate_portfolio_project(
-            str(current_user_id), skill_level, focus_areas
-        )
+            # Generate portfolio project
+            print(f"🎨 Generating portfolio project for level {skill_level}")
+            portfolio = agent.generate_portfolio_project(
+                str(current_user_id), skill_level, focus_areas
+            )
         
         if "error" in portfolio:
             return jsonify({"error": portfolio["error"]}), 500
@@ -1682,7 +1724,9 @@ def update_learning_progress(current_user_id):
             }
             
             try:
+                previous_xp = leaderboard_service.stored_xp(current_user_id)
                 supabase.table("user_progress").upsert(progress_data).execute()
+                leaderboard_service.update_points(current_user_id, progress_data["xp_points"], previous_xp)
                 print("✅ User progress updated in database")
             except Exception as e:
                 print(f"⚠️ Failed to update user progress: {e}")
@@ -1732,6 +1776,7 @@ def update_learning_progress(current_user_id):
 @token_required
 def create_learning_repository(current_user_id):
     """Create single learning repository with structured folders based on roadmap"""
+    timer = operation_logger.timer()
     try:
         # Get form data
         target_role = request.form.get('target_role', 'software_engineer')
@@ -1740,8 +1785,8 @@ def create_learning_repository(current_user_id):
         make_public = request.form.get('make_public', 'false').lower() == 'true'
         
         # Get user's current level and skills
-        user_progress = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-        current_level = user_progress.data[0]["current_level"] if user_progress.data else 1
+        user_progress = repo.user_progress.first(("current_level",), user_id=current_user_id)
+        current_level = user_progress.current_level if user_progress else 1
         
         # Get user's GitHub access token
         user_result = supabase.table("users").select("github_access_token").eq("id", current_user_id).execute()
@@ -1752,8 +1797,25 @@ def create_learning_repository(current_user_id):
         if not github_token:
             return jsonify({"error": "GitHub access token not found. Please authenticate with GitHub first."}), 400
         
-        # Generate learning roadmap
-        roadmap_data = ai_service.generate_roadmap(current_level, target_role, user_skills)
+        # Skills and gaps from the latest analysis, plus any gaps sent with the request
+        user_skills, skill_gaps = _latest_skills_and_gaps(current_user_id)
+        skill_gaps += [gap.strip() for gap in request.form.get('skill_gaps', '').split(',') if gap.strip()]
+        
+        # Serve the precomputed blueprint for this role/level; the LLM only fills uncovered gaps
+        tree = None
+        issues = None
+        blueprint_delta = None
+        blueprint = blueprint_library.get(target_role, current_level)
+        if blueprint:
+            personalized = blueprint.personalize(skill_gaps, agent2_delta_generator)
+            roadmap_data = personalized["roadmap"]
+            tree = (personalized["files"], personalized["folders"])
+            issues = personalized["issues"]
+            blueprint_delta = personalized["delta"]
+            print(f"📚 Using blueprint {target_role}/{blueprint.bucket} v{blueprint.version} "
+                  f"(+{blueprint_delta['added_tasks']} personalised tasks)")
+        else:
+            roadmap_data = _generated_learning_roadmap(current_level, target_role, user_skills, current_user_id)
         
         if not roadmap_data:
             return jsonify({"error": "Failed to generate learning roadmap"}), 500
@@ -1771,7 +1833,8 @@ def create_learning_repository(current_user_id):
             ai_service, 
             github_token, 
             repo_data, 
-            roadmap_data
+            roadmap_data,
+            tree=tree
         )
         
         # Create issues for each level/folder
@@ -1780,7 +1843,9 @@ def create_learning_repository(current_user_id):
             github_token,
             repo_data,
             roadmap_data,
-            created_folders
+            created_folders,
+            user_id=current_user_id,
+            issues=issues
         )
         
         # Store onboarding data
@@ -1848,7 +1913,9 @@ def create_learning_repository(current_user_id):
         }
         
         try:
+            previous_xp = leaderboard_service.stored_xp(current_user_id)
             supabase.table("user_progress").upsert(progress_data).execute()
+            leaderboard_service.update_points(current_user_id, progress_data["xp_points"], previous_xp)
         except Exception as e:
             print(f"Progress storage error: {e}")
         
@@ -1864,14 +1931,11 @@ def create_learning_repository(current_user_id):
                 "learning_issues": created_issues
             },
             "success": True,
-            "ai_model_used": "AI Agent + GitHub API",
-            "execution_time_ms": 10000
+            "ai_model_used": "Blueprint Library + GitHub API" if blueprint else "AI Agent + GitHub API",
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"Operation logging error: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -1879,6 +1943,7 @@ def create_learning_repository(current_user_id):
             "repository": repo_data,
             "folder_structure": created_folders,
             "learning_issues": created_issues,
+            "blueprint": blueprint_delta,
             "onboarding": onboarding_data,
             "next_steps": [
                 "Review your learning roadmap",
@@ -1888,144 +1953,81 @@ def create_learning_repository(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("create_learning_repository", current_user_id, e, timer)
         return jsonify({"error": f"Repository creation failed: {str(e)}"}), 500
 
-def create_roadmap_folder_structure(github_service, token, repo_data, roadmap_data):
-    """Create folder structure based on roadmap levels"""
-    folders_created = []
-    
-    for milestone in roadmap_data.get("milestones", []):
-        level_name = milestone.get("name", "Unknown Level")
-        level_description = milestone.get("description", "")
-        
-        # Create level folder
-        folder_path = f"Level-{level_name.replace(' ', '-')}"
-        
-        # Create README for the level
-        readme_content = f"""# {level_name}
-
-{level_description}
-
-## Learning Objectives
-{chr(10).join([f"- {obj}" for obj in milestone.get("learning_objectives", [])])}
-
-## Skills Covered
-{chr(10).join([f"- {skill}" for skill in milestone.get("skills_covered", [])])}
-
-## Estimated Duration
-{milestone.get("duration", "2-4 weeks")}
-
-## Projects in This Level
-{chr(10).join([f"- {task.get('title', 'Task')}" for task in milestone.get("tasks", [])])}
-"""
-        
-        # Create folder and README using GitHub API
-        github_service.create_file(
-            token=token,
-            owner=repo_data["owner"]["login"],
-            repo_name=repo_data["name"],
-            path=f"{folder_path}/README.md",
-            message=f"Add {level_name} level structure",
-            content=readme_content
-        )
-        
-        # Create subfolders for each task
-        for task in milestone.get("tasks", []):
-            task_folder = f"{folder_path}/{task.get('title', 'Task').replace(' ', '-').lower()}"
-            
-            # Create task README
-            task_readme = f"""# {task.get('title', 'Task')}
-
-{task.get('description', 'Complete this learning task')}
+def _generated_learning_roadmap(current_level, target_role, user_skills, user_id):
+    """Learning roadmap for a role without a blueprint.
 
-## Skills Required
-{chr(10).join([f"- {skill}" for skill in task.get("skills_required", [])])}
+    Uses the AI service's roadmap when it has level milestones with tasks (the
+    shape the repository tree is rendered from); otherwise the built-in role path.
+    """
+    from .projects import create_fallback_roadmap
 
-## Acceptance Criteria
-{chr(10).join([f"- {criteria}" for criteria in task.get("acceptance_criteria", [])])}
-
-## Resources
-{chr(10).join([f"- {resource}" for resource in task.get("resources", [])])}
+    try:
+        generated = ai_service.generate_learning_roadmap(current_level, target_role, user_id)
+    except Exception as e:
+        print(f"⚠️ Roadmap generation failed, using the built-in path: {e}")
+        generated = None
+    milestones = (generated or {}).get("milestones") or []
+    if any(isinstance(milestone, dict) and milestone.get("tasks") for milestone in milestones):
+        return generated
+    skills = [skill for skill in user_skills if isinstance(skill, dict) and skill.get("name")]
+    return create_fallback_roadmap(target_role, skills, current_level)
 
-## Estimated Time
-{task.get('estimated_time', '2-4 hours')}
+def _latest_skills_and_gaps(user_id):
+    """(skills, skill gaps) from the user's most recent skills analysis"""
+    try:
+        row = repo.user_skills_analysis.first(("analysis_data", "growth_areas"), order_by="created_at", user_id=user_id)
+    except Exception as e:
+        print(f"⚠️ Could not load skills analysis: {e}")
+        return [], []
+    if not row:
+        return [], []
+    analysis = blob_store.resolve(row.to_dict(), skip_keys={"cv_text"}).get("analysis_data") or {}
+    skills = analysis.get("skills", []) if isinstance(analysis, dict) else []
+    gaps = list(row.growth_areas or [])
+    if isinstance(analysis, dict):
+        gaps += analysis.get("skill_analysis", {}).get("skill_gaps", [])
+    return skills, gaps
 
-## Difficulty
-{task.get('difficulty', 'Medium')}
-"""
-            
-            github_service.create_file(
-                token=token,
-                owner=repo_data["owner"]["login"],
-                repo_name=repo_data["name"],
-                path=f"{task_folder}/README.md",
-                message=f"Add {task.get('title', 'Task')} structure",
-                content=task_readme
-            )
-            
-            folders_created.append({
-                "level": level_name,
-                "task": task.get('title', 'Task'),
-                "path": task_folder,
-                "difficulty": task.get('difficulty', 'Medium')
-            })
-    
-    return folders_created
+def create_roadmap_folder_structure(github_service, token, repo_data, roadmap_data, tree=None):
+    """Create folder structure based on roadmap levels in a single commit.
 
-def create_level_based_issues(github_service, token, repo_data, roadmap_data, folders):
-    """Create GitHub issues for each level/task"""
-    issues_created = []
+    ``tree`` is a prerendered (files, folders) pair, e.g. from a blueprint.
+    """
+    files, folders = tree or render_roadmap_tree(roadmap_data)
     
-    for folder in folders:
-        # Create issue for each task
-        issue_title = f"🎯 {folder['level']}: {folder['task']}"
-        issue_body = f"""## Learning Task: {folder['task']}
-
-**Level:** {folder['level']}
-**Difficulty:** {folder['difficulty']}
-**Folder Path:** `{folder['path']}`
-
-### Task Description
-Complete the learning task in the `{folder['path']}` folder.
+    # Blobs -> tree -> one commit instead of a Contents API PUT (and commit) per file
+    result = git_tree_writer.write_files(
+        token,
+        repo_data["owner"]["login"],
+        repo_data["name"],
+        files,
+        message="Add learning roadmap structure"
+    )
+    written = set(result["paths"])
+    return [folder for folder in folders if f"{folder['path']}/README.md" in written]
 
-### What to Do
-1. Navigate to the `{folder['path']}` folder
-2. Read the README.md file for requirements
-3. Complete the task according to acceptance criteria
-4. Commit your solution
-5. Create a pull request when ready
+def create_level_based_issues(github_service, token, repo_data, roadmap_data, folders, user_id=None, issues=None):
+    """Create GitHub issues for each level/task.
 
-### Resources Available
-- Check the README.md in the task folder
-- Review the main roadmap README.md
-- Use the learning objectives as guidance
-
-### Acceptance Criteria
-- [ ] Task completed according to README requirements
-- [ ] Code follows best practices
-- [ ] Documentation updated
-- [ ] Tests passing (if applicable)
-
-**Good luck with your learning journey! 🚀**
-"""
-        
-        issue = github_service.create_issue(
-            token=token,
-            owner=repo_data["owner"]["login"],
-            repo_name=repo_data["name"],
-            title=issue_title,
-            body=issue_body,
-            labels=["learning-task", f"level-{folder['level'].lower()}", f"difficulty-{folder['difficulty'].lower()}"]
-        )
-        
-        if issue:
-            issues_created.append({
-                "title": issue_title,
-                "number": issue.get("number"),
-                "url": issue.get("html_url"),
-                "level": folder['level'],
-                "task": folder['task'],
-                "difficulty": folder['difficulty']
-            })
+    ``issues`` are prerendered issue dicts (e.g. from a blueprint); only those
+    whose folder was written are published.
+    """
+    written = {(folder['level'], folder['task']) for folder in folders}
+    issue_specs = [
+        IssueSpec(title=issue["title"], body=issue["body"], labels=issue["labels"], meta=issue["meta"])
+        for issue in (render_level_issues(folders) if issues is None else issues)
+        if (issue["meta"]["level"], issue["meta"]["task"]) in written
+    ]
     
-    return issues_created 
\ No newline at end of file
+    # Concurrent, paced and idempotent: re-running skips issues that already exist
+    results = issue_publisher.publish(
+        token,
+        repo_data["owner"]["login"],
+        repo_data["name"],
+        issue_specs,
+        user_id=user_id
+    )
+    return [result for result in results if result["status"] != "failed"] 
\ No newline at end of file
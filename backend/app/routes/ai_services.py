@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from ..utils.decorators import token_required
+from ..utils.pagination import paginated_response
 from ..services.supabase_client import supabase
+from ..services.blob_store import blob_store
+from ..services import data_repository as repo
+from ..services.leaderboard_service import leaderboard_service, PERIODS
 from datetime import datetime, timedelta, timezone
 
 bp = Blueprint("ai_services", __name__)
@@ -10,11 +14,13 @@ bp = Blueprint("ai_services", __name__)
 def tech_recommendations(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("tech_recommendations").select("*").eq("user_id", current_user_id).execute()
-            return jsonify({
-                "success": True,
-                "recommendations": result.data
-            })
+            def fetch_page(cursor, limit):
+                rows, next_cursor = repo.tech_recommendations.page(
+                    repo.tech_recommendations.columns, cursor=cursor, limit=limit, user_id=current_user_id
+                )
+                return repo.to_dicts(rows), next_cursor
+            
+            return paginated_response("recommendations", fetch_page)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch tech recommendations: {str(e)}"}), 500
     
@@ -44,11 +50,13 @@ def tech_recommendations(current_user_id):
 def repository_roadmap(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("repository_roadmaps").select("*").eq("user_id", current_user_id).execute()
-            return jsonify({
-                "success": True,
-                "roadmaps": result.data
-            })
+            def fetch_page(cursor, limit):
+                rows, next_cursor = repo.repository_roadmaps.page(
+                    repo.repository_roadmaps.columns, cursor=cursor, limit=limit, user_id=current_user_id
+                )
+                return repo.to_dicts(rows), next_cursor
+            
+            return paginated_response("roadmaps", fetch_page)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch roadmaps: {str(e)}"}), 500
     
@@ -78,11 +86,13 @@ def repository_roadmap(current_user_id):
 def user_skills_analysis(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("user_skills_analysis").select("*").eq("user_id", current_user_id).execute()
-            return jsonify({
-                "success": True,
-                "skills_analysis": result.data
-            })
+            def fetch_page(cursor, limit):
+                rows, next_cursor = repo.user_skills_analysis.page(
+                    repo.user_skills_analysis.columns, cursor=cursor, limit=limit, user_id=current_user_id
+                )
+                return blob_store.resolve(repo.to_dicts(rows), skip_keys={"cv_text"}), next_cursor
+            
+            return paginated_response("skills_analysis", fetch_page)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch skills analysis: {str(e)}"}), 500
     
@@ -112,11 +122,11 @@ def user_skills_analysis(current_user_id):
 def user_onboarding(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("user_onboarding").select("*").eq("user_id", current_user_id).execute()
-            if result.data:
+            onboarding = repo.user_onboarding.first(repo.user_onboarding.columns, user_id=current_user_id)
+            if onboarding:
                 return jsonify({
                     "success": True,
-                    "onboarding": result.data[0]
+                    "onboarding": onboarding.to_dict()
                 })
             else:
                 return jsonify({
@@ -160,34 +170,74 @@ def user_onboarding(current_user_id):
 @token_required
 def user_achievements(current_user_id):
     try:
-        result = supabase.table("user_achievements").select("*").eq("user_id", current_user_id).execute()
-        return jsonify({
-            "success": True,
-            "achievements": result.data
-        })
+        def fetch_page(cursor, limit):
+            rows, next_cursor = repo.user_achievements.page(
+                repo.user_achievements.columns, cursor=cursor, limit=limit,
+                order_by="earned_at", user_id=current_user_id
+            )
+            return repo.to_dicts(rows), next_cursor
+        
+        return paginated_response("achievements", fetch_page)
     except Exception as e:
         return jsonify({"error": f"Failed to fetch achievements: {str(e)}"}), 500
 
 @bp.route("/api/leaderboard")
 def leaderboard():
     try:
-        result = supabase.table("leaderboard").select("*").order("total_points", desc=True).limit(50).execute()
+        period = request.args.get("period", "all_time")
+        if period not in PERIODS:
+            return jsonify({"error": f"Invalid period. Use one of: {', '.join(PERIODS)}"}), 400
+        limit = max(1, min(request.args.get("limit", 50, type=int), 100))
+        
+        entries = leaderboard_service.top(limit, period=period)
+        
+        # Attach display names for the visible page only
+        user_ids = [entry["user_id"] for entry in entries]
+        if user_ids:
+            users_result = supabase.table("users").select("id, github_username, avatar_url").in_("id", user_ids).execute()
+            users_by_id = {user["id"]: user for user in users_result.data or []}
+            for entry in entries:
+                user = users_by_id.get(entry["user_id"], {})
+                entry["github_username"] = user.get("github_username")
+                entry["avatar_url"] = user.get("avatar_url")
+        
         return jsonify({
             "success": True,
-            "leaderboard": result.data
+            "period": period,
+            "leaderboard": entries
         })
     except Exception as e:
         return jsonify({"error": f"Failed to fetch leaderboard: {str(e)}"}), 500
 
+@bp.route("/api/leaderboard/me")
+@token_required
+def leaderboard_position(current_user_id):
+    try:
+        period = request.args.get("period", "all_time")
+        if period not in PERIODS:
+            return jsonify({"error": f"Invalid period. Use one of: {', '.join(PERIODS)}"}), 400
+        radius = max(0, min(request.args.get("radius", 5, type=int), 25))
+        
+        return jsonify({
+            "success": True,
+            "position": leaderboard_service.position(current_user_id, period=period, radius=radius)
+        })
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch leaderboard position: {str(e)}"}), 500
+
 @bp.route("/api/agent/operations", methods=["GET", "POST"])
 @token_required
 def agent_operations(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("agent_operations").select("*").eq("user_id", current_user_id).order("created_at", desc=True).limit(100).execute()
+            rows = repo.agent_operations.find(
+                ("id", "operation_type", "target_repository", "success", "error_message",
+                 "execution_time_ms", "ai_model_used", "created_at"),
+                order_by="created_at", limit=100, user_id=current_user_id
+            )
             return jsonify({
                 "success": True,
-                "operations": result.data
+                "operations": repo.to_dicts(rows)
             })
         except Exception as e:
             return jsonify({"error": f"Failed to fetch agent operations: {str(e)}"}), 500
@@ -139,7 +139,7 @@ def github_exchange():
         # Database operations with error handling
         try:
             # Check if user exists
-            existing_user = supabase.table("users").select("*").eq("github_user_id", github_user["id"]).execute()
+            existing_user = supabase.table("users").select("id").eq("github_user_id", github_user["id"]).execute()
             
             if existing_user.data:
                 # Update existing user
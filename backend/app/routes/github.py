@@ -5,7 +5,15 @@ from datetime import datetime, timedelta, timezone
 from ..config import Config
 from ..services.github_service import GitHubIntegration
 from ..services.supabase_client import supabase
+from ..services.blob_store import blob_store
+from ..services import data_repository as repo
+from ..services.leaderboard_service import leaderboard_service
+from ..services.contribution_calendar import contribution_calendar_service, ContributionFetchError
+from ..services.contribution_history import contribution_history_store
+from ..services.activity_ingestor import activity_ingestor, ActivityFetchError, EVENT_WINDOW
+from ..services.repo_stats import repo_stats_engine, RepoStatsError
 from ..utils.decorators import token_required
+from ..utils.pagination import paginated_response
 from ..models import User, AIIssue, AIRepository, RepositoryAnalysis, TechRecommendation
 import os
 import requests
@@ -79,7 +87,8 @@ def test_endpoint():
                 "test_cv_parser": "/test_cv_parser.py"
             },
             "analytics": {
-                "leaderboard": "/api/leaderboard",
+                "leaderboard": "/api/leaderboard?period=all_time|weekly|monthly",
+                "leaderboard_position": "/api/leaderboard/me?radius=5",
                 "agent_operations": "/api/agent/operations"
             },
             "demo_oauth": {
@@ -90,8 +99,9 @@ def test_endpoint():
                 "get_profile": "/demo/api/profile", 
                 "get_repos": "/demo/api/repos",
                 "get_contributions": "/demo/api/contributions/<username> (GraphQL)",
+                "get_contribution_history": "/demo/api/contributions/<username>/history",
                 "get_user_stats": "/demo/api/stats/<username>",
-                "get_user_activity": "/demo/api/activity/<username>",
+                "get_user_activity": "/demo/api/activity/<username>?since=<latest_event_id>",
                 "list_users": "/demo/api/users",
                 "logout": "/demo/logout"
             }
@@ -240,7 +250,7 @@ def github_callback():
         # Try to find existing user first, then upsert
         try:
             # Check if user already exists by github_user_id (primary identifier)
-            existing_user = supabase.table("users").select("*").eq("github_user_id", github_user["id"]).execute()
+            existing_user = supabase.table("users").select("id").eq("github_user_id", github_user["id"]).execute()
             
             if existing_user.data:
                 # User exists, update their information
@@ -250,7 +260,7 @@ def github_callback():
                 print(f"   User updated in database with ID: {user_id}")
             else:
                 # Check if username exists (might be a different user)
-                username_check = supabase.table("users").select("*").eq("github_username", github_user["login"]).execute()
+                username_check = supabase.table("users").select("id").eq("github_username", github_user["login"]).execute()
                 
                 if username_check.data:
                     print(f"   Username '{github_user['login']}' exists but with different ID, updating...")
@@ -338,13 +348,11 @@ def get_user_repositories(current_user_id):
         
         github_token = user_result.data[0]["github_access_token"]
         
-        # Get repositories from GitHub
-        repositories = github_integration.get_user_repositories(github_token)
+        # Get repositories from GitHub, one page at a time
+        def fetch_page(cursor, limit):
+            return github_integration.get_user_repositories_page(github_token, cursor=cursor, per_page=limit)
         
-        return jsonify({
-            "success": True,
-            "repositories": repositories
-        })
+        return paginated_response("repositories", fetch_page)
         
     except Exception as e:
         return jsonify({"error": f"Failed to fetch repositories: {str(e)}"}), 500
@@ -354,18 +362,14 @@ def get_user_repositories(current_user_id):
 def get_user_profile(current_user_id):
     try:
         # Get user profile from database
-        user_result = supabase.table("users").select("*").eq("id", current_user_id).execute()
+        user = repo.users.first(repo.PUBLIC_USER_COLUMNS, id=current_user_id)
         
-        if not user_result.data:
+        if not user:
             return jsonify({"error": "User not found"}), 404
         
-        user_data = user_result.data[0]
-        # Remove sensitive data
-        user_data.pop("github_access_token", None)
-        
         return jsonify({
             "success": True,
-            "user": user_data
+            "user": user.to_dict()
         })
         
     except Exception as e:
@@ -377,11 +381,13 @@ def ai_issues(current_user_id):
     if request.method == "GET":
         try:
             # Get AI issues for the user
-            result = supabase.table("ai_issues").select("*").eq("user_id", current_user_id).execute()
-            return jsonify({
-                "success": True,
-                "issues": result.data
-            })
+            def fetch_page(cursor, limit):
+                rows, next_cursor = repo.ai_issues.page(
+                    repo.ai_issues.columns, cursor=cursor, limit=limit, user_id=current_user_id
+                )
+                return repo.to_dicts(rows), next_cursor
+            
+            return paginated_response("issues", fetch_page)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch AI issues: {str(e)}"}), 500
     
@@ -415,11 +421,13 @@ def ai_issues(current_user_id):
 def ai_repositories(current_user_id):
     if request.method == "GET":
         try:
-            result = supabase.table("ai_repositories").select("*").eq("user_id", current_user_id).execute()
-            return jsonify({
-                "success": True,
-                "repositories": result.data
-            })
+            def fetch_page(cursor, limit):
+                rows, next_cursor = repo.ai_repositories.page(
+                    repo.ai_repositories.columns, cursor=cursor, limit=limit, user_id=current_user_id
+                )
+                return repo.to_dicts(rows), next_cursor
+            
+            return paginated_response("repositories", fetch_page)
         except Exception as e:
             return jsonify({"error": f"Failed to fetch AI repositories: {str(e)}"}), 500
     
@@ -470,11 +478,11 @@ def repository_analysis(current_user_id):
 @token_required
 def get_user_progress(current_user_id):
     try:
-        result = supabase.table("user_progress").select("*").eq("user_id", current_user_id).execute()
-        if result.data:
+        progress = repo.user_progress.first(repo.user_progress.columns, user_id=current_user_id)
+        if progress:
             return jsonify({
                 "success": True,
-                "progress": result.data[0]
+                "progress": progress.to_dict()
             })
         else:
             # Create default progress if none exists
@@ -602,7 +610,7 @@ def demo_github_callback():
         try:
             print(f"🔍 Checking if user exists in database...")
             # Check if user already exists by github_user_id (primary identifier)
-            existing_user = supabase.table("users").select("*").eq("github_user_id", github_user["id"]).execute()
+            existing_user = supabase.table("users").select(", ".join(repo.PUBLIC_USER_COLUMNS)).eq("github_user_id", github_user["id"]).execute()
             
             if existing_user.data:
                 # User exists, update their information
@@ -613,7 +621,7 @@ def demo_github_callback():
                 print(f"   User updated in database with ID: {user_id}")
             else:
                 # Check if username exists (might be a different user)
-                username_check = supabase.table("users").select("*").eq("github_username", github_user["login"]).execute()
+                username_check = supabase.table("users").select(", ".join(repo.PUBLIC_USER_COLUMNS)).eq("github_username", github_user["login"]).execute()
                 
                 if username_check.data:
                     print(f"   Username '{github_user['login']}' exists but with different ID, updating...")
@@ -716,16 +724,15 @@ def demo_get_user():
 
     try:
         # First try to get user from database using the token
-        user_result = supabase.table("users").select("*").eq("github_access_token", token).execute()
+        user_result = supabase.table("users").select(
+            "id, github_username, github_user_id, email, avatar_url, created_at, updated_at"
+        ).eq("github_access_token", token).execute()
         
         if user_result.data:
             user_data = user_result.data[0]
             user_id = user_data["id"]
             github_user_id = user_data["github_user_id"]
             
-            # Remove sensitive data before returning
-            user_data.pop("github_access_token", None)
-            
             # Fetch fresh GitHub data if token is available
             fresh_github_data = {}
             try:
@@ -741,21 +748,23 @@ def demo_get_user():
             
             # 1. User Skills Analysis
             try:
-                skills_result = supabase.table("user_skills_analysis").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(1).execute()
+                skills_result = supabase.table("user_skills_analysis").select(
+                    "id, analysis_data, skill_level, strengths, growth_areas, recommended_learning_path, created_at, expires_at"
+                ).eq("user_id", user_id).order("created_at", desc=True).limit(1).execute()
                 if skills_result.data:
-                    comprehensive_data["skills_analysis"] = skills_result.data[0]
-                    # Remove user_id from nested data to avoid duplication
-                    comprehensive_data["skills_analysis"].pop("user_id", None)
+                    # Raw CV text is not needed by the dashboard; keep it as a blob reference
+                    comprehensive_data["skills_analysis"] = blob_store.resolve(skills_result.data[0], skip_keys={"cv_text"})
             except Exception as e:
                 print(f"Warning: Could not fetch skills analysis: {e}")
                 comprehensive_data["skills_analysis"] = None
             
             # 2. User Progress
             try:
-                progress_result = supabase.table("user_progress").select("*").eq("user_id", user_id).execute()
+                progress_result = supabase.table("user_progress").select(
+                    "id, current_level, xp_points, badges, next_goal, last_updated"
+                ).eq("user_id", user_id).execute()
                 if progress_result.data:
                     comprehensive_data["progress"] = progress_result.data[0]
-                    comprehensive_data["progress"].pop("user_id", None)
                 else:
                     # Create default progress if none exists
                     default_progress = {
@@ -771,7 +780,9 @@ def demo_get_user():
             
             # 3. User Achievements
             try:
-                achievements_result = supabase.table("user_achievements").select("*").eq("user_id", user_id).order("earned_at", desc=True).execute()
+                achievements_result = supabase.table("user_achievements").select(
+                    "achievement_name, description, earned_at"
+                ).eq("user_id", user_id).order("earned_at", desc=True).execute()
                 comprehensive_data["achievements"] = [
                     {
                         "achievement_name": ach["achievement_name"],
@@ -786,27 +797,31 @@ def demo_get_user():
             
             # 4. User Onboarding
             try:
-                onboarding_result = supabase.table("user_onboarding").select("*").eq("user_id", user_id).execute()
+                onboarding_result = supabase.table("user_onboarding").select(
+                    "id, uploaded_cv_url, target_role, chosen_path, onboarding_complete, created_at"
+                ).eq("user_id", user_id).execute()
                 if onboarding_result.data:
                     comprehensive_data["onboarding"] = onboarding_result.data[0]
-                    comprehensive_data["onboarding"].pop("user_id", None)
             except Exception as e:
                 print(f"Warning: Could not fetch onboarding data: {e}")
                 comprehensive_data["onboarding"] = None
             
             # 5. User Resume
             try:
-                resume_result = supabase.table("user_resume").select("*").eq("user_id", user_id).order("last_synced", desc=True).limit(1).execute()
+                resume_result = supabase.table("user_resume").select(
+                    "id, resume_data, last_synced"
+                ).eq("user_id", user_id).order("last_synced", desc=True).limit(1).execute()
                 if resume_result.data:
-                    comprehensive_data["resume"] = resume_result.data[0]
-                    comprehensive_data["resume"].pop("user_id", None)
+                    comprehensive_data["resume"] = blob_store.resolve(resume_result.data[0], skip_keys={"cv_text"})
             except Exception as e:
                 print(f"Warning: Could not fetch resume data: {e}")
                 comprehensive_data["resume"] = None
             
             # 6. Repository Analyses
             try:
-                analyses_result = supabase.table("repository_analyses").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(10).execute()
+                analyses_result = supabase.table("repository_analyses").select(
+                    "id, owner, repo_name, analysis_type, analysis_data, overall_score, created_at, expires_at"
+                ).eq("user_id", user_id).order("created_at", desc=True).limit(10).execute()
                 comprehensive_data["repository_analyses"] = [
                     {
                         "id": analysis["id"],
@@ -826,7 +841,9 @@ def demo_get_user():
             
             # 7. Tech Recommendations
             try:
-                tech_result = supabase.table("tech_recommendations").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
+                tech_result = supabase.table("tech_recommendations").select(
+                    "id, owner, repo_name, current_stack, recommendations, implementation_priority, created_at, expires_at"
+                ).eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
                 comprehensive_data["tech_recommendations"] = [
                     {
                         "id": rec["id"],
@@ -846,12 +863,14 @@ def demo_get_user():
             
             # 8. Leaderboard Position
             try:
-                leaderboard_result = supabase.table("leaderboard").select("*").eq("user_id", user_id).execute()
-                if leaderboard_result.data:
+                position = leaderboard_service.position(user_id)
+                if position["current_rank"] is not None:
                     comprehensive_data["leaderboard"] = {
-                        "total_points": leaderboard_result.data[0]["total_points"],
-                        "current_rank": leaderboard_result.data[0].get("current_rank"),
-                        "last_updated": leaderboard_result.data[0]["last_updated"]
+                        "total_points": position["total_points"],
+                        "current_rank": position["current_rank"],
+                        "total_ranked": position["total_ranked"],
+                        "weekly_rank": leaderboard_service.position(user_id, period="weekly")["current_rank"],
+                        "monthly_rank": leaderboard_service.position(user_id, period="monthly")["current_rank"]
                     }
             except Exception as e:
                 print(f"Warning: Could not fetch leaderboard data: {e}")
@@ -859,7 +878,9 @@ def demo_get_user():
             
             # 9. AI Issues (Recent)
             try:
-                ai_issues_result = supabase.table("ai_issues").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
+                ai_issues_result = supabase.table("ai_issues").select(
+                    "id, owner, repo_name, issue_title, priority, complexity, status, estimated_hours, created_at"
+                ).eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
                 comprehensive_data["recent_ai_issues"] = [
                     {
                         "id": issue["id"],
@@ -880,7 +901,9 @@ def demo_get_user():
             
             # 10. AI Repositories
             try:
-                ai_repos_result = supabase.table("ai_repositories").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
+                ai_repos_result = supabase.table("ai_repositories").select(
+                    "id, repo_name, requirements, created_files, created_issues, created_at"
+                ).eq("user_id", user_id).order("created_at", desc=True).limit(5).execute()
                 comprehensive_data["ai_repositories"] = [
                     {
                         "id": repo["id"],
@@ -1045,18 +1068,14 @@ def demo_get_profile():
 
     try:
         # Get user from database using the token
-        user_result = supabase.table("users").select("*").eq("github_access_token", token).execute()
+        user = repo.users.first(repo.PUBLIC_USER_COLUMNS, github_access_token=token)
         
-        if not user_result.data:
+        if not user:
             return jsonify({"error": "User not found in database"}), 404
         
-        user_data = user_result.data[0]
-        # Remove sensitive data
-        user_data.pop("github_access_token", None)
-        
         return jsonify({
             "success": True,
-            "user": user_data
+            "user": user.to_dict()
         })
         
     except Exception as e:
@@ -1067,13 +1086,11 @@ def demo_get_profile():
 def demo_list_users():
     """List all users in database (for testing/admin purposes)"""
     try:
-        users_result = supabase.table("users").select("id, github_username, github_user_id, email, avatar_url, created_at, updated_at").execute()
+        def fetch_page(cursor, limit):
+            rows, next_cursor = repo.users.page(repo.PUBLIC_USER_COLUMNS, cursor=cursor, limit=limit)
+            return repo.to_dicts(rows), next_cursor
         
-        return jsonify({
-            "success": True,
-            "users": users_result.data,
-            "count": len(users_result.data)
-        })
+        return paginated_response("users", fetch_page)
         
     except Exception as e:
         print(f"❌ Error listing users: {str(e)}")
@@ -1090,180 +1107,50 @@ def demo_get_contributions(username):
     period = request.args.get('period', 'year')  # year, 6months, 3months
     
     try:
-        # GitHub GraphQL API for contribution data
-        graphql_query = """
-        query($userName: String!) { 
-          user(login: $userName){
-            contributionsCollection {
-              contributionCalendar {
-                totalContributions
-                weeks {
-                  contributionDays {
-                    contributionCount
-                    date
-                    color
-                  }
-                }
-              }
-            }
-            repositories(first: 20, orderBy: {field: UPDATED_AT, direction: DESC}, ownerAffiliations: OWNER) {
-              nodes {
-                primaryLanguage {
-                  name
-                }
-              }
-            }
-          }
-        }
-        """
-        
-        variables = {"userName": username}
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
-        payload = {
-            "query": graphql_query,
-            "variables": variables
-        }
-        
-        print(f"🔍 Fetching GitHub GraphQL contribution data for: {username}")
-        
-        response = requests.post(
-            "https://api.github.com/graphql",
-            json=payload,
-            headers=headers,
-            timeout=10
-        )
-        
-        if response.status_code != 200:
-            print(f"❌ GraphQL request failed with status: {response.status_code}")
-            print(f"Response: {response.text}")
-            return jsonify({"error": f"GraphQL request failed: {response.status_code}"}), 400
-        
-        data = response.json()
-        
-        if "errors" in data:
-            print(f"❌ GraphQL errors: {data['errors']}")
-            return jsonify({"error": f"GraphQL errors: {data['errors']}"}), 400
-        
-        # Extract contribution data
-        contribution_calendar = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]
-        total_contributions = contribution_calendar["totalContributions"]
-        weeks_data = contribution_calendar["weeks"]
-        
-        # Process contribution data into flat array
-        contribution_data = []
-        for week in weeks_data:
-            for day in week["contributionDays"]:
-                # Convert GitHub's contribution count to our 0-4 level system
-                count = day["contributionCount"]
-                if count == 0:
-                    level = 0
-                elif count <= 2:
-                    level = 1
-                elif count <= 4:
-                    level = 2
-                elif count <= 6:
-                    level = 3
-                else:
-                    level = 4
-                
-                contribution_data.append({
-                    'date': day["date"],
-                    'count': count,
-                    'level': level,
-                    'color': day.get("color", "#0d1117")  # GitHub's actual color
-                })
-        
-        # Filter by period if not year
-        if period != 'year':
-            from datetime import datetime, timedelta
-            
-            days_map = {
-                '6months': 180,
-                '3months': 90
-            }
-            days_back = days_map.get(period, 365)
-            
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
-            
-            # Filter contributions to the specified period
-            filtered_data = []
-            filtered_total = 0
-            
-            for day in contribution_data:
-                day_date = datetime.strptime(day['date'], '%Y-%m-%d')
-                if start_date <= day_date <= end_date:
-                    filtered_data.append(day)
-                    filtered_total += day['count']
-            
-            contribution_data = filtered_data
-            total_contributions = filtered_total
-        
-        # Extract language statistics
-        languages = {}
-        repositories = data["data"]["user"]["repositories"]["nodes"]
-        for repo in repositories:
-            if repo["primaryLanguage"]:
-                lang = repo["primaryLanguage"]["name"]
-                languages[lang] = languages.get(lang, 0) + 1
-        
-        # Calculate contribution streaks
-        current_streak = 0
-        longest_streak = 0
-        temp_streak = 0
-        
-        # Sort by date to ensure proper order
-        sorted_contributions = sorted(contribution_data, key=lambda x: x['date'])
-        
-        # Calculate current streak (from most recent day backwards)
-        for day in reversed(sorted_contributions):
-            if day['count'] > 0:
-                temp_streak += 1
-                if current_streak == 0:  # Start counting current streak from the end
-                    current_streak = temp_streak
-            else:
-                if current_streak == 0:  # Still looking for current streak
-                    continue
-                else:  # Current streak ended
-                    break
-        
-        # Calculate longest streak
-        temp_streak = 0
-        for day in sorted_contributions:
-            if day['count'] > 0:
-                temp_streak += 1
-                longest_streak = max(longest_streak, temp_streak)
-            else:
-                temp_streak = 0
+        # One GraphQL fetch per user is cached; every period is sliced from it
+        calendar, cached = contribution_calendar_service.get(username, token)
+        view = calendar.view(period)
         
-        print(f"✅ Successfully fetched {len(contribution_data)} days of contribution data")
-        print(f"   Total contributions: {total_contributions}")
-        print(f"   Current streak: {current_streak}")
-        print(f"   Longest streak: {longest_streak}")
+        print(f"✅ Served {len(view['contribution_data'])} days of contribution data ({'cache' if cached else 'graphql'})")
+        print(f"   Total contributions: {view['total_contributions']}")
+        print(f"   Current streak: {view['current_streak']}")
+        print(f"   Longest streak: {view['longest_streak']}")
         
         return jsonify({
             "success": True,
-            "total_contributions": total_contributions,
-            "contribution_data": contribution_data,
-            "current_streak": current_streak,
-            "longest_streak": longest_streak,
-            "languages": languages,
+            **view,
             "username": username,
-            "source": "graphql"
+            "source": "graphql",
+            "cached": cached
         })
         
+    except ContributionFetchError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching contributions: {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch contributions: {str(e)}"}), 500
 
+@bp.route("/demo/api/contributions/<username>/history")
+def demo_get_contribution_history(username):
+    """Lifetime contribution totals, streaks and year-over-year breakdown"""
+    token = request.cookies.get("github_token")
+    if not token:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    try:
+        history = contribution_history_store.get(username, token)
+        summary = history.summary()
+        print(f"✅ Served contribution history for {username}: {len(summary['years'])} years")
+        return jsonify({"success": True, **summary})
+
+    except (ContributionFetchError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error fetching contribution history: {str(e)}")
+        return jsonify({"error": f"Failed to fetch contribution history: {str(e)}"}), 500
+
 @bp.route("/demo/api/stats/<username>")
 def demo_get_user_stats(username):
     """Get comprehensive user statistics from GitHub"""
@@ -1272,99 +1159,23 @@ def demo_get_user_stats(username):
         return jsonify({"error": "Not authenticated"}), 401
 
     try:
-        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
-        
         print(f"🔍 Fetching comprehensive stats for: {username}")
         
-        # Fetch user data
-        user_response = requests.get(f"https://api.github.com/users/{username}", headers=headers, timeout=10)
-        if user_response.status_code != 200:
-            return jsonify({"error": "Failed to fetch user data"}), 400
-        
-        user_data = user_response.json()
-        
-        # Fetch repositories with detailed information
-        repos_response = requests.get(
-            f"https://api.github.com/users/{username}/repos",
-            headers=headers,
-            params={"per_page": 100, "sort": "updated", "type": "owner"},
-            timeout=10
-        )
-        
-        if repos_response.status_code != 200:
-            return jsonify({"error": "Failed to fetch repositories"}), 400
-        
-        repos = repos_response.json()
-        
-        # Calculate repository statistics
-        total_stars = sum(repo.get("stargazers_count", 0) for repo in repos)
-        total_forks = sum(repo.get("forks_count", 0) for repo in repos)
-        total_watchers = sum(repo.get("watchers_count", 0) for repo in repos)
-        total_issues = sum(repo.get("open_issues_count", 0) for repo in repos)
-        
-        # Language statistics
-        languages = {}
-        for repo in repos:
-            if repo.get("language"):
-                languages[repo["language"]] = languages.get(repo["language"], 0) + 1
-        
-        # Repository type breakdown
-        public_repos = len([r for r in repos if not r.get("private", False)])
-        private_repos = len([r for r in repos if r.get("private", False)])
-        forked_repos = len([r for r in repos if r.get("fork", False)])
-        original_repos = len([r for r in repos if not r.get("fork", False)])
+        # Every repository page is fetched concurrently; results are cached per user
+        stats, cached = repo_stats_engine.get(username, token)
         
-        # Recent activity (last 30 days)
-        from datetime import datetime, timedelta
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_repos = [
-            r for r in repos 
-            if datetime.strptime(r["updated_at"][:19], "%Y-%m-%dT%H:%M:%S") > thirty_days_ago
-        ]
-        
-        stats = {
-            "user_info": {
-                "login": user_data["login"],
-                "name": user_data.get("name", ""),
-                "bio": user_data.get("bio", ""),
-                "location": user_data.get("location", ""),
-                "company": user_data.get("company", ""),
-                "blog": user_data.get("blog", ""),
-                "email": user_data.get("email", ""),
-                "avatar_url": user_data["avatar_url"],
-                "public_repos": user_data["public_repos"],
-                "followers": user_data["followers"],
-                "following": user_data["following"],
-                "created_at": user_data["created_at"],
-            },
-            "repository_stats": {
-                "total_repositories": len(repos),
-                "public_repositories": public_repos,
-                "private_repositories": private_repos,
-                "forked_repositories": forked_repos,
-                "original_repositories": original_repos,
-                "total_stars": total_stars,
-                "total_forks": total_forks,
-                "total_watchers": total_watchers,
-                "total_open_issues": total_issues,
-                "recent_activity_count": len(recent_repos)
-            },
-            "languages": dict(sorted(languages.items(), key=lambda x: x[1], reverse=True)),
-            "recent_repositories": recent_repos[:10],  # Top 10 recent
-            "top_starred_repositories": sorted(
-                repos, key=lambda r: r.get("stargazers_count", 0), reverse=True
-            )[:10]
-        }
-        
-        print(f"✅ Successfully compiled stats for {username}")
+        print(f"✅ Successfully compiled stats for {username}{' (cached)' if cached else ''}")
         
         return jsonify({
             "success": True,
             "username": username,
             "stats": stats,
+            "cached": cached,
             "generated_at": datetime.now().isoformat()
         })
         
+    except RepoStatsError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching user stats: {str(e)}")
         import traceback
@@ -1373,70 +1184,28 @@ def demo_get_user_stats(username):
 
 @bp.route("/demo/api/activity/<username>")
 def demo_get_user_activity(username):
-    """Get user's recent GitHub activity"""
+    """Get user's recent GitHub activity from the ingested event buffer"""
     token = request.cookies.get("github_token")
     if not token:
         return jsonify({"error": "Not authenticated"}), 401
 
     try:
-        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
-        
-        # Fetch recent events
-        events_response = requests.get(
-            f"https://api.github.com/users/{username}/events/public",
-            headers=headers,
-            params={"per_page": 30},
-            timeout=10
-        )
-        
-        if events_response.status_code != 200:
-            return jsonify({"error": "Failed to fetch user activity"}), 400
-        
-        events = events_response.json()
-        
-        # Process and categorize events
-        activity_summary = {
-            "total_events": len(events),
-            "push_events": 0,
-            "create_events": 0,
-            "watch_events": 0,
-            "fork_events": 0,
-            "issue_events": 0,
-            "pull_request_events": 0,
-            "recent_activity": []
-        }
-        
-        for event in events:
-            event_type = event.get("type", "")
-            
-            # Count event types
-            if event_type == "PushEvent":
-                activity_summary["push_events"] += 1
-            elif event_type == "CreateEvent":
-                activity_summary["create_events"] += 1
-            elif event_type == "WatchEvent":
-                activity_summary["watch_events"] += 1
-            elif event_type == "ForkEvent":
-                activity_summary["fork_events"] += 1
-            elif event_type in ["IssuesEvent", "IssueCommentEvent"]:
-                activity_summary["issue_events"] += 1
-            elif event_type in ["PullRequestEvent", "PullRequestReviewEvent"]:
-                activity_summary["pull_request_events"] += 1
-            
-            # Store recent activity details
-            activity_summary["recent_activity"].append({
-                "type": event_type,
-                "repo": event.get("repo", {}).get("name", ""),
-                "created_at": event.get("created_at", ""),
-                "public": event.get("public", True)
-            })
-        
+        limit = max(1, min(int(request.args.get("limit", 30)), EVENT_WINDOW))
+    except ValueError:
+        limit = 30
+    since = request.args.get("since")  # latest_event_id from a previous response
+
+    try:
+        activity_summary, refreshed = activity_ingestor.get(username, token, limit=limit, since=since)
         return jsonify({
             "success": True,
             "username": username,
-            "activity": activity_summary
+            "activity": activity_summary,
+            "refreshed": refreshed
         })
-        
+
+    except ActivityFetchError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"❌ Error fetching user activity: {str(e)}")
         return jsonify({"error": f"Failed to fetch user activity: {str(e)}"}), 500
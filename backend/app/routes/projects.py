@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app
 from ..utils.decorators import auth_required
 from ..services.supabase_client import supabase
-from ..services.ai_agent_service import AIAgentService
+from ..services import data_repository as repo
+from ..services.ai_agent_service import ai_agent_service
+from ..services.operation_logger import operation_logger
+from ..services.leaderboard_service import leaderboard_service
+from ..services.git_tree_writer import git_tree_writer
+from ..services.issue_publisher import issue_publisher, IssueSpec
+from ..utils.markdown_templates import render_project_tree, render_project_issue
 from datetime import datetime, timezone, timedelta
 import json
 import requests
@@ -10,9 +16,16 @@ import base64
 
 bp = Blueprint("projects", __name__)
 
+# Columns each projects read needs
+ROADMAP_COLUMNS = ("id", "target_role", "current_level", "roadmap_data")
+PROJECT_COLUMNS = ("id", "repository_name", "description", "repository_url", "tech_stack",
+                   "difficulty_level", "estimated_time", "status", "roadmap_id", "created_at")
+PROJECT_DETAIL_COLUMNS = PROJECT_COLUMNS + ("user_id", "github_repo_id", "learning_objectives")
+DEMO_PROJECT_COLUMNS = ("id", "repo_name", "requirements", "repo_url", "ai_plan", "created_issues", "created_at")
+
 # Initialize services
 
-ai_service = AIAgentService()
+ai_service = ai_agent_service
 
 class GitHubService:
     """GitHub API service for repository operations"""
@@ -91,6 +104,7 @@ github_service = GitHubService()
 @auth_required
 def generate_roadmap(current_user_id):
     """Generate a personalized learning roadmap for the user"""
+    timer = operation_logger.timer()
     try:
         data = request.get_json()
         target_role = data.get('target_role', 'software_engineer')
@@ -153,13 +167,10 @@ def generate_roadmap(current_user_id):
             },
             "success": True,
             "ai_model_used": "Agent2 + OpenAI GPT-4o-mini",
-            "execution_time_ms": 5000
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"⚠️ Failed to log operation: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -169,6 +180,7 @@ def generate_roadmap(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("roadmap_generation", current_user_id, e, timer, ai_model_used="Agent2 + OpenAI GPT-4o-mini")
         print(f"❌ Roadmap generation failed: {str(e)}")
         return jsonify({
             "success": False,
@@ -180,6 +192,7 @@ def generate_roadmap(current_user_id):
 @auth_required
 def create_project_from_roadmap(current_user_id):
     """Create a project repository based on user's roadmap"""
+    timer = operation_logger.timer()
     try:
         data = request.get_json()
         roadmap_id = data.get('roadmap_id')
@@ -191,13 +204,12 @@ def create_project_from_roadmap(current_user_id):
             return jsonify({"error": "Roadmap ID required"}), 400
         
         # Get the roadmap data
-        roadmap_result = supabase.table("repository_roadmaps").select("*").eq("id", roadmap_id).eq("user_id", current_user_id).execute()
+        roadmap = repo.learning_roadmaps.first(ROADMAP_COLUMNS, id=roadmap_id, user_id=current_user_id)
         
-        if not roadmap_result.data:
+        if not roadmap:
             return jsonify({"error": "Roadmap not found"}), 404
         
-        roadmap = roadmap_result.data[0]
-        roadmap_data = roadmap["roadmap_data"]
+        roadmap_data = roadmap.roadmap_data
         
         # Get user's GitHub token
         user_result = supabase.table("users").select("github_access_token, github_username").eq("id", current_user_id).execute()
@@ -210,11 +222,11 @@ def create_project_from_roadmap(current_user_id):
         
         # Generate project name if not provided
         if not project_name:
-            target_role = roadmap["target_role"].replace('_', '-')
+            target_role = roadmap.target_role.replace('_', '-')
             project_name = f"{target_role}-learning-project-{current_user_id}"
         
         # Create GitHub repository
-        repo_description = f"Learning project for {roadmap['target_role'].replace('_', ' ').title()} - Generated from AI roadmap"
+        repo_description = f"Learning project for {roadmap.target_role.replace('_', ' ').title()} - Generated from AI roadmap"
         
         repo_data = github_service.create_repository(
             token=github_token,
@@ -241,7 +253,8 @@ def create_project_from_roadmap(current_user_id):
             github_token,
             repo_data,
             roadmap_data,
-            milestone_focus
+            milestone_focus,
+            user_id=current_user_id
         )
         
         # Store project in database
@@ -270,13 +283,15 @@ def create_project_from_roadmap(current_user_id):
         try:
             progress_data = {
                 "user_id": current_user_id,
-                "current_level": roadmap["current_level"],
+                "current_level": roadmap.current_level,
                 "xp_points": 50,  # Award XP for creating project
                 "badges": ["Project Creator"],
                 "next_goal": f"Complete {project_name} milestones",
                 "last_updated": datetime.now(timezone.utc).isoformat()
             }
+            previous_xp = leaderboard_service.stored_xp(current_user_id)
             supabase.table("user_progress").upsert(progress_data).execute()
+            leaderboard_service.update_points(current_user_id, progress_data["xp_points"], previous_xp)
         except Exception as e:
             print(f"⚠️ Failed to update progress: {e}")
         
@@ -297,13 +312,10 @@ def create_project_from_roadmap(current_user_id):
             },
             "success": True,
             "ai_model_used": "Agent2 + GitHub API",
-            "execution_time_ms": 8000
+            "execution_time_ms": timer.elapsed_ms
         }
         
-        try:
-            supabase.table("agent_operations").insert(operation_data).execute()
-        except Exception as e:
-            print(f"⚠️ Failed to log operation: {e}")
+        operation_logger.log(operation_data)
         
         return jsonify({
             "success": True,
@@ -322,6 +334,7 @@ def create_project_from_roadmap(current_user_id):
         })
         
     except Exception as e:
+        operation_logger.log_failure("project_creation", current_user_id, e, timer, ai_model_used="Agent2 + GitHub API")
         print(f"❌ Project creation failed: {str(e)}")
         return jsonify({
             "success": False,
@@ -335,30 +348,30 @@ def list_user_projects(current_user_id):
     """Get all projects for the current user"""
     try:
         # Get projects from database
-        projects_result = supabase.table("ai_repositories").select("*").eq("user_id", current_user_id).order("created_at", desc=True).execute()
+        project_rows = repo.learning_projects.all(PROJECT_COLUMNS, user_id=current_user_id)
         
         projects = []
-        for project in projects_result.data:
+        for project in project_rows:
             # Get related roadmap info
             roadmap_result = supabase.table("repository_roadmaps").select("target_role, current_level").eq("id", project.get("roadmap_id", 0)).execute()
             roadmap_info = roadmap_result.data[0] if roadmap_result.data else {}
             
             # Get project issues count
-            issues_result = supabase.table("ai_issues").select("id, status").eq("user_id", current_user_id).eq("repository_name", project["repository_name"]).execute()
+            issues_result = supabase.table("ai_issues").select("id, status").eq("user_id", current_user_id).eq("repository_name", project.repository_name).execute()
             
             total_issues = len(issues_result.data) if issues_result.data else 0
             completed_issues = len([i for i in issues_result.data if i.get("status") == "completed"]) if issues_result.data else 0
             
             projects.append({
-                "id": project["id"],
-                "name": project["repository_name"],
-                "description": project["description"],
-                "repository_url": project["repository_url"],
-                "tech_stack": project["tech_stack"],
-                "difficulty_level": project["difficulty_level"],
-                "estimated_time": project["estimated_time"],
-                "status": project["status"],
-                "created_at": project["created_at"],
+                "id": project.id,
+                "name": project.repository_name,
+                "description": project.description,
+                "repository_url": project.repository_url,
+                "tech_stack": project.tech_stack,
+                "difficulty_level": project.difficulty_level,
+                "estimated_time": project.estimated_time,
+                "status": project.status,
+                "created_at": project.created_at,
                 "target_role": roadmap_info.get("target_role", "Unknown"),
                 "current_level": roadmap_info.get("current_level", 1),
                 "progress": {
@@ -388,25 +401,23 @@ def get_project_details(current_user_id, project_id):
     """Get detailed information about a specific project"""
     try:
         # Get project from database
-        project_result = supabase.table("ai_repositories").select("*").eq("id", project_id).eq("user_id", current_user_id).execute()
+        project = repo.learning_projects.first(PROJECT_DETAIL_COLUMNS, id=project_id, user_id=current_user_id)
         
-        if not project_result.data:
+        if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        project = project_result.data[0]
-        
         # Get related roadmap
-        roadmap_result = supabase.table("repository_roadmaps").select("*").eq("id", project.get("roadmap_id", 0)).execute()
-        roadmap = roadmap_result.data[0] if roadmap_result.data else None
+        roadmap = repo.learning_roadmaps.first(ROADMAP_COLUMNS + ("status", "created_at"), id=project.get("roadmap_id", 0))
         
         # Get project issues
-        issues_result = supabase.table("ai_issues").select("*").eq("user_id", current_user_id).eq("repository_name", project["repository_name"]).execute()
+        issues = repo.ai_issues.all(repo.ai_issues.columns, user_id=current_user_id,
+                                    repository_name=project.repository_name)
         
         return jsonify({
             "success": True,
-            "project": project,
-            "roadmap": roadmap,
-            "issues": issues_result.data or []
+            "project": project.to_dict(),
+            "roadmap": roadmap.to_dict() if roadmap else None,
+            "issues": repo.to_dicts(issues)
         })
         
     except Exception as e:
@@ -421,109 +432,28 @@ def create_project_structure(github_service, token, repo_data, roadmap_data, mil
     """Create project folder structure based on roadmap"""
     folders_created = []
     
-    # Create main README
-    readme_content = f"""# {repo_data['name']}
-
-{repo_data['description']}
-
-## Learning Objectives
-{chr(10).join([f"- {obj}" for obj in roadmap_data.get("learning_objectives", [])])}
-
-## Tech Stack
-{chr(10).join([f"- {tech}" for tech in roadmap_data.get("tech_stack", [])])}
-
-## Project Structure
-
-This repository is organized by learning milestones. Each folder contains:
-- Project files and code
-- README with learning objectives
-- Practice exercises
-- Resources and references
-
-## Getting Started
-
-1. Clone this repository
-2. Navigate to the first milestone folder
-3. Read the README and requirements
-4. Start coding and learning!
-
-## Progress Tracking
-
-Check the Issues tab to see your learning tasks and track progress.
-
----
-
-Generated with AI-powered learning system 🤖
-"""
+    # Every file is rendered first and written in a single commit
+    files, folders = render_project_tree(repo_data, roadmap_data, milestone_focus)
     
     try:
-        github_service.create_file(
-            token=token,
-            owner=repo_data["owner"]["login"],
-            repo_name=repo_data["name"],
-            path="README.md",
-            message="Initialize project with AI-generated structure",
-            content=readme_content
+        result = git_tree_writer.write_files(
+            token,
+            repo_data["owner"]["login"],
+            repo_data["name"],
+            files,
+            message="Initialize project with AI-generated structure"
         )
-        folders_created.append({"name": "README.md", "type": "file"})
+        written = set(result["paths"])
+        folders_created = [folder for path, folder in folders if path in written]
     except Exception as e:
-        print(f"⚠️ Failed to create main README: {e}")
-    
-    # Create milestone folders
-    milestones = roadmap_data.get("milestones", [])
-    if milestone_focus:
-        # Focus on specific milestone
-        milestones = [m for m in milestones if m.get("name") == milestone_focus]
-    
-    for i, milestone in enumerate(milestones[:3]):  # Limit to first 3 milestones
-        folder_name = f"milestone-{i+1}-{milestone.get('name', 'learning').lower().replace(' ', '-')}"
-        
-        milestone_readme = f"""# Milestone {i+1}: {milestone.get('name', 'Learning Milestone')}
-
-{milestone.get('description', 'Complete this learning milestone')}
-
-## Learning Objectives
-{chr(10).join([f"- {obj}" for obj in milestone.get("learning_objectives", [])])}
-
-## Skills to Practice
-{chr(10).join([f"- {skill}" for skill in milestone.get("skills_covered", [])])}
-
-## Estimated Time
-{milestone.get("duration", "1-2 weeks")}
-
-## Tasks
-{chr(10).join([f"- [ ] {task.get('title', 'Task')}" for task in milestone.get("tasks", [])])}
-
-## Resources
-{chr(10).join([f"- {resource}" for resource in milestone.get("resources", [])])}
-
----
-Start working on the tasks above and check them off as you complete them!
-"""
-        
-        try:
-            github_service.create_file(
-                token=token,
-                owner=repo_data["owner"]["login"],
-                repo_name=repo_data["name"],
-                path=f"{folder_name}/README.md",
-                message=f"Add {milestone.get('name', 'milestone')} structure",
-                content=milestone_readme
-            )
-            folders_created.append({
-                "name": folder_name,
-                "type": "folder",
-                "milestone": milestone.get('name', 'Unknown')
-            })
-        except Exception as e:
-            print(f"⚠️ Failed to create milestone folder {folder_name}: {e}")
+        print(f"⚠️ Failed to create project structure: {e}")
     
     return folders_created
 
 
-def create_project_issues(github_service, token, repo_data, roadmap_data, milestone_focus=None):
+def create_project_issues(github_service, token, repo_data, roadmap_data, milestone_focus=None, user_id=None):
     """Create GitHub issues for project tasks"""
-    issues_created = []
+    issue_specs = []
     
     milestones = roadmap_data.get("milestones", [])
     if milestone_focus:
@@ -533,48 +463,36 @@ def create_project_issues(github_service, token, repo_data, roadmap_data, milest
         for task in milestone.get("tasks", [])[:2]:  # Limit to 2 tasks per milestone
             issue_title = f"[{milestone.get('name', 'Milestone')}] {task.get('title', 'Learning Task')}"
             
-            issue_body = f"""{task.get('description', 'Complete this learning task')}
-
-## Skills Required
-{chr(10).join([f"- {skill}" for skill in task.get("skills_required", [])])}
-
-## Acceptance Criteria
-{chr(10).join([f"- [ ] {criteria}" for criteria in task.get("acceptance_criteria", [])])}
-
-## Resources
-{chr(10).join([f"- {resource}" for resource in task.get("resources", [])])}
-
-## Difficulty
-{task.get('difficulty', 'Medium')}
-
-## Estimated Time
-{task.get('estimated_time', '2-4 hours')}
-
----
-This is an AI-generated learning task. Complete the requirements and close the issue when done!
-"""
+            issue_body = render_project_issue(task)
             
-            try:
-                issue_response = github_service.create_issue(
-                    token=token,
-                    owner=repo_data["owner"]["login"],
-                    repo_name=repo_data["name"],
-                    title=issue_title,
-                    body=issue_body,
-                    labels=["learning", task.get('difficulty', 'medium').lower(), "ai-generated"]
-                )
-                
-                if issue_response:
-                    issues_created.append({
-                        "github_issue_id": issue_response.get("number"),
-                        "title": issue_title,
-                        "difficulty": task.get('difficulty', 'Medium'),
-                        "milestone": milestone.get('name', 'Unknown')
-                    })
-            except Exception as e:
-                print(f"⚠️ Failed to create issue '{issue_title}': {e}")
+            issue_specs.append(IssueSpec(
+                title=issue_title,
+                body=issue_body,
+                labels=["learning", task.get('difficulty', 'medium').lower(), "ai-generated"],
+                meta={"difficulty": task.get('difficulty', 'Medium'), "milestone": milestone.get('name', 'Unknown')}
+            ))
+    
+    try:
+        results = issue_publisher.publish(
+            token,
+            repo_data["owner"]["login"],
+            repo_data["name"],
+            issue_specs,
+            user_id=user_id
+        )
+    except Exception as e:
+        print(f"⚠️ Failed to create project issues: {e}")
+        return []
     
-    return issues_created
+    return [
+        {
+            "github_issue_id": result["number"],
+            "title": result["title"],
+            "difficulty": result["difficulty"],
+            "milestone": result["milestone"]
+        }
+        for result in results if result["status"] != "failed"
+    ]
 
 
 def create_fallback_roadmap(target_role, user_skills, current_level):
@@ -767,12 +685,11 @@ def demo_generate_roadmap():
     
     try:
         # Get user from database using the GitHub token
-        user_result = supabase.table("users").select("*").eq("github_access_token", github_token).execute()
-        if not user_result.data:
+        user = repo.users.first(("id", "github_username"), github_access_token=github_token)
+        if not user:
             return jsonify({"error": "User not found in database"}), 404
         
-        current_user_id = user_result.data[0]["id"]
-        user_data = user_result.data[0]
+        current_user_id = user.id
         
         # Get request data - only target_role is required now
         data = request.get_json()
@@ -786,7 +703,7 @@ def demo_generate_roadmap():
         user_provided_level = data.get('current_level', None)
         user_provided_preferences = data.get('preferences', {})
         
-        print(f"📚 [DEMO] Generating intelligent roadmap for {user_data['github_username']} -> {target_role}")
+        print(f"📚 [DEMO] Generating intelligent roadmap for {user.github_username} -> {target_role}")
         
         # STEP 1: Intelligently gather user skills from multiple sources
         user_skills = user_provided_skills or [{"name": "Python", "level": 7}, {"name": "JavaScript", "level": 6}, {"name": "Git", "level": 8}]
@@ -873,22 +790,21 @@ def demo_create_project():
             return jsonify({"error": "Roadmap ID required"}), 400
         
         # Get the roadmap data
-        roadmap_result = supabase.table("repository_roadmaps").select("*").eq("id", roadmap_id).eq("user_id", current_user_id).execute()
+        roadmap = repo.learning_roadmaps.first(ROADMAP_COLUMNS, id=roadmap_id, user_id=current_user_id)
         
-        if not roadmap_result.data:
+        if not roadmap:
             return jsonify({"error": "Roadmap not found"}), 404
         
-        roadmap = roadmap_result.data[0]
-        roadmap_data = roadmap["roadmap_data"]
+        roadmap_data = roadmap.roadmap_data
         
         # Generate project name if not provided
         if not project_name:
-            target_role = roadmap["target_role"].replace('_', '-')
+            target_role = roadmap.target_role.replace('_', '-')
             import time
             project_name = f"{target_role}-learning-{int(time.time())}"
         
         # Create GitHub repository
-        repo_description = f"Learning project for {roadmap['target_role'].replace('_', ' ').title()} - Generated from AI roadmap"
+        repo_description = f"Learning project for {roadmap.target_role.replace('_', ' ').title()} - Generated from AI roadmap"
         
         print(f"🏗️ [DEMO] Creating repository: {project_name}")
         repo_data = github_service.create_repository(
@@ -908,7 +824,7 @@ def demo_create_project():
         folders_created = create_project_structure(github_service, github_token, repo_data, roadmap_data, milestone_focus)
         
         print(f"   🎯 Creating learning issues...")
-        issues_created = create_project_issues(github_service, github_token, repo_data, roadmap_data, milestone_focus)
+        issues_created = create_project_issues(github_service, github_token, repo_data, roadmap_data, milestone_focus, user_id=current_user_id)
         
         # Store project in database
         project_record = {
@@ -918,7 +834,7 @@ def demo_create_project():
             "repo_url": repo_data["html_url"],
             "requirements": repo_description,
             "ai_plan": {
-                "target_role": roadmap["target_role"],
+                "target_role": roadmap.target_role,
                 "tech_stack": roadmap_data.get("tech_stack", []),
                 "roadmap_id": roadmap_id
             },
@@ -946,7 +862,7 @@ def demo_create_project():
                 "github_repo_id": repo_data["id"],
                 "tech_stack": roadmap_data.get("tech_stack", []),
                 "status": "active",
-                "target_role": roadmap["target_role"],
+                "target_role": roadmap.target_role,
                 "created_files": len(folders_created),
                 "created_issues": len(issues_created)
             },
@@ -980,24 +896,24 @@ def demo_list_projects():
         current_user_id = user_result.data[0]["id"]
         
         # Get projects from database - check both ai_repositories and repository_roadmaps tables
-        projects_result = supabase.table("ai_repositories").select("*").eq("user_id", current_user_id).order("created_at", desc=True).execute()
-        roadmaps_result = supabase.table("repository_roadmaps").select("*").eq("user_id", current_user_id).order("created_at", desc=True).execute()
+        project_rows = repo.ai_repositories.all(DEMO_PROJECT_COLUMNS, user_id=current_user_id)
+        roadmap_rows = repo.learning_roadmaps.all(("id", "target_role", "roadmap_data", "created_at"), user_id=current_user_id)
         
         projects = []
         
         # Process AI repositories (actual GitHub repos)
-        for project_data in projects_result.data:
+        for project_data in project_rows:
             ai_plan = project_data.get("ai_plan", {})
             project = {
-                "id": project_data["id"],
-                "name": project_data["repo_name"],
+                "id": project_data.id,
+                "name": project_data.repo_name,
                 "description": project_data.get("requirements", "AI-generated learning project"),
                 "repository_url": project_data.get("repo_url"),
                 "tech_stack": ai_plan.get("tech_stack", ["Python", "Git"]) if isinstance(ai_plan, dict) else ["Python", "Git"],
                 "difficulty_level": "intermediate",
                 "status": "active",
                 "target_role": ai_plan.get("target_role", "software_engineer") if isinstance(ai_plan, dict) else "software_engineer",
-                "created_at": project_data["created_at"],
+                "created_at": project_data.created_at,
                 "progress": {
                     "total_issues": project_data.get("created_issues", 0),
                     "completed_issues": 0,
@@ -1007,9 +923,9 @@ def demo_list_projects():
             projects.append(project)
         
         # Process roadmaps that don't have corresponding repositories yet
-        for roadmap_data in roadmaps_result.data:
+        for roadmap_data in roadmap_rows:
             # Check if this roadmap already has a repository
-            has_repo = any(p.get("ai_plan", {}).get("roadmap_id") == roadmap_data["id"] for p in projects_result.data)
+            has_repo = any(p.get("ai_plan", {}).get("roadmap_id") == roadmap_data.id for p in project_rows)
             
             if not has_repo:
                 roadmap_json = roadmap_data.get("roadmap_data", {})
@@ -1018,21 +934,21 @@ def demo_list_projects():
                     total_tasks = sum(len(milestone.get("tasks", [])) for milestone in milestones)
                     
                     project = {
-                        "id": f"roadmap_{roadmap_data['id']}",  # Prefix to distinguish from repo projects
-                        "name": f"{roadmap_data['target_role'].replace('_', ' ').title()} Learning Path",
-                        "description": roadmap_json.get("description", f"AI-generated roadmap for {roadmap_data['target_role']}"),
+                        "id": f"roadmap_{roadmap_data.id}",  # Prefix to distinguish from repo projects
+                        "name": f"{roadmap_data.target_role.replace('_', ' ').title()} Learning Path",
+                        "description": roadmap_json.get("description", f"AI-generated roadmap for {roadmap_data.target_role}"),
                         "repository_url": None,  # No repo created yet
                         "tech_stack": roadmap_json.get("tech_stack", ["Programming"]),
                         "difficulty_level": roadmap_json.get("difficulty_level", "intermediate"),
                         "status": "planning",  # Different status for roadmaps
-                        "target_role": roadmap_data["target_role"],
-                        "created_at": roadmap_data["created_at"],
+                        "target_role": roadmap_data.target_role,
+                        "created_at": roadmap_data.created_at,
                         "progress": {
                             "total_issues": total_tasks,
                             "completed_issues": 0,
                             "completion_percentage": 0
                         },
-                        "roadmap_id": roadmap_data["id"]  # Include for repository creation
+                        "roadmap_id": roadmap_data.id  # Include for repository creation
                     }
                     projects.append(project)
         
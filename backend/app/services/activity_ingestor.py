@@ -0,0 +1,202 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+import requests
+
+from ..config import Config
+
+# GitHub only exposes the latest 300 public events (3 pages of 100)
+EVENT_WINDOW = 300
+EVENTS_PER_PAGE = 100
+
+# Event type -> summary counter; unlisted types only count towards total_events
+EVENT_CATEGORIES = {
+    "PushEvent": "push_events",
+    "CreateEvent": "create_events",
+    "WatchEvent": "watch_events",
+    "ForkEvent": "fork_events",
+    "IssuesEvent": "issue_events",
+    "IssueCommentEvent": "issue_events",
+    "PullRequestEvent": "pull_request_events",
+    "PullRequestReviewEvent": "pull_request_events",
+}
+COUNTERS = ("push_events", "create_events", "watch_events", "fork_events",
+            "issue_events", "pull_request_events")
+
+
+class ActivityFetchError(Exception):
+    """GitHub events request failed before any events were ingested"""
+
+
+class EventStream:
+    """Ring buffer of one user's public events with running per-type counters"""
+
+    __slots__ = ("events", "ids", "counters", "etag", "polled_at", "poll_interval", "last_access", "lock")
+
+    def __init__(self, poll_interval: float):
+        self.events: deque = deque(maxlen=EVENT_WINDOW)  # oldest -> newest
+        self.ids = set()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.etag: Optional[str] = None
+        self.polled_at: Optional[float] = None
+        self.poll_interval = poll_interval
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def compact(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": event.get("id"),
+            "type": event.get("type", ""),
+            "repo": (event.get("repo") or {}).get("name", ""),
+            "created_at": event.get("created_at", ""),
+            "public": event.get("public", True)
+        }
+
+    def append(self, event: Dict[str, Any]):
+        """Add one event (oldest first), evicting and un-counting the oldest when full"""
+        if event["id"] in self.ids:
+            return
+        if len(self.events) == self.events.maxlen:
+            evicted = self.events[0]
+            self.ids.discard(evicted["id"])
+            counter = EVENT_CATEGORIES.get(evicted["type"])
+            if counter:
+                self.counters[counter] -= 1
+        self.events.append(event)
+        self.ids.add(event["id"])
+        counter = EVENT_CATEGORIES.get(event["type"])
+        if counter:
+            self.counters[counter] += 1
+
+    def latest_id(self) -> Optional[str]:
+        return self.events[-1]["id"] if self.events else None
+
+    def summary(self, limit: int = 30, since: Optional[str] = None) -> Dict[str, Any]:
+        """Precomputed counters, newest events first, and what changed after ``since``"""
+        recent = [self.events[i] for i in range(len(self.events) - 1, max(-1, len(self.events) - 1 - limit), -1)]
+        summary = {
+            "total_events": len(self.events),
+            **self.counters,
+            "recent_activity": recent,
+            "latest_event_id": self.latest_id()
+        }
+        if since is not None:
+            since_id = _event_number(since)
+            new_events = [event for event in reversed(self.events) if _event_number(event["id"]) > since_id]
+            delta = dict.fromkeys(COUNTERS, 0)
+            for event in new_events:
+                counter = EVENT_CATEGORIES.get(event["type"])
+                if counter:
+                    delta[counter] += 1
+            summary["delta"] = {"since": since, "new_events": new_events, "total_events": len(new_events), **delta}
+        return summary
+
+
+def _event_number(event_id: Optional[str]) -> int:
+    """Event ids are increasing integers encoded as strings"""
+    try:
+        return int(event_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ActivityIngestor:
+    """Keeps per-user event buffers fresh with conditional (ETag) polling.
+
+    A poll first sends ``If-None-Match``; a 304 costs no rate limit and means
+    nothing changed. Otherwise pages are read newest-first until a known
+    event id is reached or the 300-event window is exhausted.
+    """
+
+    def __init__(self, poll_interval: float = 60.0, max_users: int = 1000):
+        self.poll_interval = poll_interval
+        self.max_users = max_users
+        self._streams: Dict[str, EventStream] = {}
+        self._lock = threading.Lock()
+
+    def _stream(self, username: str) -> EventStream:
+        key = username.lower()
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                if len(self._streams) >= self.max_users:
+                    idle = min(self._streams, key=lambda k: self._streams[k].last_access)
+                    del self._streams[idle]
+                stream = self._streams[key] = EventStream(self.poll_interval)
+            stream.last_access = time.monotonic()
+            return stream
+
+    def get(self, username: str, token: str, limit: int = 30, since: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Return (activity summary, refreshed) for a user, polling GitHub when due"""
+        stream = self._stream(username)
+        with stream.lock:
+            refreshed = False
+            due = stream.polled_at is None or time.monotonic() - stream.polled_at >= stream.poll_interval
+            if due:
+                try:
+                    refreshed = self._poll(stream, username, token)
+                except ActivityFetchError:
+                    if stream.polled_at is None:
+                        raise
+                    print(f"⚠️ Serving buffered activity for {username}; poll failed")
+            return stream.summary(limit, since), refreshed
+
+    def _poll(self, stream: EventStream, username: str, token: str) -> bool:
+        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+        fresh: List[Dict[str, Any]] = []
+
+        for page in range(1, EVENT_WINDOW // EVENTS_PER_PAGE + 1):
+            page_headers = dict(headers)
+            if page == 1 and stream.etag:
+                page_headers["If-None-Match"] = stream.etag
+            try:
+                response = requests.get(
+                    f"https://api.github.com/users/{username}/events/public",
+                    headers=page_headers,
+                    params={"per_page": EVENTS_PER_PAGE, "page": page},
+                    timeout=10
+                )
+            except requests.RequestException as e:
+                raise ActivityFetchError(f"Failed to fetch user activity: {e}")
+
+            if page == 1:
+                if response.status_code == 304:
+                    self._mark_polled(stream, response)
+                    return False
+                if response.status_code != 200:
+                    raise ActivityFetchError("Failed to fetch user activity")
+                self._mark_polled(stream, response)
+                stream.etag = response.headers.get("ETag")
+            elif response.status_code != 200:
+                break  # keep what the earlier pages returned
+
+            events = response.json() or []
+            reached_known = False
+            for event in events:
+                if event.get("id") in stream.ids:
+                    reached_known = True
+                    break
+                fresh.append(EventStream.compact(event))
+            if reached_known or len(events) < EVENTS_PER_PAGE:
+                break
+
+        # Pages are newest-first; the buffer is filled oldest-first
+        for event in reversed(fresh):
+            stream.append(event)
+        if fresh:
+            print(f"📥 Ingested {len(fresh)} new events for {username}")
+        return bool(fresh)
+
+    def _mark_polled(self, stream: EventStream, response):
+        stream.polled_at = time.monotonic()
+        try:
+            # GitHub asks clients not to poll events faster than X-Poll-Interval
+            stream.poll_interval = max(self.poll_interval, float(response.headers.get("X-Poll-Interval", 0)))
+        except ValueError:
+            stream.poll_interval = self.poll_interval
+
+
+activity_ingestor = ActivityIngestor(poll_interval=Config.ACTIVITY_POLL_INTERVAL)
@@ -3,16 +3,21 @@ import sys
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from ..utils.lazy import LazyProxy
+
 # Add the agent directory to Python path
 AGENT_PATH = Path(__file__).parent.parent.parent / "agents" / "agent-1"
 sys.path.append(str(AGENT_PATH))
 
-try:
-    from ai_career_service import AICareerService
-    AGENT_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: AI Agent not available: {e}")
-    AGENT_AVAILABLE = False
+
+def _load_agent_service():
+    """Import the agent-1 service on first construction (it pulls in Gemini and LangChain)"""
+    try:
+        from ai_career_service import AICareerService
+        return AICareerService
+    except ImportError as e:
+        print(f"Warning: AI Agent not available: {e}")
+        return None
 
 class AIAgentService:
     """Service layer for AI agent operations - delegates to agents directory"""
@@ -22,7 +27,8 @@ class AIAgentService:
         self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
         self.supabase_key = supabase_key or os.getenv("SUPABASE_ANON_KEY")
         
-        if AGENT_AVAILABLE:
+        AICareerService = _load_agent_service()
+        if AICareerService:
             try:
                 self.agent_service = AICareerService(
                     gemini_api_key=self.gemini_api_key,
@@ -244,4 +250,8 @@ class AIAgentService:
                     "json_data": {"sections": ["summary", "skills", "projects", "achievements"]}
                 }
             }
-        } 
\ No newline at end of file
+        } 
+
+
+# Shared by the route modules; constructed on first use
+ai_agent_service = LazyProxy(AIAgentService, name="ai_agent_service")
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set
+
+from ..config import Config
+from .supabase_client import supabase
+
+BLOB_REF_KEY = "$blob"
+
+
+class BlobStore:
+    """Content-addressed storage for large JSON payloads.
+
+    Payloads above ``inline_threshold`` bytes are written once to the
+    payload_blobs table keyed by their SHA-256 and replaced in hot tables by a
+    small reference ``{"$blob": <hash>, "size_bytes": <n>}``. Identical
+    payloads (the same analysis written to several tables) share one row.
+    """
+
+    def __init__(self, client, table: str = "payload_blobs", inline_threshold: int = 2048,
+                 cache_size: int = 256):
+        self.client = client
+        self.table = table
+        self.inline_threshold = inline_threshold
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def serialize(payload: Any) -> str:
+        """Canonical JSON so equal payloads always hash the same"""
+        return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+    @staticmethod
+    def is_ref(value: Any) -> bool:
+        return isinstance(value, dict) and BLOB_REF_KEY in value and len(value) <= 2
+
+    def put(self, payload: Any) -> Any:
+        """Store a payload and return a reference (small payloads stay inline)"""
+        if payload is None or self.is_ref(payload):
+            return payload
+
+        encoded = self.serialize(payload)
+        size = len(encoded.encode("utf-8"))
+        if size < self.inline_threshold:
+            return payload
+
+        digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        if not self._cached(digest):
+            try:
+                self.client.table(self.table).upsert({
+                    "hash": digest,
+                    "payload": payload,
+                    "size_bytes": size
+                }, on_conflict="hash", ignore_duplicates=True).execute()
+            except Exception as e:
+                # Never lose data because the blob table is unavailable
+                print(f"⚠️ Blob store write failed, keeping payload inline: {e}")
+                return payload
+            self._remember(digest, payload)
+
+        return {BLOB_REF_KEY: digest, "size_bytes": size}
+
+    def get(self, digest: str) -> Any:
+        """Fetch a single blob payload by hash"""
+        return self.get_many([digest]).get(digest)
+
+    def get_many(self, digests: List[str]) -> Dict[str, Any]:
+        """Fetch several blobs in one round trip, serving repeats from cache"""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for digest in dict.fromkeys(digests):
+            with self._lock:
+                if digest in self._cache:
+                    self._cache.move_to_end(digest)
+                    found[digest] = self._cache[digest]
+                    continue
+            missing.append(digest)
+
+        if missing:
+            try:
+                result = self.client.table(self.table).select("hash, payload").in_("hash", missing).execute()
+                for row in result.data or []:
+                    found[row["hash"]] = row["payload"]
+                    self._remember(row["hash"], row["payload"])
+            except Exception as e:
+                print(f"⚠️ Blob store read failed: {e}")
+
+        return found
+
+    def resolve(self, value: Any, skip_keys: Optional[Set[str]] = None) -> Any:
+        """Replace blob references inside a row (or list of rows) with payloads.
+
+        Keys listed in ``skip_keys`` keep their reference, so callers that
+        don't need e.g. the raw CV text never download it.
+        """
+        skip_keys = skip_keys or set()
+        digests: List[str] = []
+        self._collect_refs(value, skip_keys, digests)
+        if not digests:
+            return value
+        payloads = self.get_many(digests)
+        return self._substitute(value, skip_keys, payloads)
+
+    def _collect_refs(self, value: Any, skip_keys: Set[str], digests: List[str]):
+        if self.is_ref(value):
+            digests.append(value[BLOB_REF_KEY])
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key not in skip_keys:
+                    self._collect_refs(item, skip_keys, digests)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect_refs(item, skip_keys, digests)
+
+    def _substitute(self, value: Any, skip_keys: Set[str], payloads: Dict[str, Any]) -> Any:
+        if self.is_ref(value):
+            return payloads.get(value[BLOB_REF_KEY], value)
+        if isinstance(value, dict):
+            return {
+                key: item if key in skip_keys else self._substitute(item, skip_keys, payloads)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._substitute(item, skip_keys, payloads) for item in value]
+        return value
+
+    def _cached(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._cache
+
+    def _remember(self, digest: str, payload: Any):
+        with self._lock:
+            self._cache[digest] = payload
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+blob_store = BlobStore(supabase, inline_threshold=Config.BLOB_INLINE_THRESHOLD)
@@ -0,0 +1,324 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Any, Iterable, Optional, Tuple
+
+from ..config import Config
+from .lifecycle import lifecycle
+from ..utils.markdown_templates import render, render_roadmap_tree
+
+BLUEPRINT_FORMAT = 1
+
+# (bucket, lowest level, highest level); None means no upper bound
+LEVEL_BUCKETS = (
+    ("beginner", 1, 2),
+    ("intermediate", 3, 5),
+    ("advanced", 6, None),
+)
+
+# Representative level used when generating each bucket
+BUCKET_LEVELS = {"beginner": 1, "intermediate": 3, "advanced": 6}
+
+# Generates extra tasks for skill gaps the blueprint does not cover:
+# (gap skills, bucket) -> task dicts in roadmap task shape
+DeltaGenerator = Callable[[List[str], str], List[Dict[str, Any]]]
+
+
+def level_bucket(level: Optional[int]) -> str:
+    level = int(level or 1)
+    for bucket, low, high in LEVEL_BUCKETS:
+        if level >= low and (high is None or level <= high):
+            return bucket
+    return LEVEL_BUCKETS[0][0]
+
+
+def _skill_names(skills: Iterable[Any]) -> List[str]:
+    names = []
+    for skill in skills or []:
+        name = skill.get("name") if isinstance(skill, dict) else skill
+        if name and str(name).strip():
+            names.append(str(name).strip())
+    return names
+
+
+def _uncovered(skills: Iterable[Any], covered: set) -> List[str]:
+    """Skill names not in ``covered``, deduplicated case-insensitively in input order"""
+    seen = set(covered)
+    uncovered = []
+    for name in _skill_names(skills):
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            uncovered.append(name)
+    return uncovered
+
+
+def render_level_issues(folders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Issue set for a rendered roadmap tree (same bodies as create_level_based_issues)"""
+    return [
+        {
+            "title": f"🎯 {folder['level']}: {folder['task']}",
+            "body": render("level_issue_body", task=folder["task"], level=folder["level"],
+                           difficulty=folder["difficulty"], path=folder["path"]),
+            "labels": ["learning-task", f"level-{folder['level'].lower()}", f"difficulty-{folder['difficulty'].lower()}"],
+            "meta": {"level": folder["level"], "task": folder["task"], "difficulty": folder["difficulty"]}
+        }
+        for folder in folders
+    ]
+
+
+@dataclass
+class Blueprint:
+    """A precomputed learning repository for one role x level bucket"""
+    role: str
+    bucket: str
+    roadmap: Dict[str, Any]
+    portfolio: Dict[str, Any]
+    files: List[Tuple[str, str]] = field(default_factory=list)
+    folders: List[Dict[str, Any]] = field(default_factory=list)
+    issues: List[Dict[str, Any]] = field(default_factory=list)
+    version: str = ""
+    source: str = ""
+    generated_at: str = ""
+
+    @classmethod
+    def build(cls, role: str, bucket: str, roadmap: Dict[str, Any], portfolio: Dict[str, Any],
+              source: str) -> "Blueprint":
+        """Render the tree and issue set and stamp a content version"""
+        files, folders = render_roadmap_tree(roadmap)
+        canonical = json.dumps({"roadmap": roadmap, "portfolio": portfolio}, sort_keys=True, separators=(",", ":"))
+        return cls(
+            role=role,
+            bucket=bucket,
+            roadmap=roadmap,
+            portfolio=portfolio,
+            files=files,
+            folders=folders,
+            issues=render_level_issues(folders),
+            version=hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12],
+            source=source,
+            generated_at=datetime.now(timezone.utc).isoformat()
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Blueprint":
+        return cls(
+            role=data["role"],
+            bucket=data["bucket"],
+            roadmap=data["roadmap"],
+            portfolio=data.get("portfolio", {}),
+            files=[tuple(item) for item in data.get("files", [])],
+            folders=data.get("folders", []),
+            issues=data.get("issues", []),
+            version=data.get("version", ""),
+            source=data.get("source", ""),
+            generated_at=data.get("generated_at", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": BLUEPRINT_FORMAT,
+            "role": self.role,
+            "bucket": self.bucket,
+            "version": self.version,
+            "source": self.source,
+            "generated_at": self.generated_at,
+            "roadmap": self.roadmap,
+            "portfolio": self.portfolio,
+            "files": [list(item) for item in self.files],
+            "folders": self.folders,
+            "issues": self.issues
+        }
+
+    def covered_skills(self) -> set:
+        skills = set()
+        for milestone in self.roadmap.get("milestones", []):
+            skills.update(skill.lower() for skill in milestone.get("skills_covered", []))
+            for task in milestone.get("tasks", []):
+                skills.update(skill.lower() for skill in task.get("skills_required", []))
+        skills.update(skill.lower() for skill in self.roadmap.get("tech_stack", []))
+        return skills
+
+    def personalize(self, skill_gaps: Iterable[Any] = (), delta_generator: Optional[DeltaGenerator] = None
+                    ) -> Dict[str, Any]:
+        """Blueprint plus a personalised delta for gaps it does not already cover.
+
+        Returns ``roadmap`` (deep copy), ``files`` and ``folders`` for the tree
+        writer, ``issues`` for the issue publisher, and ``delta`` describing
+        what was added. The precomputed files and issues are reused verbatim;
+        only the delta milestone is rendered, and the LLM (``delta_generator``)
+        is only called when uncovered gaps exist.
+        """
+        roadmap = copy.deepcopy(self.roadmap)
+        files = list(self.files)
+        folders = copy.deepcopy(self.folders)
+        issues = copy.deepcopy(self.issues) or render_level_issues(folders)
+
+        uncovered = _uncovered(skill_gaps, self.covered_skills())
+        delta = {"blueprint_version": self.version, "uncovered_gaps": uncovered, "added_tasks": 0}
+
+        if uncovered and delta_generator:
+            try:
+                tasks = delta_generator(uncovered, self.bucket) or []
+            except Exception as e:
+                print(f"⚠️ Blueprint personalization failed, serving base blueprint: {e}")
+                tasks = []
+            if tasks:
+                milestone = {
+                    "name": "Personal Focus",
+                    "description": f"Extra practice for {', '.join(uncovered)}",
+                    "duration": "2-3 weeks",
+                    "learning_objectives": [f"Build working experience with {gap}" for gap in uncovered],
+                    "skills_covered": uncovered,
+                    "tasks": tasks
+                }
+                roadmap.setdefault("milestones", []).append(milestone)
+                delta_files, delta_folders = render_roadmap_tree({"milestones": [milestone]})
+                files.extend(delta_files)
+                folders.extend(delta_folders)
+                issues.extend(render_level_issues(delta_folders))
+                delta["added_tasks"] = len(tasks)
+
+        return {"roadmap": roadmap, "files": files, "folders": folders, "issues": issues, "delta": delta}
+
+    def personalize_portfolio(self, user_id: str, skill_level: int, focus_areas: Iterable[Any] = (),
+                              issue_generator: Optional[DeltaGenerator] = None) -> Dict[str, Any]:
+        """Portfolio project in Agent2's response shape; only uncovered focus areas reach the LLM"""
+        portfolio = copy.deepcopy(self.portfolio)
+        covered = self.covered_skills()
+        covered.update(skill.lower() for skill in portfolio.get("project", {}).get("tech_stack", []))
+        uncovered = _uncovered(focus_areas, covered)
+
+        issues = portfolio.get("issues", [])
+        if uncovered and issue_generator:
+            try:
+                issues.extend(issue_generator(uncovered, "advanced") or [])
+            except Exception as e:
+                print(f"⚠️ Portfolio personalization failed, serving base blueprint: {e}")
+
+        return {
+            "user_id": user_id,
+            "project": portfolio.get("project", {}),
+            "issues": issues,
+            "portfolio_features": portfolio.get("portfolio_features", []),
+            "estimated_completion": f"{skill_level * 2}-{skill_level * 3} weeks",
+            "portfolio_value": "High - showcases advanced skills and best practices",
+            "blueprint_version": self.version,
+            "uncovered_focus_areas": uncovered
+        }
+
+
+def _load_agent2():
+    """Import Agent2's repository agent from the agents/ directory"""
+    import sys
+    agent_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "agents", "agent2")
+    agent_path = os.path.normpath(agent_path)
+    if agent_path not in sys.path:
+        sys.path.append(agent_path)
+    from repository_agent import RepositoryCreationAgent
+    return RepositoryCreationAgent
+
+
+def issue_to_task(issue: Any) -> Dict[str, Any]:
+    """Agent2 CodingIssue -> roadmap task dict"""
+    return {
+        "title": issue.title,
+        "description": issue.description,
+        "difficulty": str(issue.difficulty).title(),
+        "estimated_time": issue.estimated_time,
+        "skills_required": list(issue.skills_required),
+        "acceptance_criteria": list(issue.acceptance_criteria),
+        "resources": list(issue.resources)
+    }
+
+
+def agent2_delta_generator(gaps: List[str], bucket: str) -> List[Dict[str, Any]]:
+    """LLM-backed tasks for skill gaps, via Agent2's issue generator"""
+    agent = _load_agent2()()
+    return [issue_to_task(issue) for issue in agent.generate_coding_issues(bucket, gaps)[:len(gaps) + 1]]
+
+
+def agent2_portfolio_issues(focus_areas: List[str], bucket: str) -> List[Dict[str, Any]]:
+    """LLM-backed portfolio issues (with hints) for focus areas a blueprint lacks"""
+    agent = _load_agent2()()
+    return [
+        {**issue_to_task(issue), "difficulty": issue.difficulty, "hints": list(issue.hints)}
+        for issue in agent.generate_coding_issues(bucket, focus_areas)[:len(focus_areas) + 1]
+    ]
+
+
+class BlueprintLibrary:
+    """Versioned blueprints stored as JSON files: <directory>/<role>/<bucket>.json"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cache: Dict[Tuple[str, str], Tuple[float, Blueprint]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, role: str, bucket: str) -> str:
+        return os.path.join(self.directory, role, f"{bucket}.json")
+
+    def get(self, role: str, level: Optional[int]) -> Optional[Blueprint]:
+        """Blueprint for a role at a level, or None when the library has none"""
+        if not role or not role.replace("_", "").isalnum():
+            return None
+        bucket = level_bucket(level)
+        path = self._path(role, bucket)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._cache.get((role, bucket))
+            if cached and cached[0] == mtime:
+                return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                blueprint = Blueprint.from_dict(json.load(handle))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Unreadable blueprint {path}: {e}")
+            return None
+        with self._lock:
+            self._cache[(role, bucket)] = (mtime, blueprint)
+        return blueprint
+
+    def save(self, blueprint: Blueprint) -> str:
+        path = self._path(blueprint.role, blueprint.bucket)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(blueprint.to_dict(), handle, indent=2, ensure_ascii=False)
+            handle.write("\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def remove(self, role: str, bucket: str) -> bool:
+        """Delete a stored blueprint; False if there was none"""
+        with self._lock:
+            self._cache.pop((role, bucket), None)
+        try:
+            os.remove(self._path(role, bucket))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def preload(self) -> int:
+        """Load every blueprint into the cache; returns how many were loaded"""
+        return sum(1 for role in self.roles() for bucket, low, _ in LEVEL_BUCKETS if self.get(role, low))
+
+    def roles(self) -> List[str]:
+        try:
+            return sorted(entry for entry in os.listdir(self.directory)
+                          if os.path.isdir(os.path.join(self.directory, entry)))
+        except OSError:
+            return []
+
+
+blueprint_library = BlueprintLibrary(Config.BLUEPRINT_DIR)
+
+lifecycle.register_warmup("blueprints", blueprint_library.preload)
+lifecycle.register_warmup("agent2", _load_agent2)
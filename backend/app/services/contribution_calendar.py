@@ -0,0 +1,211 @@
+import hashlib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import requests
+
+from ..config import Config
+
+# Upper bounds of levels 0-3 (anything above the last bound is level 4)
+LEVEL_BOUNDS = np.array([0, 2, 4, 6], dtype=np.int16)
+
+# Days covered by each period; None means the full calendar year view
+PERIOD_DAYS = {
+    "year": None,
+    "6months": 180,
+    "3months": 90
+}
+
+CONTRIBUTION_QUERY = """
+query($userName: String!) {
+  user(login: $userName){
+    contributionsCollection {
+      contributionCalendar {
+        totalContributions
+        weeks {
+          contributionDays {
+            contributionCount
+            date
+            color
+          }
+        }
+      }
+    }
+    repositories(first: 20, orderBy: {field: UPDATED_AT, direction: DESC}, ownerAffiliations: OWNER) {
+      nodes {
+        primaryLanguage {
+          name
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class ContributionFetchError(Exception):
+    """GitHub GraphQL request failed or returned errors"""
+
+
+class ContributionCalendar:
+    """One user's contribution year stored as compact NumPy columns"""
+
+    __slots__ = ("start", "offsets", "counts", "color_index", "palette",
+                 "total_contributions", "languages", "fetched_at")
+
+    def __init__(self, start: date, offsets: np.ndarray, counts: np.ndarray, color_index: np.ndarray,
+                 palette: List[str], total_contributions: int, languages: Dict[str, int]):
+        self.start = start
+        self.offsets = offsets  # int16 days since start, ascending
+        self.counts = counts  # int16 contributions per day
+        self.color_index = color_index  # uint8 index into palette
+        self.palette = palette
+        self.total_contributions = total_contributions
+        self.languages = languages
+        self.fetched_at = time.time()
+
+    @classmethod
+    def from_graphql(cls, user_data: Dict[str, Any]) -> "ContributionCalendar":
+        calendar = user_data["contributionsCollection"]["contributionCalendar"]
+        days = [day for week in calendar["weeks"] for day in week["contributionDays"]]
+        days.sort(key=lambda day: day["date"])  # GitHub already returns them ordered
+
+        start = date.fromisoformat(days[0]["date"]) if days else date.today()
+        day_numbers = np.array([date.fromisoformat(day["date"]).toordinal() for day in days], dtype=np.int32)
+        offsets = (day_numbers - start.toordinal()).astype(np.int16)
+        counts = np.clip([day["contributionCount"] for day in days], 0, np.iinfo(np.int16).max).astype(np.int16)
+
+        palette: List[str] = []
+        palette_index: Dict[str, int] = {}
+        color_index = np.empty(len(days), dtype=np.uint8)
+        for i, day in enumerate(days):
+            color = day.get("color", "#0d1117")  # GitHub's actual color
+            if color not in palette_index:
+                palette_index[color] = len(palette)
+                palette.append(color)
+            color_index[i] = palette_index[color]
+
+        languages: Dict[str, int] = {}
+        for repo in user_data["repositories"]["nodes"]:
+            if repo["primaryLanguage"]:
+                lang = repo["primaryLanguage"]["name"]
+                languages[lang] = languages.get(lang, 0) + 1
+
+        return cls(start, offsets, counts, color_index, palette, calendar["totalContributions"], languages)
+
+    def _period_slice(self, period: str, now: Optional[datetime] = None) -> slice:
+        """Index range of days inside [now - N days, today]"""
+        if period == "year":
+            return slice(0, len(self.offsets))
+        days_back = PERIOD_DAYS.get(period) or 365
+        now = now or datetime.now()
+        threshold = now - timedelta(days=days_back)
+        # A day (at midnight) is inside the window only if it is not before the threshold
+        first_day = threshold.date() + timedelta(days=1 if threshold.time() != datetime.min.time() else 0)
+        low = first_day.toordinal() - self.start.toordinal()
+        high = now.date().toordinal() - self.start.toordinal()
+        return slice(int(np.searchsorted(self.offsets, low, side="left")),
+                     int(np.searchsorted(self.offsets, high, side="right")))
+
+    @staticmethod
+    def streaks(counts: np.ndarray) -> Tuple[int, int]:
+        """(current, longest) streak of days with contributions.
+
+        The current streak is the most recent run of active days, ignoring
+        trailing empty days (today may not have contributions yet).
+        """
+        active = (counts > 0).astype(np.int8)
+        if not active.any():
+            return 0, 0
+        edges = np.diff(np.concatenate(([0], active, [0])))
+        runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        return int(runs[-1]), int(runs.max())
+
+    def view(self, period: str = "year", now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Period slice with levels and streaks, shaped like the API response"""
+        window = self._period_slice(period, now)
+        counts = self.counts[window]
+        levels = np.searchsorted(LEVEL_BOUNDS, counts, side="left")
+        dates = (np.datetime64(self.start, "D") + self.offsets[window].astype(np.int32)).astype(str)
+        colors = np.array(self.palette, dtype=object)[self.color_index[window]] if self.palette else []
+        current_streak, longest_streak = self.streaks(counts)
+
+        contribution_data = [
+            {"date": day, "count": count, "level": level, "color": color}
+            for day, count, level, color in zip(dates.tolist(), counts.tolist(), levels.tolist(), list(colors))
+        ]
+        total = self.total_contributions if period == "year" else int(counts.sum(dtype=np.int64))
+        return {
+            "total_contributions": total,
+            "contribution_data": contribution_data,
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+            "languages": dict(self.languages)
+        }
+
+
+class ContributionCalendarService:
+    """Fetches a user's contribution year once and serves every period from cache"""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache: Dict[Tuple[str, str], ContributionCalendar] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(username: str, token: str) -> Tuple[str, str]:
+        # Private contribution counts depend on who asks, so the viewer is part of the key
+        return username.lower(), hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, username: str, token: str) -> Tuple[ContributionCalendar, bool]:
+        """Return (calendar, served_from_cache)"""
+        key = self._cache_key(username, token)
+        with self._lock:
+            calendar = self._cache.get(key)
+            if calendar is not None and time.time() - calendar.fetched_at < self.ttl_seconds:
+                return calendar, True
+
+        calendar = self._fetch(username, token)
+        with self._lock:
+            if len(self._cache) >= self.max_entries:
+                oldest = min(self._cache, key=lambda k: self._cache[k].fetched_at)
+                del self._cache[oldest]
+            self._cache[key] = calendar
+        return calendar, False
+
+    def invalidate(self, username: str, token: str):
+        with self._lock:
+            self._cache.pop(self._cache_key(username, token), None)
+
+    def _fetch(self, username: str, token: str) -> ContributionCalendar:
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        payload = {
+            "query": CONTRIBUTION_QUERY,
+            "variables": {"userName": username}
+        }
+
+        print(f"🔍 Fetching GitHub GraphQL contribution data for: {username}")
+        response = requests.post("https://api.github.com/graphql", json=payload, headers=headers, timeout=10)
+
+        if response.status_code != 200:
+            print(f"❌ GraphQL request failed with status: {response.status_code}")
+            print(f"Response: {response.text}")
+            raise ContributionFetchError(f"GraphQL request failed: {response.status_code}")
+
+        data = response.json()
+        if "errors" in data:
+            print(f"❌ GraphQL errors: {data['errors']}")
+            raise ContributionFetchError(f"GraphQL errors: {data['errors']}")
+
+        return ContributionCalendar.from_graphql(data["data"]["user"])
+
+
+contribution_calendar_service = ContributionCalendarService(ttl_seconds=Config.CONTRIBUTION_CACHE_TTL)
@@ -0,0 +1,410 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import requests
+
+from ..config import Config
+from .contribution_calendar import ContributionCalendar, ContributionFetchError
+
+# contributionsCollection spans at most one year, so history is paged per year
+HISTORY_QUERY = """
+query($userName: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $userName) {
+    createdAt
+    contributionsCollection(from: $from, to: $to) {
+      totalCommitContributions
+      totalPullRequestContributions
+      totalIssueContributions
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            contributionCount
+            date
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+CREATED_AT_QUERY = """
+query($userName: String!) {
+  user(login: $userName) {
+    createdAt
+  }
+}
+"""
+
+_USERNAME_PATTERN = re.compile(r"^[A-Za-z0-9-]{1,39}$")
+
+
+class ContributionHistory:
+    """A user's full contribution history as one dense day-indexed column.
+
+    ``counts[i]`` is the number of contributions on ``start + i`` days; the
+    per-year commit/PR/issue totals are stored alongside as parallel arrays.
+    ``complete`` is False while only the current year has been fetched.
+    """
+
+    __slots__ = ("username", "start", "synced", "counts", "years",
+                 "commits", "pull_requests", "issues", "fetched_at", "complete")
+
+    def __init__(self, username: str, start: date, synced: date, counts: np.ndarray, years: np.ndarray,
+                 commits: np.ndarray, pull_requests: np.ndarray, issues: np.ndarray,
+                 fetched_at: Optional[float] = None, complete: bool = True):
+        self.username = username
+        self.start = start
+        self.synced = synced  # last day covered by counts
+        self.counts = counts  # int16 per day
+        self.years = years  # int16, ascending
+        self.commits = commits  # int32 per year
+        self.pull_requests = pull_requests
+        self.issues = issues
+        self.fetched_at = fetched_at or time.time()
+        self.complete = complete
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Atomically write the history as a compressed .npz file"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                start=np.int32(self.start.toordinal()),
+                synced=np.int32(self.synced.toordinal()),
+                fetched_at=np.float64(self.fetched_at),
+                complete=np.bool_(self.complete),
+                counts=self.counts,
+                years=self.years,
+                commits=self.commits,
+                pull_requests=self.pull_requests,
+                issues=self.issues
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, username: str, path: str) -> "ContributionHistory":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                username,
+                date.fromordinal(int(data["start"])),
+                date.fromordinal(int(data["synced"])),
+                data["counts"],
+                data["years"],
+                data["commits"],
+                data["pull_requests"],
+                data["issues"],
+                fetched_at=float(data["fetched_at"]),
+                complete=bool(data["complete"]) if "complete" in data.files else True
+            )
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def merge_year(self, year: int, days: Dict[date, int], totals: Tuple[int, int, int], synced: date):
+        """Overwrite one year's days and totals with freshly fetched values"""
+        length = synced.toordinal() - self.start.toordinal() + 1
+        if length > len(self.counts):
+            self.counts = np.concatenate((self.counts, np.zeros(length - len(self.counts), dtype=np.int16)))
+        for day, count in days.items():
+            index = day.toordinal() - self.start.toordinal()
+            if 0 <= index < len(self.counts):
+                self.counts[index] = min(count, np.iinfo(np.int16).max)
+
+        position = int(np.searchsorted(self.years, year))
+        if position == len(self.years) or self.years[position] != year:
+            self.years = np.insert(self.years, position, year).astype(np.int16)
+            self.commits = np.insert(self.commits, position, 0).astype(np.int32)
+            self.pull_requests = np.insert(self.pull_requests, position, 0).astype(np.int32)
+            self.issues = np.insert(self.issues, position, 0).astype(np.int32)
+        self.commits[position], self.pull_requests[position], self.issues[position] = totals
+        self.synced = max(self.synced, synced)
+        self.fetched_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def _day_numbers(self) -> np.ndarray:
+        return np.datetime64(self.start, "D") + np.arange(len(self.counts))
+
+    def streaks(self, today: Optional[date] = None) -> Tuple[int, int]:
+        """(current, longest) lifetime streak.
+
+        Unlike the one-year calendar view, the current streak only counts if
+        its last active day is today or yesterday.
+        """
+        _, longest = ContributionCalendar.streaks(self.counts)
+        active = np.flatnonzero(self.counts > 0)
+        if not len(active):
+            return 0, 0
+        today = today or date.today()
+        last_active = self.start.toordinal() + int(active[-1])
+        if today.toordinal() - last_active > 1:
+            return 0, longest
+        current, _ = ContributionCalendar.streaks(self.counts[:active[-1] + 1])
+        return current, longest
+
+    def yearly(self) -> List[Dict[str, Any]]:
+        """Per-year totals with a monthly breakdown for year-over-year charts"""
+        days = self._day_numbers()
+        months = days.astype("datetime64[M]").astype(np.int64)  # months since 1970-01
+        first_month = int(months[0]) if len(months) else 0
+        monthly = np.bincount(months - first_month, weights=self.counts, minlength=1).astype(np.int64)
+
+        result = []
+        for i, year in enumerate(self.years.tolist()):
+            year_months = np.zeros(12, dtype=np.int64)
+            for month in range(12):
+                index = (year - 1970) * 12 + month - first_month
+                if 0 <= index < len(monthly):
+                    year_months[month] = monthly[index]
+            result.append({
+                "year": year,
+                "total_contributions": int(year_months.sum()),
+                "commits": int(self.commits[i]),
+                "pull_requests": int(self.pull_requests[i]),
+                "issues": int(self.issues[i]),
+                "monthly": year_months.tolist()
+            })
+        return result
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            "total_contributions": int(self.counts.sum(dtype=np.int64)),
+            "total_commits": int(self.commits.sum(dtype=np.int64)),
+            "total_pull_requests": int(self.pull_requests.sum(dtype=np.int64)),
+            "total_issues": int(self.issues.sum(dtype=np.int64))
+        }
+
+    def activity_metrics(self) -> Dict[str, Any]:
+        """Contribution metrics in the shape GitHubSkillAnalyzer expects"""
+        totals = self.totals()
+        activity = totals["total_commits"] + totals["total_pull_requests"] + totals["total_issues"]
+        return {
+            "total_commits": totals["total_commits"],
+            "total_pull_requests": totals["total_pull_requests"],
+            "total_issues": totals["total_issues"],
+            "activity_score": min(100, activity / 10),
+            "source": "history" if self.complete else "current_year"
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        current_streak, longest_streak = self.streaks()
+        return {
+            "username": self.username,
+            "first_day": self.start.isoformat(),
+            "last_day": self.synced.isoformat(),
+            **self.totals(),
+            "current_streak": current_streak,
+            "longest_streak": longest_streak,
+            "years": self.yearly(),
+            "complete": self.complete,
+            "synced_at": datetime.fromtimestamp(self.fetched_at, timezone.utc).isoformat()
+        }
+
+
+class ContributionHistoryStore:
+    """Backfills and persists users' multi-year contribution history.
+
+    The first request for a user fetches only the current year and returns;
+    the older years are paged from account creation on a background thread.
+    Afterwards only the years touched since the last sync are refetched, at
+    most once per ``refresh_seconds``. Private contribution counts depend on
+    who asks, so histories are stored per (user, viewer).
+    """
+
+    def __init__(self, directory: str, refresh_seconds: float = 86400.0, max_cached: int = 500):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.max_cached = max_cached
+        self._cache: Dict[Tuple[str, str], ContributionHistory] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._backfilling = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(username: str, token: str) -> Tuple[str, str]:
+        return username.lower(), hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.directory, f"{key[0]}.{key[1]}.npz")
+
+    def _user_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get(self, username: str, token: str) -> ContributionHistory:
+        """Return a user's history, fetching or topping it up as needed.
+
+        A new user's history only covers the current year until the
+        background backfill finishes (``history.complete``).
+        """
+        if not _USERNAME_PATTERN.match(username or ""):
+            raise ValueError(f"Invalid GitHub username: {username}")
+        key = self._cache_key(username, token)
+
+        with self._user_lock(key):
+            history = self._cache.get(key)
+            if history is None and os.path.exists(self._path(key)):
+                try:
+                    history = ContributionHistory.load(username, self._path(key))
+                except Exception as e:
+                    print(f"⚠️ Discarding unreadable contribution history for {username}: {e}")
+
+            if history is None:
+                history = self._current_year(username, token)
+            elif time.time() - history.fetched_at >= self.refresh_seconds:
+                try:
+                    self._top_up(history, token)
+                except ContributionFetchError as e:
+                    # Serve the stored history; the next request retries
+                    print(f"⚠️ Contribution history top-up failed for {username}: {e}")
+                    return history
+            else:
+                self._remember(key, history)
+                if not history.complete:
+                    self._schedule_backfill(key, username, token)
+                return history
+
+            self._store(key, history)
+        if not history.complete:
+            self._schedule_backfill(key, username, token)
+        return history
+
+    def _store(self, key: Tuple[str, str], history: ContributionHistory):
+        os.makedirs(self.directory, exist_ok=True)
+        history.save(self._path(key))
+        self._remember(key, history)
+
+    def _remember(self, key: Tuple[str, str], history: ContributionHistory):
+        with self._lock:
+            if key not in self._cache and len(self._cache) >= self.max_cached:
+                oldest = min(self._cache, key=lambda k: self._cache[k].fetched_at)
+                del self._cache[oldest]
+            self._cache[key] = history
+
+    def _schedule_backfill(self, key: Tuple[str, str], username: str, token: str):
+        with self._lock:
+            if key in self._backfilling:
+                return
+            self._backfilling.add(key)
+        threading.Thread(target=self._run_backfill, args=(key, username, token),
+                         name=f"history-backfill-{username}", daemon=True).start()
+
+    def _run_backfill(self, key: Tuple[str, str], username: str, token: str):
+        try:
+            # Built as a new object and swapped in, so readers never see a half-merged year
+            history = self._backfill(username, token)
+            with self._user_lock(key):
+                self._store(key, history)
+            print(f"✅ Contribution history backfilled for {username}")
+        except Exception as e:
+            # The partial history stays stored; the next request retries
+            print(f"⚠️ Contribution history backfill failed for {username}: {e}")
+        finally:
+            with self._lock:
+                self._backfilling.discard(key)
+
+    def _current_year(self, username: str, token: str) -> ContributionHistory:
+        """A history holding only this year, from one request"""
+        today = datetime.now(timezone.utc).date()
+        first = date(today.year, 1, 1)
+        user = self._graphql(token, HISTORY_QUERY, {
+            "userName": username,
+            "from": f"{first.isoformat()}T00:00:00Z",
+            "to": f"{today.isoformat()}T23:59:59Z"
+        })
+        created = datetime.fromisoformat(user["createdAt"].replace("Z", "+00:00")).date()
+        history = self._empty(username, created, today)
+        history.complete = created.year == today.year
+        self._merge(history, today.year, user["contributionsCollection"], max(first, created), today)
+        return history
+
+    @staticmethod
+    def _empty(username: str, created: date, today: date) -> ContributionHistory:
+        empty_int32 = np.zeros(0, dtype=np.int32)
+        return ContributionHistory(
+            username, created, created, np.zeros(today.toordinal() - created.toordinal() + 1, dtype=np.int16),
+            np.zeros(0, dtype=np.int16), empty_int32, empty_int32.copy(), empty_int32.copy()
+        )
+
+    def _backfill(self, username: str, token: str) -> ContributionHistory:
+        user = self._graphql(token, CREATED_AT_QUERY, {"userName": username})
+        created = datetime.fromisoformat(user["createdAt"].replace("Z", "+00:00")).date()
+        today = datetime.now(timezone.utc).date()
+
+        history = self._empty(username, created, today)
+        print(f"📚 Backfilling contribution history for {username} ({created.year}-{today.year})")
+        for year in range(created.year, today.year + 1):
+            self._sync_year(history, username, token, year, today)
+        return history
+
+    def _top_up(self, history: ContributionHistory, token: str):
+        today = datetime.now(timezone.utc).date()
+        # Refetch every year since the last sync; contributions can land late
+        for year in range(history.synced.year, today.year + 1):
+            self._sync_year(history, history.username, token, year, today)
+
+    def _sync_year(self, history: ContributionHistory, username: str, token: str, year: int, today: date):
+        first = max(date(year, 1, 1), history.start)
+        last = min(date(year, 12, 31), today)
+        collection = self._graphql(token, HISTORY_QUERY, {
+            "userName": username,
+            "from": f"{first.isoformat()}T00:00:00Z",
+            "to": f"{last.isoformat()}T23:59:59Z"
+        })["contributionsCollection"]
+        self._merge(history, year, collection, first, last)
+
+    @staticmethod
+    def _merge(history: ContributionHistory, year: int, collection: Dict[str, Any], first: date, last: date):
+        days: Dict[date, int] = {}
+        for week in collection["contributionCalendar"]["weeks"]:
+            for day in week["contributionDays"]:
+                day_date = date.fromisoformat(day["date"])
+                if first <= day_date <= last:
+                    days[day_date] = day["contributionCount"]
+
+        totals = (collection["totalCommitContributions"],
+                  collection["totalPullRequestContributions"],
+                  collection["totalIssueContributions"])
+        history.merge_year(year, days, totals, last)
+
+    @staticmethod
+    def _graphql(token: str, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        response = requests.post("https://api.github.com/graphql", json={"query": query, "variables": variables},
+                                 headers=headers, timeout=15)
+        if response.status_code != 200:
+            raise ContributionFetchError(f"GraphQL request failed: {response.status_code}")
+
+        data = response.json()
+        if "errors" in data:
+            raise ContributionFetchError(f"GraphQL errors: {data['errors']}")
+        if not data.get("data", {}).get("user"):
+            raise ContributionFetchError(f"GitHub user not found: {variables['userName']}")
+        return data["data"]["user"]
+
+
+contribution_history_store = ContributionHistoryStore(
+    Config.CONTRIBUTION_HISTORY_DIR,
+    refresh_seconds=Config.CONTRIBUTION_HISTORY_REFRESH,
+)
@@ -0,0 +1,206 @@
+from dataclasses import fields
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Type
+
+from .supabase_client import supabase
+from ..utils.pagination import CursorError, encode_cursor, decode_cursor
+from ..models import (
+    User, AgentOperation, AIIssue, AIRepository, Leaderboard, RepositoryAnalysis,
+    RepositoryRoadmap, TechRecommendation, UserAchievement, UserOnboarding,
+    UserProgress, UserResume, UserSkillsAnalysis, UserSubmission
+)
+
+# Shared pagination defaults for every list read
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def _keyset_filter(order_by: str, last_value: Any, last_id: int) -> str:
+    """PostgREST condition for rows after (last_value, last_id) in ``order_by DESC, id DESC``.
+
+    Postgres sorts NULLs first in descending order, so a null position moves
+    on through the remaining nulls and then every non-null row.
+    """
+    if last_value is None:
+        return f"and({order_by}.is.null,id.lt.{last_id}),{order_by}.not.is.null"
+    if isinstance(last_value, str):
+        if any(ch in last_value for ch in '"\\,()'):
+            raise CursorError("Invalid pagination cursor")
+        last_value = f'"{last_value}"'
+    elif isinstance(last_value, bool) or not isinstance(last_value, (int, float)):
+        raise CursorError("Invalid pagination cursor")
+    return f"{order_by}.lt.{last_value},and({order_by}.eq.{last_value},id.lt.{last_id})"
+
+
+def _or_filter(builder, expression: str):
+    """PostgREST or=(...) filter; postgrest-py < 0.14 has no or_() helper"""
+    if hasattr(builder, "or_"):
+        return builder.or_(expression)
+    builder.params = builder.params.add("or", f"({expression})")
+    return builder
+
+
+class Record:
+    """Slotted, read-mostly row object produced by TableRepository"""
+
+    __slots__ = ()
+    _columns: Tuple[str, ...] = ()
+
+    def __init__(self, row: Dict[str, Any]):
+        for column in self._columns:
+            setattr(self, column, row.get(column))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self._columns else None
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in self._columns}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TableRepository:
+    """Typed read access to one Supabase table, built from a models.py dataclass.
+
+    Routes declare the columns they need; unknown or hidden columns raise
+    ValueError instead of silently widening the query.
+    """
+
+    def __init__(self, table: str, model: type, extra_columns: Sequence[str] = (),
+                 hidden_columns: Sequence[str] = ()):
+        self.table = table
+        self.model = model
+        self.columns: Tuple[str, ...] = tuple(f.name for f in fields(model)) + tuple(extra_columns)
+        self.hidden_columns = frozenset(hidden_columns)
+        self.public_columns: Tuple[str, ...] = tuple(c for c in self.columns if c not in self.hidden_columns)
+        self._projections: Dict[Tuple[str, ...], Type[Record]] = {}
+
+    def projection(self, columns: Sequence[str], allow_hidden: bool = False) -> Type[Record]:
+        """Return (and cache) the slotted record class for a column set"""
+        key = tuple(columns)
+        record_class = self._projections.get(key)
+        if record_class is None:
+            for column in key:
+                if column not in self.columns:
+                    raise ValueError(f"Unknown column '{column}' for table '{self.table}'")
+                if column in self.hidden_columns and not allow_hidden:
+                    raise ValueError(f"Column '{column}' of '{self.table}' must be requested explicitly")
+            record_class = type(
+                f"{self.model.__name__}Row",
+                (Record,),
+                {"__slots__": key, "_columns": key}
+            )
+            self._projections[key] = record_class
+        return record_class
+
+    def query(self, columns: Sequence[str], allow_hidden: bool = False, count: Optional[str] = None):
+        """Raw Supabase builder restricted to validated columns"""
+        self.projection(columns, allow_hidden)
+        return supabase.table(self.table).select(", ".join(columns), count=count)
+
+    def decode(self, rows: Optional[List[Dict[str, Any]]], columns: Sequence[str],
+               allow_hidden: bool = False) -> List[Record]:
+        record_class = self.projection(columns, allow_hidden)
+        return [record_class(row) for row in rows or []]
+
+    def find(self, columns: Sequence[str], order_by: Optional[str] = None, desc: bool = True,
+             limit: int = DEFAULT_LIMIT, offset: int = 0, allow_hidden: bool = False,
+             **filters) -> List[Record]:
+        """Equality-filtered list read with bounded page size"""
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        builder = self.query(columns, allow_hidden)
+        for column, value in filters.items():
+            builder = builder.eq(column, value)
+        if order_by:
+            builder = builder.order(order_by, desc=desc)
+        builder = builder.range(offset, offset + limit - 1) if offset else builder.limit(limit)
+        return self.decode(builder.execute().data, columns, allow_hidden)
+
+    def first(self, columns: Sequence[str], order_by: Optional[str] = None, desc: bool = True,
+              allow_hidden: bool = False, **filters) -> Optional[Record]:
+        rows = self.find(columns, order_by=order_by, desc=desc, limit=1, allow_hidden=allow_hidden, **filters)
+        return rows[0] if rows else None
+
+    def page(self, columns: Sequence[str], cursor: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+             order_by: str = "created_at", allow_hidden: bool = False,
+             **filters) -> Tuple[List[Record], Optional[str]]:
+        """Keyset page ordered by (order_by, id) descending.
+
+        Returns the records and the cursor for the next page (None when done).
+        The sort key columns are always fetched so the cursor can be built.
+        Raises CursorError for a cursor that did not come from this method.
+        """
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        fetch_columns = tuple(columns) + tuple(c for c in (order_by, "id") if c not in columns)
+        builder = self.query(fetch_columns, allow_hidden)
+        for column, value in filters.items():
+            builder = builder.eq(column, value)
+
+        position = decode_cursor(cursor, size=2)
+        if position:
+            last_value, last_id = position
+            if isinstance(last_id, bool) or not isinstance(last_id, int):
+                raise CursorError("Invalid pagination cursor")
+            builder = _or_filter(builder, _keyset_filter(order_by, last_value, last_id))
+
+        # Single order parameter so both sort keys survive older postgrest clients
+        rows = builder.order(f"{order_by}.desc,id", desc=True).limit(limit + 1).execute().data or []
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][order_by], rows[-1]["id"]])
+        return self.decode(rows, columns, allow_hidden), next_cursor
+
+    def all(self, columns: Sequence[str], order_by: str = "created_at", allow_hidden: bool = False,
+            **filters) -> List[Record]:
+        """Every matching row, read in MAX_LIMIT keyset pages (for reads that must not be truncated)"""
+        records, cursor = [], None
+        while True:
+            page, cursor = self.page(columns, cursor=cursor, limit=MAX_LIMIT, order_by=order_by,
+                                     allow_hidden=allow_hidden, **filters)
+            records.extend(page)
+            if not cursor:
+                return records
+
+    def count(self, **filters) -> int:
+        """Exact row count without transferring rows"""
+        builder = self.query(("id",), count="exact")
+        for column, value in filters.items():
+            builder = builder.eq(column, value)
+        result = builder.limit(1).execute()
+        return result.count or 0
+
+
+def to_dicts(records: List[Record]) -> List[Dict[str, Any]]:
+    return [record.to_dict() for record in records]
+
+
+# Table repositories
+users = TableRepository("users", User, hidden_columns=("github_access_token",))
+agent_operations = TableRepository("agent_operations", AgentOperation)
+ai_issues = TableRepository("ai_issues", AIIssue)
+ai_repositories = TableRepository("ai_repositories", AIRepository)
+leaderboard = TableRepository("leaderboard", Leaderboard)
+repository_analyses = TableRepository("repository_analyses", RepositoryAnalysis)
+repository_roadmaps = TableRepository("repository_roadmaps", RepositoryRoadmap)
+tech_recommendations = TableRepository("tech_recommendations", TechRecommendation)
+user_achievements = TableRepository("user_achievements", UserAchievement)
+user_onboarding = TableRepository("user_onboarding", UserOnboarding)
+user_progress = TableRepository("user_progress", UserProgress)
+user_resume = TableRepository("user_resume", UserResume)
+user_skills_analysis = TableRepository("user_skills_analysis", UserSkillsAnalysis)
+user_submissions = TableRepository("user_submissions", UserSubmission)
+
+# Rows written by the projects routes carry columns outside models.py; kept as
+# separate repositories so the generic list endpoints above do not select them
+learning_projects = TableRepository("ai_repositories", AIRepository, extra_columns=(
+    "repository_name", "repository_url", "description", "tech_stack", "difficulty_level",
+    "estimated_time", "learning_objectives", "roadmap_id", "status"
+))
+learning_roadmaps = TableRepository("repository_roadmaps", RepositoryRoadmap,
+                                    extra_columns=("target_role", "current_level", "status"))
+
+# Common column sets
+PUBLIC_USER_COLUMNS = users.public_columns
+PROGRESS_COLUMNS = ("current_level", "xp_points", "badges", "next_goal", "last_updated")
@@ -0,0 +1,152 @@
+import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import requests
+
+API_BASE = "https://api.github.com"
+
+# Files up to this size are sent inline in the tree request; larger ones become blobs first
+INLINE_CONTENT_LIMIT = 64 * 1024
+
+
+class GitTreeWriteError(Exception):
+    """The Git Data API batch could not be completed"""
+
+
+class GitTreeWriter:
+    """Writes many files to a repository as a single commit.
+
+    Uses the Git Data API (blobs -> tree -> commit -> ref update) instead of
+    one Contents API PUT, and one commit, per file. Blobs for large files are
+    created concurrently. If the batch fails (for example on an empty
+    repository with no branch yet) the files are written one by one through
+    the Contents API.
+    """
+
+    def __init__(self, max_workers: int = 8, ref_retries: int = 3, retry_delay: float = 1.0):
+        self.max_workers = max_workers
+        self.ref_retries = ref_retries
+        self.retry_delay = retry_delay
+
+    @staticmethod
+    def _session(token: str) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        })
+        return session
+
+    def write_files(self, token: str, owner: str, repo_name: str, files: Sequence[Tuple[str, str]],
+                    message: str, branch: Optional[str] = None) -> Dict[str, Any]:
+        """Commit ``files`` ((path, content) pairs) and return a summary.
+
+        The summary has ``commit_sha`` (None when the fallback was used),
+        ``paths`` actually written and ``mode`` ("tree" or "contents").
+        """
+        session = self._session(token)
+        try:
+            commit_sha = self._write_tree(session, owner, repo_name, files, message, branch)
+            print(f"🌳 Wrote {len(files)} files to {owner}/{repo_name} in one commit ({commit_sha[:7]})")
+            return {"commit_sha": commit_sha, "paths": [path for path, _ in files], "mode": "tree"}
+        except (GitTreeWriteError, requests.RequestException) as e:
+            print(f"⚠️ Tree batch write failed for {owner}/{repo_name}, writing files individually: {e}")
+
+        written = [path for path, content in files
+                   if self._put_file(session, owner, repo_name, path, content, message, branch)]
+        return {"commit_sha": None, "paths": written, "mode": "contents"}
+
+    # ------------------------------------------------------------------
+    # Git Data API
+    # ------------------------------------------------------------------
+
+    def _write_tree(self, session: requests.Session, owner: str, repo_name: str,
+                    files: Sequence[Tuple[str, str]], message: str, branch: Optional[str]) -> str:
+        repo_url = f"{API_BASE}/repos/{owner}/{repo_name}"
+        branch = branch or self._default_branch(session, repo_url)
+        head_sha = self._head_commit(session, repo_url, branch)
+
+        commit = self._request(session, "get", f"{repo_url}/git/commits/{head_sha}", 200)
+        base_tree = commit["tree"]["sha"]
+
+        large = [(path, content) for path, content in files if len(content.encode("utf-8")) > INLINE_CONTENT_LIMIT]
+        blob_shas: Dict[str, str] = {}
+        if large:
+            def create_blob(item: Tuple[str, str]) -> Tuple[str, str]:
+                path, content = item
+                blob = self._request(session, "post", f"{repo_url}/git/blobs", 201, json={
+                    "content": base64.b64encode(content.encode("utf-8")).decode("ascii"),
+                    "encoding": "base64"
+                })
+                return path, blob["sha"]
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(large))) as pool:
+                blob_shas = dict(pool.map(create_blob, large))
+
+        entries: List[Dict[str, Any]] = []
+        for path, content in files:
+            entry = {"path": path, "mode": "100644", "type": "blob"}
+            if path in blob_shas:
+                entry["sha"] = blob_shas[path]
+            else:
+                entry["content"] = content
+            entries.append(entry)
+
+        tree = self._request(session, "post", f"{repo_url}/git/trees", 201,
+                             json={"base_tree": base_tree, "tree": entries})
+        new_commit = self._request(session, "post", f"{repo_url}/git/commits", 201,
+                                   json={"message": message, "tree": tree["sha"], "parents": [head_sha]})
+        self._request(session, "patch", f"{repo_url}/git/refs/heads/{branch}", 200,
+                      json={"sha": new_commit["sha"]})
+        return new_commit["sha"]
+
+    def _default_branch(self, session: requests.Session, repo_url: str) -> str:
+        return self._request(session, "get", repo_url, 200).get("default_branch") or "main"
+
+    def _head_commit(self, session: requests.Session, repo_url: str, branch: str) -> str:
+        # A just-created auto_init repository may not expose its branch immediately
+        for attempt in range(self.ref_retries):
+            response = session.get(f"{repo_url}/git/ref/heads/{branch}", timeout=10)
+            if response.status_code == 200:
+                return response.json()["object"]["sha"]
+            if attempt < self.ref_retries - 1:
+                time.sleep(self.retry_delay)
+        raise GitTreeWriteError(f"Branch '{branch}' not found ({response.status_code})")
+
+    @staticmethod
+    def _request(session: requests.Session, method: str, url: str, expected: int, **kwargs) -> Dict[str, Any]:
+        response = getattr(session, method)(url, timeout=15, **kwargs)
+        if response.status_code != expected:
+            raise GitTreeWriteError(f"{method.upper()} {url} returned {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    # ------------------------------------------------------------------
+    # Contents API fallback
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _put_file(session: requests.Session, owner: str, repo_name: str, path: str, content: str,
+                  message: str, branch: Optional[str]) -> bool:
+        url = f"{API_BASE}/repos/{owner}/{repo_name}/contents/{path}"
+        data = {
+            "message": message,
+            "content": base64.b64encode(content.encode("utf-8")).decode("ascii")
+        }
+        if branch:
+            data["branch"] = branch
+
+        # Updating an existing file (e.g. the auto_init README) requires its blob sha
+        existing = session.get(url, params={"ref": branch} if branch else None, timeout=10)
+        if existing.status_code == 200:
+            data["sha"] = existing.json().get("sha")
+
+        response = session.put(url, json=data, timeout=15)
+        if response.status_code in [200, 201]:
+            return True
+        print(f"❌ Failed to create file {path}: {response.status_code} - {response.text}")
+        return False
+
+
+git_tree_writer = GitTreeWriter()
@@ -1,5 +1,5 @@
-from github import Github
 import requests
+from ..utils.pagination import CursorError, encode_cursor, decode_cursor
 
 class GitHubIntegration:
     def __init__(self, client_id, client_secret, redirect_uri):
@@ -50,30 +50,48 @@ class GitHubIntegration:
         return None
 
     def get_user_repositories(self, access_token):
-        """Get user's repositories from GitHub"""
+        """Get all of the user's repositories from GitHub (follows pagination)"""
+        repositories = []
+        cursor = None
+        while True:
+            page, cursor = self.get_user_repositories_page(access_token, cursor=cursor)
+            repositories.extend(page)
+            if not cursor:
+                return repositories
+
+    def get_user_repositories_page(self, access_token, cursor=None, per_page=100):
+        """Get one page of the user's repositories; returns (repos, next_cursor)"""
         headers = {
             "Authorization": f"token {access_token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        position = decode_cursor(cursor, size=1)
+        if position and (isinstance(position[0], bool) or not isinstance(position[0], int) or position[0] < 1):
+            raise CursorError("Invalid pagination cursor")
+        page = position[0] if position else 1
+        params = {"per_page": max(1, min(per_page, 100)), "page": page, "sort": "full_name"}
         
-        response = requests.get("https://api.github.com/user/repos", headers=headers)
-        if response.status_code == 200:
-            repos = response.json()
-            # Return simplified repo data
-            return [{
-                "id": repo["id"],
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "description": repo["description"],
-                "html_url": repo["html_url"],
-                "clone_url": repo["clone_url"],
-                "language": repo["language"],
-                "stargazers_count": repo["stargazers_count"],
-                "forks_count": repo["forks_count"],
-                "updated_at": repo["updated_at"],
-                "private": repo["private"]
-            } for repo in repos]
-        return []
+        response = requests.get("https://api.github.com/user/repos", headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            return [], None
+        
+        repos = response.json()
+        # Return simplified repo data
+        simplified = [{
+            "id": repo["id"],
+            "name": repo["name"],
+            "full_name": repo["full_name"],
+            "description": repo["description"],
+            "html_url": repo["html_url"],
+            "clone_url": repo["clone_url"],
+            "language": repo["language"],
+            "stargazers_count": repo["stargazers_count"],
+            "forks_count": repo["forks_count"],
+            "updated_at": repo["updated_at"],
+            "private": repo["private"]
+        } for repo in repos]
+        next_cursor = encode_cursor([page + 1]) if "next" in response.links else None
+        return simplified, next_cursor
 
     def get_repository_details(self, access_token, owner, repo_name):
         """Get detailed information about a specific repository"""
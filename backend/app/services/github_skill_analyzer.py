@@ -4,6 +4,8 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import json
 
+from .contribution_history import contribution_history_store
+
 class GitHubSkillAnalyzer:
     """Analyze GitHub profile to extract skills and assess coding abilities"""
     
@@ -136,7 +138,20 @@ class GitHubSkillAnalyzer:
         return None
     
     def _get_contribution_data(self, username: str) -> Dict[str, Any]:
-        """Get user contribution metrics"""
+        """Get user contribution metrics, preferring the local history store.
+
+        A user seen for the first time gets current-year metrics; the older
+        years are backfilled in the background.
+        """
+        if self.github_token:
+            try:
+                return contribution_history_store.get(username, self.github_token).activity_metrics()
+            except Exception as e:
+                print(f"⚠️ Contribution history unavailable, using search counts: {e}")
+        return self._search_contribution_data(username)
+    
+    def _search_contribution_data(self, username: str) -> Dict[str, Any]:
+        """Contribution counts from the search API (three requests)"""
         try:
             # Get recent commits
             commits_response = requests.get(
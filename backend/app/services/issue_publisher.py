@@ -0,0 +1,282 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Any, Optional, Sequence
+
+import requests
+
+from .supabase_client import supabase
+
+API_BASE = "https://api.github.com"
+
+# Label colours for labels the publisher has to create
+LABEL_COLORS = ("0e8a16", "1d76db", "5319e7", "fbca04", "d93f0b", "006b75", "b60205", "c5def5")
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """429, or a 403 that is GitHub's primary or secondary rate limit (not a permission error)"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    return "rate limit" in (response.text or "").lower()
+
+
+def idempotency_key(owner: str, repo_name: str, title: str) -> str:
+    """Stable client-side key for one issue in one repository"""
+    normalized = f"{owner}/{repo_name}\n{' '.join(title.split()).lower()}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IssueSpec:
+    """One issue to publish; ``meta`` is passed through to the result"""
+    title: str
+    body: str = ""
+    labels: List[str] = field(default_factory=list)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class IssuePublisher:
+    """Creates a batch of GitHub issues concurrently and idempotently.
+
+    Issues whose idempotency key is already recorded in ``ai_issues`` (or
+    whose title already exists in the repository) are skipped. Creation uses
+    a small worker pool with a shared pacer, since GitHub's secondary rate
+    limits penalise bursts of content-creating requests, and retries
+    rate-limit and server errors with exponential backoff, checking first
+    whether a failed create actually went through.
+    """
+
+    def __init__(self, client, max_workers: int = 3, min_interval: float = 1.0,
+                 max_retries: int = 4, backoff: float = 2.0):
+        self.client = client
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._pace_lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def publish(self, token: str, owner: str, repo_name: str, issues: Sequence[IssueSpec],
+                user_id: Optional[int] = None,
+                progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Publish ``issues`` and return one result per spec, in input order.
+
+        Each result holds the spec's ``meta`` plus ``title``, ``number``,
+        ``url`` and ``status`` ("created", "existing" or "failed").
+        ``progress(done, total, result)`` is called as each issue finishes.
+        """
+        session = requests.Session()
+        session.headers.update({"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"})
+        repo_url = f"{API_BASE}/repos/{owner}/{repo_name}"
+
+        keys = [idempotency_key(owner, repo_name, spec.title) for spec in issues]
+        existing = self._existing_issues(session, repo_url, owner, repo_name, issues, keys)
+        self._ensure_labels(session, repo_url, {label for spec in issues for label in spec.labels})
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(issues)
+        done = 0
+        pending = []
+        for index, (spec, key) in enumerate(zip(issues, keys)):
+            if key in existing:
+                results[index] = self._result(spec, existing[key], "existing")
+                done += 1
+                if progress:
+                    progress(done, len(issues), results[index])
+            else:
+                pending.append(index)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                futures = {pool.submit(self._create_issue, session, repo_url, owner, repo_name, issues[i]): i
+                           for i in pending}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    issue = future.result()
+                    results[index] = self._result(issues[index], issue, "created" if issue else "failed")
+                    done += 1
+                    if progress:
+                        progress(done, len(issues), results[index])
+
+        self._record(owner, repo_name, user_id, issues, keys, results)
+        created = sum(1 for result in results if result["status"] == "created")
+        skipped = sum(1 for result in results if result["status"] == "existing")
+        print(f"📝 Published issues to {owner}/{repo_name}: {created} created, {skipped} existing, "
+              f"{len(results) - created - skipped} failed")
+        return results
+
+    @staticmethod
+    def _result(spec: IssueSpec, issue: Optional[Dict[str, Any]], status: str) -> Dict[str, Any]:
+        return {
+            **spec.meta,
+            "title": spec.title,
+            "number": issue.get("number") if issue else None,
+            "url": issue.get("html_url") if issue else None,
+            "status": status
+        }
+
+    # ------------------------------------------------------------------
+    # Idempotency
+    # ------------------------------------------------------------------
+
+    def _existing_issues(self, session: requests.Session, repo_url: str, owner: str, repo_name: str,
+                         issues: Sequence[IssueSpec], keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Map idempotency key -> already-published issue"""
+        existing: Dict[str, Dict[str, Any]] = {}
+        try:
+            rows = self.client.table("ai_issues").select("idempotency_key, github_issue_id").in_(
+                "idempotency_key", keys
+            ).eq("status", "created").execute().data or []
+            for row in rows:
+                if row.get("github_issue_id"):
+                    number = row["github_issue_id"]
+                    existing[row["idempotency_key"]] = {
+                        "number": number,
+                        "html_url": f"https://github.com/{owner}/{repo_name}/issues/{number}"
+                    }
+        except Exception as e:
+            print(f"⚠️ Could not read issue idempotency keys: {e}")
+
+        # Issues created on GitHub whose database write was lost are matched by title
+        if len(existing) < len(keys):
+            wanted = {key: spec for key, spec in zip(keys, issues) if key not in existing}
+            page = 1
+            while wanted and page <= 10:
+                response = session.get(f"{repo_url}/issues", params={"state": "all", "per_page": 100, "page": page},
+                                       timeout=10)
+                if response.status_code != 200:
+                    break
+                listed = response.json()
+                for issue in listed:
+                    key = idempotency_key(owner, repo_name, issue.get("title", ""))
+                    if key in wanted and "pull_request" not in issue:
+                        existing[key] = issue
+                        del wanted[key]
+                if len(listed) < 100:
+                    break
+                page += 1
+        return existing
+
+    def _record(self, owner: str, repo_name: str, user_id: Optional[int], issues: Sequence[IssueSpec],
+                keys: List[str], results: List[Dict[str, Any]]):
+        rows = []
+        for spec, key, result in zip(issues, keys, results):
+            if result["status"] == "existing":
+                continue
+            rows.append({
+                "user_id": user_id,
+                "owner": owner,
+                "repo_name": repo_name,
+                "github_issue_id": result["number"],
+                "issue_title": spec.title,
+                "issue_body": spec.body,
+                "labels": spec.labels,
+                "status": result["status"],
+                "idempotency_key": key
+            })
+        if not rows:
+            return
+        try:
+            self.client.table("ai_issues").upsert(rows, on_conflict="idempotency_key").execute()
+        except Exception as e:
+            print(f"⚠️ Failed to record published issues: {e}")
+
+    # ------------------------------------------------------------------
+    # GitHub requests
+    # ------------------------------------------------------------------
+
+    def _ensure_labels(self, session: requests.Session, repo_url: str, labels: set):
+        """Create every missing label up front instead of racing on issue creation"""
+        if not labels:
+            return
+        response = session.get(f"{repo_url}/labels", params={"per_page": 100}, timeout=10)
+        present = {label["name"].lower() for label in response.json()} if response.status_code == 200 else set()
+        missing = sorted(label for label in labels if label.lower() not in present)
+        for i, label in enumerate(missing):
+            self._send(session, "post", f"{repo_url}/labels",
+                       {"name": label, "color": LABEL_COLORS[i % len(LABEL_COLORS)]}, expected=(201, 422),
+                       recheck=lambda label=label: self._find_label(session, repo_url, label))
+
+    def _create_issue(self, session: requests.Session, repo_url: str, owner: str, repo_name: str,
+                      spec: IssueSpec) -> Optional[Dict[str, Any]]:
+        return self._send(session, "post", f"{repo_url}/issues",
+                          {"title": spec.title, "body": spec.body, "labels": spec.labels}, expected=(201,),
+                          recheck=lambda: self._find_issue(session, repo_url, owner, repo_name, spec.title))
+
+    @staticmethod
+    def _find_label(session: requests.Session, repo_url: str, name: str) -> Optional[Dict[str, Any]]:
+        response = session.get(f"{repo_url}/labels/{requests.utils.quote(name, safe='')}", timeout=10)
+        return response.json() if response.status_code == 200 else None
+
+    @staticmethod
+    def _find_issue(session: requests.Session, repo_url: str, owner: str, repo_name: str,
+                    title: str) -> Optional[Dict[str, Any]]:
+        """The most recently created issue with ``title``'s idempotency key, if any"""
+        key = idempotency_key(owner, repo_name, title)
+        response = session.get(f"{repo_url}/issues", params={"state": "all", "sort": "created", "direction": "desc",
+                                                             "per_page": 100}, timeout=10)
+        if response.status_code != 200:
+            return None
+        for issue in response.json():
+            if "pull_request" not in issue and idempotency_key(owner, repo_name, issue.get("title", "")) == key:
+                return issue
+        return None
+
+    def _pace(self):
+        """Space content-creating requests at least ``min_interval`` apart"""
+        with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _send(self, session: requests.Session, method: str, url: str, payload: Dict[str, Any],
+              expected: Sequence[int], recheck: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+              ) -> Optional[Dict[str, Any]]:
+        """Send a content-creating request with retries.
+
+        A timeout, connection error or 5xx may come after GitHub already
+        created the resource, so ``recheck()`` looks it up before each retry
+        and its result is returned instead of posting again. Rate limits are
+        retried without a recheck (nothing was created); other errors,
+        including permission-denied 403s, are not retried.
+        """
+        ambiguous = False
+        for attempt in range(self.max_retries + 1):
+            if ambiguous and recheck:
+                try:
+                    found = recheck()
+                except requests.RequestException:
+                    found = None
+                if found:
+                    return found
+            self._pace()
+            try:
+                response = getattr(session, method)(url, json=payload, timeout=15)
+            except requests.RequestException as e:
+                print(f"⚠️ GitHub request failed ({e}), attempt {attempt + 1}")
+                ambiguous = True
+                time.sleep(self.backoff ** attempt)
+                continue
+
+            if response.status_code in expected:
+                return response.json()
+            if is_rate_limited(response) or response.status_code >= 500:
+                ambiguous = ambiguous or response.status_code >= 500
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff ** (attempt + 1)
+                print(f"⚠️ GitHub returned {response.status_code}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+            print(f"❌ GitHub request to {url} failed: {response.status_code} - {response.text}")
+            return None
+        return None
+
+
+issue_publisher = IssuePublisher(supabase)
@@ -0,0 +1,316 @@
+import atexit
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+
+from ..config import Config
+from .lifecycle import lifecycle
+from .supabase_client import supabase
+
+PERIODS = ("all_time", "weekly", "monthly")
+
+
+def period_key(period: str, now: Optional[datetime] = None) -> str:
+    """Stable key for the current window of a period, e.g. weekly:2026-W42"""
+    now = now or datetime.now(timezone.utc)
+    if period == "weekly":
+        year, week, _ = now.isocalendar()
+        return f"weekly:{year}-W{week:02d}"
+    if period == "monthly":
+        return f"monthly:{now.year}-{now.month:02d}"
+    return "all_time"
+
+
+class RankingBoard:
+    """Points per user kept in a sorted container for O(log n) rank queries"""
+
+    def __init__(self):
+        self._points: Dict[Any, int] = {}
+        self._sorted = SortedList()  # (-points, user_id)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def points(self, user_id) -> Optional[int]:
+        return self._points.get(user_id)
+
+    def set(self, user_id, points: int):
+        previous = self._points.get(user_id)
+        if previous == points:
+            return
+        if previous is not None:
+            self._sorted.remove((-previous, user_id))
+        self._points[user_id] = points
+        self._sorted.add((-points, user_id))
+
+    def add(self, user_id, delta: int):
+        self.set(user_id, self._points.get(user_id, 0) + delta)
+
+    def rank(self, user_id) -> Optional[int]:
+        """Competition rank (users with equal points share a rank)"""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._sorted.bisect_left((-points,)) + 1
+
+    def _entry(self, index: int) -> Dict[str, Any]:
+        negative_points, user_id = self._sorted[index]
+        return {
+            "user_id": user_id,
+            "total_points": -negative_points,
+            "rank": self._sorted.bisect_left((negative_points,)) + 1
+        }
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        return [self._entry(i) for i in range(min(limit, len(self._sorted)))]
+
+    def around(self, user_id, radius: int) -> List[Dict[str, Any]]:
+        points = self._points.get(user_id)
+        if points is None:
+            return []
+        index = self._sorted.index((-points, user_id))
+        start = max(0, index - radius)
+        end = min(len(self._sorted), index + radius + 1)
+        return [self._entry(i) for i in range(start, end)]
+
+
+class LeaderboardService:
+    """Ranking engine over the leaderboard tables, with in-memory boards as a read cache.
+
+    The database is the source of truth. The all-time board mirrors
+    ``user_progress.xp_points``; weekly/monthly windows only count XP gained
+    within the window, and those gains are added to ``leaderboard_periods``
+    atomically (``leaderboard_add_period_points``) so several worker processes
+    never overwrite each other. Local boards apply changes immediately and are
+    rebuilt from the database every ``reload_interval`` seconds by the worker
+    thread, which also does the first load; request threads never scan the
+    tables and see only local changes until that load finishes.
+    """
+
+    # Seconds to wait before retrying a failed load
+    LOAD_RETRY_INTERVAL = 30.0
+
+    def __init__(self, client, persist_interval: float = 10.0, reload_interval: float = 30.0):
+        self.client = client
+        self.persist_interval = persist_interval
+        self.reload_interval = reload_interval
+        self._boards: Dict[str, RankingBoard] = {"all_time": RankingBoard()}
+        self._dirty: Set[Any] = set()  # users whose all-time total changed
+        self._pending: Dict[Tuple[str, Any], int] = {}  # (period key, user) -> points not yet added in the database
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()  # serializes loads and flushes
+        self._loaded_at: Optional[float] = None
+        self._load_failed_at: Optional[float] = None
+        self._worker: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update_points(self, user_id, total_points: int, previous_points: Optional[int] = None):
+        """Record a user's new XP total (mirrors user_progress.xp_points).
+
+        ``previous_points`` is the user's stored ``xp_points`` before this
+        change; only the gain over it counts toward the weekly/monthly windows.
+        When it is unknown nothing is credited to the windows.
+        """
+        user_id = self._normalize(user_id)
+        total_points = int(total_points or 0)
+        self._ensure_loaded()
+        with self._lock:
+            self._boards["all_time"].set(user_id, total_points)
+            self._dirty.add(user_id)
+
+            gained = total_points - int(previous_points) if previous_points is not None else 0
+            if gained > 0:
+                for period in ("weekly", "monthly"):
+                    key = period_key(period)
+                    self._board(key).add(user_id, gained)
+                    self._pending[(key, user_id)] = self._pending.get((key, user_id), 0) + gained
+        self._ensure_worker()
+
+    def stored_xp(self, user_id) -> Optional[int]:
+        """The user's ``user_progress.xp_points`` (0 without a row), or None if it cannot be read.
+
+        Read it before writing the new total and pass it to ``update_points``.
+        """
+        try:
+            rows = self.client.table("user_progress").select("xp_points").eq("user_id", user_id).limit(1).execute().data
+        except Exception as e:
+            print(f"⚠️ Could not read stored XP: {e}")
+            return None
+        return int(rows[0].get("xp_points") or 0) if rows else 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def top(self, limit: int = 50, period: str = "all_time") -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._board(period_key(period)).top(limit)
+
+    def position(self, user_id, period: str = "all_time", radius: int = 0) -> Dict[str, Any]:
+        """A user's points and rank, optionally with ``radius`` neighbours each side"""
+        user_id = self._normalize(user_id)
+        self._ensure_loaded()
+        with self._lock:
+            board = self._board(period_key(period))
+            position = {
+                "user_id": user_id,
+                "period": period,
+                "total_points": board.points(user_id) or 0,
+                "current_rank": board.rank(user_id),
+                "total_ranked": len(board)
+            }
+            if radius:
+                position["neighbours"] = board.around(user_id, radius)
+            return position
+
+    # ------------------------------------------------------------------
+    # Loading and persistence
+    # ------------------------------------------------------------------
+
+    def _board(self, key: str) -> RankingBoard:
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = RankingBoard()
+        return board
+
+    @staticmethod
+    def _normalize(user_id):
+        try:
+            return int(user_id)
+        except (TypeError, ValueError):
+            return user_id
+
+    def start(self):
+        """Load the boards and start the background worker (a warm-up task, see lifecycle)"""
+        if self._load_due():
+            self._load()
+        self._ensure_worker()
+
+    def _ensure_loaded(self):
+        """Never loads on a request thread: until the worker's first load, requests see the local boards"""
+        if self._loaded_at is None:
+            self._ensure_worker()
+
+    def _load_due(self) -> bool:
+        if self._loaded_at is not None:
+            return time.monotonic() - self._loaded_at > self.reload_interval
+        return self._load_failed_at is None or time.monotonic() - self._load_failed_at >= self.LOAD_RETRY_INTERVAL
+
+    def _load(self):
+        """(Re)build boards from the database, keeping changes not yet written.
+
+        A failed load keeps the current boards and is retried later; it never
+        marks the boards as loaded.
+        """
+        with self._io_lock:
+            boards: Dict[str, RankingBoard] = {"all_time": RankingBoard()}
+            try:
+                for row in self._fetch_all("leaderboard", "user_id, total_points"):
+                    boards["all_time"].set(self._normalize(row["user_id"]), row.get("total_points") or 0)
+
+                for key in (period_key(period) for period in ("weekly", "monthly")):
+                    boards[key] = RankingBoard()
+                    for row in self._fetch_all("leaderboard_periods", "user_id, points", period_key=key):
+                        boards[key].set(self._normalize(row["user_id"]), row.get("points") or 0)
+            except Exception as e:
+                print(f"⚠️ Leaderboard load error, serving cached boards: {e}")
+                self._load_failed_at = time.monotonic()
+                return
+
+            with self._lock:
+                local = self._boards["all_time"]
+                for user_id in self._dirty:
+                    if local.points(user_id) is not None:
+                        boards["all_time"].set(user_id, local.points(user_id))
+                for (key, user_id), points in self._pending.items():
+                    boards.setdefault(key, RankingBoard()).add(user_id, points)
+                self._boards = boards
+                self._loaded_at = time.monotonic()
+                self._load_failed_at = None
+        print(f"🏆 Leaderboard loaded: {len(boards['all_time'])} ranked users")
+
+    def _fetch_all(self, table: str, columns: str, page_size: int = 1000, **filters) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            builder = self.client.table(table).select(columns)
+            for column, value in filters.items():
+                builder = builder.eq(column, value)
+            page = builder.order("user_id").range(offset, offset + page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="leaderboard-persist", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            if self._load_due():
+                self._load()
+            time.sleep(self.persist_interval)
+            self.persist()
+
+    def persist(self):
+        """Write changed all-time totals and add pending window points in the database.
+
+        Ranks are served from memory and not stored: a stored rank goes stale
+        for everyone a user overtakes, so ``current_rank`` is cleared instead.
+        """
+        with self._io_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                pending, self._pending = self._pending, {}
+                now = datetime.now(timezone.utc).isoformat()
+                board = self._boards["all_time"]
+                leaderboard_rows = []
+                for user_id in dirty:
+                    if board.points(user_id) is None:
+                        continue
+                    leaderboard_rows.append({"user_id": user_id, "total_points": board.points(user_id),
+                                             "current_rank": None, "last_updated": now})
+                increments = [
+                    {"period_key": key, "user_id": user_id, "points": points}
+                    for (key, user_id), points in pending.items()
+                ]
+
+                # Drop windows that are no longer current
+                current = {"all_time"} | {period_key(period) for period in ("weekly", "monthly")}
+                for key in [key for key in self._boards if key not in current]:
+                    del self._boards[key]
+
+            try:
+                if leaderboard_rows:
+                    self.client.table("leaderboard").upsert(leaderboard_rows, on_conflict="user_id").execute()
+                    leaderboard_rows = []
+                if increments:
+                    self.client.rpc("leaderboard_add_period_points", {"increments": increments}).execute()
+            except Exception as e:
+                print(f"⚠️ Leaderboard persistence error, will retry: {e}")
+                with self._lock:
+                    self._dirty |= {row["user_id"] for row in leaderboard_rows}
+                    for (key, user_id), points in pending.items():
+                        self._pending[(key, user_id)] = self._pending.get((key, user_id), 0) + points
+
+
+leaderboard_service = LeaderboardService(
+    supabase,
+    persist_interval=Config.LEADERBOARD_PERSIST_INTERVAL,
+    reload_interval=Config.LEADERBOARD_RELOAD_INTERVAL,
+)
+
+atexit.register(leaderboard_service.persist)
+lifecycle.register_warmup("leaderboard", leaderboard_service.start)
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Callable, Dict, List, Any, Tuple
+
+from flask import Flask
+
+
+class Lifecycle:
+    """Tracks in-flight requests and drains the process on shutdown.
+
+    ``begin_drain`` (called on SIGTERM, see gunicorn.conf.py) makes the health
+    check report "draining" (503) while the worker is still serving, so a load
+    balancer stops routing here. ``drain`` then gives in-flight requests up to
+    ``timeout`` seconds to finish and flushes buffered telemetry and
+    leaderboard points to Supabase.
+
+    ``start_warmup`` builds the lazily-initialised services in a background
+    thread, so a fresh worker answers health checks immediately and the first
+    real request does not pay for client construction.
+    """
+
+    def __init__(self):
+        self._in_flight = 0
+        self._draining = False
+        self._drained = False
+        self._condition = threading.Condition()
+        self._warmup_tasks: List[Tuple[str, Callable[[], Any]]] = []
+        self._warmup: Dict[str, Any] = {"state": "pending", "tasks": {}}
+        self._warmup_thread = None
+
+    def init_app(self, app: Flask):
+        app.before_request(self._begin)
+        app.teardown_request(self._end)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def _begin(self):
+        with self._condition:
+            self._in_flight += 1
+
+    def _end(self, exc=None):
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            if not self._in_flight:
+                self._condition.notify_all()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "draining" if self._draining else "ok",
+            "in_flight": self._in_flight,
+            "warmup": self._warmup["state"]
+        }
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def warmup_status(self) -> Dict[str, Any]:
+        return dict(self._warmup, tasks=dict(self._warmup["tasks"]))
+
+    def register_warmup(self, name: str, task: Callable[[], Any]):
+        self._warmup_tasks.append((name, task))
+
+    def start_warmup(self):
+        """Run warm-up tasks, then resolve any remaining lazy proxies, off the serving threads"""
+        with self._condition:
+            if self._warmup_thread is not None:
+                return
+            self._warmup_thread = threading.Thread(target=self.warm_up, name="warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def warm_up(self) -> Dict[str, Any]:
+        from ..utils.lazy import pending_proxies, proxy_name, resolve
+
+        self._warmup["state"] = "running"
+        started = time.perf_counter()
+        tasks = list(self._warmup_tasks) + [(proxy_name(proxy), lambda proxy=proxy: resolve(proxy))
+                                            for proxy in pending_proxies()]
+        for name, task in tasks:
+            task_started = time.perf_counter()
+            try:
+                task()
+                self._warmup["tasks"][name] = round((time.perf_counter() - task_started) * 1000)
+            except Exception as e:
+                self._warmup["tasks"][name] = f"failed: {e}"
+                print(f"⚠️ Warm-up task {name} failed: {e}")
+        self._warmup["state"] = "done"
+        self._warmup["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+        print(f"🔥 Warm-up finished in {self._warmup['elapsed_ms']}ms ({len(tasks)} tasks)")
+        return self._warmup
+
+    def begin_drain(self):
+        """Report "draining" from now on; requests are still served"""
+        with self._condition:
+            if not self._draining:
+                self._draining = True
+                print("🚦 Draining: health check now returns 503")
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Wait for in-flight requests, then flush background state; True if nothing was cut off"""
+        self.begin_drain()
+        with self._condition:
+            if self._drained:
+                return True
+            deadline = time.monotonic() + timeout
+            while self._in_flight and time.monotonic() < deadline:
+                self._condition.wait(deadline - time.monotonic())
+            clean = not self._in_flight
+
+        if not clean:
+            print(f"⚠️ Shutting down with {self._in_flight} request(s) still in flight")
+
+        from .operation_logger import operation_logger
+        from .leaderboard_service import leaderboard_service
+        from ..utils.async_io import shutdown_executor
+
+        for name, flush in (("operation log", operation_logger.shutdown),
+                            ("leaderboard", leaderboard_service.persist),
+                            ("async I/O pool", shutdown_executor)):
+            try:
+                flush()
+            except Exception as e:
+                print(f"⚠️ Failed to flush {name} on shutdown: {e}")
+
+        with self._condition:
+            self._drained = True
+        print("✅ Drained: telemetry and leaderboard flushed")
+        return clean
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,238 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..config import Config
+from .supabase_client import supabase
+
+
+class OperationTimer:
+    """Wall-clock timer for agent operations (perf_counter based)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stopped: Optional[float] = None
+
+    def stop(self) -> int:
+        if self.stopped is None:
+            self.stopped = time.perf_counter()
+        return self.elapsed_ms
+
+    @property
+    def elapsed_ms(self) -> int:
+        end = self.stopped if self.stopped is not None else time.perf_counter()
+        return int((end - self.started) * 1000)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class OperationLogger:
+    """Non-blocking sink for agent_operations rows.
+
+    Records are queued in memory and written by a background thread in bulk
+    inserts, either when the batch is full or when the flush interval expires.
+    Batches that cannot be written are spilled to a local NDJSON file and
+    replayed on the next successful flush. Every flushed batch is also rolled
+    up into agent_metrics (per day and operation type) with an atomic
+    increment, so concurrent workers never overwrite each other's totals.
+    """
+
+    def __init__(self, client, batch_size: int = 50, flush_interval: float = 2.0,
+                 spill_path: str = "logs/agent_operations_spill.ndjson", max_queue: int = 10000):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        # agent_metrics increments that could not be written yet, keyed by (day, operation type)
+        self._pending_metrics: Dict[Tuple[str, str], Dict[str, int]] = {}
+        # Records that skipped the full queue and went straight to the spill file (replayed later, not lost)
+        self.spilled = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def timer(self) -> OperationTimer:
+        """Start a timer; use elapsed_ms when building the operation record"""
+        return OperationTimer()
+
+    def log(self, operation_data: Dict[str, Any]):
+        """Queue an agent_operations row; never blocks the caller"""
+        record = dict(operation_data)
+        record.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Queue is saturated (database down for a long time) - spill directly
+            self.spilled += 1
+            self._spill([record])
+
+    def log_failure(self, operation_type: str, user_id: Optional[Any], error: Exception,
+                    timer: Optional[OperationTimer] = None, ai_model_used: Optional[str] = None,
+                    target_repository: Optional[str] = None):
+        """Queue a success=False row for an operation that raised"""
+        self.log({
+            "user_id": user_id,
+            "operation_type": operation_type,
+            "target_repository": target_repository,
+            "input_data": {},
+            "output_data": None,
+            "success": False,
+            "error_message": str(error)[:1000],
+            "ai_model_used": ai_model_used,
+            "execution_time_ms": timer.stop() if timer else 0,
+        })
+
+    def flush(self):
+        """Drain the queue synchronously (used at shutdown)"""
+        batch = self._drain(block=False)
+        while batch:
+            self._write_batch(batch)
+            batch = self._drain(block=False)
+
+    def shutdown(self):
+        self._stopping.set()
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="operation-logger", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write_batch(batch)
+
+    def _drain(self, block: bool) -> List[Dict[str, Any]]:
+        """Collect up to batch_size records, waiting at most flush_interval"""
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        with self._flush_lock:
+            try:
+                self.client.table("agent_operations").insert(batch).execute()
+            except Exception as e:
+                print(f"⚠️ Operation logging error, spilling {len(batch)} records: {e}")
+                self._spill(batch)
+                return
+
+            self._rollup_metrics(batch)
+            self._replay_spill()
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+
+    def _spill(self, records: List[Dict[str, Any]]):
+        try:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + "\n")
+        except Exception as e:
+            print(f"❌ Failed to spill operation records: {e}")
+
+    def _replay_spill(self):
+        """Re-insert spilled records once Supabase is reachable again"""
+        if not os.path.exists(self.spill_path):
+            return
+
+        replay_path = f"{self.spill_path}.replay"
+        try:
+            os.replace(self.spill_path, replay_path)
+            with open(replay_path, "r", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        except Exception as e:
+            print(f"⚠️ Could not read operation spill file: {e}")
+            return
+
+        for start in range(0, len(records), self.batch_size):
+            chunk = records[start:start + self.batch_size]
+            try:
+                self.client.table("agent_operations").insert(chunk).execute()
+                self._rollup_metrics(chunk)
+            except Exception as e:
+                print(f"⚠️ Spill replay failed, keeping {len(records) - start} records: {e}")
+                self._spill(records[start:])
+                break
+
+        try:
+            os.remove(replay_path)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # agent_metrics roll-up
+    # ------------------------------------------------------------------
+
+    def _rollup_metrics(self, batch: List[Dict[str, Any]]):
+        """Add a batch to agent_metrics totals and average latency (caller holds _flush_lock)"""
+        buckets = self._pending_metrics
+        for record in batch:
+            day = str(record.get("created_at") or datetime.now(timezone.utc).isoformat())[:10]
+            key = (day, record.get("operation_type") or "unknown")
+            bucket = buckets.setdefault(key, {"total": 0, "success": 0, "time_ms": 0})
+            bucket["total"] += 1
+            bucket["success"] += 1 if record.get("success", True) else 0
+            bucket["time_ms"] += int(record.get("execution_time_ms") or 0)
+
+        increments = [
+            {"date": day, "operation_type": operation_type, **bucket}
+            for (day, operation_type), bucket in buckets.items()
+        ]
+        try:
+            # INSERT ... ON CONFLICT DO UPDATE SET total = total + excluded.total (see db.sql)
+            self.client.rpc("agent_metrics_add", {"increments": increments}).execute()
+        except Exception as e:
+            # Kept and added to the next batch's roll-up
+            print(f"⚠️ Metrics roll-up error, retrying with the next batch: {e}")
+            return
+        self._pending_metrics = {}
+
+operation_logger = OperationLogger(
+    supabase,
+    batch_size=Config.OPERATION_LOG_BATCH_SIZE,
+    flush_interval=Config.OPERATION_LOG_FLUSH_INTERVAL,
+    spill_path=Config.OPERATION_LOG_SPILL_PATH,
+)
+
+atexit.register(operation_logger.shutdown)
@@ -0,0 +1,188 @@
+import hashlib
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from ..config import Config
+
+REPOS_PER_PAGE = 100
+TOP_K = 10
+
+
+class RepoStatsError(Exception):
+    """GitHub user or repository listing could not be fetched"""
+
+
+def _last_page(response) -> int:
+    """Page count from the Link header (1 when there is no rel="last")"""
+    last = response.links.get("last", {}).get("url")
+    if not last:
+        return 1
+    try:
+        return int(parse_qs(urlparse(last).query).get("page", ["1"])[0])
+    except ValueError:
+        return 1
+
+
+def compute_repository_stats(repos: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Every repository aggregate in a single pass over ``repos``"""
+    now = now or datetime.now(timezone.utc)
+    # GitHub timestamps are fixed-width UTC ISO strings, so they compare lexically
+    recent_cutoff = (now - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    total_stars = total_forks = total_watchers = total_issues = 0
+    private_repos = forked_repos = 0
+    languages: Dict[str, int] = {}
+    recent_repos: List[Dict[str, Any]] = []
+
+    for repo in repos:
+        total_stars += repo.get("stargazers_count", 0) or 0
+        total_forks += repo.get("forks_count", 0) or 0
+        total_watchers += repo.get("watchers_count", 0) or 0
+        total_issues += repo.get("open_issues_count", 0) or 0
+        if repo.get("private", False):
+            private_repos += 1
+        if repo.get("fork", False):
+            forked_repos += 1
+        language = repo.get("language")
+        if language:
+            languages[language] = languages.get(language, 0) + 1
+        if (repo.get("updated_at") or "") > recent_cutoff:
+            recent_repos.append(repo)
+
+    return {
+        "repository_stats": {
+            "total_repositories": len(repos),
+            "public_repositories": len(repos) - private_repos,
+            "private_repositories": private_repos,
+            "forked_repositories": forked_repos,
+            "original_repositories": len(repos) - forked_repos,
+            "total_stars": total_stars,
+            "total_forks": total_forks,
+            "total_watchers": total_watchers,
+            "total_open_issues": total_issues,
+            "recent_activity_count": len(recent_repos)
+        },
+        "languages": dict(sorted(languages.items(), key=lambda x: x[1], reverse=True)),
+        "recent_repositories": heapq.nlargest(TOP_K, recent_repos, key=lambda r: r.get("updated_at") or ""),
+        "top_starred_repositories": heapq.nlargest(TOP_K, repos, key=lambda r: r.get("stargazers_count", 0) or 0)
+    }
+
+
+class RepoStatsEngine:
+    """Fetches a user's profile and every repository page concurrently and
+    caches the computed statistics per (user, viewer) for ``ttl_seconds``.
+
+    At most ``max_pages`` pages are read; larger accounts are marked
+    ``truncated`` in ``repository_stats``.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_workers: int = 8, max_pages: int = 50,
+                 max_entries: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.max_entries = max_entries
+        self._cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(username: str, token: str) -> Tuple[str, str]:
+        return username.lower(), hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, username: str, token: str) -> Tuple[Dict[str, Any], bool]:
+        """Return (stats, served_from_cache)"""
+        key = self._cache_key(username, token)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.time() - entry[0] < self.ttl_seconds:
+                return entry[1], True
+
+        user_data, repos, truncated = self._fetch(username, token)
+        stats = {"user_info": self._user_info(user_data), **compute_repository_stats(repos)}
+        # Accounts beyond max_pages are only partly counted; say so and give GitHub's own total
+        stats["repository_stats"]["truncated"] = truncated
+        stats["repository_stats"]["public_repos"] = user_data["public_repos"]
+
+        with self._lock:
+            if key not in self._cache and len(self._cache) >= self.max_entries:
+                oldest = min(self._cache, key=lambda k: self._cache[k][0])
+                del self._cache[oldest]
+            self._cache[key] = (time.time(), stats)
+        return stats, False
+
+    def invalidate(self, username: str, token: str):
+        with self._lock:
+            self._cache.pop(self._cache_key(username, token), None)
+
+    @staticmethod
+    def _user_info(user_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "login": user_data["login"],
+            "name": user_data.get("name", ""),
+            "bio": user_data.get("bio", ""),
+            "location": user_data.get("location", ""),
+            "company": user_data.get("company", ""),
+            "blog": user_data.get("blog", ""),
+            "email": user_data.get("email", ""),
+            "avatar_url": user_data["avatar_url"],
+            "public_repos": user_data["public_repos"],
+            "followers": user_data["followers"],
+            "following": user_data["following"],
+            "created_at": user_data["created_at"],
+        }
+
+    def _fetch(self, username: str, token: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+        """(user, repositories, truncated); truncated when the account has more than ``max_pages`` pages"""
+        # Stateless requests.get per call: requests does not document Session as thread-safe
+        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
+
+        def get_page(page: int):
+            # full_name order keeps page boundaries stable while pages are fetched in parallel
+            return requests.get(
+                f"https://api.github.com/users/{username}/repos",
+                params={"per_page": REPOS_PER_PAGE, "page": page, "sort": "full_name", "type": "owner"},
+                headers=headers,
+                timeout=10
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            user_future = pool.submit(requests.get, f"https://api.github.com/users/{username}",
+                                      headers=headers, timeout=10)
+            first_page = get_page(1)
+            if first_page.status_code != 200:
+                raise RepoStatsError("Failed to fetch repositories")
+
+            total_pages = _last_page(first_page)
+            last_page = min(total_pages, self.max_pages)
+            responses = [first_page] + list(pool.map(get_page, range(2, last_page + 1)))
+
+            user_response = user_future.result()
+            if user_response.status_code != 200:
+                raise RepoStatsError("Failed to fetch user data")
+
+        repos: List[Dict[str, Any]] = []
+        seen = set()
+        for response in responses:
+            if response.status_code != 200:
+                raise RepoStatsError("Failed to fetch repositories")
+            for repo in response.json():
+                if repo["id"] not in seen:
+                    seen.add(repo["id"])
+                    repos.append(repo)
+
+        truncated = total_pages > last_page
+        if truncated:
+            print(f"⚠️ Repository stats for {username} cover the first {last_page} of {total_pages} pages "
+                  f"({len(repos)} of {user_response.json().get('public_repos')} public repositories)")
+        print(f"📦 Fetched {len(repos)} repositories for {username} across {len(responses)} pages")
+        return user_response.json(), repos, truncated
+
+
+repo_stats_engine = RepoStatsEngine(ttl_seconds=Config.REPO_STATS_CACHE_TTL)
@@ -1,4 +1,11 @@
-from supabase import create_client
 from ..config import Config
+from ..utils.lazy import LazyProxy
 
-supabase = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+
+def _create_client():
+    # supabase pulls in httpx, postgrest, gotrue, realtime and storage (~0.3s)
+    from supabase import create_client
+    return create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+
+
+supabase = LazyProxy(_create_client, name="supabase")
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from ..config import Config
+
+# Shared across requests: Flask runs each async view on its own short-lived
+# event loop, so a per-loop default executor would be rebuilt every request.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.ASYNC_IO_WORKERS, thread_name_prefix="async-io")
+        return _executor
+
+
+async def run_blocking(call: Callable[[], Any]) -> Any:
+    """Await a blocking call (Supabase, GitHub, LLM SDK) on the shared I/O pool"""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), call)
+
+
+async def gather_blocking(*calls: Callable[[], Any], return_exceptions: bool = False) -> List[Any]:
+    """Run independent blocking calls concurrently and return their results in order"""
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    return await asyncio.gather(*(loop.run_in_executor(executor, call) for call in calls),
+                                return_exceptions=return_exceptions)
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
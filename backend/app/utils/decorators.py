@@ -1,10 +1,23 @@
+import inspect
 import jwt
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from functools import wraps
 from ..config import Config
 from ..services.supabase_client import supabase
 
+def _ensure_sync(f):
+    """Run async views through Flask's event-loop bridge; sync views are returned as-is"""
+    if not inspect.iscoroutinefunction(f):
+        return f
+
+    @wraps(f)
+    def run(*args, **kwargs):
+        return current_app.ensure_sync(f)(*args, **kwargs)
+    return run
+
 def token_required(f):
+    f = _ensure_sync(f)
+
     @wraps(f)
     def decorated(*args, **kwargs):
         token = request.headers.get("Authorization")
@@ -24,6 +37,8 @@ def auth_required(f):
     Authentication decorator that supports both Bearer tokens and cookies.
     Falls back from Bearer token to cookie authentication.
     """
+    f = _ensure_sync(f)
+
     @wraps(f)
     def decorated(*args, **kwargs):
         # Try Bearer token first
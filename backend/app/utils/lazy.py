@@ -0,0 +1,65 @@
+import threading
+from typing import Any, Callable, List
+
+# Every proxy created, so warm-up can resolve them all after the server is up
+_registry: List["LazyProxy"] = []
+_registry_lock = threading.Lock()
+
+
+class LazyProxy:
+    """Stand-in for an expensive object that is built on first attribute access.
+
+    ``factory`` runs exactly once (under a lock); afterwards every attribute
+    lookup is forwarded to the real object. Module singletons wrapped in a
+    proxy keep their import-time name, so callers do not change.
+    """
+
+    __slots__ = ("_factory", "_instance", "_lock", "_name")
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_name", name or getattr(factory, "__qualname__", repr(factory)))
+        with _registry_lock:
+            _registry.append(self)
+
+    def _resolve(self) -> Any:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "resolved" if self._instance is not None else "pending"
+        return f"<LazyProxy {self._name} ({state})>"
+
+
+def is_resolved(proxy: Any) -> bool:
+    return not isinstance(proxy, LazyProxy) or proxy._instance is not None
+
+
+def proxy_name(proxy: LazyProxy) -> str:
+    return proxy._name
+
+
+def pending_proxies() -> List[LazyProxy]:
+    with _registry_lock:
+        return [proxy for proxy in _registry if proxy._instance is None]
+
+
+def resolve(proxy: Any) -> Any:
+    return proxy._resolve() if isinstance(proxy, LazyProxy) else proxy
@@ -0,0 +1,266 @@
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+# Compiled once at import; every generated README and issue body comes from here.
+# Rendering is deterministic, so identical inputs give byte-identical output.
+TEMPLATES: Dict[str, Template] = {
+    "roadmap_level_readme": Template("""# $name
+
+$description
+
+## Learning Objectives
+$learning_objectives
+
+## Skills Covered
+$skills_covered
+
+## Estimated Duration
+$duration
+
+## Projects in This Level
+$tasks
+"""),
+
+    "roadmap_task_readme": Template("""# $title
+
+$description
+
+## Skills Required
+$skills_required
+
+## Acceptance Criteria
+$acceptance_criteria
+
+## Resources
+$resources
+
+## Estimated Time
+$estimated_time
+
+## Difficulty
+$difficulty
+"""),
+
+    "level_issue_body": Template("""## Learning Task: $task
+
+**Level:** $level
+**Difficulty:** $difficulty
+**Folder Path:** `$path`
+
+### Task Description
+Complete the learning task in the `$path` folder.
+
+### What to Do
+1. Navigate to the `$path` folder
+2. Read the README.md file for requirements
+3. Complete the task according to acceptance criteria
+4. Commit your solution
+5. Create a pull request when ready
+
+### Resources Available
+- Check the README.md in the task folder
+- Review the main roadmap README.md
+- Use the learning objectives as guidance
+
+### Acceptance Criteria
+- [ ] Task completed according to README requirements
+- [ ] Code follows best practices
+- [ ] Documentation updated
+- [ ] Tests passing (if applicable)
+
+**Good luck with your learning journey! 🚀**
+"""),
+
+    "project_readme": Template("""# $name
+
+$description
+
+## Learning Objectives
+$learning_objectives
+
+## Tech Stack
+$tech_stack
+
+## Project Structure
+
+This repository is organized by learning milestones. Each folder contains:
+- Project files and code
+- README with learning objectives
+- Practice exercises
+- Resources and references
+
+## Getting Started
+
+1. Clone this repository
+2. Navigate to the first milestone folder
+3. Read the README and requirements
+4. Start coding and learning!
+
+## Progress Tracking
+
+Check the Issues tab to see your learning tasks and track progress.
+
+---
+
+Generated with AI-powered learning system 🤖
+"""),
+
+    "milestone_readme": Template("""# Milestone $number: $name
+
+$description
+
+## Learning Objectives
+$learning_objectives
+
+## Skills to Practice
+$skills_covered
+
+## Estimated Time
+$duration
+
+## Tasks
+$tasks
+
+## Resources
+$resources
+
+---
+Start working on the tasks above and check them off as you complete them!
+"""),
+
+    "project_issue_body": Template("""$description
+
+## Skills Required
+$skills_required
+
+## Acceptance Criteria
+$acceptance_criteria
+
+## Resources
+$resources
+
+## Difficulty
+$difficulty
+
+## Estimated Time
+$estimated_time
+
+---
+This is an AI-generated learning task. Complete the requirements and close the issue when done!
+"""),
+}
+
+
+def bullets(items: Iterable[Any], prefix: str = "- ") -> str:
+    return "\n".join(f"{prefix}{item}" for item in items)
+
+
+def render(template: str, /, **fields: Any) -> str:
+    """Render a registered template; list values become bullet lists"""
+    values = tuple(sorted(
+        (key, bullets(value) if isinstance(value, (list, tuple)) else str(value))
+        for key, value in fields.items()
+    ))
+    return _render(template, values)
+
+
+@lru_cache(maxsize=4096)
+def _render(template: str, values: Tuple[Tuple[str, str], ...]) -> str:
+    return TEMPLATES[template].substitute(dict(values))
+
+
+# ----------------------------------------------------------------------
+# Whole-repository batches (fed straight to the Git tree writer)
+# ----------------------------------------------------------------------
+
+def render_roadmap_tree(roadmap_data: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], List[Dict[str, Any]]]:
+    """(files, task folders) for a level-based learning repository"""
+    files: List[Tuple[str, str]] = []
+    folders: List[Dict[str, Any]] = []
+
+    for milestone in roadmap_data.get("milestones", []):
+        level_name = milestone.get("name", "Unknown Level")
+        folder_path = f"Level-{level_name.replace(' ', '-')}"
+        tasks = milestone.get("tasks", [])
+
+        files.append((f"{folder_path}/README.md", render(
+            "roadmap_level_readme",
+            name=level_name,
+            description=milestone.get("description", ""),
+            learning_objectives=milestone.get("learning_objectives", []),
+            skills_covered=milestone.get("skills_covered", []),
+            duration=milestone.get("duration", "2-4 weeks"),
+            tasks=[task.get("title", "Task") for task in tasks]
+        )))
+
+        for task in tasks:
+            task_folder = f"{folder_path}/{task.get('title', 'Task').replace(' ', '-').lower()}"
+            files.append((f"{task_folder}/README.md", render(
+                "roadmap_task_readme",
+                title=task.get("title", "Task"),
+                description=task.get("description", "Complete this learning task"),
+                skills_required=task.get("skills_required", []),
+                acceptance_criteria=task.get("acceptance_criteria", []),
+                resources=task.get("resources", []),
+                estimated_time=task.get("estimated_time", "2-4 hours"),
+                difficulty=task.get("difficulty", "Medium")
+            )))
+            folders.append({
+                "level": level_name,
+                "task": task.get("title", "Task"),
+                "path": task_folder,
+                "difficulty": task.get("difficulty", "Medium")
+            })
+
+    return files, folders
+
+
+def render_project_tree(repo_data: Dict[str, Any], roadmap_data: Dict[str, Any],
+                        milestone_focus: Optional[str] = None) -> Tuple[List[Tuple[str, str]], List[Tuple[str, Dict[str, Any]]]]:
+    """(files, (path, folder) pairs) for a milestone-based project repository"""
+    files = [("README.md", render(
+        "project_readme",
+        name=repo_data["name"],
+        description=repo_data["description"],
+        learning_objectives=roadmap_data.get("learning_objectives", []),
+        tech_stack=roadmap_data.get("tech_stack", [])
+    ))]
+    folders = [("README.md", {"name": "README.md", "type": "file"})]
+
+    milestones = roadmap_data.get("milestones", [])
+    if milestone_focus:
+        milestones = [m for m in milestones if m.get("name") == milestone_focus]
+
+    for i, milestone in enumerate(milestones[:3]):  # Limit to first 3 milestones
+        folder_name = f"milestone-{i+1}-{milestone.get('name', 'learning').lower().replace(' ', '-')}"
+        files.append((f"{folder_name}/README.md", render(
+            "milestone_readme",
+            number=i + 1,
+            name=milestone.get("name", "Learning Milestone"),
+            description=milestone.get("description", "Complete this learning milestone"),
+            learning_objectives=milestone.get("learning_objectives", []),
+            skills_covered=milestone.get("skills_covered", []),
+            duration=milestone.get("duration", "1-2 weeks"),
+            tasks=bullets((task.get("title", "Task") for task in milestone.get("tasks", [])), prefix="- [ ] "),
+            resources=milestone.get("resources", [])
+        )))
+        folders.append((f"{folder_name}/README.md", {
+            "name": folder_name,
+            "type": "folder",
+            "milestone": milestone.get("name", "Unknown")
+        }))
+
+    return files, folders
+
+
+def render_project_issue(task: Dict[str, Any]) -> str:
+    return render(
+        "project_issue_body",
+        description=task.get("description", "Complete this learning task"),
+        skills_required=task.get("skills_required", []),
+        acceptance_criteria=bullets(task.get("acceptance_criteria", []), prefix="- [ ] "),
+        resources=task.get("resources", []),
+        difficulty=task.get("difficulty", "Medium"),
+        estimated_time=task.get("estimated_time", "2-4 hours")
+    )
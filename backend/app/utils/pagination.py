@@ -0,0 +1,92 @@
+import base64
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import Response, jsonify, request, stream_with_context
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+class CursorError(ValueError):
+    """A client-supplied cursor that cannot be decoded or has the wrong shape"""
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque, URL-safe cursor for the last row of a page"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: Optional[int] = None) -> Optional[List[Any]]:
+    """Values of a cursor from encode_cursor; raises CursorError if it was tampered with.
+
+    ``size`` is the number of values the caller expects.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise CursorError("Invalid pagination cursor")
+    if not isinstance(values, list) or (size is not None and len(values) != size):
+        raise CursorError("Invalid pagination cursor")
+    return values
+
+
+def page_args() -> Tuple[Optional[str], int, bool]:
+    """Read cursor, limit (capped at MAX_PAGE_SIZE) and NDJSON flag from the request"""
+    cursor = request.args.get("cursor")
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    stream = request.args.get("format") == "ndjson"
+    return cursor, limit, stream
+
+
+def ndjson_response(fetch_page: Callable[[Optional[str]], Tuple[List[Dict[str, Any]], Optional[str]]],
+                    cursor: Optional[str] = None, first_rows: Optional[List[Dict[str, Any]]] = None) -> Response:
+    """Stream every page as newline-delimited JSON, one row per line.
+
+    ``fetch_page(cursor)`` returns ``(rows, next_cursor)``; only one page is
+    held in memory at a time. With ``first_rows`` (already fetched), ``cursor``
+    is the cursor that follows them and None means there is nothing more.
+    """
+    def generate() -> Iterator[str]:
+        rows, next_cursor = (first_rows, cursor) if first_rows is not None else fetch_page(cursor)
+        while True:
+            for row in rows:
+                yield json.dumps(row, default=str) + "\n"
+            if not next_cursor:
+                break
+            rows, next_cursor = fetch_page(next_cursor)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def paginated_response(key: str, fetch_page: Callable[[Optional[str], int], Tuple[List[Dict[str, Any]], Optional[str]]]):
+    """Serve one cursor page as JSON, or every page as NDJSON with ?format=ndjson.
+
+    ``fetch_page(cursor, limit)`` returns ``(rows, next_cursor)`` and raises
+    CursorError for a malformed cursor, which becomes a 400. The first page is
+    fetched before streaming starts so that error can still be reported.
+    """
+    cursor, limit, stream = page_args()
+    try:
+        rows, next_cursor = fetch_page(cursor, limit)
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if stream:
+        return ndjson_response(lambda page_cursor: fetch_page(page_cursor, limit), next_cursor, first_rows=rows)
+
+    return jsonify({
+        "success": True,
+        key: rows,
+        "count": len(rows),
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    })
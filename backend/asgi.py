@@ -0,0 +1,33 @@
+# asgi.py
+# ASGI entry point for uvicorn/hypercorn: uvicorn asgi:app --workers 1
+# (one worker: caches and the leaderboard are per process, see backend/README.md)
+# The Flask app runs in asgiref's thread pool (size via ASGI_THREADS); async
+# views still fan out their I/O on the shared pool in app/utils/async_io.py.
+import asyncio
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+from app.config import Config
+from app.services.lifecycle import lifecycle
+
+flask_app = create_app()
+_wsgi = WsgiToAsgi(flask_app)
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "lifespan":
+        await _wsgi(scope, receive, send)
+        return
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if Config.WARMUP_ON_START:
+                lifecycle.start_warmup()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            # The server has stopped accepting connections; let in-flight requests finish
+            await asyncio.to_thread(lifecycle.drain, Config.WEB_GRACEFUL_TIMEOUT)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
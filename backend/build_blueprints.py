@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Offline generator for the repository blueprint library
+Precomputes a full learning repository (roadmap, rendered tree, issue set and
+portfolio project) for every role x level bucket so the API can serve them
+without calling the LLM. Unchanged blueprints keep their version and file.
+Each bucket keeps the tasks within one difficulty step of its level; buckets
+left with fewer than MIN_MILESTONES milestones or MIN_TASKS tasks are rejected
+(and any stale file removed), so those roles are generated per request instead.
+
+Usage:
+    python build_blueprints.py                      # built-in roadmaps, no LLM
+    python build_blueprints.py --source agent2      # generate with Agent2/Groq
+    python build_blueprints.py --roles data_scientist --buckets advanced
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Any, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.blueprint_library import (
+    Blueprint, BlueprintLibrary, BUCKET_LEVELS, LEVEL_BUCKETS, _load_agent2, issue_to_task
+)
+from app.config import Config
+
+DEFAULT_ROLES = ["software_engineer", "data_scientist"]
+DIFFICULTY_RANK = {"beginner": 0, "intermediate": 1, "advanced": 2}
+# A bucket keeps tasks at most this many difficulty steps from its own level
+MAX_DIFFICULTY_DISTANCE = 1
+# Buckets thinner than this are not written (the route then generates instead)
+MIN_MILESTONES = 2
+MIN_TASKS = 2
+PORTFOLIO_FEATURES = [
+    "Responsive design",
+    "Performance optimization",
+    "Testing coverage",
+    "Documentation",
+    "Deployment setup"
+]
+
+
+def task_to_issue(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Roadmap task -> Agent2 portfolio issue dict"""
+    return {
+        "title": task.get("title", "Task"),
+        "description": task.get("description", ""),
+        "difficulty": task.get("difficulty", "Medium").lower(),
+        "estimated_time": task.get("estimated_time", "2-4 hours"),
+        "skills_required": task.get("skills_required", []),
+        "acceptance_criteria": task.get("acceptance_criteria", []),
+        "hints": task.get("hints", []),
+        "resources": task.get("resources", [])
+    }
+
+
+def thin_bucket_reason(roadmap: Dict[str, Any]) -> Optional[str]:
+    """Why a bucket's roadmap is too thin to ship, or None"""
+    milestones = roadmap.get("milestones", [])
+    tasks = sum(len(milestone.get("tasks", [])) for milestone in milestones)
+    if len(milestones) < MIN_MILESTONES or tasks < MIN_TASKS:
+        return (f"{len(milestones)} milestones / {tasks} tasks, "
+                f"need at least {MIN_MILESTONES} / {MIN_TASKS}")
+    return None
+
+
+def from_builtin(role: str, bucket: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Roadmap and portfolio from the built-in role paths, with tasks filtered to the bucket"""
+    from app.routes.projects import create_fallback_roadmap
+
+    roadmap = create_fallback_roadmap(role, [], BUCKET_LEVELS[bucket])
+    rank = DIFFICULTY_RANK[bucket]
+    milestones = []
+    for milestone in roadmap["milestones"]:
+        tasks = [
+            task for task in milestone.get("tasks", [])
+            if abs(DIFFICULTY_RANK.get(task.get("difficulty", "").lower(), 1) - rank) <= MAX_DIFFICULTY_DISTANCE
+        ]
+        if tasks:
+            milestones.append({**milestone, "tasks": tasks})
+    roadmap["milestones"] = milestones
+    roadmap["difficulty_level"] = bucket
+    if not milestones:
+        return roadmap, {}
+
+    final_tasks = roadmap["milestones"][-1].get("tasks", [])
+    portfolio = {
+        "project": {
+            "name": f"{role.replace('_', '-')}-{bucket}-portfolio",
+            "description": f"Portfolio project for {role.replace('_', ' ')}s at the {bucket} level",
+            "tech_stack": roadmap.get("tech_stack", []),
+            "difficulty_level": bucket,
+            "estimated_time": roadmap["milestones"][-1].get("duration", "4-6 weeks"),
+            "learning_objectives": roadmap["milestones"][-1].get("learning_objectives", [])
+        },
+        "issues": [task_to_issue(task) for task in final_tasks],
+        "portfolio_features": PORTFOLIO_FEATURES
+    }
+    return roadmap, portfolio
+
+
+def from_agent2(role: str, bucket: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Roadmap and portfolio generated through Agent2 (LLM)"""
+    agent = _load_agent2()()
+    from roadmap_agent import RoadmapGenerationAgent  # importable once _load_agent2 set the path
+
+    level = BUCKET_LEVELS[bucket]
+    generated = RoadmapGenerationAgent().create_learning_roadmap(level, role, [])
+    milestones = []
+    tech_stack: List[str] = []
+    for item in generated.get("milestones", []):
+        skills = item.get("skills_covered", [])
+        tech_stack.extend(skill for skill in skills if skill not in tech_stack)
+        milestones.append({
+            "name": item.get("title", "Milestone"),
+            "description": item.get("description", ""),
+            "duration": item.get("estimated_time", "2-4 weeks"),
+            "learning_objectives": item.get("completion_criteria", []),
+            "skills_covered": skills,
+            "resources": item.get("resources", []),
+            "tasks": [issue_to_task(issue) for issue in agent.generate_coding_issues(bucket, skills)]
+        })
+    roadmap = {
+        "name": f"{role.replace('_', ' ').title()} Learning Path",
+        "description": f"Learning path to become a {role.replace('_', ' ')}",
+        "milestones": milestones,
+        "learning_objectives": generated.get("success_metrics", []),
+        "tech_stack": tech_stack,
+        "estimated_duration": generated.get("total_duration", ""),
+        "difficulty_level": bucket
+    }
+
+    project = agent.create_project_repository(level + 1, tech_stack[:3])
+    issues = agent.generate_coding_issues("advanced", project.get("tech_stack", tech_stack))
+    portfolio = {
+        "project": project,
+        "issues": [{**issue_to_task(issue), "difficulty": issue.difficulty, "hints": list(issue.hints)}
+                   for issue in issues],
+        "portfolio_features": PORTFOLIO_FEATURES
+    }
+    return roadmap, portfolio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the repository blueprint library")
+    parser.add_argument("--roles", nargs="+", default=DEFAULT_ROLES)
+    parser.add_argument("--buckets", nargs="+", default=[bucket for bucket, _, _ in LEVEL_BUCKETS],
+                        choices=[bucket for bucket, _, _ in LEVEL_BUCKETS])
+    parser.add_argument("--source", choices=["builtin", "agent2"], default="builtin",
+                        help="builtin roadmaps (no LLM) or Agent2 generation")
+    parser.add_argument("--dir", default=Config.BLUEPRINT_DIR, help="library directory")
+    parser.add_argument("--dry-run", action="store_true", help="build but do not write")
+    args = parser.parse_args()
+
+    library = BlueprintLibrary(args.dir)
+    generate = from_agent2 if args.source == "agent2" else from_builtin
+    print(f"🏗️ Building {len(args.roles) * len(args.buckets)} blueprints from '{args.source}' into {args.dir}")
+
+    failures = 0
+    for role in args.roles:
+        for bucket in args.buckets:
+            try:
+                roadmap, portfolio = generate(role, bucket)
+            except Exception as e:
+                failures += 1
+                print(f"❌ {role}/{bucket}: {e}")
+                continue
+
+            existing = library.get(role, BUCKET_LEVELS[bucket])
+            reason = thin_bucket_reason(roadmap)
+            if reason:
+                print(f"⚠️ {role}/{bucket}: rejected, {reason}")
+                if existing and not args.dry_run:
+                    library.remove(role, bucket)
+                    print(f"🗑️ {role}/{bucket}: removed the stale blueprint")
+                continue
+
+            blueprint = Blueprint.build(role, bucket, roadmap, portfolio, source=args.source)
+            if existing and existing.version == blueprint.version:
+                print(f"✅ {role}/{bucket}: unchanged (v{blueprint.version})")
+                continue
+            if args.dry_run:
+                print(f"📝 {role}/{bucket}: would write v{blueprint.version} "
+                      f"({len(blueprint.files)} files, {len(blueprint.issues)} issues)")
+                continue
+            path = library.save(blueprint)
+            print(f"✅ {role}/{bucket}: wrote v{blueprint.version} to {path} "
+                  f"({len(blueprint.files)} files, {len(blueprint.issues)} issues)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# gunicorn.conf.py
+# Production server: gunicorn -c gunicorn.conf.py wsgi:app
+# Every route blocks on GitHub, Supabase, Gemini or Groq, so each worker runs
+# a thread pool (gthread) instead of serving one request at a time. gevent
+# workers also work (WEB_WORKER_CLASS=gevent) if gevent is installed.
+import os
+import signal
+import threading
+
+from app.config import Config
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = Config.WEB_WORKERS
+worker_class = Config.WEB_WORKER_CLASS
+threads = Config.WEB_THREADS
+worker_connections = Config.WEB_THREADS * 64  # gevent only
+
+# LLM-backed routes (CV analysis, roadmap generation) can take a while
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth from per-process caches
+max_requests = 2000
+max_requests_jitter = 200
+
+# Not preloaded: the operation logger and leaderboard start background threads per worker
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    from app.services.lifecycle import lifecycle
+
+    # The worker is about to accept connections; warm lazy services in the background
+    if Config.WARMUP_ON_START:
+        lifecycle.start_warmup()
+
+    # Gunicorn closes the listener as soon as a worker handles SIGTERM, so a 503
+    # from /healthz set in worker_exit would never be seen. Report draining first
+    # and keep serving for WEB_DRAIN_DELAY seconds (within graceful_timeout).
+    delay = min(Config.WEB_DRAIN_DELAY, max(0, graceful_timeout - 1))
+    if delay > 0:
+        stop = worker.handle_exit
+
+        def handle_term(sig, frame):
+            lifecycle.begin_drain()
+            threading.Timer(delay, stop, (sig, frame)).start()
+
+        signal.signal(signal.SIGTERM, handle_term)
+
+
+def worker_exit(server, worker):
+    # Gunicorn has already waited for in-flight requests (graceful_timeout);
+    # flush buffered telemetry and leaderboard points before the worker dies
+    from app.services.lifecycle import lifecycle
+    lifecycle.drain(timeout=graceful_timeout)
@@ -31,6 +31,11 @@ def create_tables():
     except:
         print("❌ AI Issues table not found - please create it manually in Supabase")
     
+    try:
+        supabase.table("ai_issues").select("idempotency_key").limit(1).execute()
+    except:
+        print("❌ ai_issues.idempotency_key missing - run: ALTER TABLE ai_issues ADD COLUMN idempotency_key CHAR(64) UNIQUE;")
+    
     # AI Repositories table
     try:
         print("📝 Creating ai_repositories table...")
@@ -134,6 +139,14 @@ def create_tables():
         print("✅ User Resume table already exists")
     except:
         print("❌ User Resume table not found - please create it manually in Supabase")
+    
+    # Payload Blobs table (content-addressed storage for large JSON payloads)
+    try:
+        print("📝 Creating payload_blobs table...")
+        supabase.table("payload_blobs").select("hash").limit(1).execute()
+        print("✅ Payload Blobs table already exists")
+    except:
+        print("❌ Payload Blobs table not found - please create it manually in Supabase")
 
 def check_connection():
     """Check if we can connect to Supabase"""
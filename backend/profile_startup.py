@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup profile for the Flask backend
+Runs `python -X importtime` on app creation in a fresh interpreter and reports
+which imports dominate cold start, how long create_app() takes, and
+(optionally) what the warm-up hook costs afterwards.
+
+Usage:
+    python profile_startup.py                # top 15 imports by cumulative time
+    python profile_startup.py --top 30 --self
+    python profile_startup.py --warmup       # also time lifecycle.warm_up()
+    python profile_startup.py --json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Any
+
+# Runs inside the child interpreter; prints one JSON line with wall-clock timings
+CHILD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+result = {"import_ms": (imported - started) * 1000, "create_app_ms": (created - imported) * 1000}
+if "--warmup" in sys.argv:
+    from app.services.lifecycle import lifecycle
+    warmup = lifecycle.warm_up()
+    result["warmup_ms"] = warmup.get("elapsed_ms")
+    result["warmup_tasks"] = warmup.get("tasks")
+print("PROFILE " + json.dumps(result))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Rows of `import time: self | cumulative | name` with their nesting depth"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def profile(warmup: bool = False) -> Dict[str, Any]:
+    command = [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT] + (["--warmup"] if warmup else [])
+    completed = subprocess.run(command, capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    timings = {}
+    for line in completed.stdout.splitlines():
+        if line.startswith("PROFILE "):
+            timings = json.loads(line[len("PROFILE "):])
+    if not timings:
+        raise RuntimeError(f"App startup failed:\n{completed.stderr[-2000:]}")
+    return {"timings": timings, "imports": parse_importtime(completed.stderr)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile backend cold start")
+    parser.add_argument("--top", type=int, default=15, help="number of imports to list")
+    parser.add_argument("--self", dest="by_self", action="store_true",
+                        help="rank by self time instead of top-level cumulative time")
+    parser.add_argument("--warmup", action="store_true", help="also run and time the warm-up hook")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    report = profile(args.warmup)
+    imports = report["imports"]
+    if args.by_self:
+        ranked = sorted(imports, key=lambda row: row["self_ms"], reverse=True)
+    else:
+        # Top-level imports only, so nested modules are not counted twice
+        ranked = sorted((row for row in imports if row["depth"] == 0),
+                        key=lambda row: row["cumulative_ms"], reverse=True)
+
+    if args.json:
+        print(json.dumps({"timings": report["timings"], "imports": ranked[:args.top]}, indent=2))
+        return
+
+    timings = report["timings"]
+    print(f"⏱️ import app: {timings['import_ms']:.0f}ms, create_app(): {timings['create_app_ms']:.0f}ms "
+          f"({len(imports)} modules imported)")
+    if "warmup_ms" in timings:
+        print(f"🔥 warm-up: {timings['warmup_ms']}ms")
+        for name, result in (timings.get("warmup_tasks") or {}).items():
+            print(f"   {name:<32} {result}{'ms' if isinstance(result, int) else ''}")
+
+    column = "self_ms" if args.by_self else "cumulative_ms"
+    print(f"\n{'module':<48} {column:>14}")
+    for row in ranked[:args.top]:
+        print(f"{row['module']:<48} {row[column]:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
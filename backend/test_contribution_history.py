@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the contribution history store
+Checks the current-year first fetch, the background backfill, per-year
+top-ups and that each viewer gets its own .npz file
+"""
+
+import sys
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.contribution_history import ContributionHistory, ContributionHistoryStore
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+class FakeGraphQL:
+    """GraphQL stand-in: one active day per fetched range, ``counts`` per token (private
+    contributions depend on the viewer) plus ``extra`` per year; records fetched years"""
+
+    def __init__(self, created, counts=None):
+        self.created = created
+        self.counts = counts or {}
+        self.extra = {}
+        self.calls = []
+
+    def __call__(self, token, query, variables):
+        user = {"createdAt": f"{self.created.isoformat()}T08:00:00Z"}
+        if "contributionsCollection" not in query:
+            self.calls.append("createdAt")
+            return user
+        first = date.fromisoformat(variables["from"][:10])
+        self.calls.append(first.year)
+        count = self.counts.get(token, 1) + self.extra.get(first.year, 0)
+        user["contributionsCollection"] = {
+            "totalCommitContributions": count,
+            "totalPullRequestContributions": 0,
+            "totalIssueContributions": 0,
+            "contributionCalendar": {"weeks": [{"contributionDays": [
+                {"date": first.isoformat(), "contributionCount": count}
+            ]}]}
+        }
+        return user
+
+
+def _store(tmp_path, fetcher, **kwargs):
+    store = ContributionHistoryStore(str(tmp_path), **kwargs)
+    store._graphql = fetcher
+    return store
+
+
+def _wait_for_backfill(store):
+    for _ in range(500):
+        if not store._backfilling:
+            return
+        time.sleep(0.01)
+    raise AssertionError("backfill did not finish")
+
+
+def test_first_fetch_is_current_year_then_backfilled(tmp_path):
+    """The first request costs one query; older years arrive in the background and are stored"""
+    fetcher = FakeGraphQL(date(TODAY.year - 2, 3, 10))
+    store = _store(tmp_path, fetcher)
+
+    first = store.get("octo", "token")
+    assert fetcher.calls[0] == TODAY.year
+    assert not first.complete
+    assert first.years.tolist() == [TODAY.year]
+    assert first.activity_metrics()["source"] == "current_year"
+
+    _wait_for_backfill(store)
+    assert fetcher.calls[1:] == ["createdAt", TODAY.year - 2, TODAY.year - 1, TODAY.year]
+    history = store.get("octo", "token")
+    assert history.complete and history.years.tolist() == [TODAY.year - 2, TODAY.year - 1, TODAY.year]
+    assert history.totals()["total_contributions"] == 3
+    assert history.start == date(TODAY.year - 2, 3, 10)
+
+    stored = ContributionHistory.load("octo", str(next(tmp_path.glob("octo.*.npz"))))
+    assert stored.complete and stored.years.tolist() == history.years.tolist()
+    assert len(fetcher.calls) == 5
+    print("✅ First fetch is current year, then backfilled")
+
+
+def test_top_up_refetches_only_years_since_sync(tmp_path):
+    """A stale history refetches the years from its last synced day on, not the whole account"""
+    fetcher = FakeGraphQL(date(TODAY.year - 2, 3, 10))
+    store = _store(tmp_path, fetcher)
+    store.get("octo", "token")
+    _wait_for_backfill(store)
+
+    store.refresh_seconds = 0
+    fetcher.calls.clear()
+    fetcher.extra[TODAY.year] = 4
+    history = store.get("octo", "token")
+    assert fetcher.calls == [TODAY.year]
+    assert history.yearly()[-1]["total_contributions"] == 5
+    assert history.totals()["total_contributions"] == 7
+
+    fetcher.calls.clear()
+    history.synced = date(TODAY.year - 1, 12, 31)
+    store.get("octo", "token")
+    assert fetcher.calls == [TODAY.year - 1, TODAY.year]
+    print("✅ Top-up refetches only years since sync")
+
+
+def test_histories_are_kept_per_viewer(tmp_path):
+    """Two tokens see different private counts and get separate files; usernames ignore case"""
+    fetcher = FakeGraphQL(date(TODAY.year, 1, 1), counts={"token-a": 1, "token-b": 5})
+    store = _store(tmp_path, fetcher)
+
+    seen_by_a = store.get("octo", "token-a")
+    seen_by_b = store.get("octo", "token-b")
+    assert seen_by_a.complete and seen_by_b.complete  # account created this year: nothing to backfill
+    assert seen_by_a.totals()["total_contributions"] == 1
+    assert seen_by_b.totals()["total_contributions"] == 5
+    assert len(list(tmp_path.glob("octo.*.npz"))) == 2
+
+    assert store.get("OCTO", "token-a") is seen_by_a
+    reloaded = _store(tmp_path, fetcher)
+    assert reloaded.get("octo", "token-b").totals()["total_contributions"] == 5
+    assert len(fetcher.calls) == 2
+    print("✅ Histories are kept per viewer")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
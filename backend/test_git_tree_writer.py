@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for the Git tree writer
+Checks the blobs -> tree -> commit -> ref sequence and the Contents API
+fallback when the batch cannot be completed
+"""
+
+import base64
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import git_tree_writer
+from app.services.git_tree_writer import INLINE_CONTENT_LIMIT, GitTreeWriter
+
+REPO = "/repos/octo/demo"
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = "" if status_code < 400 else "error"
+
+    def json(self):
+        return self._data
+
+
+class FakeGitHub:
+    """requests.Session stand-in for one repository; records (method, path, body) calls"""
+
+    def __init__(self, branch_exists=True, ref_update_status=200, existing_files=("README.md",)):
+        self.headers = {}
+        self.calls = []
+        self.branch_exists = branch_exists
+        self.ref_update_status = ref_update_status
+        self.existing_files = set(existing_files)
+        self.blobs = 0
+
+    def _path(self, url):
+        return url.replace(git_tree_writer.API_BASE, "")
+
+    def get(self, url, params=None, timeout=None):
+        path = self._path(url)
+        self.calls.append(("GET", path, None))
+        if path == REPO:
+            return FakeResponse(200, {"default_branch": "main"})
+        if path == f"{REPO}/git/ref/heads/main":
+            return FakeResponse(200, {"object": {"sha": "head"}}) if self.branch_exists else FakeResponse(404)
+        if path == f"{REPO}/git/commits/head":
+            return FakeResponse(200, {"tree": {"sha": "base-tree"}})
+        if path.startswith(f"{REPO}/contents/"):
+            name = path.split("/contents/", 1)[1]
+            return FakeResponse(200, {"sha": f"sha-{name}"}) if name in self.existing_files else FakeResponse(404)
+        return FakeResponse(404)
+
+    def post(self, url, json=None, timeout=None):
+        path = self._path(url)
+        self.calls.append(("POST", path, json))
+        if path == f"{REPO}/git/blobs":
+            self.blobs += 1
+            return FakeResponse(201, {"sha": f"blob-{self.blobs}"})
+        if path == f"{REPO}/git/trees":
+            return FakeResponse(201, {"sha": "new-tree"})
+        if path == f"{REPO}/git/commits":
+            return FakeResponse(201, {"sha": "new-commit"})
+        return FakeResponse(404)
+
+    def patch(self, url, json=None, timeout=None):
+        self.calls.append(("PATCH", self._path(url), json))
+        return FakeResponse(self.ref_update_status, {"object": {"sha": json["sha"]}})
+
+    def put(self, url, json=None, timeout=None):
+        self.calls.append(("PUT", self._path(url), json))
+        return FakeResponse(201, {"content": {}})
+
+    def sequence(self):
+        return [(method, path) for method, path, _ in self.calls]
+
+    def body(self, method, path):
+        return next(body for m, p, body in self.calls if (m, p) == (method, path))
+
+
+def _write(monkeypatch, github, files, **kwargs):
+    monkeypatch.setattr(git_tree_writer.requests, "Session", lambda: github)
+    writer = GitTreeWriter(retry_delay=0)
+    return writer.write_files("secret", "octo", "demo", files, "Initialize project", **kwargs)
+
+
+def test_files_are_written_in_one_commit(monkeypatch):
+    """Large files become blobs, small ones go inline, and the branch moves to one new commit"""
+    github = FakeGitHub()
+    large = "x" * (INLINE_CONTENT_LIMIT + 1)
+    files = [("README.md", "# Demo"), ("data/big.txt", large), ("src/main.py", "print('hi')")]
+    result = _write(monkeypatch, github, files)
+
+    assert result == {"commit_sha": "new-commit", "paths": ["README.md", "data/big.txt", "src/main.py"],
+                      "mode": "tree"}
+    assert github.sequence() == [
+        ("GET", REPO),
+        ("GET", f"{REPO}/git/ref/heads/main"),
+        ("GET", f"{REPO}/git/commits/head"),
+        ("POST", f"{REPO}/git/blobs"),
+        ("POST", f"{REPO}/git/trees"),
+        ("POST", f"{REPO}/git/commits"),
+        ("PATCH", f"{REPO}/git/refs/heads/main"),
+    ]
+    assert base64.b64decode(github.body("POST", f"{REPO}/git/blobs")["content"]).decode() == large
+
+    tree = github.body("POST", f"{REPO}/git/trees")
+    assert tree["base_tree"] == "base-tree"
+    assert [entry.get("sha") or entry["content"] for entry in tree["tree"]] == ["# Demo", "blob-1", "print('hi')"]
+    assert github.body("POST", f"{REPO}/git/commits") == {"message": "Initialize project", "tree": "new-tree",
+                                                           "parents": ["head"]}
+    assert github.body("PATCH", f"{REPO}/git/refs/heads/main") == {"sha": "new-commit"}
+    assert github.headers["Authorization"] == "token secret"
+    print("✅ Files are written in one commit")
+
+
+def test_failed_ref_update_falls_back_to_contents(monkeypatch):
+    """A rejected ref update writes every file through the Contents API instead"""
+    github = FakeGitHub(ref_update_status=422)
+    result = _write(monkeypatch, github, [("README.md", "# Demo"), ("src/main.py", "print('hi')")], branch="main")
+
+    assert result == {"commit_sha": None, "paths": ["README.md", "src/main.py"], "mode": "contents"}
+    puts = [(path, body) for method, path, body in github.calls if method == "PUT"]
+    assert [path for path, _ in puts] == [f"{REPO}/contents/README.md", f"{REPO}/contents/src/main.py"]
+    assert puts[0][1]["sha"] == "sha-README.md"  # updating the auto_init README needs its blob sha
+    assert "sha" not in puts[1][1]
+    assert all(body["branch"] == "main" for _, body in puts)
+    assert base64.b64decode(puts[1][1]["content"]).decode() == "print('hi')"
+    print("✅ Failed ref update falls back to contents")
+
+
+def test_missing_branch_falls_back_to_contents(monkeypatch):
+    """An empty repository without a branch is retried, then written file by file"""
+    github = FakeGitHub(branch_exists=False)
+    result = _write(monkeypatch, github, [("README.md", "# Demo")])
+
+    assert result["mode"] == "contents" and result["paths"] == ["README.md"]
+    assert github.sequence().count(("GET", f"{REPO}/git/ref/heads/main")) == 3
+    assert not any(method == "POST" for method, _ in github.sequence())
+    print("✅ Missing branch falls back to contents")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the GitHub issue publisher
+Covers idempotency keys and that re-publishing a batch creates nothing twice
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import issue_publisher
+from app.services.issue_publisher import IssuePublisher, IssueSpec, idempotency_key, is_rate_limited
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None, text=""):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+        self.text = text
+
+    def json(self):
+        return self._data
+
+
+class FakeGitHub:
+    """requests.Session stand-in backed by an in-memory issue list"""
+
+    def __init__(self):
+        self.headers = {}
+        self.issues = []
+        self.posts = []
+
+    def get(self, url, params=None, timeout=None):
+        if url.endswith("/issues"):
+            return FakeResponse(200, list(reversed(self.issues)))
+        return FakeResponse(200, [])
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        issue = {"number": len(self.issues) + 1, "title": json["title"],
+                 "html_url": f"https://github.com/octo/demo/issues/{len(self.issues) + 1}"}
+        self.issues.append(issue)
+        return FakeResponse(201, issue)
+
+
+class FakeTable:
+    def __init__(self, store):
+        self.store = store
+        self.keys = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.keys = set(values)
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        for row in rows:
+            self.store[row[on_conflict]] = row
+        return self
+
+    def execute(self):
+        rows = [row for key, row in self.store.items() if self.keys is None or key in self.keys]
+        return type("Result", (), {"data": rows})()
+
+
+class FakeClient:
+    """ai_issues table keyed by idempotency_key"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def table(self, name):
+        return FakeTable(self.rows)
+
+
+def test_idempotency_key_is_stable():
+    """Case and whitespace in the title do not change the key"""
+    key = idempotency_key("octo", "demo", "Add  login page")
+    assert key == idempotency_key("octo", "demo", " add login\tPAGE ")
+    assert len(key) == 64
+    print("✅ Idempotency key is stable")
+
+
+def test_idempotency_key_is_distinct():
+    """Different titles or repositories give different keys"""
+    keys = {
+        idempotency_key("octo", "demo", "Add login page"),
+        idempotency_key("octo", "demo", "Add logout page"),
+        idempotency_key("octo", "other", "Add login page"),
+        idempotency_key("octo-demo", "", "Add login page"),
+    }
+    assert len(keys) == 4
+    print("✅ Idempotency key is distinct")
+
+
+def test_rate_limit_detection():
+    """Rate-limit 403s are retried; permission 403s are not"""
+    assert is_rate_limited(FakeResponse(429))
+    assert is_rate_limited(FakeResponse(403, headers={"X-RateLimit-Remaining": "0"}))
+    assert is_rate_limited(FakeResponse(403, text="You have exceeded a secondary rate limit"))
+    assert not is_rate_limited(FakeResponse(403, text="Resource not accessible by integration"))
+    assert not is_rate_limited(FakeResponse(500))
+    print("✅ Rate limit detection")
+
+
+def test_republish_skips_existing(monkeypatch):
+    """A second publish of the same batch creates nothing, even if the database write was lost"""
+    github = FakeGitHub()
+    monkeypatch.setattr(issue_publisher.requests, "Session", lambda: github)
+    client = FakeClient()
+    publisher = IssuePublisher(client, min_interval=0)
+    specs = [IssueSpec("Add login page"), IssueSpec("Write tests", meta={"id": 2})]
+
+    first = publisher.publish("token", "octo", "demo", specs)
+    assert [result["status"] for result in first] == ["created", "created"]
+    assert first[1]["id"] == 2
+    assert len(client.rows) == 2
+
+    second = publisher.publish("token", "octo", "demo", specs)
+    assert [result["status"] for result in second] == ["existing", "existing"]
+    assert [result["number"] for result in second] == [result["number"] for result in first]
+
+    client.rows.clear()
+    third = publisher.publish("token", "octo", "demo", [IssueSpec("add LOGIN page")])
+    assert third[0]["status"] == "existing"
+    assert len(github.posts) == 2
+    print("✅ Re-publishing skips existing issues")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for the leaderboard ranking engine
+Covers RankingBoard ranks, period windows and how XP gains reach them
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.leaderboard_service import LeaderboardService, RankingBoard, period_key
+
+
+class FakeResult:
+    def __init__(self, data=None):
+        self.data = data or []
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def upsert(self, rows, on_conflict=None):
+        self.client.upserts.extend(rows)
+        return self
+
+    def execute(self):
+        rows = self.client.rows.get(self.name, [])
+        self.client.rows[self.name] = []  # one page
+        return FakeResult(rows)
+
+
+class FakeClient:
+    """Tables holding ``rows``; records reads, upserts and RPC calls"""
+
+    def __init__(self, rows=None):
+        self.rows = rows or {}
+        self.reads = []
+        self.upserts = []
+        self.rpcs = []
+
+    def table(self, name):
+        self.reads.append(name)
+        return FakeTable(self, name)
+
+    def rpc(self, name, params):
+        self.rpcs.append((name, params))
+        return FakeTable(self, "rpc")
+
+
+def _service(client=None):
+    service = LeaderboardService(client or FakeClient())
+    service._ensure_worker = lambda: None  # persist explicitly in tests
+    return service
+
+
+def test_ranking_board_ranks():
+    """Equal points share a competition rank; updates move users"""
+    board = RankingBoard()
+    board.set("a", 100)
+    board.set("b", 50)
+    board.set("c", 100)
+    board.add("b", 70)
+    assert len(board) == 3
+    assert board.points("b") == 120
+    assert board.rank("b") == 1
+    assert board.rank("a") == board.rank("c") == 2
+    assert board.rank("missing") is None
+    print("✅ Ranking board ranks")
+
+
+def test_ranking_board_top_and_around():
+    """top() and around() return ranked entries in order"""
+    board = RankingBoard()
+    for user_id, points in enumerate([10, 40, 30, 20, 50], start=1):
+        board.set(user_id, points)
+    assert [entry["user_id"] for entry in board.top(3)] == [5, 2, 3]
+    assert board.top(1)[0] == {"user_id": 5, "total_points": 50, "rank": 1}
+    assert len(board.top(10)) == 5
+    assert [entry["rank"] for entry in board.around(3, 1)] == [2, 3, 4]
+    assert [entry["user_id"] for entry in board.around(5, 1)] == [5, 2]
+    assert board.around("missing", 1) == []
+    print("✅ Ranking board top and around")
+
+
+def test_period_windows():
+    """Weekly keys follow ISO weeks and monthly keys calendar months"""
+    now = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    assert period_key("weekly", now) == "weekly:2026-W43"
+    assert period_key("monthly", now) == "monthly:2026-10"
+    assert period_key("all_time", now) == "all_time"
+    # 2027-01-01 is in ISO week 53 of 2026
+    new_year = datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert period_key("weekly", new_year) == "weekly:2026-W53"
+    assert period_key("monthly", new_year) == "monthly:2027-01"
+    print("✅ Period windows")
+
+
+def test_gains_credit_windows():
+    """Only the gain over the stored total counts toward weekly and monthly boards"""
+    service = _service()
+    service.update_points(1, 300, previous_points=250)
+    service.update_points(2, 500)  # previous total unknown: nothing credited to windows
+
+    assert service.position(1)["total_points"] == 300
+    assert service.position(2)["current_rank"] == 1
+    for period in ("weekly", "monthly"):
+        position = service.position(1, period=period)
+        assert position["total_points"] == 50
+        assert position["current_rank"] == 1
+        assert service.position(2, period=period)["current_rank"] is None
+    print("✅ Gains credit windows")
+
+
+def test_persist_adds_window_increments():
+    """Window gains are sent once as increments, not absolute totals"""
+    service = _service()
+    service.update_points("7", 120, previous_points=100)
+    service.persist()
+    service.persist()
+
+    rpcs = service.client.rpcs
+    assert len(rpcs) == 1
+    name, params = rpcs[0]
+    assert name == "leaderboard_add_period_points"
+    assert {row["period_key"] for row in params["increments"]} == {period_key("weekly"), period_key("monthly")}
+    assert all(row["user_id"] == 7 and row["points"] == 20 for row in params["increments"])
+    print("✅ Persist adds window increments")
+
+
+def test_requests_never_load_the_boards():
+    """Reads before the first load serve local boards; the warm-up task does the scan"""
+    client = FakeClient({"leaderboard": [{"user_id": 1, "total_points": 900}, {"user_id": 2, "total_points": 100}]})
+    service = _service(client)
+    service.update_points(3, 500)
+    assert service.position(3)["current_rank"] == 1
+    assert client.reads == []
+
+    service.start()
+    assert service.position(3)["current_rank"] == 2
+    assert service.top(1)[0]["user_id"] == 1
+    print("✅ Requests never load the boards")
+
+
+def test_ranks_are_not_persisted():
+    """Stored rows clear current_rank instead of writing a rank that goes stale"""
+    service = _service()
+    service.update_points(1, 50)
+    service.persist()
+    assert service.client.upserts[0]["total_points"] == 50
+    assert service.client.upserts[0]["current_rank"] is None
+    print("✅ Ranks are not persisted")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
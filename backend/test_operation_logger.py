@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the operation logger
+Checks batching, spilling while the database is down, replay once it is back,
+and that agent_metrics increments survive a failed roll-up
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.operation_logger import OperationLogger
+
+
+class FakeQuery:
+    def __init__(self, action):
+        self.action = action
+
+    def execute(self):
+        return self.action()
+
+
+class FakeTable:
+    def __init__(self, client):
+        self.client = client
+
+    def insert(self, rows):
+        def action():
+            if self.client.insert_down:
+                raise ConnectionError("database unreachable")
+            self.client.inserts.append(list(rows))
+        return FakeQuery(action)
+
+
+class FakeClient:
+    """Records inserted batches and agent_metrics_add calls; either can be made to fail"""
+
+    def __init__(self):
+        self.inserts = []
+        self.rpcs = []
+        self.insert_down = False
+        self.rpc_down = False
+
+    def table(self, name):
+        return FakeTable(self)
+
+    def rpc(self, name, params):
+        def action():
+            if self.rpc_down:
+                raise ConnectionError("rpc unreachable")
+            self.rpcs.append((name, params))
+        return FakeQuery(action)
+
+
+def _logger(client, tmp_path, **kwargs):
+    logger = OperationLogger(client, batch_size=2, flush_interval=0.01,
+                             spill_path=str(tmp_path / "spill.ndjson"), **kwargs)
+    logger._ensure_worker = lambda: None  # flush explicitly in tests
+    return logger
+
+
+def _record(n, operation_type="analysis", success=True, time_ms=100):
+    return {"user_id": n, "operation_type": operation_type, "success": success,
+            "execution_time_ms": time_ms, "created_at": "2026-10-19T12:00:00+00:00"}
+
+
+def test_failed_batches_spill_and_replay(tmp_path):
+    """Batches that fail are spilled, then replayed in batch_size chunks after the next good flush"""
+    client = FakeClient()
+    logger = _logger(client, tmp_path)
+    client.insert_down = True
+    for n in range(3):
+        logger.log(_record(n))
+    logger.flush()
+
+    spill = tmp_path / "spill.ndjson"
+    assert client.inserts == []
+    assert [json.loads(line)["user_id"] for line in spill.read_text().splitlines()] == [0, 1, 2]
+
+    client.insert_down = False
+    logger.log(_record(3))
+    logger.flush()
+    assert [[row["user_id"] for row in batch] for batch in client.inserts] == [[3], [0, 1], [2]]
+    assert not spill.exists()
+    assert not (tmp_path / "spill.ndjson.replay").exists()
+    assert sum(params["increments"][0]["total"] for _, params in client.rpcs) == 4
+    print("✅ Failed batches spill and replay")
+
+
+def test_full_queue_spills_instead_of_blocking(tmp_path):
+    """A saturated queue sends the record to the spill file and counts it"""
+    client = FakeClient()
+    logger = _logger(client, tmp_path, max_queue=1)
+    logger.log(_record(0))
+    logger.log(_record(1))
+    assert logger.spilled == 1
+    assert json.loads((tmp_path / "spill.ndjson").read_text())["user_id"] == 1
+
+    logger.flush()
+    assert [[row["user_id"] for row in batch] for batch in client.inserts] == [[0], [1]]
+    print("✅ Full queue spills instead of blocking")
+
+
+def test_failed_rollup_is_carried_forward(tmp_path):
+    """Increments from a failed agent_metrics_add are added to the next batch's roll-up"""
+    client = FakeClient()
+    logger = _logger(client, tmp_path)
+    client.rpc_down = True
+    logger.log(_record(0, time_ms=100))
+    logger.log(_record(1, success=False, time_ms=50))
+    logger.flush()
+    assert len(client.inserts) == 1 and client.rpcs == []
+
+    client.rpc_down = False
+    logger.log(_record(2, time_ms=30))
+    logger.log(_record(3, operation_type="review", time_ms=10))
+    logger.flush()
+
+    name, params = client.rpcs[0]
+    assert name == "agent_metrics_add"
+    increments = {row["operation_type"]: row for row in params["increments"]}
+    assert increments["analysis"] == {"date": "2026-10-19", "operation_type": "analysis",
+                                      "total": 3, "success": 2, "time_ms": 180}
+    assert increments["review"]["total"] == 1
+
+    logger.log(_record(4))
+    logger.flush()
+    assert client.rpcs[1][1]["increments"] == [{"date": "2026-10-19", "operation_type": "analysis",
+                                                "total": 1, "success": 1, "time_ms": 100}]
+    print("✅ Failed roll-up is carried forward")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination
+Covers cursor encoding, keyset filter parameters and TableRepository.page()
+without a database (a fake Supabase builder records the query)
+"""
+
+import sys
+from pathlib import Path
+
+from flask import Flask
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import data_repository
+from app.services.data_repository import TableRepository, _keyset_filter
+from app.models import UserSubmission
+from app.utils.pagination import CursorError, decode_cursor, encode_cursor, paginated_response
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeBuilder:
+    """Records the query and serves rows that are already in page order"""
+
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.row_limit = None
+
+    def select(self, columns, count=None):
+        self.calls.append(("select", columns))
+        return self
+
+    def eq(self, column, value):
+        self.calls.append(("eq", column, value))
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+
+    def or_(self, expression):
+        self.calls.append(("or", expression))
+        return self
+
+    def order(self, column, desc=False):
+        self.calls.append(("order", column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def execute(self):
+        return FakeResult(self.rows[:self.row_limit])
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return FakeBuilder(list(self.rows), self.calls)
+
+
+def _rows(count):
+    return [{"id": i, "user_id": 1, "submitted_at": f"2026-01-{i:02d}"} for i in range(count, 0, -1)]
+
+
+def test_cursor_round_trip():
+    """A cursor decodes to the values it was built from"""
+    cursor = encode_cursor(["2026-01-02T10:00:00", 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ["2026-01-02T10:00:00", 42]
+    assert decode_cursor(cursor, size=2) == ["2026-01-02T10:00:00", 42]
+    assert decode_cursor(None) is None
+    print("✅ Cursor round trip")
+
+
+def test_malformed_cursors_rejected():
+    """Garbage, non-list and wrong-size cursors raise CursorError"""
+    for cursor in ("not-a-cursor!", encode_cursor({"id": 1}), encode_cursor([1, 2, 3])):
+        try:
+            decode_cursor(cursor, size=2)
+        except CursorError:
+            continue
+        raise AssertionError(f"cursor {cursor!r} was accepted")
+    print("✅ Malformed cursors rejected")
+
+
+def test_keyset_filter_parameters():
+    """Keyset conditions quote strings, pass numbers and handle NULL sort keys"""
+    assert _keyset_filter("created_at", "2026-01-02", 7) == (
+        'created_at.lt."2026-01-02",and(created_at.eq."2026-01-02",id.lt.7)'
+    )
+    assert _keyset_filter("score", 10, 3) == "score.lt.10,and(score.eq.10,id.lt.3)"
+    assert _keyset_filter("score", 2.5, 3) == "score.lt.2.5,and(score.eq.2.5,id.lt.3)"
+    assert _keyset_filter("score", None, 3) == "and(score.is.null,id.lt.3),score.not.is.null"
+    for value in ("a,b", 'a"b', "a(b)", "a\\b", True, [1]):
+        try:
+            _keyset_filter("created_at", value, 1)
+        except CursorError:
+            continue
+        raise AssertionError(f"value {value!r} was accepted")
+    print("✅ Keyset filter parameters")
+
+
+def test_page_builds_next_cursor(monkeypatch):
+    """page() fetches limit + 1 rows and continues from the last returned row"""
+    fake = FakeSupabase(_rows(5))
+    monkeypatch.setattr(data_repository, "supabase", fake)
+    repo = TableRepository("user_submissions", UserSubmission)
+
+    records, cursor = repo.page(("user_id",), limit=2, order_by="submitted_at", user_id=1)
+    assert [record.user_id for record in records] == [1, 1]
+    assert decode_cursor(cursor) == ["2026-01-04", 4]
+    assert ("select", "user_id, submitted_at, id") in fake.calls
+    assert ("order", "submitted_at.desc,id", True) in fake.calls
+
+    repo.page(("user_id",), cursor=cursor, limit=2, order_by="submitted_at", user_id=1)
+    assert ("or", 'submitted_at.lt."2026-01-04",and(submitted_at.eq."2026-01-04",id.lt.4)') in fake.calls
+    print("✅ Page builds next cursor")
+
+
+def test_page_last_page_has_no_cursor(monkeypatch):
+    """A page shorter than the limit ends the walk"""
+    monkeypatch.setattr(data_repository, "supabase", FakeSupabase(_rows(2)))
+    repo = TableRepository("user_submissions", UserSubmission)
+    records, cursor = repo.page(("id",), limit=5, order_by="submitted_at")
+    assert len(records) == 2 and cursor is None
+    print("✅ Last page has no cursor")
+
+
+def test_page_rejects_non_integer_id(monkeypatch):
+    """A cursor whose id is not an integer never reaches the query"""
+    fake = FakeSupabase(_rows(2))
+    monkeypatch.setattr(data_repository, "supabase", fake)
+    repo = TableRepository("user_submissions", UserSubmission)
+    for position in (["2026-01-01", "1)"], ["2026-01-01", True]):
+        try:
+            repo.page(("id",), cursor=encode_cursor(position), order_by="submitted_at")
+        except CursorError:
+            continue
+        raise AssertionError(f"position {position!r} was accepted")
+    assert not any(call[0] == "or" for call in fake.calls)
+    print("✅ Non-integer cursor ids rejected")
+
+
+def test_paginated_response_bad_cursor_is_400():
+    """A malformed cursor becomes a 400 instead of a server error"""
+    def fetch_page(cursor, limit):
+        decode_cursor(cursor, size=2)
+        return [], None
+
+    app = Flask(__name__)
+    with app.test_request_context("/?cursor=garbage"):
+        response, status = paginated_response("items", fetch_page)
+        assert status == 400
+        assert "cursor" in response.get_json()["error"]
+
+    with app.test_request_context("/?limit=1000"):
+        seen = []
+        response = paginated_response("items", lambda cursor, limit: (seen.append(limit) or [], None))
+        assert seen == [100]
+        assert response.get_json()["has_more"] is False
+    print("✅ Bad cursor returns 400")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for repository statistics
+Checks the page fan-out and that accounts past the page cap are marked truncated
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import repo_stats
+from app.services.repo_stats import RepoStatsEngine
+
+
+class FakeResponse:
+    def __init__(self, data, last_page=None):
+        self.status_code = 200
+        self._data = data
+        self.links = {"last": {"url": f"https://api.github.com/users/octo/repos?page={last_page}"}} if last_page else {}
+
+    def json(self):
+        return self._data
+
+
+def _fake_github(pages, calls):
+    def get(url, params=None, headers=None, timeout=None):
+        calls.append((url, (params or {}).get("page"), headers))
+        if url.endswith("/repos"):
+            page = params["page"]
+            repos = [{"id": page * 1000 + i, "stargazers_count": 1, "language": "Python"} for i in range(3)]
+            return FakeResponse(repos, last_page=pages if page == 1 else None)
+        return FakeResponse({"login": "octo", "avatar_url": "", "public_repos": pages * 3,
+                             "followers": 0, "following": 0, "created_at": "2020-01-01T00:00:00Z"})
+    return get
+
+
+def test_every_page_is_counted(monkeypatch):
+    """All pages are fetched with the viewer's token and counted once"""
+    calls = []
+    monkeypatch.setattr(repo_stats.requests, "get", _fake_github(4, calls))
+    engine = RepoStatsEngine()
+    stats, cached = engine.get("octo", "secret")
+    assert not cached
+    assert stats["repository_stats"]["total_repositories"] == 12
+    assert stats["repository_stats"]["truncated"] is False
+    assert sorted(page for url, page, _ in calls if page) == [1, 2, 3, 4]
+    assert all(headers["Authorization"] == "token secret" for _, _, headers in calls)
+    assert engine.get("octo", "secret")[1] is True
+    print("✅ Every page is counted")
+
+
+def test_page_cap_is_reported(monkeypatch):
+    """An account larger than max_pages is marked truncated with GitHub's real total"""
+    calls = []
+    monkeypatch.setattr(repo_stats.requests, "get", _fake_github(5, calls))
+    stats, _ = RepoStatsEngine(max_pages=2).get("octo", "secret")
+    assert stats["repository_stats"]["total_repositories"] == 6
+    assert stats["repository_stats"]["truncated"] is True
+    assert stats["repository_stats"]["public_repos"] == 15
+    assert max(page for _, page, _ in calls if page) == 2
+    print("✅ Page cap is reported")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))